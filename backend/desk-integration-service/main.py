@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from contextlib import asynccontextmanager
@@ -5,8 +6,13 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.messaging.rabbitmq_publisher import rabbitmq_publisher
+from src.messaging.event_queue import event_queue
 from src.routers.desk_integration import router
+from src.services.async_desk_service import async_desk_service
+from src.services.desk_command_queue import desk_command_queue
+from src.services.desk_registry import DESK_REGISTRY_ENABLED, desk_registry
+from src.services.desk_service import DeskService, desk_guard, desk_transport
+from src.services.desk_telemetry import DESK_TELEMETRY_ENABLED, desk_telemetry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -33,13 +39,15 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Desk Integration Service...")
     logger.info("=" * 60)
 
-    try:
-        logger.info("Connecting to RabbitMQ for event publishing...")
-        rabbitmq_publisher.connect()
-        logger.info("✓ RabbitMQ publisher initialized successfully")
-    except Exception as e:
-        logger.warning("⚠ RabbitMQ connection failed: %s", e)
-        logger.info("Service will continue without event publishing")
+    # The publisher thread connects to RabbitMQ and retries until it is up
+    event_queue.start()
+
+    if DESK_REGISTRY_ENABLED:
+        async_desk_service.mirror = desk_registry
+        desk_registry.start()
+
+    if DESK_TELEMETRY_ENABLED:
+        desk_telemetry.start()
 
     yield
 
@@ -48,8 +56,14 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Desk Integration Service...")
     logger.info("=" * 60)
     try:
-        rabbitmq_publisher.disconnect()
+        await desk_telemetry.stop()
+        await desk_registry.stop()
+        await desk_command_queue.aclose()
+        # Flushes queued events and closes the RabbitMQ connection
+        await asyncio.to_thread(event_queue.stop)
         logger.info("✓ RabbitMQ connection closed")
+        await async_desk_service.aclose()
+        desk_transport.close()
     except Exception as e:
         logger.error("✗ Error during shutdown: %s", e)
 
@@ -85,4 +99,53 @@ def get_root() -> dict[str, str]:
 @app.get("/health")
 def health_check() -> dict[str, str]:
     """Health check endpoint."""
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.get("/debug/http-pool")
+def debug_http_pool() -> dict[str, object]:
+    """Inspect connection pool usage of the desk API clients."""
+    return {"async": async_desk_service.stats(), "sync": desk_transport.stats()}
+
+
+@app.get("/debug/desk-routes")
+def debug_desk_routes() -> dict[str, object]:
+    """Inspect how many desks are routed to each WiFi2BLE box."""
+    return DeskService._routes.stats()
+
+
+@app.get("/debug/desk-breakers")
+def debug_desk_breakers() -> dict[str, object]:
+    """Inspect circuit breakers and adaptive timeouts of the desk API calls."""
+    return desk_guard.stats()
+
+
+@app.get("/debug/desk-motion")
+def debug_desk_motion() -> dict[str, object]:
+    """Inspect the desk motion model."""
+    motion = async_desk_service.motion
+    return {"enabled": motion is not None, **(motion.stats() if motion else {})}
+
+
+@app.get("/debug/desk-registry")
+def debug_desk_registry() -> dict[str, object]:
+    """Inspect the background desk registry poller."""
+    return desk_registry.stats()
+
+
+@app.get("/debug/desk-telemetry")
+def debug_desk_telemetry() -> dict[str, object]:
+    """Inspect the desk telemetry sampler and store."""
+    return desk_telemetry.stats()
+
+
+@app.get("/debug/event-queue")
+def debug_event_queue() -> dict[str, object]:
+    """Inspect the outgoing event queue."""
+    return event_queue.stats()
+
+
+@app.get("/debug/desk-commands")
+def debug_desk_commands() -> dict[str, object]:
+    """Inspect the per-desk command queue and its rate limit."""
+    return desk_command_queue.stats()
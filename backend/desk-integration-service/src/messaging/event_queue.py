@@ -0,0 +1,311 @@
+"""Non-blocking event publishing through a bounded in-process queue."""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.messaging.event_spool import EventSpool, SpooledEvent
+from src.messaging.rabbitmq_publisher import RabbitMQPublisher, rabbitmq_publisher
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EventQueueSettings:
+    """Event queue parameters from environment variables."""
+
+    maxsize: int = int(os.getenv("EVENT_QUEUE_MAXSIZE", "10000"))
+    batch_size: int = int(os.getenv("EVENT_QUEUE_BATCH_SIZE", "100"))
+    retry_initial: float = float(os.getenv("EVENT_QUEUE_RETRY_INITIAL_SECONDS", "0.5"))
+    retry_max: float = float(os.getenv("EVENT_QUEUE_RETRY_MAX_SECONDS", "30"))
+    shutdown_timeout: float = float(
+        os.getenv("EVENT_QUEUE_SHUTDOWN_TIMEOUT_SECONDS", "5")
+    )
+    spool_enabled: bool = os.getenv("EVENT_SPOOL_ENABLED", "true").lower() == "true"
+
+
+@dataclass(frozen=True)
+class QueuedEvent:
+    """An event waiting to be published."""
+
+    routing_key: str
+    payload: Dict[str, Any]
+    persistent: bool = True
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class EventPublishQueue:
+    """Bounded queue of events drained by a background publisher thread.
+
+    ``publish`` only enqueues, so request handlers never wait on the broker;
+    when the queue is full the event is dropped and counted. The publisher
+    thread owns the RabbitMQ connection: it drains up to ``batch_size`` events
+    at a time, publishes them as one batch that the broker confirms once and,
+    when the broker is unavailable, retries the unconfirmed events in order
+    with exponential backoff.
+
+    With a ``spool``, unconfirmed events are written to disk instead of being
+    held in memory, and later events queue up behind them so order is kept.
+    The spool is replayed in batches once the broker is back, and events still
+    queued at shutdown are spooled rather than dropped.
+    """
+
+    def __init__(
+        self,
+        publisher: RabbitMQPublisher,
+        settings: Optional[EventQueueSettings] = None,
+        *,
+        spool: Optional[EventSpool] = None,
+    ) -> None:
+        """Initialize the queue; call ``start`` to begin publishing."""
+        self.settings = settings or EventQueueSettings()
+        self._publisher = publisher
+        self._spool = spool
+        self._queue: queue.Queue[QueuedEvent] = queue.Queue(
+            maxsize=max(1, self.settings.maxsize)
+        )
+        self._pending: List[QueuedEvent] = []
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._enqueued = 0
+        self._published = 0
+        self._dropped = 0
+        self._failed_attempts = 0
+        self._batches = 0
+        self._last_error_at: Optional[float] = None
+
+    # -------- lifecycle --------
+
+    def start(self) -> None:
+        """Start the background publisher thread."""
+        if self.is_running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="event-publisher", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Event publisher started (maxsize=%d, batch_size=%d)",
+            self._queue.maxsize,
+            self.settings.batch_size,
+        )
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Flush what can still be published, then stop the publisher thread."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(
+            self.settings.shutdown_timeout if timeout is None else timeout
+        )
+        if self._thread.is_alive():
+            logger.warning("Event publisher did not stop in time")
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the publisher thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    # -------- producers --------
+
+    def publish(
+        self,
+        routing_key: str,
+        payload: Dict[str, Any],
+        persistent: bool = True,
+    ) -> bool:
+        """Queue an event for publishing without blocking.
+
+        Returns:
+            True if the event was queued, False if the queue was full.
+
+        """
+        try:
+            self._queue.put_nowait(QueuedEvent(routing_key, payload, persistent))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            logger.warning("✗ Event queue full; dropped event %s", routing_key)
+            return False
+        with self._lock:
+            self._enqueued += 1
+        return True
+
+    def stats(self) -> Dict[str, object]:
+        """Return queue depth and publishing counters."""
+        spool = None if self._spool is None else self._spool.stats()
+        with self._lock:
+            return {
+                "spool": spool,
+                "running": self.is_running,
+                "depth": self._queue.qsize() + len(self._pending),
+                "maxsize": self._queue.maxsize,
+                "enqueued": self._enqueued,
+                "published": self._published,
+                "dropped": self._dropped,
+                "failed_attempts": self._failed_attempts,
+                "batches": self._batches,
+                "last_error_age": (
+                    None
+                    if self._last_error_at is None
+                    else time.monotonic() - self._last_error_at
+                ),
+            }
+
+    # -------- publisher thread --------
+
+    def _run(self) -> None:
+        """Publish batches until stopped, backing off while the broker is down."""
+        if self._spool is not None:
+            self._spool.open()
+        self._publisher.connect()
+        delay = self.settings.retry_initial
+        while not self._stopping.is_set():
+            backlog = self._spool_backlog()
+            has_events = self._fill_pending(block=not backlog)
+            if backlog:
+                # New events wait behind the spooled ones to keep order
+                self._spool_pending()
+                published = self._replay_spool()
+            elif has_events:
+                published = self._publish_pending()
+                if not published and self._spool is not None:
+                    self._spool_pending()
+            else:
+                # Idle tick: answer heartbeats so the broker keeps the connection
+                self._publisher.process_data_events()
+                published = True
+            if self._spool is not None:
+                self._spool.flush()
+            if published:
+                delay = self.settings.retry_initial
+                continue
+            logger.warning(
+                "Event publishing failed; retrying %d events in %.1fs",
+                len(self._pending) + self._spool_backlog(),
+                delay,
+            )
+            self._stopping.wait(delay)
+            delay = min(delay * 2, self.settings.retry_max)
+
+        self._flush_on_stop()
+        self._publisher.disconnect()
+
+    def _spool_backlog(self) -> int:
+        """Return the number of events waiting in the spool."""
+        return 0 if self._spool is None else len(self._spool)
+
+    def _fill_pending(self, *, block: bool) -> bool:
+        """Top up the pending batch from the queue; return whether it has events."""
+        if not self._pending and block:
+            try:
+                self._pending.append(self._queue.get(timeout=0.5))
+            except queue.Empty:
+                return False
+        while len(self._pending) < self.settings.batch_size:
+            try:
+                self._pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return bool(self._pending)
+
+    def _publish_pending(self) -> bool:
+        """Publish the pending batch in order, stopping at the first failure.
+
+        Returns:
+            True if every pending event was confirmed by the broker.
+
+        """
+        published = self._publisher.publish_batch(
+            [
+                (event.routing_key, event.payload, event.persistent)
+                for event in self._pending
+            ]
+        )
+
+        del self._pending[:published]
+        with self._lock:
+            self._published += published
+            self._batches += 1
+            if self._pending:
+                self._failed_attempts += 1
+                self._last_error_at = time.monotonic()
+        return not self._pending
+
+    def _spool_pending(self) -> None:
+        """Move the pending batch to the spool, in order."""
+        if not self._pending:
+            return
+        self._spool.append(  # type: ignore[union-attr]
+            [
+                SpooledEvent(
+                    event.routing_key, json.dumps(event.payload), event.persistent
+                )
+                for event in self._pending
+            ]
+        )
+        self._pending.clear()
+
+    def _replay_spool(self) -> bool:
+        """Publish one batch from the front of the spool.
+
+        Returns:
+            True if the whole batch was confirmed by the broker.
+
+        """
+        batch = self._spool.peek(self.settings.batch_size)  # type: ignore[union-attr]
+        published = self._publisher.publish_batch(
+            [
+                (event.routing_key, json.loads(event.body), event.persistent)
+                for event in batch
+            ]
+        )
+
+        self._spool.ack(published)  # type: ignore[union-attr]
+        with self._lock:
+            self._published += published
+            self._batches += 1
+            if published < len(batch):
+                self._failed_attempts += 1
+                self._last_error_at = time.monotonic()
+        return published == len(batch)
+
+    def _flush_on_stop(self) -> None:
+        """Make one last attempt to publish queued events before shutdown.
+
+        Events that still can't be published are spooled if a spool is
+        configured, otherwise they are dropped.
+        """
+        if self._spool is not None:
+            while self._fill_pending(block=False):
+                if self._spool_backlog() or not self._publish_pending():
+                    self._spool_pending()
+            self._spool.close()
+            return
+
+        while self._fill_pending(block=False):
+            if not self._publish_pending():
+                break
+        lost = len(self._pending) + self._queue.qsize()
+        if lost:
+            with self._lock:
+                self._dropped += lost
+            logger.warning("✗ Dropped %d unpublished events on shutdown", lost)
+        self._pending.clear()
+
+
+# Global singleton instance
+_settings = EventQueueSettings()
+event_queue = EventPublishQueue(
+    rabbitmq_publisher,
+    _settings,
+    spool=EventSpool() if _settings.spool_enabled else None,
+)
@@ -3,8 +3,9 @@
 import json
 import logging
 import os
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 try:
     import pika
@@ -13,6 +14,9 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# (routing_key, payload, persistent)
+OutgoingEvent = Tuple[str, Dict[str, Any], bool]
+
 
 @dataclass
 class RabbitMQSettings:
@@ -24,10 +28,18 @@ class RabbitMQSettings:
     password: str = os.getenv("RABBITMQ_PASSWORD", "guest")
     exchange: str = os.getenv("RABBITMQ_EXCHANGE", "desk_events")
     exchange_type: str = os.getenv("RABBITMQ_EXCHANGE_TYPE", "topic")
+    publisher_confirms: bool = (
+        os.getenv("RABBITMQ_PUBLISHER_CONFIRMS", "true").lower() == "true"
+    )
 
 
 class RabbitMQPublisher:
-    """Simple publisher for desk integration events."""
+    """Simple publisher for desk integration events.
+
+    A pika ``BlockingConnection`` is not thread-safe, so every use of the
+    connection is serialised under one lock; callers on different threads
+    (e.g. ``asyncio.to_thread``) never interleave on the channel.
+    """
 
     def __init__(self, settings: Optional[RabbitMQSettings] = None) -> None:
         """Initialize the RabbitMQ publisher."""
@@ -35,9 +47,15 @@ class RabbitMQPublisher:
         self._connection: Optional[pika.BlockingConnection] = None
         self._channel: Optional[pika.channel.Channel] = None
         self._connected = False
+        self._lock = threading.Lock()
 
     def connect(self) -> None:
         """Connect to RabbitMQ broker and declare exchange."""
+        with self._lock:
+            self._connect()
+
+    def _connect(self) -> None:
+        """Connect while holding the lock."""
         if pika is None:
             logger.warning("pika not available; RabbitMQ integration disabled")
             return
@@ -67,6 +85,11 @@ class RabbitMQPublisher:
                 exchange_type=self.settings.exchange_type,
                 durable=True,
             )
+            if self.settings.publisher_confirms:
+                # A BlockingChannel in confirm mode waits for the ack of every
+                # single basic_publish; a transaction is confirmed once per
+                # batch by its commit instead
+                self._channel.tx_select()
 
             self._connected = True
             logger.info(
@@ -81,6 +104,11 @@ class RabbitMQPublisher:
 
     def disconnect(self) -> None:
         """Disconnect from RabbitMQ broker."""
+        with self._lock:
+            self._disconnect()
+
+    def _disconnect(self) -> None:
+        """Disconnect while holding the lock."""
         if not self._connected:
             return
 
@@ -97,6 +125,20 @@ class RabbitMQPublisher:
             self._channel = None
             self._connection = None
 
+    def process_data_events(self) -> None:
+        """Let pika answer broker heartbeats while no events are published.
+
+        Must be called from the thread that owns the connection.
+        """
+        with self._lock:
+            if not self._connected or self._connection is None:
+                return
+            try:
+                self._connection.process_data_events(time_limit=0)
+            except Exception as e:
+                logger.warning("RabbitMQ connection lost while idle: %s", e)
+                self._connected = False
+
     def _ensure_connection(self) -> bool:
         """Ensure connection is active, reconnect if needed."""
         if (
@@ -105,7 +147,7 @@ class RabbitMQPublisher:
             or self._connection.is_closed
         ):
             logger.info("Reconnecting to RabbitMQ...")
-            self.connect()
+            self._connect()
 
         return self._connected
 
@@ -115,34 +157,62 @@ class RabbitMQPublisher:
         payload: Dict[str, Any],
         persistent: bool = True,
     ) -> bool:
-        """Publish an event to RabbitMQ."""
+        """Publish an event to RabbitMQ.
+
+        With publisher confirms enabled this returns True only once the
+        broker has acknowledged the message.
+        """
+        return self.publish_batch([(routing_key, payload, persistent)]) == 1
+
+    def publish_batch(self, events: Sequence[OutgoingEvent]) -> int:
+        """Publish ``(routing_key, payload, persistent)`` events in order.
+
+        With publisher confirms enabled the batch is published in one AMQP
+        transaction, so the broker is waited on once per batch by the commit
+        instead of once per event, and it is confirmed as a whole or not at
+        all.
+
+        Returns:
+            The number of leading events that were published.
+
+        """
+        with self._lock:
+            return self._publish_batch(events)
+
+    def _publish_batch(self, events: Sequence[OutgoingEvent]) -> int:
+        """Publish a batch while holding the lock."""
+        if not events:
+            return 0
         if not self._ensure_connection():
             logger.warning(
-                "Skipping RabbitMQ publish (not connected): %s", routing_key
+                "Skipping RabbitMQ publish (not connected): %d events", len(events)
             )
-            return False
+            return 0
 
+        published = 0
         try:
-            message_body = json.dumps(payload)
-            properties = pika.BasicProperties(
-                delivery_mode=2 if persistent else 1,
-                content_type="application/json",
-            )
-
-            self._channel.basic_publish(
-                exchange=self.settings.exchange,
-                routing_key=routing_key,
-                body=message_body,
-                properties=properties,
-            )
-
-            logger.info("✓ Published event: %s", routing_key)
-            return True
+            for routing_key, payload, persistent in events:
+                self._channel.basic_publish(
+                    exchange=self.settings.exchange,
+                    routing_key=routing_key,
+                    body=json.dumps(payload),
+                    properties=pika.BasicProperties(
+                        delivery_mode=2 if persistent else 1,
+                        content_type="application/json",
+                    ),
+                )
+                published += 1
+            if self.settings.publisher_confirms:
+                self._channel.tx_commit()
 
         except Exception as e:
             logger.exception("Failed to publish to RabbitMQ: %s", e)
             self._connected = False
-            return False
+            # An uncommitted transaction is discarded with its channel
+            return 0 if self.settings.publisher_confirms else published
+
+        logger.info("✓ Published %d events", published)
+        return published
 
 
 # Global singleton instance
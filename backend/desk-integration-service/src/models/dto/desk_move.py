@@ -0,0 +1,35 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+from .desk_state import DeskState
+
+
+class DeskMoveTarget(BaseModel):
+    """Data model representing one desk of a batch move."""
+
+    desk_id: str
+    position_mm: int
+
+
+class DeskMoveResult(BaseModel):
+    """Data model representing the outcome of one desk of a batch move.
+
+    ``position_mm`` is the target actually sent to the desk, which differs
+    from ``requested_mm`` when the move was ``superseded`` by a newer one.
+    """
+
+    desk_id: str
+    requested_mm: int
+    position_mm: int | None = None
+    status: Literal["moved", "superseded", "failed"]
+    state: DeskState | None = None
+    error: str | None = None
+
+
+class DeskBatchMoveResponse(BaseModel):
+    """Data model representing the outcome of a batch move."""
+
+    results: list[DeskMoveResult]
+    moved: int
+    failed: int
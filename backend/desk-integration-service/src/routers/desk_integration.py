@@ -1,14 +1,29 @@
+import logging
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
 
-from fastapi import APIRouter, Response, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 
-from src.messaging.rabbitmq_publisher import rabbitmq_publisher
+from src.messaging.event_queue import event_queue
 from src.models.dto.desk import Desk
 from src.models.dto.desk_config import DeskConfig
 from src.models.dto.desk_error import DeskError
+from src.models.dto.desk_move import (
+    DeskBatchMoveResponse,
+    DeskMoveResult,
+    DeskMoveTarget,
+)
 from src.models.dto.desk_state import DeskState
 from src.models.dto.desk_usage import DeskUsage
-from src.services.desk_service import DeskService
+from src.services.async_desk_service import async_desk_service
+from src.services.desk_command_queue import (
+    DESK_BATCH_CONCURRENCY,
+    desk_command_queue,
+)
+from src.services.desk_telemetry import desk_telemetry
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -20,92 +35,279 @@ class _DeskServiceConfig:
 
 
 DESK_NOT_FOUND_MESSAGE = {"detail": "Desk not found"}
-desks_service = DeskService()
+# Seconds since the served desk data was read from the box
+DATA_AGE_HEADER = "X-Desk-Data-Age"
+# Set on state served from the motion model instead of the desk
+ESTIMATED_HEADER = "X-Desk-Position-Estimated"
+ACCURACY_HEADER = "X-Desk-Position-Accuracy-Mm"
+# Target actually sent when a newer request replaced this one before dispatch
+SUPERSEDED_HEADER = "X-Desk-Superseded-By"
+# Range of telemetry queries without an explicit start
+DEFAULT_TELEMETRY_RANGE = timedelta(hours=24)
+desks_service = async_desk_service
 
 router = APIRouter(prefix="/api/v1", tags=["desks"])
 
 
+def _set_data_age(response: Response, desk_id: str) -> None:
+    """Report how stale the served desk data is."""
+    age = desks_service.data_age(desk_id)
+    if age is not None:
+        response.headers[DATA_AGE_HEADER] = f"{age:.3f}"
+
+
+def _telemetry_range(start: datetime | None, end: datetime | None) -> tuple[int, int]:
+    """Resolve a telemetry query range to epoch seconds (naive times are UTC)."""
+    end = end or datetime.now(timezone.utc)
+    start = start or end - DEFAULT_TELEMETRY_RANGE
+    start, end = (
+        moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+        for moment in (start, end)
+    )
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end",
+        )
+    return int(start.timestamp()), int(end.timestamp())
+
+
 @router.get("/desks")
-def get_desks() -> list[str]:
+async def get_desks() -> list[str]:
     """Retrieve the list of all desks."""
-    return desks_service.get_all_desks()
+    return await desks_service.get_all_desks()
 
 
 @router.get("/desks/{desk_id}")
-def get_desk_by_id(desk_id: str, response: Response) -> Desk | None:
+async def get_desk_by_id(desk_id: str, response: Response) -> Desk | None:
     """Retrieve a specific desk by its ID."""
-    desk = desks_service.get_desk_by_id(desk_id)
+    desk = await desks_service.get_desk_by_id(desk_id)
+    _set_data_age(response, desk_id)
     if desk is None:
         response.status_code = status.HTTP_404_NOT_FOUND
     return desk or DESK_NOT_FOUND_MESSAGE
 
 
 @router.get("/desks/{desk_id}/config")
-def get_config(desk_id: str, response: Response) -> DeskConfig:
+async def get_config(desk_id: str, response: Response) -> DeskConfig:
     """Retrieve the configuration of a specific desk."""
-    usage_stats = desks_service.get_desk_config(desk_id)
+    usage_stats = await desks_service.get_desk_config(desk_id)
+    _set_data_age(response, desk_id)
     if usage_stats is None:
         response.status_code = status.HTTP_404_NOT_FOUND
     return usage_stats or DESK_NOT_FOUND_MESSAGE
 
 
 @router.get("/desks/{desk_id}/state")
-def get_state(desk_id: str, response: Response) -> DeskState | None:
-    """Retrieve the current state of a specific desk."""
-    desk_state = desks_service.get_desk_state(desk_id)
+async def get_state(desk_id: str, response: Response) -> DeskState | None:
+    """Retrieve the current state of a specific desk.
+
+    While a desk is moving its position is estimated locally; the response
+    then carries the estimate's error bound instead of a data age.
+    """
+    estimate = desks_service.estimate_desk_state(desk_id)
+    if estimate is not None:
+        response.headers[ESTIMATED_HEADER] = "true"
+        response.headers[ACCURACY_HEADER] = str(estimate.accuracy_mm)
+        return estimate.state
+
+    desk_state = await desks_service.get_desk_state(desk_id)
+    _set_data_age(response, desk_id)
     if desk_state is None:
         response.status_code = status.HTTP_404_NOT_FOUND
     return desk_state or DESK_NOT_FOUND_MESSAGE
 
 
 @router.put("/desks/{desk_id}/state")
-def set_desk_height(
+async def set_desk_height(
     desk_id: str, position_mm: int, response: Response
 ) -> DeskState | None:
-    """Set a desk to a specific height and publish event to RabbitMQ."""
-    
-    # Set desk position via WiFi2BLE API
-    desk_state = desks_service.set_desk_position(desk_id, position_mm)
-    
+    """Set a desk to a specific height and publish event to RabbitMQ.
+
+    The move goes through the per-desk command queue: if a newer target for
+    the same desk arrives before this one is sent, only the newer one is sent
+    and this request returns its result.
+    """
+    result = await desk_command_queue.submit(desk_id, position_mm)
+    desk_state = result.state
+
     if desk_state is None:
         response.status_code = status.HTTP_404_NOT_FOUND
         return {"detail": "Desk not found"}
-    
+
+    if result.superseded:
+        # The request that superseded this one publishes the event
+        response.headers[SUPERSEDED_HEADER] = str(result.position_mm)
+        return desk_state
+
     # Publish event to RabbitMQ (non-blocking, failures are logged)
     try:
         event_payload = {
             "desk_id": desk_id,
-            "position_mm": position_mm,
+            "position_mm": result.position_mm,
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "source": "desk-integration-service",
             "event_type": "height_changed",
         }
-        
-        rabbitmq_publisher.publish(
+
+        # Only queues the event; the broker is never awaited on the request path
+        event_queue.publish(
             routing_key="desk.height.changed",
             payload=event_payload,
             persistent=True,
         )
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.warning("Failed to publish RabbitMQ event: %s", e)
-    
+
     return desk_state
 
+
+def _move_result(target: DeskMoveTarget, outcome: object) -> DeskMoveResult:
+    """Map one outcome of ``submit_batch`` onto a per-desk result."""
+    if isinstance(outcome, BaseException):
+        return DeskMoveResult(
+            desk_id=target.desk_id,
+            requested_mm=target.position_mm,
+            status="failed",
+            error=str(outcome) or type(outcome).__name__,
+        )
+    return DeskMoveResult(
+        desk_id=target.desk_id,
+        requested_mm=target.position_mm,
+        position_mm=outcome.position_mm,
+        status="superseded" if outcome.superseded else "moved",
+        state=outcome.state,
+    )
+
+
+@router.put("/desks/state")
+async def set_desk_heights(targets: list[DeskMoveTarget]) -> DeskBatchMoveResponse:
+    """Move several desks at once and publish a single event to RabbitMQ.
+
+    Moves run concurrently, at most ``DESK_BATCH_CONCURRENCY`` at a time,
+    through the same per-desk command queue as single moves. A failed desk
+    doesn't fail the batch; its reason is reported in its result.
+    """
+    if not targets:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one desk target is required",
+        )
+
+    outcomes = await desk_command_queue.submit_batch(
+        [(target.desk_id, target.position_mm) for target in targets],
+        DESK_BATCH_CONCURRENCY,
+    )
+    results = [
+        _move_result(target, outcome)
+        for target, outcome in zip(targets, outcomes, strict=True)
+    ]
+    moved = [result for result in results if result.status == "moved"]
+    failed = [result for result in results if result.status == "failed"]
+    logger.info(
+        "Batch move of %d desks: %d moved, %d failed",
+        len(results),
+        len(moved),
+        len(failed),
+    )
+
+    # Superseded moves are reported by the request that superseded them
+    if moved:
+        try:
+            event_queue.publish(
+                routing_key="desk.height.changed.batch",
+                payload={
+                    "desks": [
+                        {"desk_id": result.desk_id, "position_mm": result.position_mm}
+                        for result in moved
+                    ],
+                    "failed_desk_ids": [result.desk_id for result in failed],
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "source": "desk-integration-service",
+                    "event_type": "height_changed_batch",
+                },
+                persistent=True,
+            )
+        except Exception as e:
+            logger.warning("Failed to publish RabbitMQ event: %s", e)
+
+    return DeskBatchMoveResponse(results=results, moved=len(moved), failed=len(failed))
+
+
 @router.get("/desks/{desk_id}/usage")
-def get_usage(desk_id: str, response: Response) -> DeskUsage:  # noqa: E501
+async def get_usage(desk_id: str, response: Response) -> DeskUsage:  # noqa: E501
     """Retrieve usage data for a specific desk."""
-    usage_stats = desks_service.get_desk_usage(desk_id)
+    usage_stats = await desks_service.get_desk_usage(desk_id)
+    _set_data_age(response, desk_id)
     if usage_stats is None:
         response.status_code = status.HTTP_404_NOT_FOUND
     return usage_stats or DESK_NOT_FOUND_MESSAGE
 
 
 @router.get("/desks/{desk_id}/errors")
-def get_errors(desk_id: str, response: Response) -> list[DeskError]:
+async def get_errors(desk_id: str, response: Response) -> list[DeskError]:
     """Retrieve error logs for a specific desk."""
-    errors = desks_service.get_desk_errors(desk_id)
+    errors = await desks_service.get_desk_errors(desk_id)
+    _set_data_age(response, desk_id)
     if errors is None:
         response.status_code = status.HTTP_404_NOT_FOUND
     return errors or DESK_NOT_FOUND_MESSAGE
+
+
+@router.get("/desks/{desk_id}/telemetry/usage")
+async def get_usage_history(
+    desk_id: str,
+    response: Response,
+    start: Annotated[datetime | None, Query(description="Range start")] = None,
+    end: Annotated[datetime | None, Query(description="Range end")] = None,
+    step: Annotated[
+        int | None, Query(ge=1, description="Bucket size in seconds")
+    ] = None,
+) -> dict:
+    """Retrieve recorded usage counters of a desk, downsampled into buckets.
+
+    Served from the telemetry store only; the box is never called.
+    """
+    range_start, range_end = _telemetry_range(start, end)
+    store = desk_telemetry.store
+    points = store.usage(desk_id, range_start, range_end, step)
+    if points is None:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return DESK_NOT_FOUND_MESSAGE
+    return {
+        "desk_id": desk_id,
+        "start": range_start,
+        "end": range_end,
+        "step": store.resolve_step(range_start, range_end, step),
+        "points": points,
+    }
+
+
+@router.get("/desks/{desk_id}/telemetry/errors")
+async def get_error_history(
+    desk_id: str,
+    response: Response,
+    start: Annotated[datetime | None, Query(description="Range start")] = None,
+    end: Annotated[datetime | None, Query(description="Range end")] = None,
+    step: Annotated[
+        int | None,
+        Query(ge=1, description="Count errors per bucket of this many seconds"),
+    ] = None,
+) -> dict:
+    """Retrieve distinct errors of a desk first seen in a time range.
+
+    Served from the telemetry store only; the box is never called.
+    """
+    range_start, range_end = _telemetry_range(start, end)
+    store = desk_telemetry.store
+    errors = store.errors(desk_id, range_start, range_end, step)
+    if errors is None:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return DESK_NOT_FOUND_MESSAGE
+    return {
+        "desk_id": desk_id,
+        "start": range_start,
+        "end": range_end,
+        "step": step and store.resolve_step(range_start, range_end, step),
+        "errors": errors,
+    }
@@ -0,0 +1,466 @@
+"""Async service for interacting with the WiFi2BLE Box Simulator API."""
+
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import httpx
+
+from src.models.dto.desk import Desk
+from src.models.dto.desk_config import DeskConfig
+from src.models.dto.desk_error import DeskError
+from src.models.dto.desk_state import DeskState
+from src.models.dto.desk_usage import DeskUsage
+from src.services.desk_cache import DeskDocument, DeskDocumentCache
+from src.services.desk_motion import (
+    DESK_MOTION_ENABLED,
+    DeskMotionModel,
+    MotionEstimate,
+)
+from src.services.desk_routing import DeskBox
+from src.services.desk_service import (
+    HTTP_ERROR_THRESHOLD,
+    DeskService,
+    DeskServiceError,
+    _fallback_set_position_state,
+    _load_positive_number,
+    _parse_config,
+    _parse_desk,
+    _parse_errors,
+    _parse_set_position_response,
+    _parse_state,
+    _parse_usage,
+    desk_guard,
+    desk_transport,
+)
+from src.services.http_transport import HttpTransportSettings
+
+if TYPE_CHECKING:
+    from src.services.desk_registry import DeskRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def _load_ttl(name: str, default: float) -> float:
+    """Load a cache TTL in seconds; ``0`` disables caching for that section."""
+    if os.getenv(name) == "0":
+        return 0.0
+    return _load_positive_number(name, default)
+
+
+# Per-section TTLs of the desk document cache: config rarely changes, state
+# changes whenever a desk moves.
+DESK_CACHE_TTLS: Dict[str, float] = {
+    "config": _load_ttl("DESK_CACHE_TTL_CONFIG_SECONDS", 300),
+    "state": _load_ttl("DESK_CACHE_TTL_STATE_SECONDS", 1),
+    "usage": _load_ttl("DESK_CACHE_TTL_USAGE_SECONDS", 30),
+    "lastErrors": _load_ttl("DESK_CACHE_TTL_ERRORS_SECONDS", 10),
+}
+
+
+class AsyncDeskService:
+    """Async counterpart of DeskService built on a pooled ``httpx.AsyncClient``.
+
+    All calls share one client, so many in-flight desk calls run on the event
+    loop over keep-alive connections instead of occupying a thread each. The
+    pool size and timeouts come from the same settings as the sync transport.
+
+    Desk reads go through a read-through cache of full desk documents, so
+    ``/desks/{id}`` and its sub-resources are served from one fetch. When a
+    ``mirror`` (the background desk registry) is attached, its snapshots are
+    served first. Every document read from the box also feeds the ``motion``
+    model, which estimates the position of desks that are moving.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[HttpTransportSettings] = None,
+        *,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        motion: Optional[DeskMotionModel] = None,
+    ) -> None:
+        """Initialize the service; the HTTP client is created on first use.
+
+        Args:
+            settings: Pool and timeout settings (defaults to the sync transport's).
+            transport: Optional httpx transport, e.g. ``httpx.MockTransport``.
+            cache_ttls: Per-section cache TTLs (defaults to ``DESK_CACHE_TTLS``).
+            motion: Optional motion model for estimating moving desks.
+
+        """
+        self.settings = settings or desk_transport.settings
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self.cache = DeskDocumentCache(
+            self.fetch_desk_document,
+            DESK_CACHE_TTLS if cache_ttls is None else cache_ttls,
+        )
+        self.mirror: Optional["DeskRegistry"] = None
+        self.motion = motion
+        self._requests_total = 0
+        self._errors_total = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+
+    # -------- lifecycle --------
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it if needed."""
+        if self._client is None or self._client.is_closed:
+            # httpx limits are per client, the pool size is per box
+            connections = self.settings.pool_maxsize * len(DeskService._routes.boxes)
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=connections,
+                    max_keepalive_connections=connections,
+                ),
+                timeout=httpx.Timeout(
+                    self.settings.read_timeout,
+                    connect=self.settings.connect_timeout,
+                ),
+                headers={"Content-Type": "application/json"},
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared client and its pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Async desk HTTP client closed")
+        self._client = None
+
+    def stats(self) -> Dict[str, object]:
+        """Return request counters and connection pool usage."""
+        stats: Dict[str, object] = {
+            "requests_total": self._requests_total,
+            "errors_total": self._errors_total,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "pool_maxsize": self.settings.pool_maxsize,
+            "connect_timeout": self.settings.connect_timeout,
+            "read_timeout": self.settings.read_timeout,
+            "cache": self.cache.stats(),
+        }
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            stats["open_connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+        return stats
+
+    # -------- transport --------
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        box: Optional[DeskBox] = None,
+        desk_id: Optional[str] = None,
+        **kwargs: object,
+    ) -> httpx.Response:
+        """Make HTTP request with proper error handling.
+
+        Goes through the same circuit breakers and adaptive read timeouts as
+        ``DeskService._request``.
+        """
+        box = DeskService._guard_call(method, url, box, desk_id)
+        read_timeout = desk_guard.read_timeout(box.name, self.settings.read_timeout)
+
+        logger.info("Making %s request to %s", method, url)
+        if "json" in kwargs:
+            logger.debug("Request payload: %s", kwargs["json"])
+
+        self._requests_total += 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        started = time.monotonic()
+        try:
+            response = await self.client.request(
+                method,
+                url,
+                timeout=httpx.Timeout(
+                    read_timeout, connect=self.settings.connect_timeout
+                ),
+                **kwargs,  # type: ignore[arg-type]
+            )
+            logger.info("Response status: %s", response.status_code)
+
+        except httpx.TimeoutException as exc:
+            self._errors_total += 1
+            # A slow desk times out on a live box; only desk-less calls count
+            desk_guard.record_failure(box.name, desk_id, box_down=desk_id is None)
+            logger.error("Request timeout after %ss for %s: %s", read_timeout, url, exc)
+            raise DeskServiceError("Request timeout after %ss" % read_timeout) from exc
+
+        except httpx.NetworkError as exc:
+            self._errors_total += 1
+            desk_guard.record_failure(box.name, desk_id, box_down=True)
+            logger.error("Connection error to %s: %s", url, exc)
+            raise DeskServiceError(
+                "Failed to connect to desk API - check if simulator is running"
+            ) from exc
+
+        except httpx.HTTPError as exc:
+            self._errors_total += 1
+            desk_guard.record_failure(box.name, desk_id, box_down=True)
+            logger.exception("Request failed to %s: %s", url, exc)
+            raise DeskServiceError("Failed to communicate with desk API") from exc
+
+        finally:
+            self._in_flight -= 1
+
+        DeskService._record_response(box, desk_id, response.status_code, started)
+        if response.status_code >= HTTP_ERROR_THRESHOLD:
+            error_text = response.text[:500] if response.text else "No error message"
+            logger.error(
+                "Desk API error %s for %s %s: %s",
+                response.status_code,
+                method,
+                url,
+                error_text,
+            )
+            raise DeskServiceError(
+                "Desk API responded with HTTP %s: %s"
+                % (response.status_code, error_text),
+                status_code=response.status_code,
+            )
+
+        return response
+
+    # -------- desk API --------
+
+    async def _list_box_desks(self, box: DeskBox) -> List[str]:
+        """Fetch the desk identifiers connected to one box."""
+        # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/
+        response = await self._request(
+            "GET", DeskService._build_url("desks/", box=box), box=box
+        )
+
+        try:
+            payload = response.json()
+        except ValueError as exc:
+            logger.error("Failed to parse JSON response: %s", exc)
+            raise DeskServiceError("Invalid JSON response from desk API") from exc
+        return DeskService._parse_desk_list(box, payload)
+
+    async def get_all_desks(self) -> list[str]:
+        """Fetch all desk identifiers from every configured box.
+
+        The boxes are listed concurrently and their lists merged into the
+        shared desk -> box routing table.
+
+        Returns:
+            List of MAC addresses like ["cd:fb:1a:53:fb:e6", ...]
+
+        Raises:
+            DeskServiceError: If no box could be listed
+
+        """
+        logger.info("Fetching all desks from API")
+        boxes = DeskService._routes.boxes
+        outcomes = await asyncio.gather(
+            *(self._list_box_desks(box) for box in boxes), return_exceptions=True
+        )
+
+        listings: List[Tuple[DeskBox, Optional[List[str]]]] = []
+        errors: List[DeskServiceError] = []
+        for box, outcome in zip(boxes, outcomes, strict=True):
+            if isinstance(outcome, DeskServiceError):
+                logger.error("✗ Failed to list desks on box %s: %s", box.name, outcome)
+                errors.append(outcome)
+                listings.append((box, None))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                listings.append((box, outcome))
+        return DeskService._merge_listings(listings, errors)
+
+    async def _desk_url(self, desk_id: str, *segments: str) -> str:
+        """Build the URL of a desk resource on the box the desk is connected to.
+
+        An unknown desk triggers one refresh of the routing table.
+
+        Raises:
+            DeskServiceError: If no box lists the desk.
+
+        """
+        box = DeskService._routes.box_for(desk_id)
+        if box is None:
+            try:
+                await self.get_all_desks()
+            except DeskServiceError as exc:
+                logger.warning("Failed to refresh desk routes: %s", exc)
+            box = DeskService._routes.box_for(desk_id)
+        return DeskService._routed_url(desk_id, box, *segments)
+
+    async def fetch_desk_document(self, desk_id: str) -> DeskDocument:
+        """Download a full desk document, bypassing the cache and mirror."""
+        # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/{desk_id}
+        response = await self._request(
+            "GET", await self._desk_url(desk_id), desk_id=desk_id
+        )
+        try:
+            document = response.json()
+        except ValueError as exc:
+            raise DeskServiceError("Invalid JSON response from desk API") from exc
+        if not isinstance(document, dict):
+            raise DeskServiceError("Desk API returned an unexpected response format")
+        if self.motion is not None:
+            self.motion.observe(desk_id, document.get("state") or {})
+        return document
+
+    async def _get_document(
+        self, desk_id: str, section: Optional[str] = None
+    ) -> DeskDocument:
+        """Return the desk document from the mirror, or else the cache."""
+        if self.mirror is not None:
+            snapshot = self.mirror.get(desk_id)
+            if snapshot is not None:
+                return snapshot.document
+        return await self.cache.get(desk_id, section)
+
+    async def _get_section(self, desk_id: str, section: str) -> Dict[str, object]:
+        """Return one section of the desk document."""
+        document = await self._get_document(desk_id, section)
+        return document.get(section, {}) or {}
+
+    def estimate_desk_state(self, desk_id: str) -> Optional[MotionEstimate]:
+        """Return the motion model's estimate for a moving desk, if reliable."""
+        if self.motion is None:
+            return None
+        return self.motion.estimate(desk_id)
+
+    def data_age(self, desk_id: str) -> Optional[float]:
+        """Return how old the desk data served for ``desk_id`` is, in seconds."""
+        if self.mirror is not None:
+            snapshot = self.mirror.get(desk_id)
+            if snapshot is not None:
+                return snapshot.age(time.monotonic())
+        return self.cache.age(desk_id)
+
+    async def get_desk_by_id(self, desk_id: str) -> Desk | None:
+        """Get the data of a specific desk, or None if failed."""
+        if not desk_id:
+            logger.warning("Attempted to fetch desk state without an identifier")
+            return None
+
+        try:
+            return _parse_desk(await self._get_document(desk_id))
+
+        except DeskServiceError as exc:
+            logger.warning("Failed to get data of desk %s: %s", desk_id, exc)
+            return None
+        except Exception as exc:
+            logger.exception("Unexpected error fetching desk %s: %s", desk_id, exc)
+            return None
+
+    async def get_desk_config(self, desk_id: str) -> DeskConfig | None:
+        """Get the current configuration of a specific desk, or None if failed."""
+        if not desk_id:
+            logger.warning("Attempted to fetch desk config without an identifier")
+            return None
+
+        try:
+            return _parse_config(await self._get_section(desk_id, "config"))
+
+        except DeskServiceError as exc:
+            logger.warning("Failed to get configuration for desk %s: %s", desk_id, exc)
+            return None
+
+    async def get_desk_state(self, desk_id: str) -> DeskState | None:
+        """Get the current state of a specific desk, or None if failed."""
+        if not desk_id:
+            logger.warning("Attempted to fetch desk state without an identifier")
+            return None
+
+        try:
+            return _parse_state(await self._get_section(desk_id, "state"))
+
+        except DeskServiceError as exc:
+            logger.warning("Failed to get state for desk %s: %s", desk_id, exc)
+            return None
+
+    async def get_desk_usage(self, desk_id: str) -> DeskUsage | None:
+        """Get the usage data of a specific desk, or None if failed."""
+        if not desk_id:
+            logger.warning("Attempted to fetch desk usage without an identifier")
+            return None
+
+        try:
+            return _parse_usage(await self._get_section(desk_id, "usage"))
+
+        except DeskServiceError as exc:
+            logger.warning("Failed to get usage for desk %s: %s", desk_id, exc)
+            return None
+
+    async def get_desk_errors(self, desk_id: str) -> List[DeskError] | None:
+        """Get the list of errors for a specific desk, or None if failed."""
+        if not desk_id:
+            logger.warning("Attempted to fetch desk errors without an identifier")
+            return None
+
+        try:
+            return _parse_errors(await self._get_document(desk_id, "lastErrors"))
+
+        except DeskServiceError as exc:
+            logger.warning("Failed to get errors for desk %s: %s", desk_id, exc)
+            return None
+        except Exception as exc:
+            logger.exception(
+                "Unexpected error fetching errors for desk %s: %s", desk_id, exc
+            )
+            return None
+
+    async def set_desk_position(self, desk_id: str, position_mm: int) -> DeskState:
+        """Set a specific desk to a target position.
+
+        Args:
+            desk_id: MAC address of the desk (e.g., "cd:fb:1a:53:fb:e6")
+            position_mm: Target position in millimeters
+
+        Returns:
+            DeskState object with the new desk state
+
+        Raises:
+            DeskServiceError: If the operation fails
+
+        """
+        if not desk_id:
+            raise DeskServiceError("Desk identifier is required")
+
+        if not isinstance(position_mm, int) or position_mm < 0:
+            raise DeskServiceError(
+                "Invalid position: %smm (must be positive integer)" % position_mm
+            )
+
+        logger.info("Setting desk %s to position %smm", desk_id, position_mm)
+
+        # WiFi2BLE API endpoint: PUT /api/v2/{api_key}/desks/{desk_id}/state
+        url = await self._desk_url(desk_id, "state")
+        response = await self._request(
+            "PUT", url, desk_id=desk_id, json={"position_mm": position_mm}
+        )
+        logger.info("✓ Successfully commanded desk %s to %smm", desk_id, position_mm)
+        self.cache.invalidate(desk_id)
+        if self.mirror is not None:
+            self.mirror.invalidate(desk_id)
+        if self.motion is not None:
+            self.motion.begin(desk_id, position_mm)
+
+        try:
+            return _parse_set_position_response(response.json(), position_mm)
+        except (ValueError, KeyError) as e:
+            logger.warning("Failed to parse desk state response: %s", e)
+            return _fallback_set_position_state(position_mm)
+
+
+# Global singleton instance
+async_desk_service = AsyncDeskService(
+    motion=DeskMotionModel() if DESK_MOTION_ENABLED else None
+)
@@ -0,0 +1,138 @@
+"""Read-through cache of WiFi2BLE desk documents."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DeskDocument = Dict[str, object]
+
+# Sections of a desk document, keyed as in the box's JSON payload
+DESK_SECTIONS = ("config", "state", "usage", "lastErrors")
+
+
+@dataclass
+class _CacheEntry:
+    """A cached desk document and when it was fetched."""
+
+    document: DeskDocument
+    fetched_at: float
+
+
+class DeskDocumentCache:
+    """Read-through cache of full desk documents with a TTL per section.
+
+    Every section (config, state, usage, lastErrors) is served from one cached
+    ``GET /desks/{id}`` document; a section is fresh while the document is
+    younger than that section's TTL. Concurrent misses for the same desk share
+    a single in-flight fetch, and ``invalidate`` drops a desk after a write so
+    the next read goes back to the box.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[DeskDocument]],
+        ttls: Dict[str, float],
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            fetch: Coroutine function that loads a full desk document.
+            ttls: TTL in seconds per section; sections missing here are not
+                cached. A TTL of 0 disables caching for that section.
+            clock: Monotonic time source (injectable for tests).
+
+        """
+        self._fetch = fetch
+        self._ttls = dict(ttls)
+        self._clock = clock
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._inflight: Dict[str, asyncio.Task[DeskDocument]] = {}
+        self._generations: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._shared_fetches = 0
+
+    def ttl_for(self, section: Optional[str]) -> float:
+        """Return the TTL for ``section``; ``None`` means the whole document."""
+        if section is None:
+            return min((self._ttls.get(s, 0.0) for s in DESK_SECTIONS), default=0.0)
+        return self._ttls.get(section, 0.0)
+
+    async def get(self, desk_id: str, section: Optional[str] = None) -> DeskDocument:
+        """Return the desk document, fetching it if ``section`` is stale.
+
+        Raises:
+            Whatever ``fetch`` raises; failures are not cached.
+
+        """
+        entry = self._entries.get(desk_id)
+        ttl = self.ttl_for(section)
+        if entry is not None and self._clock() - entry.fetched_at < ttl:
+            self._hits += 1
+            return entry.document
+
+        self._misses += 1
+        task = self._inflight.get(desk_id)
+        if task is None:
+            task = self._start_fetch(desk_id)
+        else:
+            self._shared_fetches += 1
+        # Shield so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    def age(self, desk_id: str) -> Optional[float]:
+        """Return seconds since ``desk_id`` was fetched, or None if not cached."""
+        entry = self._entries.get(desk_id)
+        return None if entry is None else self._clock() - entry.fetched_at
+
+    def invalidate(self, desk_id: str) -> None:
+        """Drop the cached document for ``desk_id``.
+
+        A fetch that is already in flight will not repopulate the cache.
+        """
+        self._entries.pop(desk_id, None)
+        self._inflight.pop(desk_id, None)
+        self._generations[desk_id] = self._generations.get(desk_id, 0) + 1
+        logger.debug("Invalidated cached document for desk %s", desk_id)
+
+    def clear(self) -> None:
+        """Drop every cached document."""
+        for desk_id in list(self._entries):
+            self.invalidate(desk_id)
+
+    def stats(self) -> Dict[str, object]:
+        """Return hit/miss counters and the current cache size."""
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self._hits,
+            "misses": self._misses,
+            "shared_fetches": self._shared_fetches,
+            "ttls": dict(self._ttls),
+        }
+
+    def _start_fetch(self, desk_id: str) -> "asyncio.Task[DeskDocument]":
+        """Start the single in-flight fetch for ``desk_id``."""
+        generation = self._generations.get(desk_id, 0)
+        task = asyncio.get_running_loop().create_task(self._fetch(desk_id))
+        self._inflight[desk_id] = task
+        task.add_done_callback(lambda done: self._on_fetched(desk_id, generation, done))
+        return task
+
+    def _on_fetched(
+        self, desk_id: str, generation: int, task: "asyncio.Task[DeskDocument]"
+    ) -> None:
+        """Store a completed fetch unless the desk was invalidated meanwhile."""
+        if self._inflight.get(desk_id) is task:
+            del self._inflight[desk_id]
+        # Retrieve the exception so failures aren't reported as unhandled
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self._generations.get(desk_id, 0) == generation:
+            self._entries[desk_id] = _CacheEntry(task.result(), self._clock())
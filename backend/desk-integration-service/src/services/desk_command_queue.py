@@ -0,0 +1,254 @@
+"""Per-desk queue of position commands with coalescing and rate limiting."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Sequence, Tuple, Union
+
+from src.models.dto.desk_state import DeskState
+from src.services.async_desk_service import async_desk_service
+from src.services.desk_service import _load_positive_number
+
+logger = logging.getLogger(__name__)
+
+DESK_COMMAND_RATE = _load_positive_number("DESK_COMMAND_RATE_PER_SECOND", 10)
+DESK_COMMAND_BURST = _load_positive_number("DESK_COMMAND_BURST", 20)
+DESK_BATCH_CONCURRENCY = int(_load_positive_number("DESK_BATCH_CONCURRENCY", 16))
+
+Dispatch = Callable[[str, int], Awaitable[DeskState]]
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, up to ``burst`` saved."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        # Waiters are served one at a time, in arrival order
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available.
+
+        Returns:
+            Seconds spent waiting for the token.
+
+        """
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+@dataclass(frozen=True)
+class DeskCommandResult:
+    """Outcome of a queued position command.
+
+    ``position_mm`` is the target that was actually sent to the desk; it
+    differs from ``requested_mm`` when a newer command superseded this one
+    before it was sent.
+    """
+
+    desk_id: str
+    requested_mm: int
+    position_mm: int
+    state: DeskState
+    superseded: bool
+
+
+@dataclass
+class _PendingCommand:
+    """The newest not-yet-sent target of a desk and everyone waiting on it."""
+
+    position_mm: int
+    waiters: List[Tuple[int, "asyncio.Future[DeskCommandResult]"]] = field(
+        default_factory=list
+    )
+
+
+class DeskCommandQueue:
+    """Serialises position commands per desk and rate-limits them globally.
+
+    Each desk has at most one command in flight. Commands submitted while one
+    is in flight wait as a single pending command whose target is replaced by
+    every newer submission, so a burst of moves for one desk results in at
+    most one extra PUT. Every dispatch takes a token from a global bucket to
+    protect the WiFi2BLE box. ``submit`` returns a future that resolves with
+    the result of the dispatch that covered the caller's command.
+    """
+
+    def __init__(self, dispatch: Dispatch, bucket: TokenBucket) -> None:
+        """Initialize the queue with the coroutine that sends one command."""
+        self._dispatch = dispatch
+        self._bucket = bucket
+        self._pending: Dict[str, _PendingCommand] = {}
+        self._workers: Dict[str, asyncio.Task[None]] = {}
+        self._submitted = 0
+        self._dispatched = 0
+        self._coalesced = 0
+        self._failed = 0
+        self._throttled_seconds = 0.0
+
+    def submit(
+        self, desk_id: str, position_mm: int
+    ) -> "asyncio.Future[DeskCommandResult]":
+        """Queue a move of ``desk_id`` to ``position_mm``.
+
+        Returns:
+            A future resolving to a ``DeskCommandResult``, or raising whatever
+            the dispatch raised (e.g. ``DeskServiceError``).
+
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[DeskCommandResult] = loop.create_future()
+        self._submitted += 1
+
+        pending = self._pending.get(desk_id)
+        if pending is None:
+            pending = self._pending[desk_id] = _PendingCommand(position_mm)
+        else:
+            logger.debug(
+                "Coalescing desk %s target %smm -> %smm",
+                desk_id,
+                pending.position_mm,
+                position_mm,
+            )
+            pending.position_mm = position_mm
+            self._coalesced += 1
+        pending.waiters.append((position_mm, future))
+
+        if desk_id not in self._workers:
+            self._workers[desk_id] = loop.create_task(self._drain(desk_id))
+        return future
+
+    async def submit_batch(
+        self, targets: Sequence[Tuple[str, int]], concurrency: int
+    ) -> List[Union[DeskCommandResult, Exception]]:
+        """Queue several moves, with at most ``concurrency`` in flight.
+
+        Args:
+            targets: ``(desk_id, position_mm)`` pairs, submitted in order.
+            concurrency: Maximum number of moves awaited at the same time.
+
+        Returns:
+            One ``DeskCommandResult`` or the raised exception per target, in
+            the order of ``targets``.
+
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _submit(desk_id: str, position_mm: int) -> DeskCommandResult:
+            async with semaphore:
+                return await self.submit(desk_id, position_mm)
+
+        return await asyncio.gather(
+            *(_submit(desk_id, position_mm) for desk_id, position_mm in targets),
+            return_exceptions=True,
+        )
+
+    def stats(self) -> Dict[str, object]:
+        """Return queue counters."""
+        return {
+            "active_desks": len(self._workers),
+            "pending_commands": len(self._pending),
+            "submitted": self._submitted,
+            "dispatched": self._dispatched,
+            "coalesced": self._coalesced,
+            "failed": self._failed,
+            "throttled_seconds": round(self._throttled_seconds, 3),
+            "rate_per_second": self._bucket.rate,
+            "burst": self._bucket.capacity,
+        }
+
+    async def aclose(self) -> None:
+        """Cancel outstanding commands, in flight or pending.
+
+        Everyone still waiting on a command gets ``asyncio.CancelledError``.
+        """
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for command in self._pending.values():
+            _cancel_waiters(command)
+        self._pending.clear()
+
+    async def _drain(self, desk_id: str) -> None:
+        """Send the desk's pending commands one at a time until none are left."""
+        command = None
+        try:
+            while (command := self._pending.pop(desk_id, None)) is not None:
+                self._throttled_seconds += await self._bucket.acquire()
+                # Targets submitted while waiting for a token are still coalesced
+                if desk_id in self._pending:
+                    newer = self._pending.pop(desk_id)
+                    command.position_mm = newer.position_mm
+                    command.waiters.extend(newer.waiters)
+                await self._send(desk_id, command)
+        except asyncio.CancelledError:
+            # The command being sent is no longer pending; don't strand its waiters
+            if command is not None:
+                _cancel_waiters(command)
+            raise
+        finally:
+            self._workers.pop(desk_id, None)
+
+    async def _send(self, desk_id: str, command: _PendingCommand) -> None:
+        """Dispatch one command and resolve everyone waiting on it."""
+        try:
+            state = await self._dispatch(desk_id, command.position_mm)
+        except Exception as exc:
+            self._failed += 1
+            for _, future in command.waiters:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self._dispatched += 1
+        last = command.waiters[-1][1]
+        for requested_mm, future in command.waiters:
+            if not future.done():
+                future.set_result(
+                    DeskCommandResult(
+                        desk_id=desk_id,
+                        requested_mm=requested_mm,
+                        position_mm=command.position_mm,
+                        state=state,
+                        superseded=future is not last,
+                    )
+                )
+
+
+def _cancel_waiters(command: _PendingCommand) -> None:
+    """Cancel the futures of everyone still waiting on ``command``."""
+    for _, future in command.waiters:
+        if not future.done():
+            future.cancel()
+
+
+# Global singleton instance
+desk_command_queue = DeskCommandQueue(
+    async_desk_service.set_desk_position,
+    TokenBucket(DESK_COMMAND_RATE, DESK_COMMAND_BURST),
+)
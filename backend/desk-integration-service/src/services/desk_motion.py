@@ -0,0 +1,214 @@
+"""Motion model that estimates desk positions while desks are moving."""
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from src.models.dto.desk_state import DeskState
+from src.services.desk_service import _load_positive_number
+
+logger = logging.getLogger(__name__)
+
+DESK_MOTION_ENABLED = os.getenv("DESK_MOTION_ENABLED", "true").lower() == "true"
+
+
+@dataclass(frozen=True)
+class MotionSettings:
+    """Tuning of the desk motion model.
+
+    Attributes:
+        nominal_speed: Assumed speed in mm/s until a desk reports its own.
+        base_error: Error in mm of a fresh observation.
+        speed_tolerance: Relative speed uncertainty; the error bound grows by
+            ``speed * speed_tolerance`` mm per second since the last check.
+        max_error: Largest error bound in mm that is still served; beyond it
+            the real desk is checked.
+        arrival_tolerance: Distance in mm from the target counted as arrived.
+        start_grace: Seconds a desk may report zero speed after a command
+            before it is considered stopped.
+        idle_anchor_age: Age in seconds up to which the position of a desk
+            at rest is trusted as the starting point of a new move.
+
+    """
+
+    nominal_speed: float = _load_positive_number("DESK_MOTION_SPEED_MMS", 30)
+    base_error: float = _load_positive_number("DESK_MOTION_BASE_ERROR_MM", 2)
+    speed_tolerance: float = _load_positive_number("DESK_MOTION_SPEED_TOLERANCE", 0.15)
+    max_error: float = _load_positive_number("DESK_MOTION_MAX_ERROR_MM", 15)
+    arrival_tolerance: float = _load_positive_number(
+        "DESK_MOTION_ARRIVAL_TOLERANCE_MM", 5
+    )
+    start_grace: float = _load_positive_number("DESK_MOTION_START_GRACE_SECONDS", 1.5)
+    idle_anchor_age: float = _load_positive_number(
+        "DESK_MOTION_IDLE_ANCHOR_SECONDS", 30
+    )
+
+
+@dataclass(frozen=True)
+class MotionEstimate:
+    """Estimated state of a moving desk and how far off it may be."""
+
+    state: DeskState
+    accuracy_mm: float
+    target_mm: int
+    eta_s: float
+
+
+@dataclass
+class _Track:
+    """Last real observation of a desk and its current target, if moving."""
+
+    position_mm: Optional[float] = None
+    observed_at: float = 0.0
+    speed_mms: float = 0.0
+    state: Dict[str, object] = field(default_factory=dict)
+    target_mm: Optional[int] = None
+    commanded_at: float = 0.0
+
+
+class DeskMotionModel:
+    """Per-desk motion twin anchored on real observations.
+
+    Every document read from the box is ``observe``d. After a position
+    command (``begin``) the desk's position is extrapolated from the last
+    observation at its reported (or nominal) speed towards the target. An
+    estimate is only served while its error bound stays under ``max_error``
+    and the desk hasn't reached its predicted arrival; otherwise ``estimate``
+    returns None so the caller checks the real desk, which re-anchors the
+    model. A desk reported at its target, or standing still after the start
+    grace period, is no longer tracked as moving.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[MotionSettings] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty model."""
+        self.settings = settings or MotionSettings()
+        self._clock = clock
+        self._tracks: Dict[str, _Track] = {}
+        self._estimates_served = 0
+        self._checkpoints = 0
+
+    def observe(self, desk_id: str, state: Dict[str, object]) -> None:
+        """Anchor the model on a real ``state`` section read from the box."""
+        position = state.get("position_mm")
+        if not isinstance(position, (int, float)):
+            return
+        now = self._clock()
+        track = self._tracks.setdefault(desk_id, _Track())
+        speed = state.get("speed_mms")
+        track.position_mm = float(position)
+        track.observed_at = now
+        track.state = dict(state)
+        if isinstance(speed, (int, float)) and speed:
+            track.speed_mms = abs(float(speed))
+
+        if track.target_mm is None:
+            return
+        if abs(track.position_mm - track.target_mm) <= self.settings.arrival_tolerance:
+            logger.debug("Desk %s arrived at %smm", desk_id, track.target_mm)
+            track.target_mm = None
+        elif not speed and now - track.commanded_at > self.settings.start_grace:
+            logger.debug(
+                "Desk %s stopped at %smm short of %smm",
+                desk_id,
+                position,
+                track.target_mm,
+            )
+            track.target_mm = None
+
+    def begin(self, desk_id: str, target_mm: int) -> None:
+        """Start tracking a move of ``desk_id`` towards ``target_mm``."""
+        now = self._clock()
+        track = self._tracks.setdefault(desk_id, _Track())
+        if track.target_mm is not None and track.position_mm is not None:
+            # Re-anchor on where the previous move has got to by now
+            estimate = self._extrapolate(track, now)
+            track.position_mm, track.observed_at = estimate, now
+        elif (
+            track.position_mm is not None
+            and now - track.observed_at <= self.settings.idle_anchor_age
+        ):
+            # A desk at rest is still where it was last seen
+            track.observed_at = now
+        else:
+            # Unknown or stale start; wait for a real observation
+            track.position_mm = None
+        track.target_mm = target_mm
+        track.commanded_at = now
+
+    def forget(self, desk_id: str) -> None:
+        """Drop everything known about ``desk_id``."""
+        self._tracks.pop(desk_id, None)
+
+    def estimate(self, desk_id: str) -> Optional[MotionEstimate]:
+        """Estimate the state of a moving desk.
+
+        Returns:
+            The estimate, or None when the desk isn't moving, its position is
+            unknown, it should have arrived, or the error bound is too large
+            (a checkpoint against the real desk is due).
+
+        """
+        track = self._tracks.get(desk_id)
+        if track is None or track.target_mm is None or track.position_mm is None:
+            return None
+
+        now = self._clock()
+        elapsed = now - track.observed_at
+        speed = track.speed_mms or self.settings.nominal_speed
+        accuracy = (
+            self.settings.base_error + speed * self.settings.speed_tolerance * elapsed
+        )
+        position = self._extrapolate(track, now)
+        if position is None or accuracy > self.settings.max_error:
+            self._checkpoints += 1
+            return None
+
+        direction = 1 if track.target_mm >= position else -1
+        state = DeskState(
+            position_mm=round(position),
+            speed_mms=round(direction * speed),
+            status=str(track.state.get("status") or "Normal"),
+            is_position_lost=bool(track.state.get("isPositionLost", False)),
+            is_overload_protection_up=bool(
+                track.state.get("isOverloadProtectionUp", False)
+            ),
+            is_overload_protection_down=bool(
+                track.state.get("isOverloadProtectionDown", False)
+            ),
+            is_anti_collision=bool(track.state.get("isAntiCollision", False)),
+        )
+        self._estimates_served += 1
+        return MotionEstimate(
+            state=state,
+            accuracy_mm=round(accuracy, 1),
+            target_mm=track.target_mm,
+            eta_s=abs(track.target_mm - position) / speed,
+        )
+
+    def stats(self) -> Dict[str, object]:
+        """Return model counters."""
+        return {
+            "tracked_desks": len(self._tracks),
+            "moving_desks": sum(
+                1 for track in self._tracks.values() if track.target_mm is not None
+            ),
+            "estimates_served": self._estimates_served,
+            "checkpoints": self._checkpoints,
+        }
+
+    def _extrapolate(self, track: _Track, now: float) -> Optional[float]:
+        """Return the extrapolated position, or None once arrival is predicted."""
+        speed = track.speed_mms or self.settings.nominal_speed
+        distance = track.target_mm - track.position_mm  # type: ignore[operator]
+        travelled = speed * (now - track.observed_at)
+        if travelled >= abs(distance):
+            return None
+        step = travelled if distance > 0 else -travelled
+        return track.position_mm + step  # type: ignore[operator]
@@ -0,0 +1,227 @@
+"""Background mirror of every desk's config, state and usage."""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from src.messaging.event_queue import EventPublishQueue, event_queue
+from src.services.async_desk_service import AsyncDeskService, async_desk_service
+from src.services.desk_cache import DeskDocument
+from src.services.desk_service import DeskServiceError, _load_positive_number
+
+logger = logging.getLogger(__name__)
+
+# Sections compared between snapshots to detect changes
+MIRRORED_SECTIONS = ("config", "state", "usage")
+STATE_CHANGED_ROUTING_KEY = "desk.state.changed"
+
+DESK_REGISTRY_ENABLED = os.getenv("DESK_REGISTRY_ENABLED", "true").lower() == "true"
+DESK_REGISTRY_POLL_INTERVAL = _load_positive_number(
+    "DESK_REGISTRY_POLL_INTERVAL_SECONDS", 5
+)
+DESK_REGISTRY_CONCURRENCY = int(_load_positive_number("DESK_REGISTRY_CONCURRENCY", 16))
+
+
+@dataclass(frozen=True)
+class DeskSnapshot:
+    """A mirrored desk document and when it was observed."""
+
+    document: DeskDocument
+    observed_at: float
+
+    def age(self, now: float) -> float:
+        """Seconds since the snapshot was taken."""
+        return max(0.0, now - self.observed_at)
+
+
+def diff_sections(
+    previous: DeskDocument, current: DeskDocument
+) -> Dict[str, Dict[str, Dict[str, object]]]:
+    """Return ``{section: {field: {"old": ..., "new": ...}}}`` for changed fields."""
+    changes: Dict[str, Dict[str, Dict[str, object]]] = {}
+    for section in MIRRORED_SECTIONS:
+        old = previous.get(section) or {}
+        new = current.get(section) or {}
+        fields = {
+            key: {"old": old.get(key), "new": new.get(key)}
+            for key in sorted(set(old) | set(new))
+            if old.get(key) != new.get(key)
+        }
+        if fields:
+            changes[section] = fields
+    return changes
+
+
+class DeskRegistry:
+    """In-memory mirror of all desks, refreshed by a background poller.
+
+    Every ``interval`` seconds the poller lists the desks and fetches each
+    desk document concurrently (at most ``concurrency`` at once). Each new
+    snapshot is diffed against the previous one and a ``desk.state.changed``
+    event is published only when a mirrored section actually changed.
+    Snapshots older than ``max_staleness`` are not served.
+    """
+
+    def __init__(
+        self,
+        service: AsyncDeskService,
+        publisher: EventPublishQueue,
+        *,
+        interval: float = DESK_REGISTRY_POLL_INTERVAL,
+        concurrency: int = DESK_REGISTRY_CONCURRENCY,
+        max_staleness: Optional[float] = None,
+    ) -> None:
+        """Initialize the registry; call ``start`` to begin polling."""
+        self._service = service
+        self._publisher = publisher
+        self.interval = interval
+        self.concurrency = max(1, concurrency)
+        self.max_staleness = max_staleness or 3 * interval
+        self._snapshots: Dict[str, DeskSnapshot] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+        self._polls = 0
+        self._poll_errors = 0
+        self._events_published = 0
+        self._last_poll_duration: Optional[float] = None
+
+    # -------- lifecycle --------
+
+    def start(self) -> None:
+        """Start the background poller on the running event loop."""
+        if self.is_running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(
+            "Desk registry poller started (interval=%ss, concurrency=%d)",
+            self.interval,
+            self.concurrency,
+        )
+
+    async def stop(self) -> None:
+        """Stop the background poller."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        logger.info("Desk registry poller stopped")
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the poller task is active."""
+        return self._task is not None and not self._task.done()
+
+    # -------- reads --------
+
+    def get(self, desk_id: str) -> Optional[DeskSnapshot]:
+        """Return the desk's snapshot, or None if missing or too stale."""
+        snapshot = self._snapshots.get(desk_id)
+        if snapshot is None or snapshot.age(time.monotonic()) > self.max_staleness:
+            return None
+        return snapshot
+
+    def desk_ids(self) -> List[str]:
+        """Return the identifiers of all mirrored desks."""
+        return list(self._snapshots)
+
+    def invalidate(self, desk_id: str) -> None:
+        """Stop serving ``desk_id`` from the mirror until the next poll."""
+        snapshot = self._snapshots.get(desk_id)
+        if snapshot is not None:
+            # Keep the document as the diff baseline, but mark it expired
+            self._snapshots[desk_id] = DeskSnapshot(snapshot.document, float("-inf"))
+
+    def stats(self) -> Dict[str, object]:
+        """Return poller counters."""
+        return {
+            "running": self.is_running,
+            "desks": len(self._snapshots),
+            "interval": self.interval,
+            "concurrency": self.concurrency,
+            "polls": self._polls,
+            "poll_errors": self._poll_errors,
+            "events_published": self._events_published,
+            "last_poll_duration": self._last_poll_duration,
+        }
+
+    # -------- polling --------
+
+    async def poll_once(self) -> None:
+        """List desks and refresh every snapshot once."""
+        started = time.monotonic()
+        desk_ids = await self._service.get_all_desks()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _bounded(desk_id: str) -> None:
+            async with semaphore:
+                await self._poll_desk(desk_id)
+
+        await asyncio.gather(*(_bounded(desk_id) for desk_id in desk_ids))
+
+        for removed in set(self._snapshots) - set(desk_ids):
+            del self._snapshots[removed]
+
+        self._polls += 1
+        self._last_poll_duration = time.monotonic() - started
+
+    async def _run(self) -> None:
+        """Poll forever at the configured interval."""
+        while True:
+            started = time.monotonic()
+            try:
+                await self.poll_once()
+            except Exception as exc:
+                self._poll_errors += 1
+                logger.warning("Desk registry poll failed: %s", exc)
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, self.interval - elapsed))
+
+    async def _poll_desk(self, desk_id: str) -> None:
+        """Refresh one desk and publish its changes, if any."""
+        try:
+            document = await self._service.fetch_desk_document(desk_id)
+        except DeskServiceError as exc:
+            logger.warning("Desk registry failed to refresh %s: %s", desk_id, exc)
+            return
+
+        previous = self._snapshots.get(desk_id)
+        self._snapshots[desk_id] = DeskSnapshot(document, time.monotonic())
+        if previous is None:
+            return
+
+        changes = diff_sections(previous.document, document)
+        if changes:
+            self._publish_change(desk_id, document, changes)
+
+    def _publish_change(
+        self,
+        desk_id: str,
+        document: DeskDocument,
+        changes: Dict[str, Dict[str, Dict[str, object]]],
+    ) -> None:
+        """Publish a ``desk.state.changed`` event for one desk."""
+        payload: Dict[str, object] = {
+            "desk_id": desk_id,
+            "changes": changes,
+            **{section: document.get(section) for section in MIRRORED_SECTIONS},
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "source": "desk-integration-service",
+            "event_type": "state_changed",
+        }
+        published = self._publisher.publish(
+            routing_key=STATE_CHANGED_ROUTING_KEY,
+            payload=payload,
+            persistent=True,
+        )
+        if published:
+            self._events_published += 1
+
+
+# Global singleton instance
+desk_registry = DeskRegistry(async_desk_service, event_queue)
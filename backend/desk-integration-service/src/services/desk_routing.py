@@ -0,0 +1,136 @@
+"""Routing of desks to the WiFi2BLE boxes they are connected to."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DeskBox:
+    """One WiFi2BLE box: where to reach it and the API key for its desks."""
+
+    name: str
+    base_url: str
+    api_key: str
+
+
+def parse_boxes(raw: str) -> List[DeskBox]:
+    """Parse a box list like ``floor1=http://box1/api/v2|KEY1,floor2=...``.
+
+    Each comma-separated entry is ``[name=]base_url|api_key``; unnamed boxes
+    are called ``box1``, ``box2``, ... in order.
+
+    Raises:
+        ValueError: If an entry has no API key or two boxes share a name.
+
+    """
+    boxes: List[DeskBox] = []
+    for index, entry in enumerate(filter(None, map(str.strip, raw.split(",")))):
+        name, separator, target = entry.partition("=")
+        if not separator or "/" in name:
+            name, target = "box%d" % (index + 1), entry
+        base_url, _, api_key = target.partition("|")
+        if not base_url.strip() or not api_key.strip():
+            raise ValueError("Invalid desk box entry: '%s'" % entry)
+        boxes.append(
+            DeskBox(
+                name=name.strip(),
+                base_url=base_url.strip().rstrip("/"),
+                api_key=api_key.strip(),
+            )
+        )
+    names = [box.name for box in boxes]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate desk box names in %s" % names)
+    return boxes
+
+
+class DeskRoutingTable:
+    """Thread-safe desk -> box table built from each box's desk list.
+
+    With a single box every desk is routed to it without a lookup. With
+    several boxes the table is rebuilt by ``merge``-ing the ``GET /desks/``
+    listing of every box; a desk listed by more than one box stays on the
+    box it was first seen on. Desks of a box that couldn't be listed keep
+    their last known route.
+    """
+
+    def __init__(self, boxes: Sequence[DeskBox]) -> None:
+        """Initialize an empty table for ``boxes``."""
+        if not boxes:
+            raise ValueError("At least one desk box is required")
+        self.boxes: Tuple[DeskBox, ...] = tuple(boxes)
+        self._lock = threading.Lock()
+        self._routes: Dict[str, DeskBox] = {}
+        self._refreshed_at: Optional[float] = None
+
+    @property
+    def default_box(self) -> DeskBox:
+        """The first configured box."""
+        return self.boxes[0]
+
+    def box_for(self, desk_id: str) -> Optional[DeskBox]:
+        """Return the box ``desk_id`` is connected to, or None if unknown."""
+        if len(self.boxes) == 1:
+            return self.default_box
+        with self._lock:
+            return self._routes.get(desk_id)
+
+    def merge(
+        self, listings: Sequence[Tuple[DeskBox, Optional[List[str]]]]
+    ) -> List[str]:
+        """Rebuild the table from each box's desk list.
+
+        Args:
+            listings: ``(box, desk_ids)`` per box, with None for a box whose
+                list couldn't be fetched.
+
+        Returns:
+            Every routed desk id, grouped by box in configuration order.
+
+        """
+        with self._lock:
+            routes: Dict[str, DeskBox] = {}
+            for box, listed in listings:
+                desk_ids = (
+                    listed
+                    if listed is not None
+                    else [
+                        desk_id
+                        for desk_id, owner in self._routes.items()
+                        if owner == box
+                    ]
+                )
+                for desk_id in desk_ids:
+                    owner = routes.setdefault(desk_id, box)
+                    if owner != box:
+                        logger.warning(
+                            "Desk %s is listed by boxes %s and %s; using %s",
+                            desk_id,
+                            owner.name,
+                            box.name,
+                            owner.name,
+                        )
+            self._routes = routes
+            self._refreshed_at = time.monotonic()
+            return list(routes)
+
+    def stats(self) -> Dict[str, object]:
+        """Return the number of desks routed to each box."""
+        with self._lock:
+            per_box = {box.name: 0 for box in self.boxes}
+            for box in self._routes.values():
+                per_box[box.name] += 1
+            return {
+                "boxes": per_box,
+                "routed_desks": len(self._routes),
+                "refreshed_age": (
+                    None
+                    if self._refreshed_at is None
+                    else time.monotonic() - self._refreshed_at
+                ),
+            }
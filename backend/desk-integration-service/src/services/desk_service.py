@@ -2,8 +2,10 @@
 
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import requests
 from dotenv import load_dotenv
@@ -13,6 +15,9 @@ from src.models.dto.desk_config import DeskConfig
 from src.models.dto.desk_error import DeskError
 from src.models.dto.desk_state import DeskState
 from src.models.dto.desk_usage import DeskUsage
+from src.services.desk_breaker import CircuitOpenError, DeskCallGuard
+from src.services.desk_routing import DeskBox, DeskRoutingTable, parse_boxes
+from src.services.http_transport import DeskHttpTransport, HttpTransportSettings
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -34,8 +39,25 @@ def _load_timeout() -> int:
         return 10
 
 
+def _load_positive_number(name: str, default: float) -> float:
+    """Load a positive number from environment with fallback.
+
+    Falls back to ``default`` if the env var is missing, invalid or not positive.
+    """
+    raw = os.getenv(name, str(default))
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        value = -1
+    if value <= 0:
+        logger.warning("Invalid %s value '%s'; falling back to %s", name, raw, default)
+        return default
+    return value
+
+
 DEFAULT_TIMEOUT = _load_timeout()
 HTTP_ERROR_THRESHOLD = 400  # First HTTP error status code (4xx/5xx)
+HTTP_SERVER_ERROR_THRESHOLD = 500  # First status code counted as a desk failure
 
 
 class DeskServiceError(RuntimeError):
@@ -50,40 +72,175 @@ class DeskServiceError(RuntimeError):
 class _DeskServiceConfig:
     """Configuration container for the DeskService."""
 
-    base_url: str
-    api_key: str
+    boxes: Tuple[DeskBox, ...]
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the default (first) box."""
+        return self.boxes[0].base_url
+
+    @property
+    def api_key(self) -> str:
+        """API key of the default (first) box."""
+        return self.boxes[0].api_key
 
     @classmethod
     def from_env(cls) -> "_DeskServiceConfig":
-        """Load configuration from environment variables."""
-        base = os.getenv("DESK_API_BASE_URL", "http://localhost:8000/api/v2").rstrip(
-            "/"
-        )
-        api_key = os.getenv("DESK_API_KEY", "")
+        """Load configuration from environment variables.
 
-        if not api_key:
-            logger.error("DESK_API_KEY environment variable is not set!")
-            raise ValueError("DESK_API_KEY is required")
+        ``DESK_API_BOXES`` lists several boxes; without it the single box
+        given by ``DESK_API_BASE_URL`` and ``DESK_API_KEY`` is used.
+        """
+        raw_boxes = os.getenv("DESK_API_BOXES", "")
+        if raw_boxes.strip():
+            boxes = parse_boxes(raw_boxes)
+        else:
+            base = os.getenv(
+                "DESK_API_BASE_URL", "http://localhost:8000/api/v2"
+            ).rstrip("/")
+            api_key = os.getenv("DESK_API_KEY", "")
+
+            if not api_key:
+                logger.error("DESK_API_KEY environment variable is not set!")
+                raise ValueError("DESK_API_KEY is required")
+            boxes = [DeskBox(name="default", base_url=base, api_key=api_key)]
+
+        for box in boxes:
+            logger.info(
+                "DeskService box %s: base_url=%s, api_key=%s...",
+                box.name,
+                box.base_url,
+                box.api_key[:8],
+            )
+        return cls(boxes=tuple(boxes))
+
+
+_config = _DeskServiceConfig.from_env()
+
+# Circuit breakers and adaptive timeouts shared by every call to the boxes
+desk_guard = DeskCallGuard()
+
+# Pooled keep-alive transport shared by every call to the boxes
+desk_transport = DeskHttpTransport(
+    HttpTransportSettings(
+        pool_maxsize=int(_load_positive_number("DESK_API_POOL_MAXSIZE", 32)),
+        pool_connections=max(4, len(_config.boxes)),
+        pool_block=os.getenv("DESK_API_POOL_BLOCK", "false").lower() == "true",
+        connect_timeout=_load_positive_number("DESK_API_CONNECT_TIMEOUT_SECONDS", 3),
+        read_timeout=_load_positive_number(
+            "DESK_API_READ_TIMEOUT_SECONDS", DEFAULT_TIMEOUT
+        ),
+    )
+)
+
+
+def _parse_config(config: Dict[str, object]) -> DeskConfig:
+    """Build a DeskConfig from the box's ``config`` section."""
+    return DeskConfig(
+        name=config.get("name"),
+        manufacturer=config.get("manufacturer"),
+    )
+
+
+def _parse_state(state: Dict[str, object]) -> DeskState:
+    """Build a DeskState from the box's ``state`` section."""
+    return DeskState(
+        position_mm=state.get("position_mm"),
+        speed_mms=state.get("speed_mms"),
+        status=state.get("status"),
+        is_position_lost=state.get("isPositionLost"),
+        is_overload_protection_up=state.get("isOverloadProtectionUp"),
+        is_overload_protection_down=state.get("isOverloadProtectionDown"),
+        is_anti_collision=state.get("isAntiCollision"),
+    )
+
+
+def _parse_usage(usage: Dict[str, object]) -> DeskUsage:
+    """Build a DeskUsage from the box's ``usage`` section."""
+    return DeskUsage(
+        activations_counter=usage.get("activationsCounter"),
+        sit_stand_counter=usage.get("sitStandCounter"),
+    )
+
+
+def _parse_errors(desk: object) -> List[DeskError]:
+    """Safely construct the ``lastErrors`` list of a desk document with coercion."""
+    last_errors: List[DeskError] = []
+    errors_payload = desk.get("lastErrors") if isinstance(desk, dict) else None
+    if errors_payload:
+        for error in errors_payload:
+            time_s = error.get("time_s")
+            raw_code = error.get("error_code")
+            try:
+                error_code = int(raw_code) if raw_code is not None else 0
+            except (TypeError, ValueError):
+                error_code = 0
+            last_errors.append(DeskError(time_s=time_s, error_code=error_code))
+    return last_errors
+
+
+def _parse_desk(desk: Dict[str, object]) -> Desk:
+    """Build a Desk from a full desk document.
+
+    The API returns nested sections: 'config', 'state', 'usage' and 'lastErrors'.
+    """
+    return Desk(
+        config=_parse_config(desk.get("config", {}) or {}),
+        state=_parse_state(desk.get("state", {}) or {}),
+        usage=_parse_usage(desk.get("usage", {}) or {}),
+        last_errors=_parse_errors(desk),
+    )
 
-        logger.info(
-            "DeskService initialized: base_url=%s, api_key=%s...",
-            base,
-            api_key[:8],
-        )
-        return cls(base_url=base, api_key=api_key)
+
+def _parse_set_position_response(
+    state_data: Dict[str, object], position_mm: int
+) -> DeskState:
+    """Build the DeskState returned by a ``PUT .../state`` call.
+
+    Missing fields are filled in, since the box may only echo the target.
+    """
+    return DeskState(
+        position_mm=state_data.get("position_mm", position_mm),
+        speed_mms=state_data.get("speed_mms", 0),
+        status=state_data.get("status", "moving"),
+        is_position_lost=state_data.get("isPositionLost", False),
+        is_overload_protection_up=state_data.get("isOverloadProtectionUp", False),
+        is_overload_protection_down=state_data.get("isOverloadProtectionDown", False),
+        is_anti_collision=state_data.get("isAntiCollision", False),
+    )
+
+
+def _fallback_set_position_state(position_mm: int) -> DeskState:
+    """Return a minimal valid DeskState when the PUT response can't be parsed."""
+    return DeskState(
+        position_mm=position_mm,
+        speed_mms=0,
+        status="unknown",
+        is_position_lost=False,
+        is_overload_protection_up=False,
+        is_overload_protection_down=False,
+        is_anti_collision=False,
+    )
 
 
 class DeskService:
-    """Service for interacting with the WiFi2BLE Box Simulator API."""
+    """Service for interacting with the WiFi2BLE Box Simulator API.
 
-    _config = _DeskServiceConfig.from_env()
+    Desks may be spread over several boxes; calls for a single desk go to the
+    box it was listed by (see ``DeskRoutingTable``).
+    """
+
+    _config = _config
+    _routes = DeskRoutingTable(_config.boxes)
 
     @classmethod
-    def _build_url(cls, *segments: str) -> str:
+    def _build_url(cls, *segments: str, box: Optional[DeskBox] = None) -> str:
         """Build URL with API key in path for WiFi2BLE Box Simulator.
 
         Format: {base_url}/{api_key}/desks/...
 
+        ``box`` defaults to the first configured box.
+
         The requests library automatically handles URL encoding, so we don't need
         to encode manually.
 
@@ -93,7 +250,8 @@ class DeskService:
                 -> http://localhost:8000/api/v2/API_KEY/desks/cd:fb:1a:53:fb:e6
 
         """
-        parts: List[str] = [cls._config.base_url, cls._config.api_key]
+        box = box or cls._routes.default_box
+        parts: List[str] = [box.base_url, box.api_key]
         parts.extend(segment.strip("/") for segment in segments if segment)
         url = "/".join(parts)
 
@@ -109,45 +267,59 @@ class DeskService:
         cls,
         method: str,
         url: str,
+        *,
+        box: Optional[DeskBox] = None,
+        desk_id: Optional[str] = None,
         **kwargs: dict[str, object],
     ) -> requests.Response:
-        """Make HTTP request with proper error handling."""
+        """Make HTTP request with proper error handling.
+
+        The call goes through the desk and box circuit breakers of
+        ``desk_guard``: it fails fast with HTTP status 503 while either is
+        open, and its read timeout adapts to the box's recent latency.
+        """
+        box = cls._guard_call(method, url, box, desk_id)
         headers: Dict[str, str] = kwargs.pop("headers", {}) or {}  # type: ignore[assignment]
         headers.setdefault("Content-Type", "application/json")
 
+        connect_timeout, read_timeout = desk_transport.timeout
+        read_timeout = desk_guard.read_timeout(box.name, read_timeout)
+
         logger.info("Making %s request to %s", method, url)
         if "json" in kwargs:
             logger.debug("Request payload: %s", kwargs["json"])
 
+        started = time.monotonic()
         try:
-            response = requests.request(
+            response = desk_transport.request(
                 method=method,
                 url=url,
                 headers=headers,
-                timeout=DEFAULT_TIMEOUT,
-                **kwargs,  # type: ignore[arg-type]
+                timeout=(connect_timeout, read_timeout),
+                **kwargs,
             )
             logger.info("Response status: %s", response.status_code)
             logger.info("Response body: %s", response.text)
 
         except requests.exceptions.Timeout as exc:
-            logger.error(
-                "Request timeout after %ss for %s: %s", DEFAULT_TIMEOUT, url, exc
-            )
-            raise DeskServiceError(
-                "Request timeout after %ss" % DEFAULT_TIMEOUT
-            ) from exc
+            # A slow desk times out on a live box; only desk-less calls count
+            desk_guard.record_failure(box.name, desk_id, box_down=desk_id is None)
+            logger.error("Request timeout after %ss for %s: %s", read_timeout, url, exc)
+            raise DeskServiceError("Request timeout after %ss" % read_timeout) from exc
 
         except requests.exceptions.ConnectionError as exc:
+            desk_guard.record_failure(box.name, desk_id, box_down=True)
             logger.error("Connection error to %s: %s", url, exc)
             raise DeskServiceError(
                 "Failed to connect to desk API - check if simulator is running"
             ) from exc
 
         except requests.RequestException as exc:
+            desk_guard.record_failure(box.name, desk_id, box_down=True)
             logger.exception("Request failed to %s: %s", url, exc)
             raise DeskServiceError("Failed to communicate with desk API") from exc
 
+        cls._record_response(box, desk_id, response.status_code, started)
         if response.status_code >= HTTP_ERROR_THRESHOLD:
             error_text = response.text[:500] if response.text else "No error message"
             logger.error(
@@ -165,6 +337,39 @@ class DeskService:
 
         return response
 
+    @classmethod
+    def _guard_call(
+        cls,
+        method: str,
+        url: str,
+        box: Optional[DeskBox],
+        desk_id: Optional[str],
+    ) -> DeskBox:
+        """Resolve the box of a call and check its circuit breakers.
+
+        Raises:
+            DeskServiceError: With status 503 if the desk or box breaker is open.
+
+        """
+        if box is None:
+            box = (desk_id and cls._routes.box_for(desk_id)) or cls._routes.default_box
+        try:
+            desk_guard.check(box.name, desk_id)
+        except CircuitOpenError as exc:
+            logger.info("Skipping %s %s: %s", method, url, exc)
+            raise DeskServiceError(str(exc), status_code=503) from exc
+        return box
+
+    @staticmethod
+    def _record_response(
+        box: DeskBox, desk_id: Optional[str], status_code: int, started: float
+    ) -> None:
+        """Report an answered call to the circuit breakers."""
+        if status_code >= HTTP_SERVER_ERROR_THRESHOLD:
+            desk_guard.record_failure(box.name, desk_id, box_down=True)
+        else:
+            desk_guard.record_success(box.name, desk_id, time.monotonic() - started)
+
     @classmethod
     def get_desk_by_id(cls, desk_id: str) -> Desk | None:
         """Get the data of a specific desk.
@@ -183,53 +388,9 @@ class DeskService:
 
         try:
             # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/{desk_id}
-            url = cls._build_url("desks", desk_id)
-            response = cls._request("GET", url)
-            desk = response.json()
-
-            # Safely construct last_errors list with coercion
-            last_errors: List[DeskError] = []
-            errors_payload = desk.get("lastErrors") if isinstance(desk, dict) else None
-            if errors_payload:
-                for error in errors_payload:
-                    time_s = error.get("time_s")
-                    raw_code = error.get("error_code")
-                    try:
-                        error_code = int(raw_code) if raw_code is not None else 0
-                    except (TypeError, ValueError):
-                        error_code = 0
-                    last_errors.append(DeskError(time_s=time_s, error_code=error_code))
-
-            # The API returns nested sections: 'config', 'state', 'usage', so use those
-            config_payload = desk.get("config", {}) or {}
-            state_payload = desk.get("state", {}) or {}
-            usage_payload = desk.get("usage", {}) or {}
-
-            desk_output = Desk(
-                config=DeskConfig(
-                    name=config_payload.get("name"),
-                    manufacturer=config_payload.get("manufacturer"),
-                ),
-                state=DeskState(
-                    position_mm=state_payload.get("position_mm"),
-                    speed_mms=state_payload.get("speed_mms"),
-                    status=state_payload.get("status"),
-                    is_position_lost=state_payload.get("isPositionLost"),
-                    is_overload_protection_up=state_payload.get(
-                        "isOverloadProtectionUp"
-                    ),
-                    is_overload_protection_down=state_payload.get(
-                        "isOverloadProtectionDown"
-                    ),
-                    is_anti_collision=state_payload.get("isAntiCollision"),
-                ),
-                usage=DeskUsage(
-                    activations_counter=usage_payload.get("activationsCounter"),
-                    sit_stand_counter=usage_payload.get("sitStandCounter"),
-                ),
-                last_errors=last_errors,
-            )
-            return desk_output
+            url = cls._desk_url(desk_id)
+            response = cls._request("GET", url, desk_id=desk_id)
+            return _parse_desk(response.json())
 
         except DeskServiceError as exc:
             logger.warning("Failed to get data of desk %s: %s", desk_id, exc)
@@ -239,37 +400,122 @@ class DeskService:
             return None
 
     @classmethod
-    def get_all_desks(cls) -> list[str]:
-        """Fetch all desk identifiers from the desk API.
+    def _desk_url(cls, desk_id: str, *segments: str) -> str:
+        """Build the URL of a desk resource on the box the desk is connected to.
 
-        Returns:
-            List of MAC addresses like ["cd:fb:1a:53:fb:e6", ...]
+        An unknown desk triggers one refresh of the routing table.
 
         Raises:
-            DeskServiceError: If the API request fails
+            DeskServiceError: If no box lists the desk.
 
         """
-        logger.info("Fetching all desks from API")
+        box = cls._routes.box_for(desk_id)
+        if box is None:
+            try:
+                cls.get_all_desks()
+            except DeskServiceError as exc:
+                logger.warning("Failed to refresh desk routes: %s", exc)
+            box = cls._routes.box_for(desk_id)
+        return cls._routed_url(desk_id, box, *segments)
 
-        # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/
-        url = cls._build_url("desks/")
-        response = cls._request("GET", url)
+    @classmethod
+    def _routed_url(cls, desk_id: str, box: Optional[DeskBox], *segments: str) -> str:
+        """Build the URL of a desk resource on ``box``.
 
-        try:
-            payload = response.json()
-        except ValueError as exc:
-            logger.error("Failed to parse JSON response: %s", exc)
-            raise DeskServiceError("Invalid JSON response from desk API") from exc
+        Raises:
+            DeskServiceError: If ``box`` is None (no box lists the desk).
 
+        """
+        if box is None:
+            raise DeskServiceError(
+                "Desk %s is not connected to any configured box" % desk_id,
+                status_code=404,
+            )
+        return cls._build_url("desks", desk_id, *segments, box=box)
+
+    @classmethod
+    def _parse_desk_list(cls, box: DeskBox, payload: object) -> List[str]:
+        """Extract the desk identifiers from a box's ``GET /desks/`` payload.
+
+        Raises:
+            DeskServiceError: If the payload is not a list
+
+        """
         # WiFi2BLE returns a simple list of MAC addresses (strings)
         if isinstance(payload, list):
             desk_ids = [str(item) for item in payload if item]
-            logger.info("✓ Found %d desks: %s", len(desk_ids), desk_ids)
+            logger.info("✓ Found %d desks on box %s", len(desk_ids), box.name)
             return desk_ids
 
         logger.error("Unexpected payload format: %s - %s", type(payload), payload)
         raise DeskServiceError("Desk API returned an unexpected response format")
 
+    @classmethod
+    def _list_box_desks(cls, box: DeskBox) -> List[str]:
+        """Fetch the desk identifiers connected to one box.
+
+        Raises:
+            DeskServiceError: If the API request fails
+
+        """
+        # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/
+        response = cls._request("GET", cls._build_url("desks/", box=box), box=box)
+
+        try:
+            payload = response.json()
+        except ValueError as exc:
+            logger.error("Failed to parse JSON response: %s", exc)
+            raise DeskServiceError("Invalid JSON response from desk API") from exc
+        return cls._parse_desk_list(box, payload)
+
+    @classmethod
+    def _merge_listings(
+        cls,
+        listings: List[Tuple[DeskBox, Optional[List[str]]]],
+        errors: List[DeskServiceError],
+    ) -> List[str]:
+        """Merge per-box desk lists into the routing table.
+
+        Raises:
+            DeskServiceError: If no box could be listed
+
+        """
+        if errors and len(errors) == len(listings):
+            raise errors[0]
+        return cls._routes.merge(listings)
+
+    @classmethod
+    def get_all_desks(cls) -> list[str]:
+        """Fetch all desk identifiers from every configured box.
+
+        The boxes are listed in parallel and their lists merged into the
+        routing table. A box that can't be listed is logged and its desks
+        keep their last known route.
+
+        Returns:
+            List of MAC addresses like ["cd:fb:1a:53:fb:e6", ...]
+
+        Raises:
+            DeskServiceError: If no box could be listed
+
+        """
+        logger.info("Fetching all desks from API")
+        boxes = cls._routes.boxes
+        listings: List[Tuple[DeskBox, Optional[List[str]]]] = []
+        errors: List[DeskServiceError] = []
+        with ThreadPoolExecutor(
+            max_workers=len(boxes), thread_name_prefix="desk-list"
+        ) as executor:
+            futures = [executor.submit(cls._list_box_desks, box) for box in boxes]
+            for box, future in zip(boxes, futures, strict=True):
+                try:
+                    listings.append((box, future.result()))
+                except DeskServiceError as exc:
+                    logger.error("✗ Failed to list desks on box %s: %s", box.name, exc)
+                    errors.append(exc)
+                    listings.append((box, None))
+        return cls._merge_listings(listings, errors)
+
     @classmethod
     def get_desk_config(cls, desk_id: str) -> DeskConfig | None:
         """Get the current configuration of a specific desk.
@@ -288,14 +534,9 @@ class DeskService:
 
         try:
             # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/{desk_id}
-            url = cls._build_url("desks", desk_id, "config")
-            response = cls._request("GET", url)
-            config = response.json()
-            desk_config = DeskConfig(
-                name=config.get("name"),
-                manufacturer=config.get("manufacturer"),
-            )
-            return desk_config
+            url = cls._desk_url(desk_id, "config")
+            response = cls._request("GET", url, desk_id=desk_id)
+            return _parse_config(response.json())
 
         except DeskServiceError as exc:
             logger.warning("Failed to get configuration for desk %s: %s", desk_id, exc)
@@ -319,19 +560,9 @@ class DeskService:
 
         try:
             # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/{desk_id}
-            url = cls._build_url("desks", desk_id, "state")
-            response = cls._request("GET", url)
-            state = response.json()
-            desk_state = DeskState(
-                position_mm=state.get("position_mm"),
-                speed_mms=state.get("speed_mms"),
-                status=state.get("status"),
-                is_position_lost=state.get("isPositionLost"),
-                is_overload_protection_up=state.get("isOverloadProtectionUp"),
-                is_overload_protection_down=state.get("isOverloadProtectionDown"),
-                is_anti_collision=state.get("isAntiCollision"),
-            )
-            return desk_state
+            url = cls._desk_url(desk_id, "state")
+            response = cls._request("GET", url, desk_id=desk_id)
+            return _parse_state(response.json())
 
         except DeskServiceError as exc:
             logger.warning("Failed to get state for desk %s: %s", desk_id, exc)
@@ -355,14 +586,9 @@ class DeskService:
 
         try:
             # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/{desk_id}
-            url = cls._build_url("desks", desk_id, "usage")
-            response = cls._request("GET", url)
-            usage = response.json()
-            desk_usage = DeskUsage(
-                activations_counter=usage.get("activationsCounter"),
-                sit_stand_counter=usage.get("sitStandCounter"),
-            )
-            return desk_usage
+            url = cls._desk_url(desk_id, "usage")
+            response = cls._request("GET", url, desk_id=desk_id)
+            return _parse_usage(response.json())
 
         except DeskServiceError as exc:
             logger.warning("Failed to get usage for desk %s: %s", desk_id, exc)
@@ -385,25 +611,9 @@ class DeskService:
 
         try:
             # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/{desk_id}
-            url = cls._build_url("desks", desk_id)
-            response = cls._request("GET", url)
-            payload = response.json()
-
-            last_errors: List[DeskError] = []
-            errors_payload = (
-                payload.get("lastErrors") if isinstance(payload, dict) else None
-            )  # noqa: E501
-            if errors_payload:
-                for error in errors_payload:
-                    time_s = error.get("time_s")
-                    raw_code = error.get("error_code")
-                    try:
-                        error_code = int(raw_code) if raw_code is not None else 0
-                    except (TypeError, ValueError):
-                        error_code = 0
-                    last_errors.append(DeskError(time_s=time_s, error_code=error_code))
-
-            return last_errors
+            url = cls._desk_url(desk_id)
+            response = cls._request("GET", url, desk_id=desk_id)
+            return _parse_errors(response.json())
 
         except DeskServiceError as exc:
             logger.warning("Failed to get errors for desk %s: %s", desk_id, exc)
@@ -441,34 +651,14 @@ class DeskService:
 
         # WiFi2BLE API endpoint: PUT /api/v2/{api_key}/desks/{desk_id}/state
         payload = {"position_mm": position_mm}
-        url = cls._build_url("desks", desk_id, "state")
+        url = cls._desk_url(desk_id, "state")
 
-        response = cls._request("PUT", url, json=payload)
+        response = cls._request("PUT", url, desk_id=desk_id, json=payload)
         logger.info("✓ Successfully commanded desk %s to %smm", desk_id, position_mm)
 
         try:
             # Parse response from WiFi2BLE API
-            state_data = response.json()
-            
-            # Return proper DeskState object
-            return DeskState(
-                position_mm=state_data.get("position_mm", position_mm),
-                speed_mms=state_data.get("speed_mms", 0),
-                status=state_data.get("status", "moving"),
-                is_position_lost=state_data.get("isPositionLost", False),
-                is_overload_protection_up=state_data.get("isOverloadProtectionUp", False),
-                is_overload_protection_down=state_data.get("isOverloadProtectionDown", False),
-                is_anti_collision=state_data.get("isAntiCollision", False),
-            )
+            return _parse_set_position_response(response.json(), position_mm)
         except (ValueError, KeyError) as e:
             logger.warning("Failed to parse desk state response: %s", e)
-            # Return minimal valid DeskState
-            return DeskState(
-                position_mm=position_mm,
-                speed_mms=0,
-                status="unknown",
-                is_position_lost=False,
-                is_overload_protection_up=False,
-                is_overload_protection_down=False,
-                is_anti_collision=False,
-            )
\ No newline at end of file
+            return _fallback_set_position_state(position_mm)
@@ -0,0 +1,451 @@
+"""Time-series store of desk usage counters and errors."""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from array import array
+from contextlib import suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.models.dto.desk import Desk
+from src.services.async_desk_service import AsyncDeskService, async_desk_service
+from src.services.desk_service import DeskServiceError, _load_positive_number
+
+logger = logging.getLogger(__name__)
+
+DESK_TELEMETRY_ENABLED = os.getenv("DESK_TELEMETRY_ENABLED", "true").lower() == "true"
+SNAPSHOT_FILE = "telemetry.json"
+
+ErrorKey = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class TelemetrySettings:
+    """Sampling, retention and persistence of the telemetry store.
+
+    Attributes:
+        interval: Seconds between samples of every desk.
+        concurrency: Max desks sampled at once.
+        retention: Seconds of history kept.
+        max_points: Most points a range query returns; coarser steps are used
+            beyond it.
+        directory: Where the store is persisted.
+        save_interval: Seconds between saves of the store to disk.
+
+    """
+
+    interval: float = _load_positive_number("DESK_TELEMETRY_INTERVAL_SECONDS", 60)
+    concurrency: int = int(_load_positive_number("DESK_TELEMETRY_CONCURRENCY", 16))
+    retention: float = _load_positive_number(
+        "DESK_TELEMETRY_RETENTION_SECONDS", 30 * 24 * 3600
+    )
+    max_points: int = int(_load_positive_number("DESK_TELEMETRY_MAX_POINTS", 1000))
+    directory: str = os.getenv("DESK_TELEMETRY_DIR", "data/telemetry")
+    save_interval: float = _load_positive_number(
+        "DESK_TELEMETRY_SAVE_INTERVAL_SECONDS", 300
+    )
+
+
+@dataclass
+class _CounterSeries:
+    """Delta-encoded usage counters of one desk.
+
+    Only samples where a counter changed are stored, as deltas from the
+    previous change: ``times`` holds seconds since the previous point and
+    ``activations``/``sit_stand`` the counter increments. ``base_*`` is the
+    absolute value before the first stored delta. A desk whose counters
+    never change costs no memory per sample.
+    """
+
+    base_time: int
+    base_activations: int
+    base_sit_stand: int
+    times: array = field(default_factory=lambda: array("q"))
+    activations: array = field(default_factory=lambda: array("q"))
+    sit_stand: array = field(default_factory=lambda: array("q"))
+    last_time: int = 0
+    last_activations: int = 0
+    last_sit_stand: int = 0
+    last_sampled: int = 0
+
+    def __post_init__(self) -> None:
+        self.last_time = self.base_time
+        self.last_activations = self.base_activations
+        self.last_sit_stand = self.base_sit_stand
+        self.last_sampled = self.base_time
+
+    def append(self, t: int, activations: int, sit_stand: int) -> None:
+        """Record a sample, storing it only if a counter changed."""
+        self.last_sampled = max(self.last_sampled, t)
+        if (activations, sit_stand) == (self.last_activations, self.last_sit_stand):
+            return
+        self.times.append(t - self.last_time)
+        self.activations.append(activations - self.last_activations)
+        self.sit_stand.append(sit_stand - self.last_sit_stand)
+        self.last_time = t
+        self.last_activations = activations
+        self.last_sit_stand = sit_stand
+
+    def deltas(self) -> Iterator[Tuple[int, int, int]]:
+        """Yield the stored ``(dt, d_activations, d_sit_stand)`` deltas."""
+        return zip(self.times, self.activations, self.sit_stand, strict=True)
+
+    def points(self) -> Iterator[Tuple[int, int, int]]:
+        """Yield absolute ``(t, activations, sit_stand)`` points, oldest first."""
+        t, a, s = self.base_time, self.base_activations, self.base_sit_stand
+        yield t, a, s
+        for dt, da, ds in self.deltas():
+            t, a, s = t + dt, a + da, s + ds
+            yield t, a, s
+
+    def trim(self, before: int) -> None:
+        """Fold points older than ``before`` into the base."""
+        folded = 0
+        t, a, s = self.base_time, self.base_activations, self.base_sit_stand
+        for dt, da, ds in self.deltas():
+            if t + dt > before:
+                break
+            t, a, s = t + dt, a + da, s + ds
+            folded += 1
+        if folded:
+            del self.times[:folded], self.activations[:folded], self.sit_stand[:folded]
+            self.base_time, self.base_activations, self.base_sit_stand = t, a, s
+
+    def to_dict(self) -> Dict[str, object]:
+        """Return the series in its compact persisted form."""
+        return {
+            "base": [self.base_time, self.base_activations, self.base_sit_stand],
+            "t": self.times.tolist(),
+            "a": self.activations.tolist(),
+            "s": self.sit_stand.tolist(),
+            "sampled": self.last_sampled,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "_CounterSeries":
+        """Rebuild a series persisted by ``to_dict``."""
+        base_time, base_activations, base_sit_stand = data["base"]  # type: ignore[misc]
+        series = cls(int(base_time), int(base_activations), int(base_sit_stand))
+        t, a, s = series.base_time, series.base_activations, series.base_sit_stand
+        deltas = zip(data["t"], data["a"], data["s"], strict=True)  # type: ignore[call-overload]
+        for dt, da, ds in deltas:
+            t, a, s = t + dt, a + da, s + ds
+            series.append(t, a, s)
+        series.last_sampled = int(data.get("sampled", t))  # type: ignore[arg-type]
+        return series
+
+
+def _bucket_count(start: int, end: int, step: int) -> int:
+    return max(1, math.ceil((end - start) / step))
+
+
+class DeskTelemetryStore:
+    """Compact history of every desk's usage counters and errors.
+
+    Counters are delta-encoded per desk (see ``_CounterSeries``). Errors are
+    kept once per ``(time_s, error_code)`` with the time they were first
+    seen, since the box repeats its ``lastErrors`` list on every read.
+    Range queries are downsampled into at most ``max_points`` buckets.
+    """
+
+    def __init__(self, settings: Optional[TelemetrySettings] = None) -> None:
+        """Initialize an empty store."""
+        self.settings = settings or TelemetrySettings()
+        self._counters: Dict[str, _CounterSeries] = {}
+        self._errors: Dict[str, Dict[ErrorKey, int]] = {}
+        self._samples = 0
+
+    # -------- writes --------
+
+    def record(self, desk_id: str, t: int, desk: Desk) -> None:
+        """Record one sample of ``desk`` taken at epoch second ``t``."""
+        usage = desk.usage
+        series = self._counters.get(desk_id)
+        if series is None:
+            self._counters[desk_id] = _CounterSeries(
+                t, usage.activations_counter, usage.sit_stand_counter
+            )
+        else:
+            series.append(t, usage.activations_counter, usage.sit_stand_counter)
+
+        seen = self._errors.setdefault(desk_id, {})
+        for error in desk.last_errors:
+            seen.setdefault((error.time_s, error.error_code), t)
+        self._samples += 1
+
+    def trim(self, now: int) -> None:
+        """Drop history older than the retention period."""
+        cutoff = now - int(self.settings.retention)
+        for series in self._counters.values():
+            series.trim(cutoff)
+        for desk_id, seen in list(self._errors.items()):
+            self._errors[desk_id] = {
+                key: seen_at for key, seen_at in seen.items() if seen_at >= cutoff
+            }
+
+    # -------- reads --------
+
+    def desk_ids(self) -> List[str]:
+        """Return the desks with recorded telemetry."""
+        return sorted(set(self._counters) | set(self._errors))
+
+    def resolve_step(self, start: int, end: int, step: Optional[int]) -> int:
+        """Return ``step``, widened so the range fits in ``max_points`` buckets."""
+        minimum = math.ceil((end - start) / self.settings.max_points)
+        return max(1, step or int(self.settings.interval), minimum)
+
+    def usage(
+        self, desk_id: str, start: int, end: int, step: Optional[int] = None
+    ) -> Optional[List[Dict[str, int]]]:
+        """Return downsampled usage counters of ``desk_id`` in ``[start, end)``.
+
+        Each bucket holds the counter values at its end and how much they
+        grew during it. Buckets before the first sample are left out.
+
+        Returns:
+            The buckets, or None if the desk has no telemetry.
+
+        """
+        series = self._counters.get(desk_id)
+        if series is None:
+            return None
+        step = self.resolve_step(start, end, step)
+
+        buckets: List[Dict[str, int]] = []
+        points = series.points()
+        current: Optional[Tuple[int, int, int]] = None
+        upcoming = next(points, None)
+        # Counter values in effect at ``start``
+        while upcoming is not None and upcoming[0] < start:
+            current, upcoming = upcoming, next(points, None)
+        for index in range(_bucket_count(start, end, step)):
+            bucket_start = start + index * step
+            bucket_end = min(end, bucket_start + step)
+            opening = current
+            while upcoming is not None and upcoming[0] < bucket_end:
+                current, upcoming = upcoming, next(points, None)
+            if current is None or bucket_start > series.last_sampled:
+                continue
+            opening = opening or current
+            buckets.append(
+                {
+                    "t": bucket_start,
+                    "activations": current[1],
+                    "sit_stand": current[2],
+                    "activations_delta": current[1] - opening[1],
+                    "sit_stand_delta": current[2] - opening[2],
+                }
+            )
+        return buckets
+
+    def errors(
+        self, desk_id: str, start: int, end: int, step: Optional[int] = None
+    ) -> Optional[List[Dict[str, object]]]:
+        """Return errors of ``desk_id`` first seen in ``[start, end)``.
+
+        Without ``step`` every distinct error is listed; with ``step`` they
+        are counted per bucket and error code.
+
+        Returns:
+            The errors or buckets, or None if the desk has no telemetry.
+
+        """
+        seen = self._errors.get(desk_id)
+        if seen is None:
+            return None
+        in_range = sorted(
+            (seen_at, time_s, code)
+            for (time_s, code), seen_at in seen.items()
+            if start <= seen_at < end
+        )
+        if step is None:
+            return [
+                {"seen_at": seen_at, "time_s": time_s, "error_code": code}
+                for seen_at, time_s, code in in_range
+            ]
+
+        step = self.resolve_step(start, end, step)
+        buckets: Dict[int, Dict[str, object]] = {}
+        for seen_at, _, code in in_range:
+            bucket_start = start + (seen_at - start) // step * step
+            bucket = buckets.setdefault(
+                bucket_start, {"t": bucket_start, "count": 0, "codes": {}}
+            )
+            bucket["count"] += 1  # type: ignore[operator]
+            codes: Dict[str, int] = bucket["codes"]  # type: ignore[assignment]
+            codes[str(code)] = codes.get(str(code), 0) + 1
+        return list(buckets.values())
+
+    def stats(self) -> Dict[str, object]:
+        """Return store size counters."""
+        return {
+            "desks": len(self.desk_ids()),
+            "samples": self._samples,
+            "stored_points": sum(
+                len(series.times) + 1 for series in self._counters.values()
+            ),
+            "errors": sum(len(seen) for seen in self._errors.values()),
+        }
+
+    # -------- persistence --------
+
+    def save(self, path: Path) -> None:
+        """Atomically write the store to ``path``."""
+        data = {
+            "counters": {
+                desk_id: series.to_dict() for desk_id, series in self._counters.items()
+            },
+            "errors": {
+                desk_id: [
+                    [time_s, code, seen_at] for (time_s, code), seen_at in seen.items()
+                ]
+                for desk_id, seen in self._errors.items()
+            },
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")))
+        os.replace(tmp, path)
+
+    def load(self, path: Path) -> None:
+        """Load a store written by ``save``; a missing or corrupt file is ignored."""
+        try:
+            data = json.loads(path.read_text())
+            counters = {
+                desk_id: _CounterSeries.from_dict(series)
+                for desk_id, series in data.get("counters", {}).items()
+            }
+            errors = {
+                desk_id: {
+                    (int(time_s), int(code)): int(seen_at)
+                    for time_s, code, seen_at in rows
+                }
+                for desk_id, rows in data.get("errors", {}).items()
+            }
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("Ignoring unreadable telemetry file %s: %s", path, exc)
+            return
+        self._counters, self._errors = counters, errors
+        logger.info("Loaded telemetry of %d desks from %s", len(counters), path)
+
+
+class DeskTelemetrySampler:
+    """Background task sampling every desk into a ``DeskTelemetryStore``.
+
+    Desks are read through the desk service, so samples are served from the
+    registry mirror or the document cache when those are fresh. The store is
+    loaded on ``start`` and saved every ``save_interval`` seconds and on
+    ``stop``.
+    """
+
+    def __init__(
+        self,
+        service: AsyncDeskService,
+        store: DeskTelemetryStore,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the sampler; call ``start`` to begin sampling."""
+        self._service = service
+        self.store = store
+        self.settings = store.settings
+        self._clock = clock
+        self._path = Path(self.settings.directory) / SNAPSHOT_FILE
+        self._task: Optional[asyncio.Task[None]] = None
+        self._rounds = 0
+        self._failed_reads = 0
+        self._failed_rounds = 0
+        self._last_saved = 0.0
+
+    # -------- lifecycle --------
+
+    def start(self) -> None:
+        """Load the persisted store and start sampling on the running loop."""
+        if self.is_running:
+            return
+        self.store.load(self._path)
+        self._last_saved = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(
+            "Desk telemetry sampler started (interval=%ss)", self.settings.interval
+        )
+
+    async def stop(self) -> None:
+        """Stop sampling and save the store."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        await asyncio.to_thread(self.store.save, self._path)
+        logger.info("Desk telemetry sampler stopped")
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the sampling task is active."""
+        return self._task is not None and not self._task.done()
+
+    def stats(self) -> Dict[str, object]:
+        """Return sampler and store counters."""
+        return {
+            "running": self.is_running,
+            "interval": self.settings.interval,
+            "rounds": self._rounds,
+            "failed_reads": self._failed_reads,
+            "failed_rounds": self._failed_rounds,
+            **self.store.stats(),
+        }
+
+    # -------- sampling --------
+
+    async def sample_once(self) -> None:
+        """Sample every desk once."""
+        t = int(self._clock())
+        desk_ids = await self._service.get_all_desks()
+        semaphore = asyncio.Semaphore(max(1, self.settings.concurrency))
+
+        async def _sample(desk_id: str) -> None:
+            async with semaphore:
+                desk = await self._service.get_desk_by_id(desk_id)
+            if desk is None:
+                self._failed_reads += 1
+                return
+            self.store.record(desk_id, t, desk)
+
+        await asyncio.gather(*(_sample(desk_id) for desk_id in desk_ids))
+        self.store.trim(t)
+        self._rounds += 1
+
+    async def _run(self) -> None:
+        """Sample forever at the configured interval."""
+        while True:
+            started = time.monotonic()
+            try:
+                await self.sample_once()
+            except DeskServiceError as exc:
+                self._failed_rounds += 1
+                logger.warning("Desk telemetry sampling failed: %s", exc)
+            except Exception as exc:
+                # Keep sampling; a dead task would look like a stopped sampler
+                self._failed_rounds += 1
+                logger.exception("Unexpected error in desk telemetry sampling: %s", exc)
+            if started - self._last_saved >= self.settings.save_interval:
+                try:
+                    await asyncio.to_thread(self.store.save, self._path)
+                except OSError as exc:
+                    logger.warning("Failed to save desk telemetry: %s", exc)
+                self._last_saved = started
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, self.settings.interval - elapsed))
+
+
+# Global singleton instance
+desk_telemetry = DeskTelemetrySampler(async_desk_service, DeskTelemetryStore())
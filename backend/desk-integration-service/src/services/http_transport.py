@@ -0,0 +1,152 @@
+"""Pooled keep-alive HTTP transport for calls to the WiFi2BLE box."""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+@dataclass(frozen=True)
+class HttpTransportSettings:
+    """Connection pool and timeout settings for the desk HTTP transport.
+
+    Attributes:
+        pool_maxsize: Keep-alive connections kept per host.
+        pool_connections: Number of per-host pools cached by the transport.
+        pool_block: Wait for a free connection instead of opening an extra,
+            non-pooled one when a host's pool is exhausted.
+        connect_timeout: Seconds allowed to establish a TCP connection.
+        read_timeout: Seconds allowed between bytes of the response.
+
+    """
+
+    pool_maxsize: int = 32
+    pool_connections: int = 4
+    pool_block: bool = False
+    connect_timeout: float = 3.0
+    read_timeout: float = 10.0
+
+
+class DeskHttpTransport:
+    """Thread-safe ``requests`` session with a keep-alive connection pool.
+
+    One instance is shared by every desk call so TCP connections to the box
+    are reused instead of being opened per request.
+    """
+
+    def __init__(self, settings: Optional[HttpTransportSettings] = None) -> None:
+        self.settings = settings or HttpTransportSettings()
+        self._adapter = HTTPAdapter(
+            pool_connections=self.settings.pool_connections,
+            pool_maxsize=self.settings.pool_maxsize,
+            pool_block=self.settings.pool_block,
+        )
+        self._session = requests.Session()
+        self._session.mount("http://", self._adapter)
+        self._session.mount("https://", self._adapter)
+
+        self._lock = threading.Lock()
+        self._requests_total = 0
+        self._errors_total = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """Default ``(connect, read)`` timeout tuple."""
+        return (self.settings.connect_timeout, self.settings.read_timeout)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: Optional[Timeout] = None,
+        **kwargs: object,
+    ) -> requests.Response:
+        """Send a request over the pooled session.
+
+        Args:
+            method: HTTP method.
+            url: Absolute URL.
+            timeout: Optional override; defaults to ``(connect, read)``.
+            **kwargs: Passed through to ``requests.Session.request``.
+
+        Returns:
+            The ``requests`` response.
+
+        """
+        with self._lock:
+            self._requests_total += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+        try:
+            return self._session.request(
+                method=method,
+                url=url,
+                timeout=timeout or self.timeout,
+                **kwargs,  # type: ignore[arg-type]
+            )
+        except requests.RequestException:
+            with self._lock:
+                self._errors_total += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self) -> Dict[str, object]:
+        """Return request counters and per-host connection pool usage.
+
+        ``connections_opened`` vs ``requests`` per host shows how well
+        keep-alive connections are being reused.
+        """
+        with self._lock:
+            stats: Dict[str, object] = {
+                "requests_total": self._requests_total,
+                "errors_total": self._errors_total,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+            }
+
+        stats.update(
+            pool_maxsize=self.settings.pool_maxsize,
+            pool_block=self.settings.pool_block,
+            connect_timeout=self.settings.connect_timeout,
+            read_timeout=self.settings.read_timeout,
+            hosts=self._host_pool_stats(),
+        )
+        return stats
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._session.close()
+        logger.info("Desk HTTP transport closed")
+
+    def _host_pool_stats(self) -> List[Dict[str, object]]:
+        """Collect usage figures from each urllib3 host pool."""
+        pools = self._adapter.poolmanager.pools
+        hosts: List[Dict[str, object]] = []
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            queued = list(pool.pool.queue) if pool.pool is not None else []
+            idle = sum(1 for conn in queued if conn is not None)
+            hosts.append(
+                {
+                    "host": "%s://%s:%s" % (key.key_scheme, key.key_host, key.key_port),
+                    "connections_opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "idle_connections": idle,
+                }
+            )
+        return hosts
@@ -0,0 +1,70 @@
+"""Run the fake WiFi2BLE box: ``python -m src.simulator --help``."""
+
+import argparse
+import logging
+from typing import Optional, Sequence
+
+import uvicorn
+
+from src.simulator.fake_box import (
+    FakeBox,
+    FakeBoxSettings,
+    LatencyDistribution,
+    create_app,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--api-key", default="", help="accept only this key")
+    parser.add_argument("--desks", type=int, default=10)
+    parser.add_argument(
+        "--latency",
+        type=LatencyDistribution.parse,
+        default=LatencyDistribution(),
+        help="fixed:MS, uniform:LOW:HIGH, normal:MEAN:STDEV, "
+        "lognormal:MEDIAN:SIGMA or exponential:MEAN (milliseconds)",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--offline-desks", type=int, default=0)
+    parser.add_argument("--hang-seconds", type=float, default=30.0)
+    parser.add_argument("--speed-mms", type=float, default=32.0)
+    parser.add_argument("--error-rate-per-move", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Start the fake box on ``--host``/``--port``."""
+    args = parse_args(argv)
+    settings = FakeBoxSettings(
+        api_key=args.api_key,
+        desks=args.desks,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        offline_desks=args.offline_desks,
+        hang_seconds=args.hang_seconds,
+        speed_mms=args.speed_mms,
+        error_rate_per_move=args.error_rate_per_move,
+        seed=args.seed,
+    )
+    logging.basicConfig(level=logging.INFO)
+    logger.info(
+        "Fake box with %d desks on http://%s:%d/api/v2/%s",
+        settings.desks,
+        args.host,
+        args.port,
+        settings.api_key or "<any key>",
+    )
+    uvicorn.run(create_app(FakeBox(settings)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
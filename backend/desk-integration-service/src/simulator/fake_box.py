@@ -0,0 +1,337 @@
+"""Self-contained stand-in for the WiFi2BLE box simulator.
+
+Serves the ``/api/v2/{api_key}/desks/...`` endpoints used by ``DeskService``
+for any number of virtual desks that move at a constant speed, with
+configurable response latency and fault injection. Runs offline and, given
+a seed, reproducibly::
+
+    python -m src.simulator --desks 2000 --latency lognormal:20:0.5 --error-rate 0.01
+"""
+
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Annotated, Callable, Dict, List, Optional
+
+from fastapi import APIRouter, Body, FastAPI, HTTPException, status
+
+SECTIONS = ("config", "state", "usage", "lastErrors")
+# Desks standing above this height count as standing for sitStandCounter
+STANDING_THRESHOLD_MM = 900
+# Error codes the simulated desks report
+ERROR_CODES = (93, 94, 95)
+MAX_REPORTED_ERRORS = 5
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """Per-request latency in milliseconds.
+
+    ``kind`` is one of ``fixed:<ms>``, ``uniform:<low>:<high>``,
+    ``normal:<mean>:<stdev>``, ``lognormal:<median>:<sigma>`` or
+    ``exponential:<mean>``; samples are never negative.
+    """
+
+    kind: str = "fixed"
+    params: tuple = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Parse a ``kind:param[:param]`` spec.
+
+        Raises:
+            ValueError: If the kind is unknown or has the wrong parameters.
+
+        """
+        kind, *raw = spec.split(":")
+        arity = {
+            "fixed": 1,
+            "uniform": 2,
+            "normal": 2,
+            "lognormal": 2,
+            "exponential": 1,
+        }
+        if kind not in arity or len(raw) != arity[kind]:
+            raise ValueError("Invalid latency distribution: '%s'" % spec)
+        return cls(kind, tuple(float(value) for value in raw))
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency in seconds."""
+        if self.kind == "uniform":
+            millis = rng.uniform(*self.params)
+        elif self.kind == "normal":
+            millis = rng.gauss(*self.params)
+        elif self.kind == "lognormal":
+            median, sigma = self.params
+            millis = rng.lognormvariate(math.log(max(median, 1e-9)), sigma)
+        elif self.kind == "exponential":
+            millis = rng.expovariate(1 / self.params[0]) if self.params[0] else 0.0
+        else:
+            millis = self.params[0]
+        return max(0.0, millis) / 1000
+
+
+@dataclass(frozen=True)
+class FakeBoxSettings:
+    """Shape and misbehaviour of the fake box.
+
+    Attributes:
+        api_key: Key accepted in the URL; any key is accepted if empty.
+        desks: Number of virtual desks.
+        latency: Latency added to every request.
+        error_rate: Fraction of requests answered with HTTP 500.
+        timeout_rate: Fraction of requests that hang for ``hang_seconds``.
+        offline_desks: Number of desks (the last ones) that never answer.
+        hang_seconds: How long hanging requests take before answering.
+        speed_mms: Speed at which desks move.
+        error_rate_per_move: Chance that a move logs a desk error.
+        seed: Seed of the random generator; None for a random run.
+
+    """
+
+    api_key: str = ""
+    desks: int = 10
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    offline_desks: int = 0
+    hang_seconds: float = 30.0
+    speed_mms: float = 32.0
+    min_position_mm: int = 680
+    max_position_mm: int = 1320
+    error_rate_per_move: float = 0.0
+    seed: Optional[int] = 0
+
+
+def desk_id_for(index: int) -> str:
+    """Return the MAC-style identifier of the ``index``-th virtual desk."""
+    octets = [0xCD, 0xFB] + [(index >> shift) & 0xFF for shift in (24, 16, 8, 0)]
+    return ":".join("%02x" % octet for octet in octets)
+
+
+@dataclass
+class VirtualDesk:
+    """A desk moving at constant speed towards its target."""
+
+    desk_id: str
+    name: str
+    position_mm: float
+    speed_mms: float
+    target_mm: float = 0.0
+    moved_at: float = 0.0
+    activations: int = 0
+    sit_stand: int = 0
+    errors: List[Dict[str, int]] = field(default_factory=list)
+    created_at: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Start at rest."""
+        self.target_mm = self.position_mm
+
+    def position(self, now: float) -> float:
+        """Return the position at ``now``."""
+        distance = self.target_mm - self.position_mm
+        travelled = min(abs(distance), self.speed_mms * (now - self.moved_at))
+        return self.position_mm + math.copysign(travelled, distance)
+
+    def move(self, target_mm: int, now: float) -> None:
+        """Start moving towards ``target_mm`` from the current position."""
+        current = self.position(now)
+        if (current > STANDING_THRESHOLD_MM) != (target_mm > STANDING_THRESHOLD_MM):
+            self.sit_stand += 1
+        self.position_mm, self.target_mm, self.moved_at = current, target_mm, now
+        self.activations += 1
+
+    def state(self, now: float) -> Dict[str, object]:
+        """Return the ``state`` section."""
+        position = self.position(now)
+        moving = position != self.target_mm
+        return {
+            "position_mm": round(position),
+            "speed_mms": round(math.copysign(self.speed_mms, self.target_mm - position))
+            if moving
+            else 0,
+            "status": "Normal",
+            "isPositionLost": False,
+            "isOverloadProtectionUp": False,
+            "isOverloadProtectionDown": False,
+            "isAntiCollision": False,
+        }
+
+    def document(self, now: float) -> Dict[str, object]:
+        """Return the full desk document."""
+        return {
+            "config": {"name": self.name, "manufacturer": "Linak"},
+            "state": self.state(now),
+            "usage": {
+                "activationsCounter": self.activations,
+                "sitStandCounter": self.sit_stand,
+            },
+            "lastErrors": list(self.errors),
+        }
+
+
+class FakeBox:
+    """Virtual desks plus the latency and faults applied to each request."""
+
+    def __init__(
+        self,
+        settings: Optional[FakeBoxSettings] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create ``settings.desks`` desks at random heights."""
+        self.settings = settings or FakeBoxSettings()
+        self._clock = clock
+        self._rng = random.Random(self.settings.seed)  # noqa: S311
+        now = clock()
+        self.desks: Dict[str, VirtualDesk] = {}
+        for index in range(self.settings.desks):
+            desk_id = desk_id_for(index)
+            self.desks[desk_id] = VirtualDesk(
+                desk_id=desk_id,
+                name="Desk %d" % (index + 1),
+                position_mm=self._rng.randint(
+                    self.settings.min_position_mm, self.settings.max_position_mm
+                ),
+                speed_mms=self.settings.speed_mms,
+                created_at=now,
+            )
+        online = max(0, self.settings.desks - self.settings.offline_desks)
+        self.offline = set(list(self.desks)[online:])
+        self.requests = 0
+        self.injected_errors = 0
+        self.injected_timeouts = 0
+
+    async def disturb(self, desk_id: Optional[str] = None) -> None:
+        """Apply latency and faults to one request.
+
+        Raises:
+            HTTPException: With status 500 for an injected error.
+
+        """
+        self.requests += 1
+        settings = self.settings
+        if desk_id in self.offline or self._rng.random() < settings.timeout_rate:
+            self.injected_timeouts += 1
+            await asyncio.sleep(settings.hang_seconds)
+        else:
+            await asyncio.sleep(settings.latency.sample(self._rng))
+        if self._rng.random() < settings.error_rate:
+            self.injected_errors += 1
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Injected failure",
+            )
+
+    def desk(self, desk_id: str) -> VirtualDesk:
+        """Return a desk.
+
+        Raises:
+            HTTPException: With status 404 for an unknown desk.
+
+        """
+        desk = self.desks.get(desk_id)
+        if desk is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Desk not found"
+            )
+        return desk
+
+    def move(self, desk_id: str, position_mm: int) -> Dict[str, object]:
+        """Command a desk and return the box's echo of the target."""
+        desk = self.desk(desk_id)
+        now = self._clock()
+        target = min(
+            max(position_mm, self.settings.min_position_mm),
+            self.settings.max_position_mm,
+        )
+        desk.move(target, now)
+        if self._rng.random() < self.settings.error_rate_per_move:
+            desk.errors.append(
+                {
+                    "time_s": int(now - desk.created_at),
+                    "error_code": self._rng.choice(ERROR_CODES),
+                }
+            )
+            # The box only reports the last few errors
+            del desk.errors[:-MAX_REPORTED_ERRORS]
+        return {"position_mm": target}
+
+    def now(self) -> float:
+        """Return the box's current time."""
+        return self._clock()
+
+    def stats(self) -> Dict[str, object]:
+        """Return request and fault counters."""
+        now = self._clock()
+        return {
+            "desks": len(self.desks),
+            "offline_desks": len(self.offline),
+            "moving_desks": sum(
+                1
+                for desk in self.desks.values()
+                if desk.position(now) != desk.target_mm
+            ),
+            "requests": self.requests,
+            "injected_errors": self.injected_errors,
+            "injected_timeouts": self.injected_timeouts,
+        }
+
+
+def create_app(box: FakeBox) -> FastAPI:
+    """Build the ASGI app serving ``box`` under ``/api/v2/{api_key}``."""
+    router = APIRouter(prefix="/api/v2/{api_key}")
+
+    def _authorize(api_key: str) -> None:
+        if box.settings.api_key and api_key != box.settings.api_key:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key"
+            )
+
+    @router.get("/desks")
+    @router.get("/desks/")
+    async def list_desks(api_key: str) -> List[str]:
+        _authorize(api_key)
+        await box.disturb()
+        return list(box.desks)
+
+    @router.get("/desks/{desk_id}")
+    async def get_desk(api_key: str, desk_id: str) -> Dict[str, object]:
+        _authorize(api_key)
+        await box.disturb(desk_id)
+        return box.desk(desk_id).document(box.now())
+
+    @router.get("/desks/{desk_id}/{section}")
+    async def get_section(api_key: str, desk_id: str, section: str) -> object:
+        _authorize(api_key)
+        if section not in SECTIONS:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Unknown section"
+            )
+        await box.disturb(desk_id)
+        return box.desk(desk_id).document(box.now())[section]
+
+    @router.put("/desks/{desk_id}/state")
+    async def put_state(
+        api_key: str, desk_id: str, payload: Annotated[Dict[str, int], Body()]
+    ) -> Dict[str, object]:
+        _authorize(api_key)
+        if not isinstance(payload.get("position_mm"), int):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="position_mm is required",
+            )
+        await box.disturb(desk_id)
+        return box.move(desk_id, payload["position_mm"])
+
+    app = FastAPI(title="Fake WiFi2BLE Box")
+    app.include_router(router)
+
+    @app.get("/stats")
+    async def get_stats() -> Dict[str, object]:
+        return box.stats()
+
+    return app
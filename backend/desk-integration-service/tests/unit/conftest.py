@@ -0,0 +1,22 @@
+"""Pytest configuration for unit tests."""
+
+import os
+import tempfile
+
+# Prevent desk_service from failing to load its config during import
+os.environ.setdefault("DESK_API_BASE_URL", "http://localhost:8000/api/v2")
+os.environ.setdefault("DESK_API_KEY", "test-api-key-for-unit-tests")
+os.environ.setdefault("DESK_API_TIMEOUT_SECONDS", "10")
+# Keep the event spool of the shared publisher out of the source tree
+os.environ.setdefault("EVENT_SPOOL_DIR", tempfile.mkdtemp(prefix="event-spool-"))
+os.environ.setdefault("DESK_TELEMETRY_DIR", tempfile.mkdtemp(prefix="telemetry-"))
+
+import pytest  # noqa: E402
+
+from src.services.desk_service import desk_guard  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reset_desk_guard() -> None:
+    """Start every test with closed circuit breakers."""
+    desk_guard.reset()
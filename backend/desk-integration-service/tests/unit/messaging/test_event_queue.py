@@ -0,0 +1,146 @@
+import math
+import threading
+import time
+from unittest.mock import MagicMock
+
+from src.messaging.event_queue import EventPublishQueue, EventQueueSettings
+
+EVENT_COUNT = 5
+QUEUE_SIZE = 3
+BATCH_SIZE = 2
+
+
+def _settings(**overrides: float) -> EventQueueSettings:
+    values = {
+        "maxsize": 100,
+        "batch_size": BATCH_SIZE,
+        "retry_initial": 0.01,
+        "retry_max": 0.05,
+        "shutdown_timeout": 2,
+    }
+    values.update(overrides)
+    return EventQueueSettings(**values)  # type: ignore[arg-type]
+
+
+def _publisher() -> MagicMock:
+    """Return a publisher whose batches go through ``publish`` one by one."""
+    publisher = MagicMock()
+
+    def publish_batch(events: list[tuple[str, dict, bool]]) -> int:
+        published = 0
+        for routing_key, payload, persistent in events:
+            if not publisher.publish(
+                routing_key=routing_key, payload=payload, persistent=persistent
+            ):
+                break
+            published += 1
+        return published
+
+    publisher.publish_batch.side_effect = publish_batch
+    return publisher
+
+
+def _wait_for(condition: object, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not condition():  # type: ignore[operator]
+        time.sleep(0.005)
+
+
+def test_publish_never_blocks_and_counts_drops() -> None:
+    """Test that a full queue drops new events instead of blocking."""
+    events = EventPublishQueue(MagicMock(), _settings(maxsize=QUEUE_SIZE))
+
+    accepted = [
+        events.publish("desk.height.changed", {"n": i}) for i in range(EVENT_COUNT)
+    ]
+
+    assert accepted == [True] * QUEUE_SIZE + [False] * (EVENT_COUNT - QUEUE_SIZE)
+    stats = events.stats()
+    assert stats["depth"] == QUEUE_SIZE
+    assert stats["dropped"] == EVENT_COUNT - QUEUE_SIZE
+
+
+def test_events_are_published_in_order() -> None:
+    """Test that the background thread publishes queued events in order."""
+    publisher = _publisher()
+    publisher.publish.return_value = True
+    events = EventPublishQueue(publisher, _settings())
+
+    for i in range(EVENT_COUNT):
+        events.publish("desk.height.changed", {"n": i})
+    events.start()
+    _wait_for(lambda: events.stats()["published"] == EVENT_COUNT)
+    events.stop()
+
+    sent = [call.kwargs["payload"]["n"] for call in publisher.publish.call_args_list]
+    assert sent == list(range(EVENT_COUNT))
+    assert publisher.publish_batch.call_count == math.ceil(EVENT_COUNT / BATCH_SIZE)
+    assert events.stats()["depth"] == 0
+    publisher.connect.assert_called_once()
+    publisher.disconnect.assert_called_once()
+
+
+def test_idle_publisher_services_heartbeats() -> None:
+    """Test that the idle publisher thread lets pika answer heartbeats."""
+    publisher = _publisher()
+    events = EventPublishQueue(publisher, _settings())
+
+    events.start()
+    _wait_for(lambda: publisher.process_data_events.call_count >= 2)  # noqa: PLR2004
+    events.stop()
+
+    assert publisher.process_data_events.call_count >= 2  # noqa: PLR2004
+    publisher.publish_batch.assert_not_called()
+
+
+def test_failed_publishes_are_retried_in_order() -> None:
+    """Test that unconfirmed events are retried with backoff, keeping order."""
+    publisher = _publisher()
+    outcomes = iter([True, False, False])
+    publisher.publish.side_effect = lambda **_: next(outcomes, True)
+    events = EventPublishQueue(publisher, _settings())
+
+    for i in range(EVENT_COUNT):
+        events.publish("desk.height.changed", {"n": i})
+    events.start()
+    _wait_for(lambda: events.stats()["published"] == EVENT_COUNT)
+    events.stop()
+
+    confirmed = [
+        call.kwargs["payload"]["n"] for call in publisher.publish.call_args_list
+    ]
+    assert confirmed == [0, 1, 1, 1, 2, 3, 4]
+    assert events.stats()["failed_attempts"] == 2  # noqa: PLR2004
+
+
+def test_publish_does_not_wait_for_slow_broker() -> None:
+    """Test that producers return immediately while the broker is stalled."""
+    release = threading.Event()
+    publisher = _publisher()
+    publisher.publish.side_effect = lambda **_: release.wait(2)
+    events = EventPublishQueue(publisher, _settings())
+    events.start()
+
+    started = time.monotonic()
+    for i in range(EVENT_COUNT):
+        assert events.publish("desk.height.changed", {"n": i})
+    elapsed = time.monotonic() - started
+
+    release.set()
+    events.stop()
+    assert elapsed < 0.1  # noqa: PLR2004
+
+
+def test_stop_counts_unpublishable_events_as_dropped() -> None:
+    """Test that events still unconfirmed at shutdown are counted as dropped."""
+    publisher = _publisher()
+    publisher.publish.return_value = False
+    events = EventPublishQueue(publisher, _settings())
+
+    for i in range(EVENT_COUNT):
+        events.publish("desk.height.changed", {"n": i})
+    events.start()
+    events.stop()
+
+    assert events.stats()["dropped"] == EVENT_COUNT
+    assert events.stats()["published"] == 0
@@ -0,0 +1,125 @@
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.messaging.event_queue import EventPublishQueue, EventQueueSettings
+from src.messaging.event_spool import EventSpool, SpooledEvent, SpoolSettings
+
+EVENT_COUNT = 10
+BATCH_SIZE = 4
+
+
+def _spool(directory: Path, **overrides: float) -> EventSpool:
+    values = {
+        "directory": str(directory),
+        "segment_bytes": 1 << 20,
+        "max_bytes": 1 << 24,
+        "fsync_every": 2,
+        "fsync_interval": 60,
+    }
+    values.update(overrides)
+    return EventSpool(SpoolSettings(**values))  # type: ignore[arg-type]
+
+
+def _events(count: int) -> list[SpooledEvent]:
+    return [SpooledEvent("desk.height.changed", '{"n": %d}' % i) for i in range(count)]
+
+
+def test_replays_in_order_across_segments(tmp_path: Path) -> None:
+    """Test that events come back in order even when spread over segments."""
+    spool = _spool(tmp_path, segment_bytes=200)
+    spool.append(_events(EVENT_COUNT))
+    assert spool.stats()["segments"] > 1
+
+    replayed: list[str] = []
+    while len(spool):
+        batch = spool.peek(BATCH_SIZE)
+        replayed.extend(event.body for event in batch)
+        spool.ack(len(batch))
+
+    assert replayed == [event.body for event in _events(EVENT_COUNT)]
+    stats = spool.stats()
+    assert stats["replayed_total"] == EVENT_COUNT
+    assert stats["segments"] == 0
+    assert stats["bytes"] == 0
+
+
+def test_partial_ack_survives_restart(tmp_path: Path) -> None:
+    """Test that replay resumes after the last acked event on reopen."""
+    spool = _spool(tmp_path)
+    spool.append(_events(EVENT_COUNT))
+    spool.ack(3)
+    spool.close()
+
+    reopened = _spool(tmp_path)
+    reopened.open()
+
+    assert len(reopened) == EVENT_COUNT - 3
+    assert reopened.peek(1)[0].body == '{"n": 3}'
+
+
+def test_torn_tail_is_discarded_on_open(tmp_path: Path) -> None:
+    """Test that a half-written record left by a crash is cut off."""
+    spool = _spool(tmp_path)
+    spool.append(_events(2))
+    spool.close()
+    (segment,) = tmp_path.glob("segment-*.log")
+    with open(segment, "ab") as handle:
+        handle.write(b'{"routing_key": "desk.hei')
+
+    reopened = _spool(tmp_path)
+    reopened.open()
+
+    assert len(reopened) == 2  # noqa: PLR2004
+    reopened.append(_events(1))
+    assert [event.body for event in reopened.peek(5)][-1] == '{"n": 0}'
+
+
+def test_size_cap_rejects_new_events(tmp_path: Path) -> None:
+    """Test that appends beyond max_bytes are dropped and counted."""
+    spool = _spool(tmp_path, max_bytes=150)
+
+    accepted = spool.append(_events(EVENT_COUNT))
+
+    assert 0 < accepted < EVENT_COUNT
+    assert spool.stats()["dropped_total"] == EVENT_COUNT - accepted
+    assert spool.stats()["bytes"] <= 150  # noqa: PLR2004
+
+
+def test_queue_spools_while_broker_is_down_and_replays(tmp_path: Path) -> None:
+    """Test that the publisher spools failures and replays them in order."""
+    broker_up = False
+    sent: list[int] = []
+
+    def publish_batch(batch: list[tuple[str, dict, bool]]) -> int:
+        if not broker_up:
+            return 0
+        sent.extend(payload["n"] for _, payload, _ in batch)
+        return len(batch)
+
+    publisher = MagicMock()
+    publisher.publish_batch.side_effect = publish_batch
+    spool = _spool(tmp_path)
+    events = EventPublishQueue(
+        publisher,
+        EventQueueSettings(
+            maxsize=100, batch_size=BATCH_SIZE, retry_initial=0.01, retry_max=0.02
+        ),
+        spool=spool,
+    )
+    events.start()
+    for i in range(EVENT_COUNT):
+        events.publish("desk.height.changed", {"n": i})
+
+    deadline = time.monotonic() + 2
+    while len(spool) < EVENT_COUNT and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(spool) == EVENT_COUNT
+
+    broker_up = True
+    while len(spool) and time.monotonic() < deadline + 2:
+        time.sleep(0.01)
+    events.stop()
+
+    assert sent == list(range(EVENT_COUNT))
+    assert events.stats()["spool"]["replayed_total"] == EVENT_COUNT
@@ -0,0 +1,58 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from src.messaging.rabbitmq_publisher import RabbitMQPublisher, RabbitMQSettings
+
+PUBLISHERS = 16
+BATCH_SIZE = 3
+
+
+def test_concurrent_publishes_never_share_the_channel() -> None:
+    """Test that publishes from many threads are serialised on the channel."""
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def basic_publish(**_: object) -> None:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.005)
+        with lock:
+            in_flight -= 1
+
+    publisher = RabbitMQPublisher()
+    publisher._connected = True
+    publisher._connection = MagicMock(is_closed=False)
+    publisher._channel = MagicMock()
+    publisher._channel.basic_publish.side_effect = basic_publish
+
+    with ThreadPoolExecutor(max_workers=PUBLISHERS) as executor:
+        published = list(
+            executor.map(
+                lambda i: publisher.publish("desk.state.changed", {"n": i}),
+                range(PUBLISHERS),
+            )
+        )
+
+    assert all(published)
+    assert peak == 1
+
+
+def test_batch_is_confirmed_once_as_a_whole() -> None:
+    """Test that a batch is committed once and fails as a whole."""
+    publisher = RabbitMQPublisher(RabbitMQSettings(publisher_confirms=True))
+    publisher._connected = True
+    publisher._connection = MagicMock(is_closed=False)
+    publisher._channel = MagicMock()
+    batch = [("desk.state.changed", {"n": i}, True) for i in range(BATCH_SIZE)]
+
+    assert publisher.publish_batch(batch) == BATCH_SIZE
+    assert publisher._channel.basic_publish.call_count == BATCH_SIZE
+    publisher._channel.tx_commit.assert_called_once()
+
+    publisher._channel.tx_commit.side_effect = ConnectionError("broker gone")
+    assert publisher.publish_batch(batch) == 0
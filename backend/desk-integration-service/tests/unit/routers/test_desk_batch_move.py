@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from src.models.dto.desk_state import DeskState
+from src.routers import desk_integration
+from src.services.desk_command_queue import DeskCommandQueue, TokenBucket
+from src.services.desk_service import DeskServiceError
+
+MISSING_DESK = "cd:fb:00:00:00:00"
+TARGET_MM = 1100
+
+
+async def _dispatch(desk_id: str, position_mm: int) -> DeskState:
+    if desk_id == MISSING_DESK:
+        raise DeskServiceError("Desk not found", status_code=404)
+    return DeskState(
+        position_mm=position_mm,
+        speed_mms=0,
+        status="Normal",
+        is_position_lost=False,
+        is_overload_protection_up=False,
+        is_overload_protection_down=False,
+        is_anti_collision=False,
+    )
+
+
+@pytest.fixture
+def events(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace the command queue and capture published events."""
+    monkeypatch.setattr(
+        desk_integration,
+        "desk_command_queue",
+        DeskCommandQueue(_dispatch, TokenBucket(1000, 1000)),
+    )
+    mock = MagicMock()
+    monkeypatch.setattr(desk_integration, "event_queue", mock)
+    return mock
+
+
+@pytest.fixture
+def client() -> TestClient:
+    """Serve only the desk router."""
+    app = FastAPI()
+    app.include_router(desk_integration.router)
+    return TestClient(app)
+
+
+def test_batch_move_reports_each_desk_and_publishes_one_event(
+    client: TestClient, events: MagicMock
+) -> None:
+    """Test that a batch returns per-desk results and publishes once."""
+    targets = [
+        {"desk_id": f"cd:fb:00:00:00:0{i}", "position_mm": TARGET_MM}
+        for i in range(1, 4)
+    ] + [{"desk_id": MISSING_DESK, "position_mm": TARGET_MM}]
+
+    response = client.put("/api/v1/desks/state", json=targets)
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["moved"] == 3  # noqa: PLR2004
+    assert body["failed"] == 1
+    assert [r["desk_id"] for r in body["results"]] == [t["desk_id"] for t in targets]
+    assert body["results"][0]["state"]["position_mm"] == TARGET_MM
+    assert body["results"][-1]["status"] == "failed"
+    assert body["results"][-1]["error"] == "Desk not found"
+
+    events.publish.assert_called_once()
+    payload = events.publish.call_args.kwargs["payload"]
+    assert events.publish.call_args.kwargs["routing_key"] == (
+        "desk.height.changed.batch"
+    )
+    assert len(payload["desks"]) == 3  # noqa: PLR2004
+    assert payload["failed_desk_ids"] == [MISSING_DESK]
+
+
+def test_batch_move_rejects_empty_list(client: TestClient, events: MagicMock) -> None:
+    """Test that an empty batch is rejected."""
+    response = client.put("/api/v1/desks/state", json=[])
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    events.publish.assert_not_called()
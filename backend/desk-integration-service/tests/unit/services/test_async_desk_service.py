@@ -0,0 +1,162 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.services.async_desk_service import AsyncDeskService
+from src.services.desk_service import DeskServiceError
+
+DESK_ID = "cd:fb:1a:53:fb:e6"
+DESK_DOCUMENT = {
+    "config": {"name": "Desk 1", "manufacturer": "Linak"},
+    "state": {
+        "position_mm": 680,
+        "speed_mms": 0,
+        "status": "Normal",
+        "isPositionLost": False,
+        "isOverloadProtectionUp": False,
+        "isOverloadProtectionDown": False,
+        "isAntiCollision": False,
+    },
+    "usage": {"activationsCounter": 25, "sitStandCounter": 3},
+    "lastErrors": [{"time_s": 120, "error_code": "93"}],
+}
+CONCURRENT_CALLS = 20
+
+
+def _service(handler: httpx.MockTransport) -> AsyncDeskService:
+    return AsyncDeskService(transport=handler)
+
+
+@pytest.mark.asyncio
+async def test_get_all_desks() -> None:
+    """Test that the desk list is parsed from the box response."""
+    service = _service(
+        httpx.MockTransport(lambda _: httpx.Response(200, json=[DESK_ID]))
+    )
+
+    assert await service.get_all_desks() == [DESK_ID]
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_desk_by_id_parses_document() -> None:
+    """Test that a full desk document is mapped onto the Desk DTO."""
+    service = _service(
+        httpx.MockTransport(lambda _: httpx.Response(200, json=DESK_DOCUMENT))
+    )
+
+    desk = await service.get_desk_by_id(DESK_ID)
+
+    assert desk is not None
+    assert desk.config.name == "Desk 1"
+    assert desk.state.position_mm == DESK_DOCUMENT["state"]["position_mm"]
+    assert desk.usage.sit_stand_counter == DESK_DOCUMENT["usage"]["sitStandCounter"]
+    assert desk.last_errors[0].error_code == 93  # noqa: PLR2004
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_desk_state_returns_none_on_http_error() -> None:
+    """Test that lookup failures map to None like the sync service."""
+    service = _service(httpx.MockTransport(lambda _: httpx.Response(404, text="nope")))
+
+    assert await service.get_desk_state(DESK_ID) is None
+    assert service.stats()["requests_total"] == 1
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_set_desk_position_sends_put() -> None:
+    """Test that a position change is sent as a PUT with a JSON body."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"position_mm": 1100})
+
+    service = _service(httpx.MockTransport(handler))
+
+    state = await service.set_desk_position(DESK_ID, 1100)
+
+    assert state.position_mm == 1100  # noqa: PLR2004
+    assert seen[0].method == "PUT"
+    assert seen[0].url.path.endswith(f"/desks/{DESK_ID}/state")
+    assert seen[0].content == b'{"position_mm":1100}'
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_sub_resources_share_one_cached_fetch() -> None:
+    """Test that desk, state, config, usage and errors reads hit the box once."""
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=DESK_DOCUMENT)
+
+    service = _service(httpx.MockTransport(handler))
+
+    await service.get_desk_by_id(DESK_ID)
+    await service.get_desk_state(DESK_ID)
+    await service.get_desk_config(DESK_ID)
+    await service.get_desk_usage(DESK_ID)
+    await service.get_desk_errors(DESK_ID)
+
+    assert len(calls) == 1
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_set_desk_position_invalidates_cache() -> None:
+    """Test that a successful PUT forces the next read back to the box."""
+    gets: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            gets.append(request)
+            return httpx.Response(200, json=DESK_DOCUMENT)
+        return httpx.Response(200, json={"position_mm": 1100})
+
+    service = _service(httpx.MockTransport(handler))
+
+    await service.get_desk_state(DESK_ID)
+    await service.set_desk_position(DESK_ID, 1100)
+    await service.get_desk_state(DESK_ID)
+
+    assert len(gets) == 2  # noqa: PLR2004
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_connection_error_raises_desk_service_error() -> None:
+    """Test that transport failures surface as DeskServiceError."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    service = _service(httpx.MockTransport(handler))
+
+    with pytest.raises(DeskServiceError, match="Failed to connect"):
+        await service.get_all_desks()
+    assert service.stats()["errors_total"] == 1
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_event_loop() -> None:
+    """Test that many desk calls can be in flight at once."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=DESK_DOCUMENT)
+
+    service = _service(httpx.MockTransport(handler))
+
+    states = await asyncio.gather(
+        *(service.get_desk_state(f"desk-{i}") for i in range(CONCURRENT_CALLS))
+    )
+
+    assert all(state is not None for state in states)
+    assert service.stats()["peak_in_flight"] == CONCURRENT_CALLS
+    await service.aclose()
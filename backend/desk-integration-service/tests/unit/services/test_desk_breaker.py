@@ -0,0 +1,113 @@
+import httpx
+import pytest
+
+from src.services.async_desk_service import AsyncDeskService
+from src.services.desk_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerSettings,
+    CircuitBreaker,
+    DeskCallGuard,
+)
+from src.services.desk_service import DeskServiceError, desk_guard
+
+DESK_ID = "cd:fb:1a:53:fb:e6"
+RESET_SECONDS = 30.0
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_half_open_allows_one_probe() -> None:
+    """Test that an open breaker lets exactly one probe through after the reset."""
+    clock = _Clock()
+    breaker = CircuitBreaker("desk", 2, RESET_SECONDS, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.now = RESET_SECONDS
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_read_timeout_follows_p99() -> None:
+    """Test that the read timeout adapts once enough latencies are seen."""
+    guard = DeskCallGuard(
+        BreakerSettings(min_samples=10, p99_multiplier=4, min_timeout=0.5)
+    )
+    for _ in range(10):
+        guard.record_success("box", None, 0.25)
+
+    assert guard.read_timeout("box", 10.0) == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_dead_desk_fails_fast() -> None:
+    """Test that an open desk breaker stops calls from reaching the box."""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        raise httpx.ReadTimeout("desk not answering", request=request)
+
+    service = AsyncDeskService(transport=httpx.MockTransport(handler))
+    threshold = desk_guard.settings.desk_failures
+    for _ in range(threshold):
+        with pytest.raises(DeskServiceError):
+            await service.set_desk_position(DESK_ID, 800)
+
+    with pytest.raises(DeskServiceError) as exc_info:
+        await service.set_desk_position(DESK_ID, 800)
+
+    assert exc_info.value.status_code == 503  # noqa: PLR2004
+    assert calls == threshold
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_desk_timeouts_only_open_the_desk() -> None:
+    """Test that desks timing out on a live box don't open the box breaker."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if DESK_ID in request.url.path:
+            raise httpx.ReadTimeout("desk not answering", request=request)
+        return httpx.Response(200, json=[DESK_ID])
+
+    service = AsyncDeskService(transport=httpx.MockTransport(handler))
+    for i in range(desk_guard.settings.box_failures + 1):
+        assert await service.get_desk_state("%s-%d" % (DESK_ID, i)) is None
+
+    assert await service.get_all_desks() == [DESK_ID]
+    boxes = desk_guard.stats()["boxes"].values()  # type: ignore[attr-defined]
+    assert [box["state"] for box in boxes] == [CLOSED]
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_server_errors_open_the_box() -> None:
+    """Test that HTTP 5xx answers count against the box as well."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, text="box overloaded")
+
+    service = AsyncDeskService(transport=httpx.MockTransport(handler))
+    for i in range(desk_guard.settings.box_failures):
+        assert await service.get_desk_state("%s-%d" % (DESK_ID, i)) is None
+
+    boxes = desk_guard.stats()["boxes"].values()  # type: ignore[attr-defined]
+    assert [box["state"] for box in boxes] == [OPEN]
+    await service.aclose()
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from src.services.desk_cache import DeskDocumentCache
+from src.services.desk_service import DeskServiceError
+
+TTLS = {"config": 300.0, "state": 1.0, "usage": 30.0, "lastErrors": 10.0}
+CONCURRENT_READERS = 10
+
+
+class _FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _CountingFetcher:
+    """Fetch function that counts calls and can be held open."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, desk_id: str) -> dict[str, object]:
+        self.calls += 1
+        await self.release.wait()
+        return {"state": {"position_mm": self.calls}, "config": {"name": desk_id}}
+
+
+@pytest.mark.asyncio
+async def test_section_ttls_are_applied_independently() -> None:
+    """Test that a stale state section refetches while config is still fresh."""
+    clock = _FakeClock()
+    fetch = _CountingFetcher()
+    cache = DeskDocumentCache(fetch, TTLS, clock=clock)
+
+    await cache.get("desk1", "state")
+    clock.now = 5.0
+    await cache.get("desk1", "config")
+    assert fetch.calls == 1
+
+    document = await cache.get("desk1", "state")
+    assert fetch.calls == 2  # noqa: PLR2004
+    assert document["state"]["position_mm"] == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_full_document_uses_shortest_ttl() -> None:
+    """Test that reading the whole document respects the tightest section TTL."""
+    clock = _FakeClock()
+    fetch = _CountingFetcher()
+    cache = DeskDocumentCache(fetch, TTLS, clock=clock)
+
+    await cache.get("desk1")
+    clock.now = 2.0
+    await cache.get("desk1")
+
+    assert fetch.calls == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch() -> None:
+    """Test single-flight deduplication of concurrent misses."""
+    fetch = _CountingFetcher()
+    fetch.release.clear()
+    cache = DeskDocumentCache(fetch, TTLS)
+
+    readers = [
+        asyncio.create_task(cache.get("desk1", "state"))
+        for _ in range(CONCURRENT_READERS)
+    ]
+    await asyncio.sleep(0)
+    fetch.release.set()
+    documents = await asyncio.gather(*readers)
+
+    assert fetch.calls == 1
+    assert all(doc is documents[0] for doc in documents)
+    assert cache.stats()["shared_fetches"] == CONCURRENT_READERS - 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_fetch_does_not_repopulate() -> None:
+    """Test that a write during an in-flight read isn't masked by stale data."""
+    fetch = _CountingFetcher()
+    fetch.release.clear()
+    cache = DeskDocumentCache(fetch, TTLS)
+
+    reader = asyncio.create_task(cache.get("desk1", "state"))
+    await asyncio.sleep(0)
+    cache.invalidate("desk1")
+    fetch.release.set()
+    await reader
+
+    await cache.get("desk1", "state")
+    assert fetch.calls == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached() -> None:
+    """Test that a failed fetch propagates and the next read retries."""
+    attempts = 0
+
+    async def flaky_fetch(desk_id: str) -> dict[str, object]:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise DeskServiceError("box unreachable")
+        return {"state": {}}
+
+    cache = DeskDocumentCache(flaky_fetch, TTLS)
+
+    with pytest.raises(DeskServiceError):
+        await cache.get("desk1", "state")
+    assert await cache.get("desk1", "state") == {"state": {}}
+    assert attempts == 2  # noqa: PLR2004
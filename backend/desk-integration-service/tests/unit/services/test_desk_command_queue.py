@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+
+from src.models.dto.desk_state import DeskState
+from src.services.desk_command_queue import DeskCommandQueue, TokenBucket
+from src.services.desk_service import DeskServiceError
+
+DESK_ID = "cd:fb:1a:53:fb:e6"
+FIRST_MM = 700
+SECOND_MM = 900
+LATEST_MM = 1100
+DESK_COUNT = 5
+
+
+def _state(position_mm: int) -> DeskState:
+    return DeskState(
+        position_mm=position_mm,
+        speed_mms=0,
+        status="Normal",
+        is_position_lost=False,
+        is_overload_protection_up=False,
+        is_overload_protection_down=False,
+        is_anti_collision=False,
+    )
+
+
+class _FakeBox:
+    """Records dispatched moves and lets tests hold them in flight."""
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, int]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def dispatch(self, desk_id: str, position_mm: int) -> DeskState:
+        self.sent.append((desk_id, position_mm))
+        await self.release.wait()
+        return _state(position_mm)
+
+
+def _queue(box: _FakeBox, rate: float = 1000, burst: float = 1000) -> DeskCommandQueue:
+    return DeskCommandQueue(box.dispatch, TokenBucket(rate, burst))
+
+
+@pytest.mark.asyncio
+async def test_pending_targets_are_coalesced() -> None:
+    """Test that targets queued behind an in-flight move collapse to the newest."""
+    box = _FakeBox()
+    box.release.clear()
+    commands = _queue(box)
+
+    first = commands.submit(DESK_ID, FIRST_MM)
+    await asyncio.sleep(0)
+    second = commands.submit(DESK_ID, SECOND_MM)
+    latest = commands.submit(DESK_ID, LATEST_MM)
+    box.release.set()
+
+    results = await asyncio.gather(first, second, latest)
+
+    assert box.sent == [(DESK_ID, FIRST_MM), (DESK_ID, LATEST_MM)]
+    assert [r.position_mm for r in results] == [FIRST_MM, LATEST_MM, LATEST_MM]
+    assert [r.superseded for r in results] == [False, True, False]
+    assert results[1].requested_mm == SECOND_MM
+    assert commands.stats()["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_commands_for_one_desk_run_in_order() -> None:
+    """Test that one desk never has two moves in flight."""
+    in_flight = 0
+    peak = 0
+
+    async def dispatch(desk_id: str, position_mm: int) -> DeskState:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _state(position_mm)
+
+    commands = DeskCommandQueue(dispatch, TokenBucket(1000, 1000))
+    for position_mm in (FIRST_MM, SECOND_MM):
+        await commands.submit(DESK_ID, position_mm)
+        commands.submit(DESK_ID, position_mm)
+    await asyncio.sleep(0.05)
+
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_different_desks_are_not_coalesced() -> None:
+    """Test that each desk gets its own dispatch."""
+    box = _FakeBox()
+    commands = _queue(box)
+
+    await asyncio.gather(
+        *(commands.submit(f"desk-{i}", FIRST_MM) for i in range(DESK_COUNT))
+    )
+
+    assert len(box.sent) == DESK_COUNT
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_dispatch_rate() -> None:
+    """Test that dispatches beyond the burst wait for tokens."""
+    box = _FakeBox()
+    commands = _queue(box, rate=100, burst=1)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.gather(
+        *(commands.submit(f"desk-{i}", FIRST_MM) for i in range(DESK_COUNT))
+    )
+    elapsed = loop.time() - started
+
+    # One token up front, then one every 10ms
+    assert elapsed >= 0.035  # noqa: PLR2004
+    assert commands.stats()["throttled_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_dispatch_failure_reaches_every_waiter() -> None:
+    """Test that a failed PUT is raised to all coalesced callers."""
+
+    async def dispatch(desk_id: str, position_mm: int) -> DeskState:
+        await asyncio.sleep(0)
+        raise DeskServiceError("Desk API returned 503")
+
+    commands = DeskCommandQueue(dispatch, TokenBucket(1000, 1000))
+    first = commands.submit(DESK_ID, FIRST_MM)
+    second = commands.submit(DESK_ID, SECOND_MM)
+
+    for future in (first, second):
+        with pytest.raises(DeskServiceError):
+            await future
+    assert commands.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_submit_batch_bounds_concurrency_and_keeps_failures() -> None:
+    """Test that a batch keeps at most ``concurrency`` moves in flight."""
+    in_flight = 0
+    peak = 0
+
+    async def dispatch(desk_id: str, position_mm: int) -> DeskState:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if desk_id == "desk-0":
+            raise DeskServiceError("Desk not found", status_code=404)
+        return _state(position_mm)
+
+    commands = DeskCommandQueue(dispatch, TokenBucket(1000, 1000))
+    outcomes = await commands.submit_batch(
+        [(f"desk-{i}", FIRST_MM + i) for i in range(DESK_COUNT)], concurrency=2
+    )
+
+    assert peak == 2  # noqa: PLR2004
+    assert isinstance(outcomes[0], DeskServiceError)
+    assert [o.position_mm for o in outcomes[1:]] == [
+        FIRST_MM + i for i in range(1, DESK_COUNT)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_aclose_cancels_in_flight_and_pending_waiters() -> None:
+    """Test that closing the queue resolves every outstanding future."""
+    box = _FakeBox()
+    box.release.clear()
+    commands = _queue(box)
+
+    in_flight = commands.submit(DESK_ID, FIRST_MM)
+    await asyncio.sleep(0)
+    pending = commands.submit(DESK_ID, SECOND_MM)
+    await commands.aclose()
+
+    assert box.sent == [(DESK_ID, FIRST_MM)]
+    assert in_flight.cancelled()
+    assert pending.cancelled()
+    assert commands.stats()["active_desks"] == 0
@@ -0,0 +1,142 @@
+import httpx
+import pytest
+
+from src.services.async_desk_service import AsyncDeskService
+from src.services.desk_motion import DeskMotionModel, MotionSettings
+
+DESK_ID = "cd:fb:1a:53:fb:e6"
+START_MM = 700
+TARGET_MM = 1100
+SPEED_MMS = 40
+SETTINGS = MotionSettings(
+    nominal_speed=30,
+    base_error=2,
+    speed_tolerance=0.1,
+    max_error=15,
+    arrival_tolerance=5,
+    start_grace=1.5,
+    idle_anchor_age=30,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _state(position_mm: int, speed_mms: int = 0) -> dict[str, object]:
+    return {
+        "position_mm": position_mm,
+        "speed_mms": speed_mms,
+        "status": "Normal",
+        "isPositionLost": False,
+        "isOverloadProtectionUp": False,
+        "isOverloadProtectionDown": False,
+        "isAntiCollision": False,
+    }
+
+
+def _model() -> tuple[DeskMotionModel, _Clock]:
+    clock = _Clock()
+    return DeskMotionModel(SETTINGS, clock=clock), clock
+
+
+def test_idle_desk_is_not_estimated() -> None:
+    """Test that desks without a pending move are read from the box."""
+    model, _ = _model()
+    model.observe(DESK_ID, _state(START_MM))
+
+    assert model.estimate(DESK_ID) is None
+
+
+def test_estimates_position_during_move() -> None:
+    """Test extrapolation from the last observation towards the target."""
+    model, clock = _model()
+    model.observe(DESK_ID, _state(START_MM))
+    model.begin(DESK_ID, TARGET_MM)
+    model.observe(DESK_ID, _state(START_MM, SPEED_MMS))
+
+    clock.now += 2
+    estimate = model.estimate(DESK_ID)
+
+    assert estimate is not None
+    assert estimate.state.position_mm == START_MM + 2 * SPEED_MMS
+    assert estimate.state.speed_mms == SPEED_MMS
+    assert estimate.accuracy_mm == pytest.approx(2 + SPEED_MMS * 0.1 * 2)
+    assert estimate.target_mm == TARGET_MM
+
+
+def test_checkpoint_due_when_error_bound_too_large() -> None:
+    """Test that no estimate is served once the error bound exceeds max_error."""
+    model, clock = _model()
+    model.observe(DESK_ID, _state(START_MM, SPEED_MMS))
+    model.begin(DESK_ID, TARGET_MM)
+
+    clock.now += 4  # 2 + 40 * 0.1 * 4 = 18mm > 15mm
+    assert model.estimate(DESK_ID) is None
+
+    # A real observation re-anchors the model
+    model.observe(DESK_ID, _state(START_MM + 160, SPEED_MMS))
+    assert model.estimate(DESK_ID) is not None
+    assert model.stats()["checkpoints"] == 1
+
+
+def test_predicted_arrival_requires_real_check() -> None:
+    """Test that the desk is verified once it should have reached its target."""
+    model, clock = _model()
+    model.observe(DESK_ID, _state(TARGET_MM - 20, SPEED_MMS))
+    model.begin(DESK_ID, TARGET_MM)
+
+    clock.now += 1
+    assert model.estimate(DESK_ID) is None
+
+    model.observe(DESK_ID, _state(TARGET_MM))
+    assert model.stats()["moving_desks"] == 0
+
+
+def test_stopped_desk_ends_tracking_after_grace() -> None:
+    """Test that a desk standing still short of its target is not extrapolated."""
+    model, clock = _model()
+    model.observe(DESK_ID, _state(START_MM))
+    model.begin(DESK_ID, TARGET_MM)
+
+    model.observe(DESK_ID, _state(START_MM))
+    assert model.stats()["moving_desks"] == 1
+
+    clock.now += 2
+    model.observe(DESK_ID, _state(START_MM + 50))
+    assert model.estimate(DESK_ID) is None
+    assert model.stats()["moving_desks"] == 0
+
+
+def test_unknown_start_position_is_not_estimated() -> None:
+    """Test that a move of a never-observed desk waits for a real reading."""
+    model, _ = _model()
+    model.begin(DESK_ID, TARGET_MM)
+
+    assert model.estimate(DESK_ID) is None
+
+
+@pytest.mark.asyncio
+async def test_service_feeds_motion_model_from_box_reads() -> None:
+    """Test that fetched documents and PUTs drive the service's motion model."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "PUT":
+            return httpx.Response(200, json={"position_mm": TARGET_MM})
+        return httpx.Response(200, json={"state": _state(START_MM)})
+
+    model, clock = _model()
+    service = AsyncDeskService(transport=httpx.MockTransport(handler), motion=model)
+
+    await service.get_desk_state(DESK_ID)
+    await service.set_desk_position(DESK_ID, TARGET_MM)
+    clock.now += 1
+    estimate = service.estimate_desk_state(DESK_ID)
+
+    assert estimate is not None
+    assert estimate.state.position_mm == START_MM + SETTINGS.nominal_speed
+    await service.aclose()
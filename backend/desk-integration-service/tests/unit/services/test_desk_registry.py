@@ -0,0 +1,152 @@
+import asyncio
+import copy
+from unittest.mock import Mock
+
+import pytest
+
+from src.services.desk_registry import DeskRegistry, diff_sections
+from src.services.desk_service import DeskServiceError
+
+DESK_ID = "cd:fb:1a:53:fb:e6"
+DESK_DOCUMENT = {
+    "config": {"name": "Desk 1", "manufacturer": "Linak"},
+    "state": {"position_mm": 680, "speed_mms": 0, "status": "Normal"},
+    "usage": {"activationsCounter": 25, "sitStandCounter": 3},
+    "lastErrors": [],
+}
+DESK_COUNT = 12
+CONCURRENCY = 3
+
+
+class _FakeDeskService:
+    """Serves mutable desk documents and records fetch concurrency."""
+
+    def __init__(self, desk_ids: list[str], delay: float = 0.0) -> None:
+        self.documents = {desk_id: copy.deepcopy(DESK_DOCUMENT) for desk_id in desk_ids}
+        self.delay = delay
+        self.fetches = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def get_all_desks(self) -> list[str]:
+        return list(self.documents)
+
+    async def fetch_desk_document(self, desk_id: str) -> dict:
+        self.fetches += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return copy.deepcopy(self.documents[desk_id])
+        finally:
+            self.in_flight -= 1
+
+
+def _registry(service: _FakeDeskService, **kwargs: object) -> DeskRegistry:
+    publisher = Mock()
+    publisher.publish.return_value = True
+    return DeskRegistry(service, publisher, interval=1, **kwargs)  # type: ignore[arg-type]
+
+
+def test_diff_sections_reports_changed_fields_only() -> None:
+    """Test that only differing fields appear in the diff."""
+    current = copy.deepcopy(DESK_DOCUMENT)
+    current["state"]["position_mm"] = 1100
+
+    assert diff_sections(DESK_DOCUMENT, current) == {
+        "state": {"position_mm": {"old": 680, "new": 1100}}
+    }
+
+
+@pytest.mark.asyncio
+async def test_first_snapshot_does_not_publish() -> None:
+    """Test that the initial poll only seeds the mirror."""
+    registry = _registry(_FakeDeskService([DESK_ID]))
+
+    await registry.poll_once()
+
+    assert registry.get(DESK_ID) is not None
+    registry._publisher.publish.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_publishes_only_when_desk_changes() -> None:
+    """Test that unchanged polls are silent and changes publish one event."""
+    service = _FakeDeskService([DESK_ID])
+    registry = _registry(service)
+
+    await registry.poll_once()
+    await registry.poll_once()
+    registry._publisher.publish.assert_not_called()
+
+    service.documents[DESK_ID]["state"]["position_mm"] = 1100
+    await registry.poll_once()
+
+    registry._publisher.publish.assert_called_once()
+    kwargs = registry._publisher.publish.call_args.kwargs
+    assert kwargs["routing_key"] == "desk.state.changed"
+    assert kwargs["payload"]["desk_id"] == DESK_ID
+    assert kwargs["payload"]["changes"] == {
+        "state": {"position_mm": {"old": 680, "new": 1100}}
+    }
+    assert registry.stats()["events_published"] == 1
+
+
+@pytest.mark.asyncio
+async def test_poll_respects_concurrency_limit() -> None:
+    """Test that at most ``concurrency`` desk fetches run at once."""
+    service = _FakeDeskService([f"desk-{i}" for i in range(DESK_COUNT)], delay=0.01)
+    registry = _registry(service, concurrency=CONCURRENCY)
+
+    await registry.poll_once()
+
+    assert service.fetches == DESK_COUNT
+    assert service.peak_in_flight == CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_failed_desk_keeps_previous_snapshot() -> None:
+    """Test that one failing desk does not abort the poll."""
+    service = _FakeDeskService([DESK_ID, "other"])
+    registry = _registry(service)
+    await registry.poll_once()
+
+    async def failing(desk_id: str) -> dict:
+        raise DeskServiceError("boom")
+
+    service.fetch_desk_document = failing  # type: ignore[method-assign]
+    await registry.poll_once()
+
+    assert registry.get(DESK_ID) is not None
+    registry._publisher.publish.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_invalidated_and_stale_snapshots_are_not_served() -> None:
+    """Test that invalidation and max_staleness hide old snapshots."""
+    service = _FakeDeskService([DESK_ID])
+    registry = _registry(service)
+    await registry.poll_once()
+
+    registry.invalidate(DESK_ID)
+    assert registry.get(DESK_ID) is None
+
+    await registry.poll_once()
+    assert registry.get(DESK_ID) is not None
+
+    registry.max_staleness = 0
+    await asyncio.sleep(0.01)
+    assert registry.get(DESK_ID) is None
+
+
+@pytest.mark.asyncio
+async def test_removed_desks_are_dropped() -> None:
+    """Test that desks no longer listed by the box leave the mirror."""
+    service = _FakeDeskService([DESK_ID, "other"])
+    registry = _registry(service)
+    await registry.poll_once()
+
+    del service.documents["other"]
+    await registry.poll_once()
+
+    assert registry.desk_ids() == [DESK_ID]
@@ -0,0 +1,94 @@
+import httpx
+import pytest
+
+from src.services.async_desk_service import AsyncDeskService
+from src.services.desk_routing import DeskBox, DeskRoutingTable, parse_boxes
+from src.services.desk_service import DeskService, DeskServiceError
+
+BOX_A = DeskBox(name="a", base_url="http://box-a/api/v2", api_key="KEY_A")
+BOX_B = DeskBox(name="b", base_url="http://box-b/api/v2", api_key="KEY_B")
+DESKS = {"box-a": ["desk1", "desk2"], "box-b": ["desk3"]}
+
+
+@pytest.fixture
+def two_boxes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Route DeskService over BOX_A and BOX_B."""
+    monkeypatch.setattr(DeskService, "_routes", DeskRoutingTable([BOX_A, BOX_B]))
+
+
+def _service(down: tuple[str, ...] = ()) -> tuple[AsyncDeskService, list[str]]:
+    """Return a service whose boxes serve DESKS, and the list of URLs hit."""
+    urls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        urls.append(str(request.url))
+        if request.url.host in down:
+            raise httpx.ConnectError("box down", request=request)
+        if request.url.path.endswith("/desks/"):
+            return httpx.Response(200, json=DESKS[request.url.host])
+        return httpx.Response(200, json={"position_mm": 800})
+
+    return AsyncDeskService(transport=httpx.MockTransport(handler)), urls
+
+
+def test_parse_boxes() -> None:
+    """Test that named and unnamed box entries are parsed."""
+    boxes = parse_boxes("floor1=http://box1/api/v2/|K1, http://box2/api/v2|K2")
+
+    assert boxes == [
+        DeskBox("floor1", "http://box1/api/v2", "K1"),
+        DeskBox("box2", "http://box2/api/v2", "K2"),
+    ]
+    with pytest.raises(ValueError, match="Invalid desk box"):
+        parse_boxes("floor1=http://box1/api/v2")
+
+
+def test_routing_table_keeps_routes_of_unlisted_box() -> None:
+    """Test that a box that couldn't be listed keeps its desks."""
+    table = DeskRoutingTable([BOX_A, BOX_B])
+    table.merge([(BOX_A, ["desk1"]), (BOX_B, ["desk3", "desk1"])])
+
+    assert table.box_for("desk1") == BOX_A
+    assert table.merge([(BOX_A, ["desk2"]), (BOX_B, None)]) == ["desk2", "desk3"]
+    assert table.box_for("desk3") == BOX_B
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("two_boxes")
+async def test_get_all_desks_merges_boxes() -> None:
+    """Test that every box is listed and the lists are merged."""
+    service, _ = _service()
+
+    assert await service.get_all_desks() == ["desk1", "desk2", "desk3"]
+    assert DeskService._routes.box_for("desk3") == BOX_B
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("two_boxes")
+async def test_get_all_desks_skips_unreachable_box() -> None:
+    """Test that one unreachable box doesn't fail the listing."""
+    service, _ = _service(down=("box-b",))
+
+    assert await service.get_all_desks() == ["desk1", "desk2"]
+
+    service, _ = _service(down=("box-a", "box-b"))
+    with pytest.raises(DeskServiceError):
+        await service.get_all_desks()
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("two_boxes")
+async def test_desk_calls_are_routed_to_owning_box() -> None:
+    """Test that an unknown desk refreshes the routes once, then goes to its box."""
+    service, urls = _service()
+
+    await service.set_desk_position("desk3", 800)
+
+    assert urls[-1] == "http://box-b/api/v2/KEY_B/desks/desk3/state"
+    assert sum(url.endswith("/desks/") for url in urls) == len(DESKS)
+    with pytest.raises(DeskServiceError) as exc_info:
+        await service.set_desk_position("ghost", 800)
+    assert exc_info.value.status_code == 404  # noqa: PLR2004
+    await service.aclose()
@@ -0,0 +1,210 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.models.dto.desk import Desk
+from src.services.desk_telemetry import (
+    DeskTelemetrySampler,
+    DeskTelemetryStore,
+    TelemetrySettings,
+)
+
+DESK_ID = "cd:fb:1a:53:fb:e6"
+HOUR = 3600
+
+
+def _desk(activations: int, sit_stand: int, errors: list[tuple[int, int]] = ()) -> Desk:
+    return Desk.model_validate(
+        {
+            "config": {"name": "Desk 1", "manufacturer": "Linak"},
+            "state": {
+                "position_mm": 680,
+                "speed_mms": 0,
+                "status": "Normal",
+                "is_position_lost": False,
+                "is_overload_protection_up": False,
+                "is_overload_protection_down": False,
+                "is_anti_collision": False,
+            },
+            "usage": {
+                "activations_counter": activations,
+                "sit_stand_counter": sit_stand,
+            },
+            "last_errors": [
+                {"time_s": time_s, "error_code": code} for time_s, code in errors
+            ],
+        }
+    )
+
+
+def _store(**overrides: object) -> DeskTelemetryStore:
+    settings = {"interval": 60, "max_points": 1000, "retention": 7 * 24 * HOUR}
+    settings.update(overrides)
+    return DeskTelemetryStore(TelemetrySettings(**settings))  # type: ignore[arg-type]
+
+
+def test_unchanged_counters_are_not_stored() -> None:
+    """Test that only samples where a counter changed take space."""
+    store = _store()
+    for minute in range(60):
+        store.record(DESK_ID, minute * 60, _desk(10, 2))
+    store.record(DESK_ID, 3600, _desk(12, 3))
+
+    assert store.stats()["samples"] == 61  # noqa: PLR2004
+    assert store.stats()["stored_points"] == 2  # noqa: PLR2004
+
+
+def test_usage_is_downsampled_into_buckets() -> None:
+    """Test that each bucket has the closing values and the growth within it."""
+    store = _store()
+    for hour, activations in enumerate([10, 14, 14, 20]):
+        store.record(DESK_ID, hour * HOUR, _desk(activations, activations // 2))
+
+    points = store.usage(DESK_ID, 0, 4 * HOUR, step=2 * HOUR)
+
+    assert points == [
+        {
+            "t": 0,
+            "activations": 14,
+            "sit_stand": 7,
+            "activations_delta": 0,
+            "sit_stand_delta": 0,
+        },
+        {
+            "t": 2 * HOUR,
+            "activations": 20,
+            "sit_stand": 10,
+            "activations_delta": 6,
+            "sit_stand_delta": 3,
+        },
+    ]
+    assert store.usage("unknown", 0, HOUR) is None
+
+
+def test_usage_range_starting_mid_series() -> None:
+    """Test that growth is measured from the values in effect at the start."""
+    store = _store()
+    store.record(DESK_ID, 0, _desk(10, 0))
+    store.record(DESK_ID, HOUR, _desk(15, 0))
+    store.record(DESK_ID, 2 * HOUR, _desk(15, 0))
+
+    points = store.usage(DESK_ID, HOUR // 2, HOUR + HOUR // 2, step=HOUR)
+
+    assert points is not None
+    assert points[0]["activations"] == 15  # noqa: PLR2004
+    assert points[0]["activations_delta"] == 5  # noqa: PLR2004
+
+
+def test_step_is_widened_to_max_points() -> None:
+    """Test that a range never yields more than max_points buckets."""
+    store = _store(max_points=10)
+
+    assert store.resolve_step(0, 24 * HOUR, step=60) == 24 * HOUR // 10
+
+
+def test_errors_are_deduplicated() -> None:
+    """Test that repeated lastErrors lists are stored once per error."""
+    store = _store()
+    store.record(DESK_ID, 0, _desk(1, 0, [(100, 93)]))
+    store.record(DESK_ID, 60, _desk(1, 0, [(100, 93), (150, 93)]))
+    store.record(DESK_ID, 120, _desk(1, 0, [(100, 93), (150, 93), (170, 7)]))
+
+    assert store.errors(DESK_ID, 0, HOUR) == [
+        {"seen_at": 0, "time_s": 100, "error_code": 93},
+        {"seen_at": 60, "time_s": 150, "error_code": 93},
+        {"seen_at": 120, "time_s": 170, "error_code": 7},
+    ]
+    assert store.errors(DESK_ID, 0, HOUR, step=HOUR) == [
+        {"t": 0, "count": 3, "codes": {"93": 2, "7": 1}}
+    ]
+
+
+def test_trim_keeps_values_but_drops_old_points() -> None:
+    """Test that history beyond retention is folded into the base value."""
+    store = _store(retention=HOUR)
+    store.record(DESK_ID, 0, _desk(1, 0, [(5, 93)]))
+    store.record(DESK_ID, 60, _desk(2, 0))
+    store.record(DESK_ID, 2 * HOUR, _desk(3, 1))
+
+    store.trim(2 * HOUR)
+
+    assert store.stats()["stored_points"] == 2  # noqa: PLR2004
+    assert store.errors(DESK_ID, 0, 3 * HOUR) == []
+    points = store.usage(DESK_ID, 0, 3 * HOUR, step=HOUR)
+    assert points is not None
+    assert points[-1]["activations"] == 3  # noqa: PLR2004
+
+
+def test_save_and_load_round_trip(tmp_path: Path) -> None:
+    """Test that the persisted store answers the same queries."""
+    store = _store()
+    store.record(DESK_ID, 0, _desk(1, 0, [(5, 93)]))
+    store.record(DESK_ID, HOUR, _desk(4, 2))
+    store.save(tmp_path / "telemetry.json")
+
+    loaded = _store()
+    loaded.load(tmp_path / "telemetry.json")
+
+    assert loaded.usage(DESK_ID, 0, 2 * HOUR) == store.usage(DESK_ID, 0, 2 * HOUR)
+    assert loaded.errors(DESK_ID, 0, HOUR) == store.errors(DESK_ID, 0, HOUR)
+
+
+class _FakeDeskService:
+    def __init__(self) -> None:
+        self.desks = {"desk1": _desk(3, 1), "desk2": None}
+
+    async def get_all_desks(self) -> list[str]:
+        return list(self.desks)
+
+    async def get_desk_by_id(self, desk_id: str) -> Desk | None:
+        return self.desks[desk_id]
+
+
+@pytest.mark.asyncio
+async def test_sampler_records_every_readable_desk(tmp_path: Path) -> None:
+    """Test that one sampling round stores each desk that could be read."""
+    store = DeskTelemetryStore(TelemetrySettings(directory=str(tmp_path)))
+    sampler = DeskTelemetrySampler(
+        _FakeDeskService(),
+        store,
+        clock=lambda: 1000.0,  # type: ignore[arg-type]
+    )
+
+    await sampler.sample_once()
+
+    assert store.desk_ids() == ["desk1"]
+    assert sampler.stats()["failed_reads"] == 1
+    sampler.start()
+    await sampler.stop()
+    assert (tmp_path / "telemetry.json").exists()
+
+
+class _FlakyDeskService(_FakeDeskService):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def get_all_desks(self) -> list[str]:
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("unexpected")
+        return await super().get_all_desks()
+
+
+@pytest.mark.asyncio
+async def test_sampler_survives_unexpected_errors(tmp_path: Path) -> None:
+    """Test that an unexpected error doesn't end the sampling task."""
+    store = DeskTelemetryStore(
+        TelemetrySettings(interval=0.01, directory=str(tmp_path))
+    )
+    sampler = DeskTelemetrySampler(_FlakyDeskService(), store)  # type: ignore[arg-type]
+
+    sampler.start()
+    await asyncio.sleep(0.1)
+    stats = sampler.stats()
+    await sampler.stop()
+
+    assert stats["running"] is True
+    assert stats["failed_rounds"] == 1
+    assert stats["rounds"] >= 1
@@ -0,0 +1,129 @@
+import random
+
+import httpx
+import pytest
+
+from src.services.async_desk_service import AsyncDeskService
+from src.simulator.fake_box import (
+    FakeBox,
+    FakeBoxSettings,
+    LatencyDistribution,
+    create_app,
+    desk_id_for,
+)
+
+API_KEY = "test-api-key-for-unit-tests"
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+def _box(clock: FakeClock, **overrides: object) -> FakeBox:
+    return FakeBox(FakeBoxSettings(api_key=API_KEY, **overrides), clock=clock)
+
+
+def _service(box: FakeBox) -> AsyncDeskService:
+    # No caching so reads follow the fake clock
+    return AsyncDeskService(
+        transport=httpx.ASGITransport(app=create_app(box)),
+        cache_ttls={"config": 0, "state": 0, "usage": 0, "lastErrors": 0},
+    )
+
+
+def test_latency_distribution_parse() -> None:
+    """Test that latency specs are parsed and sampled in seconds."""
+    rng = random.Random(0)  # noqa: S311
+
+    assert LatencyDistribution.parse("fixed:20").sample(rng) == 0.02  # noqa: PLR2004
+    assert 0.01 <= LatencyDistribution.parse("uniform:10:50").sample(rng) <= 0.05  # noqa: PLR2004
+    assert LatencyDistribution.parse("normal:-50:1").sample(rng) == 0.0
+    with pytest.raises(ValueError, match="Invalid latency"):
+        LatencyDistribution.parse("pareto:1")
+    with pytest.raises(ValueError, match="Invalid latency"):
+        LatencyDistribution.parse("uniform:10")
+
+
+def test_desks_are_reproducible() -> None:
+    """Test that the same seed creates the same desks."""
+    clock = FakeClock()
+    first, second = _box(clock, desks=50), _box(clock, desks=50)
+
+    assert list(first.desks) == list(second.desks)
+    assert [desk.position_mm for desk in first.desks.values()] == [
+        desk.position_mm for desk in second.desks.values()
+    ]
+    assert len(set(first.desks)) == 50  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_desk_service_moves_simulated_desk() -> None:
+    """Test that DeskService can list, move and read desks of the fake box."""
+    clock = FakeClock()
+    box = _box(clock, desks=3, speed_mms=40.0)
+    service = _service(box)
+    desk_id = desk_id_for(1)
+    start = box.desks[desk_id].position_mm
+    target = 1300 if start < 1000 else 700  # noqa: PLR2004
+
+    assert await service.get_all_desks() == [desk_id_for(i) for i in range(3)]
+    state = await service.set_desk_position(desk_id, target)
+    assert state.position_mm == target
+
+    clock.now += 1.0
+    moving = await service.get_desk_state(desk_id)
+    assert moving is not None
+    assert abs(moving.position_mm - start) == 40  # noqa: PLR2004
+    assert moving.speed_mms != 0
+
+    clock.now += 60.0
+    desk = await service.get_desk_by_id(desk_id)
+    assert desk is not None
+    assert desk.state.position_mm == target
+    assert desk.state.speed_mms == 0
+    assert desk.usage.activations_counter == 1
+    assert desk.usage.sit_stand_counter == 1
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fake_box_rejects_wrong_api_key_and_unknown_desk() -> None:
+    """Test that the fake box answers 401 and 404 like the real one."""
+    box = _box(FakeClock(), desks=1)
+    transport = httpx.ASGITransport(app=create_app(box))
+    async with httpx.AsyncClient(transport=transport, base_url="http://box") as client:
+        assert (await client.get("/api/v2/wrong/desks")).status_code == 401  # noqa: PLR2004
+        response = await client.get("/api/v2/%s/desks/00:00/state" % API_KEY)
+        assert response.status_code == 404  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_fake_box_injects_errors() -> None:
+    """Test that error_rate turns requests into HTTP 500s."""
+    box = _box(FakeClock(), desks=1, error_rate=1.0)
+    transport = httpx.ASGITransport(app=create_app(box))
+    async with httpx.AsyncClient(transport=transport, base_url="http://box") as client:
+        response = await client.get("/api/v2/%s/desks" % API_KEY)
+
+    assert response.status_code == 500  # noqa: PLR2004
+    assert box.stats()["injected_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_offline_desks_hang() -> None:
+    """Test that offline desks only answer after hang_seconds."""
+    box = _box(FakeClock(), desks=2, offline_desks=1, hang_seconds=0.0)
+    transport = httpx.ASGITransport(app=create_app(box))
+    async with httpx.AsyncClient(transport=transport, base_url="http://box") as client:
+        await client.get("/api/v2/%s/desks/%s" % (API_KEY, desk_id_for(0)))
+        await client.get("/api/v2/%s/desks/%s" % (API_KEY, desk_id_for(1)))
+
+    assert box.offline == {desk_id_for(1)}
+    assert box.stats()["injected_timeouts"] == 1
@@ -5,10 +5,20 @@ from typing import AsyncIterator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.api.dependencies import get_db_session
+from src.api.dependencies import engine, get_db_session
 from src.routers import scheduler as scheduler_router
+from src.services.async_desk_service import async_desk_service
+from src.services.async_rabbitmq_client import async_rabbitmq_client
+from src.services.desk_service import DeskService, desk_guard, desk_transport
 from src.services.rabbitmq_client import rabbitmq_client
-from src.services.scheduler_service import scheduler_service
+from src.services.scheduler_service import (
+    SCHEDULER_ASYNCIO_ENABLED,
+    SCHEDULER_BATCH_ENABLED,
+    SCHEDULER_DB_JOBSTORE_ENABLED,
+    SCHEDULER_WARMUP_ENABLED,
+    schedule_batcher,
+    scheduler_service,
+)
 
 # ----------------------------
 # Logging
@@ -23,6 +33,56 @@ logger = logging.getLogger("desk-scheduler-service")
 # ----------------------------
 # Lifespan (startup / shutdown)
 # ----------------------------
+async def _start_rabbitmq() -> None:
+    """Start the RabbitMQ publisher matching the scheduler mode."""
+    if SCHEDULER_ASYNCIO_ENABLED:
+        # One connection on the event loop for API requests and jobs
+        await async_rabbitmq_client.connect()
+    else:
+        # Owns the broker connection; also replays events spooled while
+        # the broker was unreachable
+        rabbitmq_client.start_publisher()
+
+
+def _load_schedules() -> None:
+    """Load schedules from the database, creating defaults if there are none."""
+    # Load schedules from database
+    logger.info("Loading schedules from database...")
+    db_session = next(get_db_session())
+    try:
+        scheduler_service.load_schedules_from_db(db_session)
+    finally:
+        db_session.close()
+
+    # Check if any schedules were loaded
+    jobs = scheduler_service.get_all_jobs()
+    logger.info(f"Total jobs after database load: {len(jobs)}")
+
+    # If no schedules exist, create defaults
+    if len(jobs) == 0:
+        logger.info("No schedules found in database. Creating defaults...")
+        db_session = next(get_db_session())
+        try:
+            scheduler_service.setup_default_schedules(db_session)
+        finally:
+            db_session.close()
+
+        # Verify defaults were created
+        jobs = scheduler_service.get_all_jobs()
+        logger.info(f"Total jobs after creating defaults: {len(jobs)}")
+
+    # Log all schedules
+    if jobs:
+        logger.info("Active schedules:")
+        for job in jobs:
+            jid = job.get("id") or job.get("job_id")
+            jname = job.get("name") or job.get("job_name") or "<unnamed>"
+            next_run = job.get("next_run") or "not scheduled"
+            logger.info(f"  ✓ {jid}: {jname} (next: {next_run})")
+    else:
+        logger.warning("  ⚠ No jobs were created!")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Application startup and shutdown lifecycle."""
@@ -32,52 +92,21 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info("=" * 60)
 
     try:
-        logger.info("Connecting to RabbitMQ broker...")
-        rabbitmq_client.connect()
+        logger.info("Starting RabbitMQ publisher...")
+        await _start_rabbitmq()
 
         if (
             hasattr(scheduler_service, "is_running")
             and not scheduler_service.is_running()
             and hasattr(scheduler_service, "start")
         ):
+            if SCHEDULER_DB_JOBSTORE_ENABLED:
+                # Jobs live in the database; only the lease holder fires them
+                scheduler_service.use_database(engine)
             logger.info("Starting scheduler service...")
             scheduler_service.start()
 
-        # Load schedules from database
-        logger.info("Loading schedules from database...")
-        db_session = next(get_db_session())
-        try:
-            scheduler_service.load_schedules_from_db(db_session)
-        finally:
-            db_session.close()
-
-        # Check if any schedules were loaded
-        jobs = scheduler_service.get_all_jobs()
-        logger.info(f"Total jobs after database load: {len(jobs)}")
-
-        # If no schedules exist, create defaults
-        if len(jobs) == 0:
-            logger.info("No schedules found in database. Creating defaults...")
-            db_session = next(get_db_session())
-            try:
-                scheduler_service.setup_default_schedules(db_session)
-            finally:
-                db_session.close()
-
-            # Verify defaults were created
-            jobs = scheduler_service.get_all_jobs()
-            logger.info(f"Total jobs after creating defaults: {len(jobs)}")
-
-        # Log all schedules
-        if jobs:
-            logger.info("Active schedules:")
-            for job in jobs:
-                jid = job.get("id") or job.get("job_id")
-                jname = job.get("name") or job.get("job_name") or "<unnamed>"
-                next_run = job.get("next_run") or "not scheduled"
-                logger.info(f"  ✓ {jid}: {jname} (next: {next_run})")
-        else:
-            logger.warning("  ⚠ No jobs were created!")
+        _load_schedules()
 
     except Exception as e:
         logger.exception(f"ERROR during startup: {e}")
@@ -92,7 +121,12 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     try:
         if hasattr(scheduler_service, "shutdown"):
             scheduler_service.shutdown()
+        rabbitmq_client.stop_publisher()
+        rabbitmq_client.stop_replay()
         rabbitmq_client.disconnect()
+        await async_rabbitmq_client.close()
+        desk_transport.close()
+        await async_desk_service.aclose()
     except Exception as e:  # noqa: BLE001
         logger.exception(f"Error during shutdown: {e}")
 
@@ -162,3 +196,61 @@ def debug_jobs() -> dict[str, object]:
         "jobs_count": len(jobs),
         "jobs": jobs,
     }
+
+
+@app.get("/debug/leader")
+def debug_leader() -> dict[str, object]:
+    """Inspect the leader election between scheduler replicas."""
+    leader = scheduler_service.leader
+    return {
+        "enabled": leader is not None,
+        "is_leader": scheduler_service.is_leader(),
+        **(leader.stats() if leader else {}),
+    }
+
+
+@app.get("/debug/schedule-batches")
+def debug_schedule_batches() -> dict[str, object]:
+    """Inspect how co-firing schedules are merged into move plans."""
+    return {"enabled": SCHEDULER_BATCH_ENABLED, **schedule_batcher.stats()}
+
+
+@app.get("/debug/schedule-warmup")
+def debug_schedule_warmup() -> dict[str, object]:
+    """Inspect the desk inventory prefetched ahead of scheduled runs."""
+    return {"enabled": SCHEDULER_WARMUP_ENABLED, **scheduler_service.warmup.stats()}
+
+
+@app.get("/debug/http-pool")
+def debug_http_pool() -> dict[str, object]:
+    """Inspect connection pool usage of the desk API transport."""
+    if SCHEDULER_ASYNCIO_ENABLED:
+        return {**desk_transport.stats(), "async": async_desk_service.stats()}
+    return desk_transport.stats()
+
+
+@app.get("/debug/desk-routes")
+def debug_desk_routes() -> dict[str, object]:
+    """Inspect how many desks are routed to each WiFi2BLE box."""
+    return DeskService._routes.stats()
+
+
+@app.get("/debug/desk-breakers")
+def debug_desk_breakers() -> dict[str, object]:
+    """Inspect circuit breakers and adaptive timeouts of the desk API calls."""
+    return desk_guard.stats()
+
+
+@app.get("/debug/rabbitmq")
+def debug_rabbitmq() -> dict[str, object]:
+    """Inspect the RabbitMQ publisher (thread, or connection on the event loop)."""
+    if SCHEDULER_ASYNCIO_ENABLED:
+        return async_rabbitmq_client.stats()
+    return rabbitmq_client.publisher_stats()
+
+
+@app.get("/debug/event-spool")
+def debug_event_spool() -> dict[str, object]:
+    """Inspect the on-disk spool of unpublished RabbitMQ events."""
+    stats = rabbitmq_client.spool_stats()
+    return {"enabled": stats is not None, **(stats or {})}
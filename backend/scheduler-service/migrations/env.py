@@ -10,7 +10,7 @@ from sqlalchemy import pool
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from sqlmodel import SQLModel
-from src.models.db import schedule  # noqa: F401
+from src.models.db import schedule, schedule_run, scheduler_lease  # noqa: F401
 
 load_dotenv()
 
@@ -26,6 +26,20 @@ if config.config_file_name is not None:
 # model's MetaData object
 target_metadata = SQLModel.metadata
 
+# Tables created and managed at runtime rather than by migrations
+RUNTIME_TABLES = {"apscheduler_jobs"}
+
+
+def include_object(
+    object: object,  # noqa: A002
+    name: str | None,
+    type_: str,
+    reflected: bool,
+    compare_to: object,
+) -> bool:
+    """Keep autogenerate from dropping the APScheduler jobstore table."""
+    return not (type_ == "table" and name in RUNTIME_TABLES)
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -53,6 +67,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -79,7 +94,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
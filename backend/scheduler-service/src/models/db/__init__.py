@@ -1,3 +1,5 @@
 from .schedule import Schedule
+from .schedule_run import ScheduleRun
+from .scheduler_lease import SchedulerLease
 
-__all__ = ["Schedule"]
+__all__ = ["Schedule", "ScheduleRun", "SchedulerLease"]
@@ -0,0 +1,56 @@
+"""Database model for the history of scheduled desk moves."""
+
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, SQLModel
+
+
+class ScheduleRun(SQLModel, table=True):
+    """Database model for one execution of a schedule.
+
+    Attributes:
+        id (UUID): Unique identifier for the run.
+        job_id (str): Job identifier of the schedule that ran.
+        action (str): Action performed: "raise" or "lower".
+        position_mm (int): Target position in millimeters.
+        started_at (datetime): When the run started (UTC).
+        finished_at (datetime): When the run finished (UTC).
+        duration_s (float): Wall-clock duration of the run in seconds.
+        total_desks (int): Number of desks in the run.
+        successful (int): Desks commanded successfully.
+        failed (int): Desks that could not be commanded.
+        skipped (int): Desks skipped because they were already at the target.
+        latency_p50_ms (float | None): Median desk command latency.
+        latency_p95_ms (float | None): 95th percentile desk command latency.
+        latency_max_ms (float | None): Slowest desk command.
+        desk_latencies_ms (dict): Command latency of every commanded desk.
+        error (str | None): Why the run failed as a whole, if it did.
+        superseded_by (str | None): Job that moved the desks instead, when
+            this schedule fired together with others (no desks recorded).
+
+    """
+
+    __tablename__ = "schedule_runs"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    job_id: str = Field(index=True)
+    action: str
+    position_mm: int
+    started_at: datetime = Field(index=True)
+    finished_at: datetime
+    duration_s: float
+    total_desks: int = Field(default=0)
+    successful: int = Field(default=0)
+    failed: int = Field(default=0)
+    skipped: int = Field(default=0)
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
+    latency_max_ms: Optional[float] = None
+    desk_latencies_ms: Dict[str, float] = Field(
+        default_factory=dict, sa_column=Column(JSON)
+    )
+    error: Optional[str] = None
+    superseded_by: Optional[str] = Field(default=None, index=True)
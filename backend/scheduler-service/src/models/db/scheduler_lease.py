@@ -0,0 +1,22 @@
+"""Database model for the leadership lease shared by scheduler replicas."""
+
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class SchedulerLease(SQLModel, table=True):
+    """Database model for a named lease held by one scheduler replica.
+
+    Attributes:
+        name (str): Name of the lease (one per group of replicas).
+        holder (str): Identifier of the replica holding the lease.
+        expires_at (datetime): When the lease lapses unless renewed (UTC).
+
+    """
+
+    __tablename__ = "scheduler_leases"
+
+    name: str = Field(primary_key=True)
+    holder: str
+    expires_at: datetime
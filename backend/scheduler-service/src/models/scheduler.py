@@ -1,4 +1,5 @@
-from typing import Literal, Optional
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -35,6 +36,28 @@ class ScheduleResponse(BaseModel):
     next_run: Optional[str] = None
 
 
+class ScheduleBulkCreate(BaseModel):
+    """Payload for creating or replacing many schedules at once."""
+
+    schedules: List[ScheduleCreate] = Field(
+        ..., min_length=1, max_length=1000, description="Schedules to save"
+    )
+
+
+class ScheduleBulkItem(BaseModel):
+    """One schedule saved by a bulk request."""
+
+    job_id: str
+    next_run: Optional[str] = None
+
+
+class ScheduleBulkResponse(BaseModel):
+    """Response returned after a bulk save, in request order."""
+
+    message: str
+    schedules: List[ScheduleBulkItem]
+
+
 class Schedule(BaseModel):
     """Public representation of a scheduled job and its trigger details."""
 
@@ -58,6 +81,58 @@ class DeskActionResult(BaseModel):
     desk_id: str
     success: bool
     position_mm: int
+    # "moved", "skipped" (already at the target) or "failed"
+    status: str = "moved"
+    # Set for moved desks when the run verified their arrival
+    arrived: Optional[bool] = None
+    arrival_s: Optional[float] = None
+    # Command latency of desks that answered before the run deadline
+    latency_ms: Optional[float] = None
+
+
+class ScheduleRunRecord(BaseModel):
+    """One recorded run of a schedule with its desk counts and latencies."""
+
+    id: str
+    job_id: str
+    action: str
+    position_mm: int
+    started_at: datetime
+    finished_at: datetime
+    duration_s: float
+    total_desks: int
+    successful: int
+    failed: int
+    skipped: int
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
+    latency_max_ms: Optional[float] = None
+    # Only returned when requested with ?include_desks=true
+    desk_latencies_ms: Optional[Dict[str, float]] = None
+    error: Optional[str] = None
+    # Set when a co-firing schedule moved the desks instead
+    superseded_by: Optional[str] = None
+
+
+class ScheduleRunPage(BaseModel):
+    """One page of the run history of a schedule, newest run first."""
+
+    job_id: str
+    total: int
+    limit: int
+    offset: int
+    runs: List[ScheduleRunRecord]
+
+
+class ScheduleRunStats(BaseModel):
+    """Run duration percentiles over the latest runs of a schedule."""
+
+    job_id: str
+    runs: int
+    p50_s: Optional[float] = None
+    p95_s: Optional[float] = None
+    p99_s: Optional[float] = None
+    max_s: Optional[float] = None
 
 
 class HealthResponse(BaseModel):
@@ -1,8 +1,10 @@
 """Repository for managing Schedule entities in the database."""
 
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Iterable
 from uuid import UUID
 
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlmodel import Session, select
 
 from src.models.db.schedule import Schedule
@@ -72,6 +74,76 @@ class ScheduleRepository:
         statement = select(Schedule).where(Schedule.is_active == True)  # noqa: E712
         return list(self._session.exec(statement).all())
 
+    def upsert(self, schedule: Schedule) -> Schedule:
+        """Create a Schedule or update the one with the same job_id.
+
+        Args:
+            schedule (Schedule): The Schedule entity to save.
+
+        Returns:
+            Schedule: The saved Schedule entity.
+
+        """
+        return self.upsert_many([schedule])[0]
+
+    def upsert_many(self, schedules: Iterable[Schedule]) -> list[Schedule]:
+        """Create or update Schedules by job_id in a single statement.
+
+        Uses ``INSERT ... ON CONFLICT (job_id) DO UPDATE ... RETURNING`` and
+        commits once, so the whole batch is saved or none of it is. Later
+        entries win when a job_id appears more than once.
+
+        Args:
+            schedules (Iterable[Schedule]): The Schedule entities to save.
+
+        Returns:
+            list[Schedule]: The saved Schedule entities.
+
+        """
+        now = datetime.now(timezone.utc)
+        rows = {
+            schedule.job_id: {
+                "id": schedule.id,
+                "job_id": schedule.job_id,
+                "name": schedule.name,
+                "action": schedule.action,
+                "position_mm": schedule.position_mm,
+                "hour": schedule.hour,
+                "minute": schedule.minute,
+                "day_of_week": schedule.day_of_week,
+                "is_active": schedule.is_active,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for schedule in schedules
+        }
+        if not rows:
+            return []
+
+        dialect = self._session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        table = Schedule.__table__  # type: ignore[attr-defined]
+        statement = insert(table).values(list(rows.values()))
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.job_id],
+            set_={
+                column: statement.excluded[column]
+                for column in (
+                    "name",
+                    "action",
+                    "position_mm",
+                    "hour",
+                    "minute",
+                    "day_of_week",
+                    "is_active",
+                    "updated_at",
+                )
+            },
+        ).returning(*table.c)
+        saved = [Schedule(**row._mapping) for row in self._session.execute(statement)]
+        self._session.commit()
+        return saved
+
     def update(self, schedule: Schedule) -> Schedule | None:
         """Update an existing Schedule in the database.
 
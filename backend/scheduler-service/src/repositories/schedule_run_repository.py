@@ -0,0 +1,104 @@
+"""Repository for the run history of schedules."""
+
+from sqlalchemy import func
+from sqlmodel import Session, col, select
+
+from src.models.db.schedule_run import ScheduleRun
+
+
+class ScheduleRunRepository:
+    """Repository for managing ScheduleRun entities in the database."""
+
+    def __init__(self, session: Session) -> None:
+        """Initialize the repository with a database session."""
+        self._session = session
+
+    def create(self, run: ScheduleRun) -> ScheduleRun:
+        """Record a new ScheduleRun in the database.
+
+        Args:
+            run (ScheduleRun): The ScheduleRun entity to record.
+
+        Returns:
+            ScheduleRun: The recorded ScheduleRun entity.
+
+        """
+        self._session.add(run)
+        self._session.commit()
+        self._session.refresh(run)
+        return run
+
+    def create_many(self, runs: list[ScheduleRun]) -> list[ScheduleRun]:
+        """Record several ScheduleRuns in one transaction.
+
+        Args:
+            runs (list[ScheduleRun]): The ScheduleRun entities to record.
+
+        Returns:
+            list[ScheduleRun]: The recorded ScheduleRun entities.
+
+        """
+        self._session.add_all(runs)
+        self._session.commit()
+        for run in runs:
+            self._session.refresh(run)
+        return runs
+
+    def list_by_job_id(
+        self, job_id: str, *, limit: int, offset: int = 0
+    ) -> list[ScheduleRun]:
+        """Retrieve one page of the runs of a schedule, newest first.
+
+        Args:
+            job_id (str): The job_id of the schedule.
+            limit (int): Maximum number of runs to return.
+            offset (int): Number of newer runs to skip.
+
+        Returns:
+            list[ScheduleRun]: The runs on the page.
+
+        """
+        statement = (
+            select(ScheduleRun)
+            .where(ScheduleRun.job_id == job_id)
+            .order_by(col(ScheduleRun.started_at).desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        return list(self._session.exec(statement).all())
+
+    def count_by_job_id(self, job_id: str) -> int:
+        """Count the recorded runs of a schedule.
+
+        Args:
+            job_id (str): The job_id of the schedule.
+
+        Returns:
+            int: The number of runs.
+
+        """
+        statement = (
+            select(func.count())
+            .select_from(ScheduleRun)
+            .where(ScheduleRun.job_id == job_id)
+        )
+        return self._session.exec(statement).one()
+
+    def recent_durations(self, job_id: str, *, limit: int) -> list[float]:
+        """Retrieve the durations of the latest runs of a schedule.
+
+        Args:
+            job_id (str): The job_id of the schedule.
+            limit (int): Number of latest runs to include.
+
+        Returns:
+            list[float]: Run durations in seconds, newest first.
+
+        """
+        statement = (
+            select(ScheduleRun.duration_s)
+            .where(ScheduleRun.job_id == job_id)
+            .order_by(col(ScheduleRun.started_at).desc())
+            .limit(limit)
+        )
+        return list(self._session.exec(statement).all())
@@ -1,7 +1,8 @@
 import logging
-from typing import Any, List
+from typing import Annotated, Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session
 
 from src.api.dependencies import get_db_session
@@ -10,17 +11,35 @@ from src.models.scheduler import (
     DeskPositionRequest,
     HealthResponse,
     Schedule,
+    ScheduleBulkCreate,
+    ScheduleBulkItem,
+    ScheduleBulkResponse,
     ScheduleCreate,
     ScheduleResponse,
+    ScheduleRunPage,
+    ScheduleRunRecord,
+    ScheduleRunStats,
 )
+from src.repositories.schedule_run_repository import ScheduleRunRepository
+from src.services.async_desk_service import async_desk_service
 from src.services.desk_service import DeskService
-from src.services.scheduler_service import scheduler_service
+from src.services.desk_snapshot import desk_snapshot, parse_fields
+from src.services.schedule_runs import percentile
+from src.services.scheduler_service import (
+    SCHEDULER_ASYNCIO_ENABLED,
+    scheduler_service,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/scheduler/api/v1", tags=["scheduler"])
 
 
+def _job_id_for(schedule: ScheduleCreate) -> str:
+    """Return the job id of a schedule: its id, or its name as a slug."""
+    return schedule.id or schedule.name.lower().replace(" ", "_")
+
+
 @router.get("/health")
 def health_check() -> HealthResponse:
     """Health check endpoint."""
@@ -64,7 +83,7 @@ def create_schedule(
     }
     """
     try:
-        job_id = schedule.id or schedule.name.lower().replace(" ", "_")
+        job_id = _job_id_for(schedule)
 
         # Add to scheduler and save to database
         result = scheduler_service.add_schedule(
@@ -90,6 +109,45 @@ def create_schedule(
         raise HTTPException(status_code=500, detail="Failed to create schedule") from e
 
 
+@router.post("/schedules:bulk", status_code=201)
+def create_schedules_bulk(
+    request: ScheduleBulkCreate,
+    session: Session = Depends(get_db_session),
+) -> ScheduleBulkResponse:
+    """Create or replace many schedules in one transaction.
+
+    Schedules are matched by id (or by name when no id is given, as for
+    single creates); existing ones are replaced. Nothing is saved if any
+    schedule is invalid.
+    """
+    try:
+        results = scheduler_service.add_schedules(
+            [
+                {
+                    "job_id": _job_id_for(schedule),
+                    "name": schedule.name,
+                    "action": schedule.action,
+                    "position_mm": schedule.position_mm,
+                    "hour": schedule.cron.hour,
+                    "minute": schedule.cron.minute,
+                    "day_of_week": schedule.cron.day_of_week,
+                }
+                for schedule in request.schedules
+            ],
+            session,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        logger.exception(f"Error creating schedules in bulk: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create schedules") from e
+
+    return ScheduleBulkResponse(
+        message=f"{len(results)} schedules saved successfully",
+        schedules=[ScheduleBulkItem(**result) for result in results],
+    )
+
+
 @router.delete("/schedules/{job_id}")
 def delete_schedule(
     job_id: str,
@@ -108,38 +166,123 @@ def delete_schedule(
         raise HTTPException(status_code=500, detail="Failed to delete schedule") from e
 
 
+@router.get("/schedules/{job_id}/runs")
+def get_schedule_runs(
+    job_id: str,
+    session: Annotated[Session, Depends(get_db_session)],
+    limit: Annotated[int, Query(ge=1, le=500, description="Runs per page")] = 50,
+    offset: Annotated[int, Query(ge=0, description="Number of newer runs to skip")] = 0,
+    include_desks: Annotated[
+        bool, Query(description="Include the command latency of every desk")
+    ] = False,
+) -> ScheduleRunPage:
+    """Get the recorded runs of a schedule, newest first."""
+    try:
+        repo = ScheduleRunRepository(session)
+        total = repo.count_by_job_id(job_id)
+        runs = repo.list_by_job_id(job_id, limit=limit, offset=offset)
+    except Exception as e:
+        logger.exception("Error fetching runs of %s: %s", job_id, e)
+        raise HTTPException(status_code=500, detail="Failed to fetch runs") from e
+
+    return ScheduleRunPage(
+        job_id=job_id,
+        total=total,
+        limit=limit,
+        offset=offset,
+        runs=[
+            ScheduleRunRecord(
+                **run.model_dump(exclude={"id", "desk_latencies_ms"}),
+                id=str(run.id),
+                desk_latencies_ms=run.desk_latencies_ms if include_desks else None,
+            )
+            for run in runs
+        ],
+    )
+
+
+@router.get("/schedules/{job_id}/runs/stats")
+def get_schedule_run_stats(
+    job_id: str,
+    session: Annotated[Session, Depends(get_db_session)],
+    last: Annotated[
+        int, Query(ge=1, le=10000, description="Number of latest runs")
+    ] = 100,
+) -> ScheduleRunStats:
+    """Get run duration percentiles over the latest runs of a schedule."""
+    try:
+        durations = ScheduleRunRepository(session).recent_durations(job_id, limit=last)
+    except Exception as e:
+        logger.exception("Error fetching run stats of %s: %s", job_id, e)
+        raise HTTPException(status_code=500, detail="Failed to fetch run stats") from e
+
+    return ScheduleRunStats(
+        job_id=job_id,
+        runs=len(durations),
+        p50_s=percentile(durations, 0.5),
+        p95_s=percentile(durations, 0.95),
+        p99_s=percentile(durations, 0.99),
+        max_s=max(durations, default=None),
+    )
+
+
 @router.post("/desks/position")
-def set_position(request: DeskPositionRequest) -> List[DeskActionResult]:
-    """Set all desks to a specific height (in millimeters)."""
+async def set_position(request: DeskPositionRequest) -> List[DeskActionResult]:
+    """Set all desks to a specific height (in millimeters).
+
+    With ``SCHEDULER_ASYNCIO_ENABLED`` the desks are moved on the event loop,
+    sharing the connection pool and broker connection with scheduled jobs.
+    """
+    context: dict[str, object] = {"trigger": "manual", "endpoint": "position"}
     try:
+        if SCHEDULER_ASYNCIO_ENABLED:
+            return await async_desk_service.raise_all_desks(  # type: ignore[return-value]
+                request.position_mm, context=context
+            )
         # Prefer unified service method if present; otherwise fall back.
         if hasattr(DeskService, "set_all_desks_position"):
-            return DeskService.set_all_desks_position(
+            return await run_in_threadpool(
+                DeskService.set_all_desks_position,
                 request.position_mm,
-                context={"trigger": "manual", "endpoint": "position"},
+                context=context,
             )
-        return DeskService.raise_all_desks(
-            request.position_mm,
-            context={"trigger": "manual", "endpoint": "position"},
+        return await run_in_threadpool(
+            DeskService.raise_all_desks, request.position_mm, context=context
         )
     except Exception as e:
         logger.exception(f"Set position error: {e}")
         raise HTTPException(
             status_code=500, detail="Failed to set desk position"
         ) from e
+    finally:
+        # Desks are moving; don't serve their old positions from the snapshot
+        desk_snapshot.invalidate()
 
 
 @router.get("/desks")
-def get_desks() -> List[dict[str, Any]]:
-    """Get all desks and their current status."""
+def get_desks(
+    fields: Annotated[
+        Optional[str],
+        Query(
+            description="Comma-separated desk fields to return, e.g. "
+            "'state.position_mm,state.status'",
+        ),
+    ] = None,
+) -> List[dict[str, Any]]:
+    """Get all desks and their current status.
+
+    Desk documents are fetched concurrently and shared for a few seconds
+    between callers. Desks that couldn't be read are returned with
+    ``state: null`` and the reason in ``error``.
+    """
+    try:
+        paths = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
     try:
-        desk_ids = DeskService.get_all_desks()
-        desks_info: List[dict[str, Any]] = []
-        for desk_id in desk_ids:
-            state = DeskService.get_desk_state(desk_id)
-            if state:
-                desks_info.append({"id": desk_id, "state": state})
-        return desks_info
+        snapshot = desk_snapshot.get()
     except Exception as e:
         logger.exception(f"Error fetching desks: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch desks") from e
+    return [entry.as_row(paths) for entry in snapshot]
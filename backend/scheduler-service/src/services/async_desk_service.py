@@ -0,0 +1,609 @@
+"""Async service for moving desks from the event loop."""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from src.services.async_rabbitmq_client import async_rabbitmq_client
+from src.services.desk_routing import DeskBox
+from src.services.desk_service import (
+    BULK_MOVE_CONCURRENCY,
+    BULK_MOVE_DESK_TIMEOUT,
+    BULK_MOVE_RUN_TIMEOUT,
+    BULK_MOVE_SKIP_TOLERANCE_MM,
+    BULK_MOVE_VERIFY,
+    BULK_MOVE_VERIFY_INITIAL_INTERVAL,
+    BULK_MOVE_VERIFY_MAX_INTERVAL,
+    BULK_MOVE_VERIFY_TIMEOUT,
+    BULK_MOVE_VERIFY_TOLERANCE_MM,
+    DeskService,
+    DeskServiceError,
+    PositionSource,
+    _request_timeout,
+    desk_guard,
+    desk_transport,
+)
+from src.services.http_transport import HttpTransportSettings
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDeskService:
+    """Async counterpart of DeskService built on a pooled ``httpx.AsyncClient``.
+
+    All calls share one client, so the desks of a bulk move are commanded
+    by coroutines over keep-alive connections instead of by a thread each.
+    Calls go through the same circuit breakers, adaptive timeouts and desk
+    routing table as ``DeskService``, and bulk moves return the same results
+    and publish the same events (through ``async_rabbitmq_client``).
+    """
+
+    def __init__(
+        self,
+        settings: Optional[HttpTransportSettings] = None,
+        *,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """Initialize the service; the HTTP client is created on first use.
+
+        Args:
+            settings: Pool and timeout settings (defaults to the sync transport's).
+            transport: Optional httpx transport, e.g. ``httpx.MockTransport``.
+
+        """
+        self.settings = settings or desk_transport.settings
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._requests_total = 0
+        self._errors_total = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+
+    # -------- lifecycle --------
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it if needed."""
+        if self._client is None or self._client.is_closed:
+            # httpx limits are per client, the pool size is per box
+            connections = self.settings.pool_maxsize * len(DeskService._routes.boxes)
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=connections,
+                    max_keepalive_connections=connections,
+                ),
+                timeout=httpx.Timeout(
+                    self.settings.read_timeout,
+                    connect=self.settings.connect_timeout,
+                ),
+                headers={"Content-Type": "application/json"},
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared client and its pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Async desk HTTP client closed")
+        self._client = None
+
+    def stats(self) -> Dict[str, object]:
+        """Return request counters and connection pool usage."""
+        stats: Dict[str, object] = {
+            "requests_total": self._requests_total,
+            "errors_total": self._errors_total,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "pool_maxsize": self.settings.pool_maxsize,
+        }
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            stats["open_connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+        return stats
+
+    # -------- transport --------
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        box: Optional[DeskBox] = None,
+        desk_id: Optional[str] = None,
+        **kwargs: object,
+    ) -> httpx.Response:
+        """Make HTTP request with proper error handling.
+
+        Goes through the same circuit breakers and adaptive read timeouts as
+        ``DeskService._request``.
+        """
+        box = DeskService._guard_call(method, url, box, desk_id)
+        read_timeout = desk_guard.read_timeout(
+            box.name,
+            min(
+                _request_timeout.get() or self.settings.read_timeout,
+                self.settings.read_timeout,
+            ),
+        )
+
+        logger.info("Making %s request to %s", method, url)
+        self._requests_total += 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        started = time.monotonic()
+        try:
+            response = await self.client.request(
+                method,
+                url,
+                timeout=httpx.Timeout(
+                    read_timeout, connect=self.settings.connect_timeout
+                ),
+                **kwargs,  # type: ignore[arg-type]
+            )
+            logger.info("Response status: %s", response.status_code)
+
+        except httpx.TimeoutException as exc:
+            self._errors_total += 1
+            # A slow desk times out on a live box; only desk-less calls count
+            desk_guard.record_failure(box.name, desk_id, box_down=desk_id is None)
+            logger.error("Request timeout after %ss for %s: %s", read_timeout, url, exc)
+            raise DeskServiceError("Request timeout after %ss" % read_timeout) from exc
+
+        except httpx.NetworkError as exc:
+            self._errors_total += 1
+            desk_guard.record_failure(box.name, desk_id, box_down=True)
+            logger.error("Connection error to %s: %s", url, exc)
+            raise DeskServiceError(
+                "Failed to connect to desk API - check if simulator is running"
+            ) from exc
+
+        except httpx.HTTPError as exc:
+            self._errors_total += 1
+            desk_guard.record_failure(box.name, desk_id, box_down=True)
+            logger.exception("Request failed to %s: %s", url, exc)
+            raise DeskServiceError("Failed to communicate with desk API") from exc
+
+        finally:
+            self._in_flight -= 1
+
+        DeskService._check_response(
+            method,
+            url,
+            box,
+            desk_id,
+            status_code=response.status_code,
+            text=response.text,
+            elapsed=time.monotonic() - started,
+        )
+        return response
+
+    async def _desk_url(self, desk_id: str, *segments: str) -> str:
+        """Build the URL of a desk resource on the box the desk is connected to.
+
+        An unknown desk triggers one refresh of the routing table.
+
+        Raises:
+            DeskServiceError: If no box lists the desk.
+
+        """
+        box = DeskService._routes.box_for(desk_id)
+        if box is None:
+            try:
+                await self.get_all_desks()
+            except DeskServiceError as exc:
+                logger.warning("Failed to refresh desk routes: %s", exc)
+            box = DeskService._routes.box_for(desk_id)
+        if box is None:
+            raise DeskServiceError(
+                "Desk %s is not connected to any configured box" % desk_id,
+                status_code=404,
+            )
+        return DeskService._build_url("desks", desk_id, *segments, box=box)
+
+    # -------- desks --------
+
+    async def _list_box_desks(self, box: DeskBox) -> List[str]:
+        """Fetch the desk identifiers connected to one box.
+
+        Raises:
+            DeskServiceError: If the API request fails
+
+        """
+        url = DeskService._build_url("desks/", box=box)
+        response = await self._request("GET", url, box=box)
+        try:
+            payload = response.json()
+        except ValueError as exc:
+            logger.error("Failed to parse JSON response: %s", exc)
+            raise DeskServiceError("Invalid JSON response from desk API") from exc
+        return DeskService._parse_desk_list(payload, box)
+
+    async def get_all_desks(self) -> List[str]:
+        """Fetch all desk identifiers from every configured box.
+
+        The boxes are listed concurrently and their lists merged into the
+        routing table shared with ``DeskService``.
+
+        Raises:
+            DeskServiceError: If no box could be listed
+
+        """
+        logger.info("Fetching all desks from API")
+        boxes = DeskService._routes.boxes
+        listed = await asyncio.gather(
+            *(self._list_box_desks(box) for box in boxes), return_exceptions=True
+        )
+
+        listings: List[Tuple[DeskBox, Optional[List[str]]]] = []
+        errors: List[BaseException] = []
+        for box, outcome in zip(boxes, listed, strict=True):
+            if isinstance(outcome, DeskServiceError):
+                logger.error("✗ Failed to list desks on box %s: %s", box.name, outcome)
+                errors.append(outcome)
+                listings.append((box, None))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                listings.append((box, outcome))
+
+        if len(errors) == len(boxes):
+            raise errors[0]
+        return DeskService._routes.merge(listings)
+
+    async def get_desk_document(self, desk_id: str) -> Dict[str, object]:
+        """Fetch the full document of a specific desk.
+
+        Raises:
+            DeskServiceError: If the API request fails or returns invalid JSON
+
+        """
+        if not desk_id:
+            raise DeskServiceError("Desk identifier is required")
+
+        url = await self._desk_url(desk_id)
+        response = await self._request("GET", url, desk_id=desk_id)
+        try:
+            document = response.json()
+        except ValueError as exc:
+            raise DeskServiceError("Invalid JSON response from desk API") from exc
+        if not isinstance(document, dict):
+            raise DeskServiceError("Desk API returned an unexpected response format")
+        return document
+
+    async def set_desk_position(
+        self, desk_id: str, position_mm: int
+    ) -> Dict[str, object]:
+        """Set a specific desk to a target position.
+
+        Raises:
+            DeskServiceError: If the operation fails
+
+        """
+        if not desk_id:
+            raise DeskServiceError("Desk identifier is required")
+        if not isinstance(position_mm, int) or position_mm < 0:
+            raise DeskServiceError(
+                "Invalid position: %smm (must be positive integer)" % position_mm
+            )
+
+        logger.info("Setting desk %s to position %smm", desk_id, position_mm)
+        url = await self._desk_url(desk_id, "state")
+        response = await self._request(
+            "PUT", url, desk_id=desk_id, json={"position_mm": position_mm}
+        )
+        logger.info("✓ Successfully commanded desk %s to %smm", desk_id, position_mm)
+
+        try:
+            return response.json()
+        except ValueError:
+            return {"success": True, "position_mm": position_mm}
+
+    # -------- bulk moves --------
+
+    async def raise_all_desks(
+        self,
+        position_mm: int,
+        *,
+        context: Optional[Dict[str, object]] = None,
+        current_positions: Optional[PositionSource] = None,
+        desk_ids: Optional[List[str]] = None,
+    ) -> List[Dict[str, object]]:
+        """Raise all desks to the specified height and broadcast the outcome."""
+        return await self._move_all_desks(
+            "raise",
+            position_mm,
+            context=context,
+            current_positions=current_positions,
+            desk_ids=desk_ids,
+        )
+
+    async def lower_all_desks(
+        self,
+        position_mm: int,
+        *,
+        context: Optional[Dict[str, object]] = None,
+        current_positions: Optional[PositionSource] = None,
+        desk_ids: Optional[List[str]] = None,
+    ) -> List[Dict[str, object]]:
+        """Lower all desks to the specified height and broadcast the outcome."""
+        return await self._move_all_desks(
+            "lower",
+            position_mm,
+            context=context,
+            current_positions=current_positions,
+            desk_ids=desk_ids,
+        )
+
+    async def _move_all_desks(  # noqa: PLR0913
+        self,
+        action: str,
+        position_mm: int,
+        *,
+        context: Optional[Dict[str, object]] = None,
+        concurrency: Optional[int] = None,
+        desk_timeout: Optional[float] = None,
+        run_timeout: Optional[float] = None,
+        current_positions: Optional[PositionSource] = None,
+        skip_tolerance_mm: Optional[float] = None,
+        verify: Optional[bool] = None,
+        desk_ids: Optional[List[str]] = None,
+    ) -> List[Dict[str, object]]:
+        """Move all desks to a specified position.
+
+        Same arguments, limits and results as ``DeskService._move_all_desks``;
+        desks still in flight at the run deadline are cancelled. A
+        ``current_positions`` source may block, so it is read on a worker
+        thread.
+
+        Returns:
+            List of results for each desk, in desk list order
+
+        """
+        concurrency = max(1, concurrency or BULK_MOVE_CONCURRENCY)
+        desk_timeout = desk_timeout or BULK_MOVE_DESK_TIMEOUT
+        run_timeout = run_timeout or BULK_MOVE_RUN_TIMEOUT
+
+        logger.info(
+            "Starting %s operation for all desks to %smm", action.upper(), position_mm
+        )
+        if desk_ids is None:
+            try:
+                desk_ids = await self.get_all_desks()
+            except DeskServiceError as exc:
+                logger.error("Failed to get desk list: %s", exc)
+                return []
+
+        skipped: Set[str] = set()
+        if current_positions is not None:
+            skipped = await asyncio.to_thread(
+                DeskService._desks_at_target,
+                desk_ids,
+                position_mm,
+                current_positions,
+                BULK_MOVE_SKIP_TOLERANCE_MM
+                if skip_tolerance_mm is None
+                else skip_tolerance_mm,
+            )
+        latencies: Dict[str, float] = {}
+        outcomes = await self._fan_out_moves(
+            [desk_id for desk_id in desk_ids if desk_id not in skipped],
+            position_mm,
+            concurrency=concurrency,
+            desk_timeout=desk_timeout,
+            run_timeout=run_timeout,
+            latencies=latencies,
+        )
+        results = DeskService._collect_results(
+            desk_ids, position_mm, skipped, outcomes, latencies
+        )
+
+        verification: Optional[Dict[str, object]] = None
+        if BULK_MOVE_VERIFY if verify is None else verify:
+            started = time.monotonic()
+            arrivals = await self._verify_arrivals(
+                [str(r["desk_id"]) for r in results if r["status"] == "moved"],
+                position_mm,
+                concurrency=concurrency,
+                desk_timeout=desk_timeout,
+            )
+            verification = DeskService._apply_arrivals(results, arrivals, started)
+
+        DeskService._log_completion(action, results, skipped)
+        await self._publish_event(
+            action=action,
+            position_mm=position_mm,
+            results=results,
+            context=context,
+            verification=verification,
+        )
+        return results
+
+    async def _fan_out_moves(  # noqa: PLR0913
+        self,
+        desk_ids: List[str],
+        position_mm: int,
+        *,
+        concurrency: int,
+        desk_timeout: float,
+        run_timeout: float,
+        latencies: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, bool]:
+        """Command desks concurrently and collect per-desk success flags.
+
+        At most ``concurrency`` desks per box are commanded at once, so a
+        slow box doesn't hold up the others. Desks missing from the returned
+        mapping did not finish before the run deadline.
+        """
+        outcomes: Dict[str, bool] = {}
+        if not desk_ids:
+            return outcomes
+        slots: Dict[Optional[str], asyncio.Semaphore] = {}
+
+        async def _move_one(desk_id: str) -> None:
+            box = DeskService._routes.box_for(desk_id)
+            slot = slots.setdefault(
+                box.name if box else None, asyncio.Semaphore(concurrency)
+            )
+            async with slot:
+                _request_timeout.set(desk_timeout)
+                started = time.monotonic()
+                try:
+                    await self.set_desk_position(desk_id, position_mm)
+                    outcomes[desk_id] = True
+                    logger.info(
+                        "[%d/%d] ✓ Successfully commanded desk %s",
+                        len(outcomes),
+                        len(desk_ids),
+                        desk_id,
+                    )
+                except Exception as exc:  # noqa: BLE001
+                    # Like the threaded fan-out, one desk never aborts the run
+                    outcomes[desk_id] = False
+                    logger.error(
+                        "[%d/%d] ✗ Failed to move desk %s: %s",
+                        len(outcomes),
+                        len(desk_ids),
+                        desk_id,
+                        exc,
+                    )
+                finally:
+                    if latencies is not None:
+                        latencies[desk_id] = round(
+                            (time.monotonic() - started) * 1000, 1
+                        )
+
+        tasks = [asyncio.create_task(_move_one(desk_id)) for desk_id in desk_ids]
+        _, pending = await asyncio.wait(tasks, timeout=run_timeout)
+        if pending:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            unfinished = sorted(d for d in desk_ids if d not in outcomes)
+            for desk_id in unfinished:
+                if latencies is not None:
+                    latencies.pop(desk_id, None)
+            logger.warning(
+                "Run deadline of %ss exceeded; %d desks did not finish: %s",
+                run_timeout,
+                len(unfinished),
+                unfinished,
+            )
+        return outcomes
+
+    async def _verify_arrivals(  # noqa: PLR0913
+        self,
+        desk_ids: List[str],
+        position_mm: int,
+        *,
+        concurrency: int,
+        desk_timeout: float,
+        timeout: float = BULK_MOVE_VERIFY_TIMEOUT,  # noqa: ASYNC109
+        initial_interval: float = BULK_MOVE_VERIFY_INITIAL_INTERVAL,
+        max_interval: float = BULK_MOVE_VERIFY_MAX_INTERVAL,
+        tolerance_mm: float = BULK_MOVE_VERIFY_TOLERANCE_MM,
+    ) -> Dict[str, float]:
+        """Poll commanded desks in rounds until they are at rest at the target.
+
+        Same polling schedule as ``DeskService._verify_arrivals``; reads
+        still in flight at the deadline are cancelled.
+
+        Returns:
+            Seconds from the start of verification until each desk was seen
+            at the target; desks that never arrived are missing.
+
+        """
+        arrivals: Dict[str, float] = {}
+        if not desk_ids:
+            return arrivals
+        slot = asyncio.Semaphore(concurrency)
+
+        async def _at_target(desk_id: str) -> bool:
+            async with slot:
+                _request_timeout.set(desk_timeout)
+                try:
+                    document = await self.get_desk_document(desk_id)
+                except DeskServiceError as exc:
+                    logger.debug("Failed to poll desk %s: %s", desk_id, exc)
+                    return False
+            state = document.get("state") or {}
+            position = state.get("position_mm")  # type: ignore[union-attr]
+            return (
+                isinstance(position, int)
+                and not state.get("speed_mms")  # type: ignore[union-attr]
+                and abs(position - position_mm) <= tolerance_mm
+            )
+
+        started = time.monotonic()
+        deadline = started + timeout
+        interval = initial_interval
+        pending = list(desk_ids)
+        while pending:
+            # Desks need time to move, so even the first round waits
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, max_interval)
+            polls = {asyncio.ensure_future(_at_target(d)): d for d in pending}
+            done, late = await asyncio.wait(
+                polls, timeout=max(0.0, deadline - time.monotonic())
+            )
+            for task in late:
+                task.cancel()
+            await asyncio.gather(*late, return_exceptions=True)
+            now = time.monotonic()
+            for task in done:
+                if task.result():
+                    arrivals[polls[task]] = round(now - started, 3)
+            pending = [d for d in pending if d not in arrivals]
+
+        if pending:
+            logger.warning(
+                "✗ %d/%d desks did not reach %smm within %ss: %s",
+                len(pending),
+                len(desk_ids),
+                position_mm,
+                timeout,
+                pending,
+            )
+        return arrivals
+
+    @staticmethod
+    async def _publish_event(
+        *,
+        action: str,
+        position_mm: int,
+        results: List[Dict[str, object]],
+        context: Optional[Dict[str, object]],
+        verification: Optional[Dict[str, object]] = None,
+    ) -> None:
+        """Publish the desk action event on the shared broker connection."""
+        routing_key, messages = DeskService._build_event(
+            action=action,
+            position_mm=position_mm,
+            results=results,
+            context=context,
+            verification=verification,
+        )
+        try:
+            # Every chunk is attempted even if an earlier one failed
+            published = [
+                await async_rabbitmq_client.publish(routing_key, body, **options)  # type: ignore[arg-type]
+                for body, options in messages
+            ]
+            if all(published):
+                logger.info("✓ Published event to RabbitMQ: %s", routing_key)
+            else:
+                logger.warning("⚠ Failed to publish event to RabbitMQ: %s", routing_key)
+        except Exception as exc:  # pragma: no cover
+            logger.exception("Error publishing to RabbitMQ: %s", exc)
+
+
+# Global singleton instance
+async_desk_service = AsyncDeskService()
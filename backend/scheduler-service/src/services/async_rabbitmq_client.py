@@ -0,0 +1,272 @@
+"""Publish events to RabbitMQ from the event loop over one aio-pika connection."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, Optional, Union
+
+from src.services.event_spool import EventSpool, SpooledEvent
+from src.services.rabbitmq_client import (
+    RabbitMQClient,
+    RabbitMQSettings,
+    event_spool,
+    rabbitmq_settings,
+)
+
+try:
+    import aio_pika
+except Exception:  # pragma: no cover - handled gracefully at runtime
+    aio_pika = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRabbitMQClient:
+    """Asyncio counterpart of ``RabbitMQClient``.
+
+    One robust aio-pika connection (reconnected automatically) and one
+    channel are shared by every publisher on the event loop, so API
+    requests and scheduled jobs publish over the same broker connection.
+    With confirms enabled, ``publish`` returns once the broker has taken
+    the message. Events that can't be published go to the same ``spool`` as
+    the sync client, and a replay task publishes it in order once the broker
+    is reachable again.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[RabbitMQSettings] = None,
+        *,
+        spool: Optional[EventSpool] = None,
+    ) -> None:
+        self.settings = settings or RabbitMQSettings()
+        self._spool = spool
+        self._connection: Optional[aio_pika.abc.AbstractRobustConnection] = None
+        self._channel: Optional[aio_pika.abc.AbstractRobustChannel] = None
+        self._exchange: Optional[aio_pika.abc.AbstractExchange] = None
+        # Serialises publishing between publishers and the replay task
+        self._lock = asyncio.Lock()
+        self._replay_task: Optional[asyncio.Task[None]] = None
+        self._published_total = 0
+        self._failed_total = 0
+
+    # Lifecycle management
+
+    @property
+    def connected(self) -> bool:
+        """Whether the exchange is declared on an open connection."""
+        return (
+            self._exchange is not None
+            and self._connection is not None
+            and not self._connection.is_closed
+        )
+
+    async def connect(self) -> None:
+        """Connect to the broker, declare the exchange and start replaying."""
+        if aio_pika is None:
+            logger.warning("aio-pika is not available; RabbitMQ integration disabled.")
+            return
+
+        if self._spool is not None and self._replay_task is None:
+            await asyncio.to_thread(self._spool.open)
+            self._replay_task = asyncio.create_task(self._replay_loop())
+
+        if self.connected:
+            return
+        try:
+            self._connection = await aio_pika.connect_robust(
+                host=self.settings.host,
+                port=self.settings.port,
+                login=self.settings.username,
+                password=self.settings.password,
+                heartbeat=self.settings.heartbeat,
+            )
+            self._channel = await self._connection.channel(
+                publisher_confirms=self.settings.publish_confirms
+            )
+            self._exchange = await self._channel.declare_exchange(
+                self.settings.exchange,
+                self.settings.exchange_type,
+                durable=True,
+            )
+            logger.info(
+                "Connected to RabbitMQ broker at %s:%s (exchange: %s)",
+                self.settings.host,
+                self.settings.port,
+                self.settings.exchange,
+            )
+        except Exception as exc:  # pragma: no cover - network failure path
+            logger.exception("Failed to connect to RabbitMQ broker: %s", exc)
+            await self._close_connection()
+
+    async def close(self) -> None:
+        """Stop replaying, close the connection and the spool."""
+        if self._replay_task is not None:
+            self._replay_task.cancel()
+            await asyncio.gather(self._replay_task, return_exceptions=True)
+            self._replay_task = None
+        await self._close_connection()
+        if self._spool is not None:
+            await asyncio.to_thread(self._spool.close)
+
+    def stats(self) -> Dict[str, object]:
+        """Return connection state and counters."""
+        return {
+            "connected": self.connected,
+            "replaying": self._replay_task is not None,
+            "published_total": self._published_total,
+            "failed_total": self._failed_total,
+            "confirms": self.settings.publish_confirms,
+        }
+
+    # Publishing
+
+    async def publish(  # noqa: PLR0913
+        self,
+        routing_key: str,
+        payload: object,
+        persistent: bool = True,
+        *,
+        content_type: str = "application/json",
+        content_encoding: Optional[str] = None,
+        headers: Optional[Dict[str, object]] = None,
+    ) -> bool:
+        """Publish ``payload`` with ``routing_key`` and return ``True`` on success.
+
+        Same arguments and spooling as ``RabbitMQClient.publish``.
+        """
+        body: Union[str, bytes] = (
+            bytes(payload)
+            if content_encoding and isinstance(payload, (bytes, bytearray))
+            else RabbitMQClient._serialise_payload(payload)
+        )
+        event = SpooledEvent(
+            routing_key,
+            body,
+            persistent,
+            content_type=content_type,
+            content_encoding=content_encoding,
+            headers=headers,
+        )
+
+        async with self._lock:
+            if self._spool is not None and len(self._spool):
+                # Older events are still spooled; queue up behind them
+                await self._spool_event(event)
+                return False
+            if not await self._ensure_connection() or not await self._send(event):
+                await self._spool_event(event)
+                return False
+        return True
+
+    async def replay_spool(self) -> bool:
+        """Publish one batch of spooled events in order.
+
+        Returns:
+            ``True`` if the batch was fully published (or the spool is empty).
+
+        """
+        if self._spool is None:
+            return True
+
+        async with self._lock:
+            batch = await asyncio.to_thread(
+                self._spool.peek, self.settings.replay_batch_size
+            )
+            if not batch:
+                return True
+            if not await self._ensure_connection():
+                return False
+            published = 0
+            for event in batch:
+                if not await self._send(event):
+                    break
+                published += 1
+            await asyncio.to_thread(self._spool.ack, published)
+
+        if published:
+            logger.info("Replayed %d spooled RabbitMQ events", published)
+        return published == len(batch)
+
+    # Internal helpers
+
+    async def _replay_loop(self) -> None:
+        """Replay the spool until cancelled, backing off while the broker is down."""
+        delay = self.settings.replay_interval
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                replayed = await self.replay_spool()
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.exception("Spool replay failed: %s", exc)
+                replayed = False
+            if replayed and self._spool is not None and len(self._spool):
+                # More to drain; go again straight away
+                delay = 0
+            elif replayed:
+                delay = self.settings.replay_interval
+            else:
+                delay = min(
+                    max(delay * 2, self.settings.replay_interval),
+                    self.settings.replay_backoff_max,
+                )
+
+    async def _ensure_connection(self) -> bool:
+        """Connect if there is no connection yet."""
+        if not self.connected:
+            await self.connect()
+        return self.connected
+
+    async def _send(self, event: SpooledEvent) -> bool:
+        """Send one message; return ``True`` once the broker has taken it."""
+        body = event.body if isinstance(event.body, bytes) else event.body.encode()
+        message = aio_pika.Message(
+            body=body,
+            content_type=event.content_type,
+            content_encoding=event.content_encoding,
+            headers=event.headers,  # type: ignore[arg-type]
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT
+            if event.persistent
+            else aio_pika.DeliveryMode.NOT_PERSISTENT,
+        )
+        try:
+            await self._exchange.publish(  # type: ignore[union-attr]
+                message,
+                routing_key=event.routing_key,
+                timeout=self.settings.publish_timeout,
+            )
+        except Exception as exc:  # pragma: no cover - network failure path
+            logger.exception(
+                "RabbitMQ publish failed for routing_key %s: %s",
+                event.routing_key,
+                exc,
+            )
+            self._failed_total += 1
+            return False
+        self._published_total += 1
+        return True
+
+    async def _spool_event(self, event: SpooledEvent) -> None:
+        """Append an unpublished event to the spool, if one is configured."""
+        if self._spool is None:
+            return
+        if await asyncio.to_thread(self._spool.append, [event]):
+            logger.warning("Spooled RabbitMQ event for replay: %s", event.routing_key)
+
+    async def _close_connection(self) -> None:
+        """Close the channel and connection, ignoring errors."""
+        try:
+            if self._connection is not None and not self._connection.is_closed:
+                await self._connection.close()
+        except Exception as exc:  # pragma: no cover - defensive cleanup
+            logger.warning("Error while disconnecting RabbitMQ client: %s", exc)
+        finally:
+            self._connection = None
+            self._channel = None
+            self._exchange = None
+
+
+# Shared singleton, sharing settings and spool with the sync client
+async_rabbitmq_client = AsyncRabbitMQClient(rabbitmq_settings, spool=event_spool)
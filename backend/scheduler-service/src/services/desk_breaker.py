@@ -0,0 +1,326 @@
+"""Circuit breakers and adaptive timeouts for calls to the WiFi2BLE boxes."""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class BreakerSettings:
+    """Breaker and adaptive timeout parameters from environment variables.
+
+    Attributes:
+        desk_failures: Consecutive failures that open a desk's breaker.
+        box_failures: Consecutive connection failures or server errors that
+            open a box's breaker.
+        reset_timeout: Seconds an open breaker waits before letting a probe
+            through (half-open).
+        latency_window: Number of recent call latencies kept per box.
+        min_samples: Latencies needed before the timeout adapts.
+        p99_multiplier: The adaptive read timeout is ``p99 * p99_multiplier``.
+        min_timeout: Lower bound in seconds of the adaptive read timeout.
+
+    """
+
+    desk_failures: int = int(os.getenv("DESK_BREAKER_DESK_FAILURES", "3"))
+    box_failures: int = int(os.getenv("DESK_BREAKER_BOX_FAILURES", "5"))
+    reset_timeout: float = float(os.getenv("DESK_BREAKER_RESET_SECONDS", "30"))
+    latency_window: int = int(os.getenv("DESK_TIMEOUT_LATENCY_WINDOW", "200"))
+    min_samples: int = int(os.getenv("DESK_TIMEOUT_MIN_SAMPLES", "20"))
+    p99_multiplier: float = float(os.getenv("DESK_TIMEOUT_P99_MULTIPLIER", "3"))
+    min_timeout: float = float(os.getenv("DESK_TIMEOUT_MIN_SECONDS", "1"))
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised by ``DeskCallGuard.check`` when a breaker rejects a call."""
+
+    def __init__(self, name: str, retry_in: float) -> None:
+        super().__init__(
+            "Circuit open for %s; not calling it for %.1fs" % (name, retry_in)
+        )
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Closed, it lets every call through and opens after ``failure_threshold``
+    failures in a row. Open, it rejects calls until ``reset_timeout`` has
+    passed, then turns half-open and lets a single probe through: a
+    successful probe closes the breaker, a failed one opens it again. A probe
+    that never reports back is replaced after another ``reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, turning open into half-open once the reset is due."""
+        with self._lock:
+            return self._current_state(self._clock())
+
+    def allow(self) -> bool:
+        """Return whether a call may go through now."""
+        with self._lock:
+            now = self._clock()
+            state = self._current_state(now)
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and (
+                self._probe_started is None
+                or now - self._probe_started >= self.reset_timeout
+            ):
+                self._probe_started = now
+                return True
+            self._rejected += 1
+            return False
+
+    def release(self) -> None:
+        """Give back a probe taken by ``allow`` for a call that wasn't made."""
+        with self._lock:
+            self._probe_started = None
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        with self._lock:
+            return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("✓ Circuit for %s closed", self.name)
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold."""
+        with self._lock:
+            now = self._clock()
+            self._failures += 1
+            if (
+                self._current_state(now) == HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                if self._state == CLOSED:
+                    logger.warning(
+                        "✗ Circuit for %s opened after %d failures",
+                        self.name,
+                        self._failures,
+                    )
+                self._state = OPEN
+                self._opened_at = now
+                self._probe_started = None
+
+    def stats(self) -> Dict[str, object]:
+        """Return the breaker state and counters."""
+        with self._lock:
+            return {
+                "state": self._current_state(self._clock()),
+                "failures": self._failures,
+                "rejected": self._rejected,
+            }
+
+    def _current_state(self, now: float) -> str:
+        """Return the state at ``now`` (called with the lock held)."""
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+
+class LatencyTracker:
+    """Sliding window of call latencies with a p99-based timeout."""
+
+    def __init__(self, window: int) -> None:
+        """Initialize an empty window of ``window`` samples."""
+        self._samples: Deque[float] = deque(maxlen=max(1, window))
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        """Record the latency of one call."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Return the ``fraction`` percentile (e.g. 0.99), or None if empty."""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+        return ordered[index]
+
+
+class DeskCallGuard:
+    """Breakers per desk and per box, plus per-box adaptive read timeouts.
+
+    ``check`` is called before each request and raises ``CircuitOpenError``
+    if the desk's or the box's breaker is open, so calls to unreachable desks
+    fail immediately instead of waiting for a timeout. Outcomes are reported
+    with ``record_success`` / ``record_failure``: a call that can't connect
+    or is answered with HTTP 5xx counts against the box and the desk, a call
+    to a desk that times out counts against the desk only. ``read_timeout``
+    returns the p99 latency of the box times ``p99_multiplier``, bounded by
+    ``min_timeout`` and the configured default.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[BreakerSettings] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a guard with no breakers yet."""
+        self.settings = settings or BreakerSettings()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._desks: Dict[str, CircuitBreaker] = {}
+        self._boxes: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+
+    def check(self, box: str, desk_id: Optional[str] = None) -> None:
+        """Raise ``CircuitOpenError`` if the box or desk must not be called.
+
+        The desk is checked first so that a rejected desk doesn't use up the
+        box's half-open probe; a desk probe is given back if the box rejects.
+        """
+        desk_breaker = None
+        if desk_id is not None:
+            desk_breaker = self._breaker(
+                self._desks, desk_id, self.settings.desk_failures
+            )
+            if not desk_breaker.allow():
+                raise CircuitOpenError("desk %s" % desk_id, desk_breaker.retry_in())
+        box_breaker = self._breaker(self._boxes, box, self.settings.box_failures)
+        if not box_breaker.allow():
+            if desk_breaker is not None:
+                desk_breaker.release()
+            raise CircuitOpenError("box %s" % box, box_breaker.retry_in())
+
+    def record_success(self, box: str, desk_id: Optional[str], latency: float) -> None:
+        """Record a call the box answered (in ``latency`` seconds)."""
+        self._breaker(self._boxes, box, self.settings.box_failures).record_success()
+        if desk_id is not None:
+            self._breaker(
+                self._desks, desk_id, self.settings.desk_failures
+            ).record_success()
+        self._tracker(box).add(latency)
+
+    def record_failure(
+        self, box: str, desk_id: Optional[str], *, box_down: bool
+    ) -> None:
+        """Record a failed call; ``box_down`` if the box itself failed.
+
+        Without ``box_down`` the failure is the desk's alone (e.g. a slow
+        desk timing out) and the box's breaker is left as it is.
+        """
+        if box_down:
+            self._breaker(self._boxes, box, self.settings.box_failures).record_failure()
+        if desk_id is not None:
+            self._breaker(
+                self._desks, desk_id, self.settings.desk_failures
+            ).record_failure()
+
+    def read_timeout(self, box: str, default: float) -> float:
+        """Return the adaptive read timeout for ``box``, at most ``default``."""
+        tracker = self._tracker(box)
+        if len(tracker) < self.settings.min_samples:
+            return default
+        p99 = tracker.percentile(0.99) or 0.0
+        return min(
+            default, max(self.settings.min_timeout, p99 * self.settings.p99_multiplier)
+        )
+
+    def reset(self) -> None:
+        """Forget every breaker and latency sample."""
+        with self._lock:
+            self._desks.clear()
+            self._boxes.clear()
+            self._latencies.clear()
+
+    def stats(self) -> Dict[str, object]:
+        """Return breaker states and latency percentiles."""
+        with self._lock:
+            boxes = dict(self._boxes)
+            desks = dict(self._desks)
+            latencies = dict(self._latencies)
+        return {
+            "boxes": {
+                name: {
+                    **breaker.stats(),
+                    "p50": latencies[name].percentile(0.5)
+                    if name in latencies
+                    else None,
+                    "p99": latencies[name].percentile(0.99)
+                    if name in latencies
+                    else None,
+                }
+                for name, breaker in boxes.items()
+            },
+            "open_desks": {
+                desk_id: breaker.stats()
+                for desk_id, breaker in desks.items()
+                if breaker.state != CLOSED
+            },
+        }
+
+    def _breaker(
+        self, breakers: Dict[str, CircuitBreaker], name: str, threshold: int
+    ) -> CircuitBreaker:
+        """Return the breaker for ``name``, creating it on first use."""
+        with self._lock:
+            breaker = breakers.get(name)
+            if breaker is None:
+                breaker = breakers[name] = CircuitBreaker(
+                    name,
+                    threshold,
+                    self.settings.reset_timeout,
+                    clock=self._clock,
+                )
+            return breaker
+
+    def _tracker(self, box: str) -> LatencyTracker:
+        """Return the latency window of ``box``, creating it on first use."""
+        with self._lock:
+            tracker = self._latencies.get(box)
+            if tracker is None:
+                tracker = self._latencies[box] = LatencyTracker(
+                    self.settings.latency_window
+                )
+            return tracker
@@ -2,12 +2,19 @@
 
 import logging
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple
 
 import requests
 
+from src.services.desk_breaker import CircuitOpenError, DeskCallGuard
+from src.services.desk_routing import DeskBox, DeskRoutingTable, parse_boxes
+from src.services.event_encoding import DESK_EVENT_ENCODING, encode_columnar
+from src.services.http_transport import DeskHttpTransport, HttpTransportSettings
 from src.services.rabbitmq_client import rabbitmq_client
 
 logger = logging.getLogger(__name__)
@@ -29,8 +36,61 @@ def _load_timeout() -> int:
         return 10
 
 
+def _load_positive_number(name: str, default: float) -> float:
+    """Load a positive number from environment with fallback.
+
+    Falls back to ``default`` if the env var is missing, invalid or not positive.
+    """
+    raw = os.getenv(name, str(default))
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        value = -1
+    if value <= 0:
+        logger.warning("Invalid %s value '%s'; falling back to %s", name, raw, default)
+        return default
+    return value
+
+
 DEFAULT_TIMEOUT = _load_timeout()
 HTTP_ERROR_THRESHOLD = 400  # First HTTP error status code (4xx/5xx)
+HTTP_SERVER_ERROR_THRESHOLD = 500  # First status code counted as a desk failure
+
+# Bulk move fan-out settings (see DeskService._move_all_desks)
+BULK_MOVE_CONCURRENCY = int(_load_positive_number("DESK_BULK_CONCURRENCY", 16))
+BULK_MOVE_DESK_TIMEOUT = _load_positive_number(
+    "DESK_BULK_DESK_TIMEOUT_SECONDS", DEFAULT_TIMEOUT
+)
+BULK_MOVE_RUN_TIMEOUT = _load_positive_number("DESK_BULK_RUN_TIMEOUT_SECONDS", 120)
+# Scheduled runs skip desks already within this many mm of the target
+BULK_MOVE_SKIP_NOOP = (
+    os.getenv("DESK_BULK_SKIP_NOOP_ENABLED", "false").lower() == "true"
+)
+BULK_MOVE_SKIP_TOLERANCE_MM = _load_positive_number("DESK_BULK_SKIP_TOLERANCE_MM", 5)
+
+# Optional check that commanded desks arrived (see DeskService._verify_arrivals)
+BULK_MOVE_VERIFY = os.getenv("DESK_BULK_VERIFY_ENABLED", "false").lower() == "true"
+BULK_MOVE_VERIFY_TIMEOUT = _load_positive_number("DESK_BULK_VERIFY_TIMEOUT_SECONDS", 60)
+BULK_MOVE_VERIFY_INITIAL_INTERVAL = _load_positive_number(
+    "DESK_BULK_VERIFY_INITIAL_INTERVAL_SECONDS", 1
+)
+BULK_MOVE_VERIFY_MAX_INTERVAL = _load_positive_number(
+    "DESK_BULK_VERIFY_MAX_INTERVAL_SECONDS", 8
+)
+BULK_MOVE_VERIFY_TOLERANCE_MM = _load_positive_number(
+    "DESK_BULK_VERIFY_TOLERANCE_MM", 5
+)
+
+# Returns the current position of desks at rest, e.g. from a bulk snapshot
+PositionSource = Callable[[], Mapping[str, int]]
+
+# Circuit breakers and adaptive timeouts shared by every call to the boxes
+desk_guard = DeskCallGuard()
+
+# Per-call read timeout override, set by bulk workers to enforce the per-desk deadline
+_request_timeout: ContextVar[Optional[float]] = ContextVar(
+    "desk_request_timeout", default=None
+)
 
 
 class DeskServiceError(RuntimeError):
@@ -45,40 +105,83 @@ class DeskServiceError(RuntimeError):
 class _DeskServiceConfig:
     """Configuration container for the DeskService."""
 
-    base_url: str
-    api_key: str
+    boxes: Tuple[DeskBox, ...]
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the default (first) box."""
+        return self.boxes[0].base_url
+
+    @property
+    def api_key(self) -> str:
+        """API key of the default (first) box."""
+        return self.boxes[0].api_key
 
     @classmethod
     def from_env(cls) -> "_DeskServiceConfig":
-        """Load configuration from environment variables."""
-        base = os.getenv("DESK_API_BASE_URL", "http://localhost:8000/api/v2").rstrip(
-            "/"
-        )
-        api_key = os.getenv("DESK_API_KEY", "")
+        """Load configuration from environment variables.
 
-        if not api_key:
-            logger.error("DESK_API_KEY environment variable is not set!")
-            raise ValueError("DESK_API_KEY is required")
+        ``DESK_API_BOXES`` lists several boxes; without it the single box
+        given by ``DESK_API_BASE_URL`` and ``DESK_API_KEY`` is used.
+        """
+        raw_boxes = os.getenv("DESK_API_BOXES", "")
+        if raw_boxes.strip():
+            boxes = parse_boxes(raw_boxes)
+        else:
+            base = os.getenv(
+                "DESK_API_BASE_URL", "http://localhost:8000/api/v2"
+            ).rstrip("/")
+            api_key = os.getenv("DESK_API_KEY", "")
+
+            if not api_key:
+                logger.error("DESK_API_KEY environment variable is not set!")
+                raise ValueError("DESK_API_KEY is required")
+            boxes = [DeskBox(name="default", base_url=base, api_key=api_key)]
+
+        for box in boxes:
+            logger.info(
+                "DeskService box %s: base_url=%s, api_key=%s...",
+                box.name,
+                box.base_url,
+                box.api_key[:8],
+            )
+        return cls(boxes=tuple(boxes))
 
-        logger.info(
-            "DeskService initialized: base_url=%s, api_key=%s...",
-            base,
-            api_key[:8],
-        )
-        return cls(base_url=base, api_key=api_key)
+
+_config = _DeskServiceConfig.from_env()
+
+# Pooled keep-alive transport shared by every call to the boxes
+desk_transport = DeskHttpTransport(
+    HttpTransportSettings(
+        pool_maxsize=int(_load_positive_number("DESK_API_POOL_MAXSIZE", 32)),
+        pool_connections=max(4, len(_config.boxes)),
+        pool_block=os.getenv("DESK_API_POOL_BLOCK", "false").lower() == "true",
+        connect_timeout=_load_positive_number("DESK_API_CONNECT_TIMEOUT_SECONDS", 3),
+        read_timeout=_load_positive_number(
+            "DESK_API_READ_TIMEOUT_SECONDS", DEFAULT_TIMEOUT
+        ),
+    )
+)
 
 
 class DeskService:
-    """Service for interacting with the WiFi2BLE Box Simulator API."""
+    """Service for interacting with the WiFi2BLE Box Simulator API.
 
-    _config = _DeskServiceConfig.from_env()
+    Desks may be spread over several boxes; calls for a single desk go to the
+    box it was listed by (see ``DeskRoutingTable``).
+    """
+
+    _config = _config
+    _routes = DeskRoutingTable(_config.boxes)
 
     @classmethod
-    def _build_url(cls, *segments: str) -> str:
+    def _build_url(cls, *segments: str, box: Optional[DeskBox] = None) -> str:
         """Build URL with API key in path for WiFi2BLE Box Simulator.
 
         Format: {base_url}/{api_key}/desks/...
 
+        ``box`` defaults to the first configured box.
+
         The requests library automatically handles URL encoding, so we don't need
         to encode manually.
 
@@ -88,7 +191,8 @@ class DeskService:
                 -> http://localhost:8000/api/v2/API_KEY/desks/cd:fb:1a:53:fb:e6
 
         """
-        parts: List[str] = [cls._config.base_url, cls._config.api_key]
+        box = box or cls._routes.default_box
+        parts: List[str] = [box.base_url, box.api_key]
         parts.extend(segment.strip("/") for segment in segments if segment)
         url = "/".join(parts)
 
@@ -104,93 +208,260 @@ class DeskService:
         cls,
         method: str,
         url: str,
+        *,
+        box: Optional[DeskBox] = None,
+        desk_id: Optional[str] = None,
         **kwargs: dict[str, object],
     ) -> requests.Response:
-        """Make HTTP request with proper error handling."""
+        """Make HTTP request with proper error handling.
+
+        The call goes through the desk and box circuit breakers of
+        ``desk_guard``: it fails fast with HTTP status 503 while either is
+        open, and its read timeout adapts to the box's recent latency.
+        """
+        box = cls._guard_call(method, url, box, desk_id)
+
         headers: Dict[str, str] = kwargs.pop("headers", {}) or {}  # type: ignore[assignment]
         headers.setdefault("Content-Type", "application/json")
 
+        connect_timeout, read_timeout = desk_transport.timeout
+        read_timeout = desk_guard.read_timeout(
+            box.name, min(_request_timeout.get() or read_timeout, read_timeout)
+        )
+
         logger.info("Making %s request to %s", method, url)
         if "json" in kwargs:
             logger.debug("Request payload: %s", kwargs["json"])
 
+        started = time.monotonic()
         try:
-            response = requests.request(
+            response = desk_transport.request(
                 method=method,
                 url=url,
                 headers=headers,
-                timeout=DEFAULT_TIMEOUT,
-                **kwargs,  # type: ignore[arg-type]
+                timeout=(connect_timeout, read_timeout),
+                **kwargs,
             )
             logger.info("Response status: %s", response.status_code)
 
         except requests.exceptions.Timeout as exc:
-            logger.error(
-                "Request timeout after %ss for %s: %s", DEFAULT_TIMEOUT, url, exc
-            )
-            raise DeskServiceError(
-                "Request timeout after %ss" % DEFAULT_TIMEOUT
-            ) from exc
+            # A slow desk times out on a live box; only desk-less calls count
+            desk_guard.record_failure(box.name, desk_id, box_down=desk_id is None)
+            logger.error("Request timeout after %ss for %s: %s", read_timeout, url, exc)
+            raise DeskServiceError("Request timeout after %ss" % read_timeout) from exc
 
         except requests.exceptions.ConnectionError as exc:
+            desk_guard.record_failure(box.name, desk_id, box_down=True)
             logger.error("Connection error to %s: %s", url, exc)
             raise DeskServiceError(
                 "Failed to connect to desk API - check if simulator is running"
             ) from exc
 
         except requests.RequestException as exc:
+            desk_guard.record_failure(box.name, desk_id, box_down=True)
             logger.exception("Request failed to %s: %s", url, exc)
             raise DeskServiceError("Failed to communicate with desk API") from exc
 
-        if response.status_code >= HTTP_ERROR_THRESHOLD:
-            error_text = response.text[:500] if response.text else "No error message"
+        cls._check_response(
+            method,
+            url,
+            box,
+            desk_id,
+            status_code=response.status_code,
+            text=response.text,
+            elapsed=time.monotonic() - started,
+        )
+        return response
+
+    @classmethod
+    def _guard_call(
+        cls, method: str, url: str, box: Optional[DeskBox], desk_id: Optional[str]
+    ) -> DeskBox:
+        """Resolve the box of a call and fail fast while its breaker is open.
+
+        Raises:
+            DeskServiceError: With status 503 if the desk or box circuit is open.
+
+        """
+        if box is None:
+            box = (desk_id and cls._routes.box_for(desk_id)) or cls._routes.default_box
+        try:
+            desk_guard.check(box.name, desk_id)
+        except CircuitOpenError as exc:
+            logger.info("Skipping %s %s: %s", method, url, exc)
+            raise DeskServiceError(str(exc), status_code=503) from exc
+        return box
+
+    @staticmethod
+    def _check_response(  # noqa: PLR0913
+        method: str,
+        url: str,
+        box: DeskBox,
+        desk_id: Optional[str],
+        *,
+        status_code: int,
+        text: str,
+        elapsed: float,
+    ) -> None:
+        """Feed a response into the circuit breakers and raise on HTTP errors.
+
+        Raises:
+            DeskServiceError: If the box answered with an HTTP error status.
+
+        """
+        if status_code >= HTTP_SERVER_ERROR_THRESHOLD:
+            desk_guard.record_failure(box.name, desk_id, box_down=True)
+        else:
+            desk_guard.record_success(box.name, desk_id, elapsed)
+
+        if status_code >= HTTP_ERROR_THRESHOLD:
+            error_text = text[:500] if text else "No error message"
             logger.error(
                 "Desk API error %s for %s %s: %s",
-                response.status_code,
+                status_code,
                 method,
                 url,
                 error_text,
             )
             raise DeskServiceError(
-                "Desk API responded with HTTP %s: %s"
-                % (response.status_code, error_text),
-                status_code=response.status_code,
+                "Desk API responded with HTTP %s: %s" % (status_code, error_text),
+                status_code=status_code,
             )
 
-        return response
-
     @classmethod
-    def get_all_desks(cls) -> List[str]:
-        """Fetch all desk identifiers from the desk API.
+    def _desk_url(cls, desk_id: str, *segments: str) -> str:
+        """Build the URL of a desk resource on the box the desk is connected to.
 
-        Returns:
-            List of MAC addresses like ["cd:fb:1a:53:fb:e6", ...]
+        An unknown desk triggers one refresh of the routing table.
 
         Raises:
-            DeskServiceError: If the API request fails
+            DeskServiceError: If no box lists the desk.
 
         """
-        logger.info("Fetching all desks from API")
+        box = cls._routes.box_for(desk_id)
+        if box is None:
+            try:
+                cls.get_all_desks()
+            except DeskServiceError as exc:
+                logger.warning("Failed to refresh desk routes: %s", exc)
+            box = cls._routes.box_for(desk_id)
+        if box is None:
+            raise DeskServiceError(
+                "Desk %s is not connected to any configured box" % desk_id,
+                status_code=404,
+            )
+        return cls._build_url("desks", desk_id, *segments, box=box)
+
+    @classmethod
+    def _list_box_desks(cls, box: DeskBox) -> List[str]:
+        """Fetch the desk identifiers connected to one box.
 
+        Raises:
+            DeskServiceError: If the API request fails
+
+        """
         # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/
-        url = cls._build_url("desks/")
-        response = cls._request("GET", url)
+        url = cls._build_url("desks/", box=box)
+        response = cls._request("GET", url, box=box)
 
         try:
             payload = response.json()
         except ValueError as exc:
             logger.error("Failed to parse JSON response: %s", exc)
             raise DeskServiceError("Invalid JSON response from desk API") from exc
+        return cls._parse_desk_list(payload, box)
 
+    @staticmethod
+    def _parse_desk_list(payload: object, box: DeskBox) -> List[str]:
+        """Return the desk identifiers of a box's desk list response.
+
+        Raises:
+            DeskServiceError: If the response is not a list
+
+        """
         # WiFi2BLE returns a simple list of MAC addresses (strings)
         if isinstance(payload, list):
             desk_ids = [str(item) for item in payload if item]
-            logger.info("✓ Found %d desks: %s", len(desk_ids), desk_ids)
+            logger.info(
+                "✓ Found %d desks on box %s: %s", len(desk_ids), box.name, desk_ids
+            )
             return desk_ids
 
         logger.error("Unexpected payload format: %s - %s", type(payload), payload)
         raise DeskServiceError("Desk API returned an unexpected response format")
 
+    @classmethod
+    def get_all_desks(cls) -> List[str]:
+        """Fetch all desk identifiers from every configured box.
+
+        The boxes are listed in parallel and their lists merged into the
+        routing table. A box that can't be listed is logged and its desks
+        keep their last known route.
+
+        Returns:
+            List of MAC addresses like ["cd:fb:1a:53:fb:e6", ...]
+
+        Raises:
+            DeskServiceError: If no box could be listed
+
+        """
+        logger.info("Fetching all desks from API")
+        boxes = cls._routes.boxes
+        if len(boxes) == 1:
+            return cls._routes.merge([(boxes[0], cls._list_box_desks(boxes[0]))])
+
+        listings: List[Tuple[DeskBox, Optional[List[str]]]] = []
+        errors: List[DeskServiceError] = []
+        with ThreadPoolExecutor(
+            max_workers=len(boxes), thread_name_prefix="desk-list"
+        ) as executor:
+            futures = [executor.submit(cls._list_box_desks, box) for box in boxes]
+            for box, future in zip(boxes, futures, strict=True):
+                try:
+                    listings.append((box, future.result()))
+                except DeskServiceError as exc:
+                    logger.error("✗ Failed to list desks on box %s: %s", box.name, exc)
+                    errors.append(exc)
+                    listings.append((box, None))
+
+        if len(errors) == len(boxes):
+            raise errors[0]
+        return cls._routes.merge(listings)
+
+    @classmethod
+    def get_desk_document(cls, desk_id: str) -> Dict[str, object]:
+        """Fetch the full document of a specific desk.
+
+        Args:
+            desk_id: MAC address of the desk (e.g., "cd:fb:1a:53:fb:e6")
+
+        Returns:
+            Dict with 'config', 'state', 'usage', 'lastErrors' keys.
+
+        Raises:
+            DeskServiceError: If the API request fails or returns invalid JSON
+
+        """
+        if not desk_id:
+            raise DeskServiceError("Desk identifier is required")
+
+        # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/{desk_id}
+        url = cls._desk_url(desk_id)
+        response = cls._request("GET", url, desk_id=desk_id)
+        try:
+            document = response.json()
+        except ValueError as exc:
+            raise DeskServiceError("Invalid JSON response from desk API") from exc
+        if not isinstance(document, dict):
+            raise DeskServiceError("Desk API returned an unexpected response format")
+
+        logger.debug(
+            "Desk %s state: position=%smm",
+            desk_id,
+            (document.get("state", {}) or {}).get("position_mm"),
+        )
+        return document
+
     @classmethod
     def get_desk_state(cls, desk_id: str) -> Optional[Dict[str, object]]:
         """Get the current state of a specific desk.
@@ -208,18 +479,7 @@ class DeskService:
             return None
 
         try:
-            # WiFi2BLE API endpoint: GET /api/v2/{api_key}/desks/{desk_id}
-            url = cls._build_url("desks", desk_id)
-            response = cls._request("GET", url)
-            state = response.json()
-
-            logger.debug(
-                "Desk %s state: position=%smm",
-                desk_id,
-                (state.get("state", {}) or {}).get("position_mm"),
-            )
-            return state
-
+            return cls.get_desk_document(desk_id)
         except DeskServiceError as exc:
             logger.warning("Failed to get state for desk %s: %s", desk_id, exc)
             return None
@@ -251,9 +511,9 @@ class DeskService:
 
         # WiFi2BLE API endpoint: PUT /api/v2/{api_key}/desks/{desk_id}/state
         payload = {"position_mm": position_mm}
-        url = cls._build_url("desks", desk_id, "state")
+        url = cls._desk_url(desk_id, "state")
 
-        response = cls._request("PUT", url, json=payload)
+        response = cls._request("PUT", url, desk_id=desk_id, json=payload)
         logger.info("✓ Successfully commanded desk %s to %smm", desk_id, position_mm)
 
         try:
@@ -267,18 +527,30 @@ class DeskService:
         position_mm: int,
         *,
         context: Optional[Dict[str, object]] = None,
+        current_positions: Optional[PositionSource] = None,
+        desk_ids: Optional[List[str]] = None,
     ) -> List[Dict[str, object]]:
         """Raise all desks to the specified height and broadcast the outcome.
 
         Args:
             position_mm: Target position in millimeters
             context: Optional context dict for logging/events
+            current_positions: Optional source of current desk positions;
+                desks already at the target are skipped
+            desk_ids: Optional prefetched desk list to move instead of
+                fetching it
 
         Returns:
             List of results for each desk
 
         """
-        return cls._move_all_desks("raise", position_mm, context=context)
+        return cls._move_all_desks(
+            "raise",
+            position_mm,
+            context=context,
+            current_positions=current_positions,
+            desk_ids=desk_ids,
+        )
 
     @classmethod
     def lower_all_desks(
@@ -286,93 +558,497 @@ class DeskService:
         position_mm: int,
         *,
         context: Optional[Dict[str, object]] = None,
+        current_positions: Optional[PositionSource] = None,
+        desk_ids: Optional[List[str]] = None,
     ) -> List[Dict[str, object]]:
         """Lower all desks to the specified height and broadcast the outcome.
 
         Args:
             position_mm: Target position in millimeters
             context: Optional context dict for logging/events
+            current_positions: Optional source of current desk positions;
+                desks already at the target are skipped
+            desk_ids: Optional prefetched desk list to move instead of
+                fetching it
 
         Returns:
             List of results for each desk
 
         """
-        return cls._move_all_desks("lower", position_mm, context=context)
+        return cls._move_all_desks(
+            "lower",
+            position_mm,
+            context=context,
+            current_positions=current_positions,
+            desk_ids=desk_ids,
+        )
 
     @classmethod
-    def _move_all_desks(
+    def _move_all_desks(  # noqa: PLR0913
         cls,
         action: str,
         position_mm: int,
         *,
         context: Optional[Dict[str, object]] = None,
+        concurrency: Optional[int] = None,
+        desk_timeout: Optional[float] = None,
+        run_timeout: Optional[float] = None,
+        current_positions: Optional[PositionSource] = None,
+        skip_tolerance_mm: Optional[float] = None,
+        verify: Optional[bool] = None,
+        desk_ids: Optional[List[str]] = None,
     ) -> List[Dict[str, object]]:
-        """Move all desks to a specified position."""
+        """Move all desks to a specified position.
+
+        Desks are commanded concurrently by a bounded worker pool. Each desk
+        call is limited to ``desk_timeout`` seconds and the whole run to
+        ``run_timeout`` seconds; desks that have not answered once the run
+        deadline passes are reported as failed, so the results are always
+        complete even if some desks are slow. Each desk that answered in time
+        carries its command latency in ``latency_ms``.
+
+        With ``current_positions``, desks already within ``skip_tolerance_mm``
+        of the target are not commanded and are reported as ``skipped``.
+
+        With ``verify``, the commanded desks are then polled until they reach
+        the target (see ``_verify_arrivals``); each moved desk's result gets
+        ``arrived`` and ``arrival_s``, and the event lists the stragglers.
+
+        Args:
+            action: "raise" or "lower" (used for logging and the routing key)
+            position_mm: Target position in millimeters
+            context: Optional context dict for logging/events
+            concurrency: Max desks commanded at once per box (1 = sequential)
+            desk_timeout: Deadline in seconds for a single desk call
+            run_timeout: Deadline in seconds for the whole run
+            current_positions: Optional source of current desk positions
+            skip_tolerance_mm: Max distance from the target for a desk to be
+                skipped (defaults to ``DESK_BULK_SKIP_TOLERANCE_MM``)
+            verify: Poll moved desks until they arrive (defaults to
+                ``DESK_BULK_VERIFY_ENABLED``)
+            desk_ids: Desks to move, e.g. prefetched before a scheduled run
+                (defaults to fetching the desk list)
+
+        Returns:
+            List of results for each desk, in desk list order
+
+        """
+        concurrency = max(1, concurrency or BULK_MOVE_CONCURRENCY)
+        desk_timeout = desk_timeout or BULK_MOVE_DESK_TIMEOUT
+        run_timeout = run_timeout or BULK_MOVE_RUN_TIMEOUT
+
         logger.info("=" * 60)
         logger.info(
             "Starting %s operation for all desks to %smm", action.upper(), position_mm
         )
         logger.info("=" * 60)
 
-        try:
-            desk_ids = cls.get_all_desks()
-        except DeskServiceError as exc:
-            logger.error("Failed to get desk list: %s", exc)
-            return []
+        if desk_ids is None:
+            try:
+                desk_ids = cls.get_all_desks()
+            except DeskServiceError as exc:
+                logger.error("Failed to get desk list: %s", exc)
+                return []
 
-        logger.info("Found %d desks to %s", len(desk_ids), action)
+        logger.info(
+            "Found %d desks to %s (concurrency=%d, desk_timeout=%ss, run_timeout=%ss)",
+            len(desk_ids),
+            action,
+            concurrency,
+            desk_timeout,
+            run_timeout,
+        )
 
-        results: List[Dict[str, object]] = []
+        skipped = cls._desks_at_target(
+            desk_ids,
+            position_mm,
+            current_positions,
+            BULK_MOVE_SKIP_TOLERANCE_MM
+            if skip_tolerance_mm is None
+            else skip_tolerance_mm,
+        )
+        latencies: Dict[str, float] = {}
+        outcomes = cls._fan_out_moves(
+            [desk_id for desk_id in desk_ids if desk_id not in skipped],
+            position_mm,
+            concurrency=concurrency,
+            desk_timeout=desk_timeout,
+            run_timeout=run_timeout,
+            latencies=latencies,
+        )
 
-        for i, desk_id in enumerate(desk_ids, 1):
-            logger.info("[%d/%d] Processing desk %s", i, len(desk_ids), desk_id)
+        results = cls._collect_results(
+            desk_ids, position_mm, skipped, outcomes, latencies
+        )
 
-            try:
-                cls.set_desk_position(desk_id, position_mm)
-                success = True
-                logger.info("  ✓ Successfully commanded desk %s", desk_id)
+        verification: Optional[Dict[str, object]] = None
+        if verify is None:
+            verify = BULK_MOVE_VERIFY
+        if verify:
+            moved = [str(r["desk_id"]) for r in results if r["status"] == "moved"]
+            started = time.monotonic()
+            arrivals = cls._verify_arrivals(
+                moved, position_mm, concurrency=concurrency, desk_timeout=desk_timeout
+            )
+            verification = cls._apply_arrivals(results, arrivals, started)
 
-            except DeskServiceError as exc:
-                logger.error("  ✗ Failed to move desk %s: %s", desk_id, exc)
-                success = False
+        cls._log_completion(action, results, skipped)
 
-            results.append(
-                {
-                    "desk_id": desk_id,
-                    "success": success,
-                    "position_mm": position_mm,
-                }
-            )
+        cls._publish_rabbitmq_event(
+            action=action,
+            position_mm=position_mm,
+            results=results,
+            context=context,
+            verification=verification,
+        )
 
+        return results
+
+    @staticmethod
+    def _collect_results(
+        desk_ids: List[str],
+        position_mm: int,
+        skipped: Set[str],
+        outcomes: Mapping[str, bool],
+        latencies: Mapping[str, float],
+    ) -> List[Dict[str, object]]:
+        """Build the per-desk results of a bulk move, in desk list order.
+
+        Desks missing from ``outcomes`` did not finish in time and are failed.
+        """
+        results: List[Dict[str, object]] = []
+        for desk_id in desk_ids:
+            if desk_id in skipped:
+                success, status = True, "skipped"
+            else:
+                success = outcomes.get(desk_id, False)
+                status = "moved" if success else "failed"
+            result: Dict[str, object] = {
+                "desk_id": desk_id,
+                "success": success,
+                "position_mm": position_mm,
+                "status": status,
+            }
+            if desk_id in latencies:
+                result["latency_ms"] = latencies[desk_id]
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _apply_arrivals(
+        results: List[Dict[str, object]],
+        arrivals: Mapping[str, float],
+        started: float,
+    ) -> Dict[str, object]:
+        """Mark moved desks as arrived or not and summarize the verification."""
+        moved = [str(r["desk_id"]) for r in results if r["status"] == "moved"]
+        for result in results:
+            if result["status"] == "moved":
+                arrival = arrivals.get(result["desk_id"])  # type: ignore[call-overload]
+                result["arrived"] = arrival is not None
+                result["arrival_s"] = arrival
+        return {
+            "arrived": len(arrivals),
+            "stragglers": [d for d in moved if d not in arrivals],
+            "duration_s": round(time.monotonic() - started, 3),
+            "max_arrival_s": max(arrivals.values(), default=None),
+        }
+
+    @staticmethod
+    def _log_completion(
+        action: str, results: List[Dict[str, object]], skipped: Set[str]
+    ) -> None:
+        """Log the outcome of a bulk move."""
         successful = sum(1 for r in results if r["success"])
         logger.info("=" * 60)
         logger.info(
-            "%s complete: %d/%d desks successful",
+            "%s complete: %d/%d desks successful (%d already in position)",
             action.upper(),
             successful,
             len(results),
+            len(skipped),
         )
         logger.info("=" * 60)
 
-        cls._publish_rabbitmq_event(
+    @staticmethod
+    def _desks_at_target(
+        desk_ids: List[str],
+        position_mm: int,
+        current_positions: Optional[PositionSource],
+        tolerance_mm: float,
+    ) -> Set[str]:
+        """Return the desks already within ``tolerance_mm`` of ``position_mm``.
+
+        If the positions can't be read every desk is moved.
+        """
+        if current_positions is None:
+            return set()
+        try:
+            positions = current_positions()
+        except DeskServiceError as exc:
+            logger.warning("Desk positions unavailable; moving every desk: %s", exc)
+            return set()
+        at_target = {
+            desk_id
+            for desk_id in desk_ids
+            if desk_id in positions
+            and abs(positions[desk_id] - position_mm) <= tolerance_mm
+        }
+        if at_target:
+            logger.info(
+                "Skipping %d desks already within %smm of %smm",
+                len(at_target),
+                tolerance_mm,
+                position_mm,
+            )
+        return at_target
+
+    @classmethod
+    def _verify_arrivals(  # noqa: PLR0913
+        cls,
+        desk_ids: List[str],
+        position_mm: int,
+        *,
+        concurrency: int,
+        desk_timeout: float,
+        timeout: float = BULK_MOVE_VERIFY_TIMEOUT,
+        initial_interval: float = BULK_MOVE_VERIFY_INITIAL_INTERVAL,
+        max_interval: float = BULK_MOVE_VERIFY_MAX_INTERVAL,
+        tolerance_mm: float = BULK_MOVE_VERIFY_TOLERANCE_MM,
+    ) -> Dict[str, float]:
+        """Poll commanded desks until they are at rest at the target.
+
+        Desks are polled together in rounds: every desk that hasn't arrived
+        yet is read once per round by a pool of ``concurrency`` workers, and
+        the wait between rounds doubles from ``initial_interval`` up to
+        ``max_interval``. Polling stops when every desk has arrived or
+        ``timeout`` seconds after the first round started; reads are cut
+        short at that deadline, and a desk that can't be read is polled again
+        in the next round.
+
+        Returns:
+            Seconds from the start of verification until each desk was seen
+            at the target; desks that never arrived are missing.
+
+        """
+        arrivals: Dict[str, float] = {}
+        if not desk_ids:
+            return arrivals
+
+        started = time.monotonic()
+        deadline = started + timeout
+
+        def _at_target(desk_id: str) -> bool:
+            # Desks queued behind slow reads must not outlast the deadline
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            token = _request_timeout.set(min(desk_timeout, remaining))
+            try:
+                state = cls.get_desk_document(desk_id).get("state") or {}
+            except DeskServiceError as exc:
+                logger.debug("Failed to poll desk %s: %s", desk_id, exc)
+                return False
+            finally:
+                _request_timeout.reset(token)
+            position = state.get("position_mm")  # type: ignore[union-attr]
+            return (
+                isinstance(position, int)
+                and not state.get("speed_mms")  # type: ignore[union-attr]
+                and abs(position - position_mm) <= tolerance_mm
+            )
+
+        interval = initial_interval
+        pending = list(desk_ids)
+        rounds = 0
+        with ThreadPoolExecutor(
+            max_workers=min(concurrency, len(desk_ids)),
+            thread_name_prefix="desk-verify",
+        ) as executor:
+            while pending:
+                # Desks need time to move, so even the first round waits
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(interval, remaining))
+                interval = min(interval * 2, max_interval)
+                rounds += 1
+                arrived = list(executor.map(_at_target, pending))
+                now = time.monotonic()
+                for desk_id, at_target in zip(pending, arrived, strict=True):
+                    if at_target:
+                        arrivals[desk_id] = round(now - started, 3)
+                pending = [d for d in pending if d not in arrivals]
+
+        if pending:
+            logger.warning(
+                "✗ %d/%d desks did not reach %smm within %ss: %s",
+                len(pending),
+                len(desk_ids),
+                position_mm,
+                timeout,
+                pending,
+            )
+        else:
+            logger.info(
+                "✓ All %d desks reached %smm after %d polling rounds",
+                len(desk_ids),
+                position_mm,
+                rounds,
+            )
+        return arrivals
+
+    @classmethod
+    def _fan_out_moves(  # noqa: PLR0913
+        cls,
+        desk_ids: List[str],
+        position_mm: int,
+        *,
+        concurrency: int,
+        desk_timeout: float,
+        run_timeout: float,
+        latencies: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, bool]:
+        """Command desks concurrently and collect per-desk success flags.
+
+        Each box gets its own pool of ``concurrency`` workers, so the boxes
+        are commanded in parallel and a slow box doesn't hold up the others.
+        Desks missing from the returned mapping did not finish before the run
+        deadline. If given, ``latencies`` receives the command latency in
+        milliseconds of every desk that answered (or failed) in time.
+        """
+        outcomes: Dict[str, bool] = {}
+        if not desk_ids:
+            return outcomes
+        # Written by the workers, including stragglers finishing after the
+        # deadline; only desks collected in time are copied to ``latencies``
+        measured: Dict[str, float] = {}
+
+        def _move_one(desk_id: str) -> bool:
+            token = _request_timeout.set(desk_timeout)
+            started = time.monotonic()
+            try:
+                cls.set_desk_position(desk_id, position_mm)
+                return True
+            finally:
+                _request_timeout.reset(token)
+                measured[desk_id] = round((time.monotonic() - started) * 1000, 1)
+
+        by_box: Dict[Optional[DeskBox], List[str]] = {}
+        for desk_id in desk_ids:
+            by_box.setdefault(cls._routes.box_for(desk_id), []).append(desk_id)
+
+        deadline = time.monotonic() + run_timeout
+        total = len(desk_ids)
+        executors = [
+            ThreadPoolExecutor(
+                max_workers=min(concurrency, len(box_desks)),
+                thread_name_prefix="desk-move-%s" % (box.name if box else "unrouted"),
+            )
+            for box, box_desks in by_box.items()
+        ]
+        try:
+            pending: Dict[Future[bool], str] = {
+                executor.submit(_move_one, desk_id): desk_id
+                for executor, box_desks in zip(executors, by_box.values(), strict=True)
+                for desk_id in box_desks
+            }
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    desk_id = pending.pop(future)
+                    if latencies is not None and desk_id in measured:
+                        latencies[desk_id] = measured[desk_id]
+                    try:
+                        outcomes[desk_id] = future.result()
+                        logger.info(
+                            "[%d/%d] ✓ Successfully commanded desk %s",
+                            len(outcomes),
+                            total,
+                            desk_id,
+                        )
+                    except Exception as exc:  # noqa: BLE001
+                        # One desk failing in an unexpected way must not
+                        # abort the moves of the others
+                        outcomes[desk_id] = False
+                        logger.error(
+                            "[%d/%d] ✗ Failed to move desk %s: %s",
+                            len(outcomes),
+                            total,
+                            desk_id,
+                            exc,
+                        )
+
+            if pending:
+                logger.warning(
+                    "Run deadline of %ss exceeded; %d desks did not finish: %s",
+                    run_timeout,
+                    len(pending),
+                    sorted(pending.values()),
+                )
+        finally:
+            # Don't wait for stragglers; their calls are bounded by desk_timeout.
+            for executor in executors:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        return outcomes
+
+    @staticmethod
+    def _publish_rabbitmq_event(
+        *,
+        action: str,
+        position_mm: int,
+        results: List[Dict[str, object]],
+        context: Optional[Dict[str, object]],
+        verification: Optional[Dict[str, object]] = None,
+    ) -> None:
+        """Publish desk action event to RabbitMQ.
+
+        With ``DESK_EVENT_ENCODING=columnar`` the event is sent as compact,
+        optionally compressed chunks (see ``event_encoding``).
+        """
+        routing_key, messages = DeskService._build_event(
             action=action,
             position_mm=position_mm,
             results=results,
             context=context,
+            verification=verification,
         )
-
-        return results
+        try:
+            # Every chunk is attempted even if an earlier one failed, so the
+            # results are collected before all() rather than short-circuited
+            published = [
+                rabbitmq_client.publish(routing_key, body, **options)
+                for body, options in messages
+            ]
+            if all(published):
+                logger.info("✓ Published event to RabbitMQ: %s", routing_key)
+            else:
+                logger.warning("⚠ Failed to publish event to RabbitMQ: %s", routing_key)
+        except Exception as exc:  # pragma: no cover
+            logger.exception("Error publishing to RabbitMQ: %s", exc)
 
     @staticmethod
-    def _publish_rabbitmq_event(
+    def _build_event(
         *,
         action: str,
         position_mm: int,
         results: List[Dict[str, object]],
         context: Optional[Dict[str, object]],
-    ) -> None:
-        """Publish desk action event to RabbitMQ."""
-        successful = sum(1 for r in results if r["success"])
+        verification: Optional[Dict[str, object]] = None,
+    ) -> Tuple[str, List[Tuple[object, Dict[str, object]]]]:
+        """Build the routing key and messages of a desk action event.
+
+        Returns:
+            The routing key and the ``(payload, publish options)`` of every
+            message: one JSON payload, or the columnar chunks.
+
+        """
+        skipped = sum(1 for r in results if r.get("status") == "skipped")
+        successful = sum(1 for r in results if r["success"]) - skipped
 
         payload: Dict[str, object] = {
             "action": action,
@@ -380,21 +1056,29 @@ class DeskService:
             "executed_at": datetime.now(timezone.utc).isoformat(),
             "total_desks": len(results),
             "successful": successful,
-            "failed": len(results) - successful,
+            "skipped": skipped,
+            "failed": len(results) - successful - skipped,
             "results": results,
         }
 
         if context:
             payload["context"] = context
+        if verification is not None:
+            payload["verification"] = verification
 
         # Use routing key pattern: desk.action.<raise|lower>
         routing_key = "desk.action.%s" % action
 
-        try:
-            success = rabbitmq_client.publish(routing_key, payload)
-            if success:
-                logger.info("✓ Published event to RabbitMQ: %s", routing_key)
-            else:
-                logger.warning("⚠ Failed to publish event to RabbitMQ: %s", routing_key)
-        except Exception as exc:  # pragma: no cover
-            logger.exception("Error publishing to RabbitMQ: %s", exc)
+        if DESK_EVENT_ENCODING != "columnar":
+            return routing_key, [(payload, {})]
+        return routing_key, [
+            (
+                chunk.body,
+                {
+                    "content_type": chunk.content_type,
+                    "content_encoding": chunk.content_encoding,
+                    "headers": chunk.headers,
+                },
+            )
+            for chunk in encode_columnar(payload)
+        ]
@@ -0,0 +1,245 @@
+"""Bulk snapshot of every desk document, shared between concurrent callers."""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.services.desk_service import (
+    DEFAULT_TIMEOUT,
+    DeskService,
+    DeskServiceError,
+    _load_positive_number,
+    _request_timeout,
+)
+
+logger = logging.getLogger(__name__)
+
+DESK_SNAPSHOT_TTL = _load_positive_number("DESK_SNAPSHOT_TTL_SECONDS", 2)
+DESK_SNAPSHOT_CONCURRENCY = int(_load_positive_number("DESK_SNAPSHOT_CONCURRENCY", 16))
+DESK_SNAPSHOT_DESK_TIMEOUT = _load_positive_number(
+    "DESK_SNAPSHOT_DESK_TIMEOUT_SECONDS", DEFAULT_TIMEOUT
+)
+
+FieldPath = Tuple[str, ...]
+
+
+def parse_fields(raw: Optional[str]) -> Optional[List[FieldPath]]:
+    """Parse a ``?fields=`` value like ``state.position_mm,config.name``.
+
+    Returns:
+        List of dotted paths split into segments, or None for "all fields".
+
+    Raises:
+        ValueError: If a path is empty or has an empty segment.
+
+    """
+    if raw is None or not raw.strip():
+        return None
+    paths: List[FieldPath] = []
+    for item in raw.split(","):
+        segments = tuple(part.strip() for part in item.strip().split("."))
+        if not all(segments):
+            raise ValueError("Invalid field path: '%s'" % item.strip())
+        paths.append(segments)
+    return paths
+
+
+def project(
+    document: Dict[str, object], paths: Optional[List[FieldPath]]
+) -> Dict[str, object]:
+    """Keep only ``paths`` of ``document``; missing paths are left out."""
+    if paths is None:
+        return document
+    projected: Dict[str, object] = {}
+    for path in paths:
+        value: object = document
+        for segment in path:
+            if not isinstance(value, dict) or segment not in value:
+                break
+            value = value[segment]
+        else:
+            target = projected
+            for segment in path[:-1]:
+                target = target.setdefault(segment, {})  # type: ignore[assignment]
+            target[path[-1]] = value
+    return projected
+
+
+@dataclass(frozen=True)
+class DeskSnapshotEntry:
+    """One desk in a bulk snapshot: its document, or why it couldn't be read."""
+
+    desk_id: str
+    document: Optional[Dict[str, object]]
+    error: Optional[str] = None
+
+    def as_row(self, paths: Optional[List[FieldPath]] = None) -> Dict[str, object]:
+        """Render the entry as an API row, projected onto ``paths``."""
+        state = None if self.document is None else project(self.document, paths)
+        return {"id": self.desk_id, "state": state, "error": self.error}
+
+
+def positions_at_rest(entries: List[DeskSnapshotEntry]) -> Dict[str, int]:
+    """Return the position of every desk at rest among ``entries``.
+
+    Desks that couldn't be read or are still moving are left out.
+    """
+    positions: Dict[str, int] = {}
+    for entry in entries:
+        state = (entry.document or {}).get("state")
+        if (
+            isinstance(state, dict)
+            and not state.get("speed_mms")
+            and isinstance(state.get("position_mm"), int)
+        ):
+            positions[entry.desk_id] = state["position_mm"]
+    return positions
+
+
+class DeskSnapshotCache:
+    """Concurrently fetched snapshot of all desks, cached for a short TTL.
+
+    The desk list is fetched once and every desk document is then fetched in
+    parallel (at most ``concurrency`` at once, each bounded by
+    ``desk_timeout``). Callers arriving while a snapshot is being built wait
+    for that same build instead of starting their own.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = DESK_SNAPSHOT_TTL,
+        concurrency: int = DESK_SNAPSHOT_CONCURRENCY,
+        desk_timeout: float = DESK_SNAPSHOT_DESK_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty snapshot cache."""
+        self.ttl = ttl
+        self.concurrency = max(1, concurrency)
+        self.desk_timeout = desk_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Optional[List[DeskSnapshotEntry]] = None
+        self._taken_at = 0.0
+        self._inflight: Optional[Future[List[DeskSnapshotEntry]]] = None
+        self._generation = 0
+        self._hits = 0
+        self._builds = 0
+        self._shared_builds = 0
+
+    def get(self) -> List[DeskSnapshotEntry]:
+        """Return the current snapshot, building it if it has expired.
+
+        Raises:
+            DeskServiceError: If the desk list cannot be fetched.
+
+        """
+        with self._lock:
+            if self._entries is not None and self._clock() - self._taken_at < self.ttl:
+                self._hits += 1
+                return self._entries
+            if self._inflight is not None:
+                self._shared_builds += 1
+                shared = self._inflight
+            else:
+                shared = None
+                future: Future[List[DeskSnapshotEntry]] = Future()
+                self._inflight = future
+                generation = self._generation
+                self._builds += 1
+
+        if shared is not None:
+            return shared.result()
+        return self._build(future, generation)
+
+    def positions(self) -> Dict[str, int]:
+        """Return the position of every desk at rest in the snapshot.
+
+        Desks that couldn't be read or are still moving are left out.
+
+        Raises:
+            DeskServiceError: If the desk list cannot be fetched.
+
+        """
+        return positions_at_rest(self.get())
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot; an in-flight build won't be stored."""
+        with self._lock:
+            self._entries = None
+            self._inflight = None
+            self._generation += 1
+
+    def stats(self) -> Dict[str, object]:
+        """Return cache counters."""
+        with self._lock:
+            return {
+                "ttl": self.ttl,
+                "concurrency": self.concurrency,
+                "cached_desks": len(self._entries or []),
+                "hits": self._hits,
+                "builds": self._builds,
+                "shared_builds": self._shared_builds,
+            }
+
+    def _build(
+        self, future: "Future[List[DeskSnapshotEntry]]", generation: int
+    ) -> List[DeskSnapshotEntry]:
+        """Build the snapshot and hand it to callers waiting on ``future``."""
+        try:
+            entries = self._collect()
+        except BaseException as exc:
+            with self._lock:
+                if self._inflight is future:
+                    self._inflight = None
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            if self._inflight is future:
+                self._inflight = None
+            if self._generation == generation:
+                self._entries = entries
+                self._taken_at = self._clock()
+        future.set_result(entries)
+        return entries
+
+    def _collect(self) -> List[DeskSnapshotEntry]:
+        """Fetch the desk list and every desk document concurrently."""
+        desk_ids = DeskService.get_all_desks()
+        if not desk_ids:
+            return []
+
+        def _fetch_one(desk_id: str) -> DeskSnapshotEntry:
+            token = _request_timeout.set(self.desk_timeout)
+            try:
+                document = DeskService.get_desk_document(desk_id)
+                return DeskSnapshotEntry(desk_id, document)
+            except DeskServiceError as exc:
+                logger.warning("✗ Failed to read desk %s: %s", desk_id, exc)
+                return DeskSnapshotEntry(desk_id, None, str(exc))
+            finally:
+                _request_timeout.reset(token)
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(
+            max_workers=min(self.concurrency, len(desk_ids)),
+            thread_name_prefix="desk-snapshot",
+        ) as executor:
+            entries = list(executor.map(_fetch_one, desk_ids))
+
+        failed = sum(1 for entry in entries if entry.error is not None)
+        logger.info(
+            "✓ Desk snapshot of %d desks built in %.3fs (%d failed)",
+            len(entries),
+            time.monotonic() - started,
+            failed,
+        )
+        return entries
+
+
+# Global singleton instance
+desk_snapshot = DeskSnapshotCache()
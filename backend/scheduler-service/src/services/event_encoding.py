@@ -0,0 +1,150 @@
+"""Compact, chunked encoding of ``desk.action.*`` result events."""
+
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from uuid import uuid4
+
+# "json" (one message with a results list) or "columnar"
+DESK_EVENT_ENCODING = os.getenv("DESK_EVENT_ENCODING", "json").lower()
+# "gzip" or "none"; only applies to the columnar encoding
+DESK_EVENT_COMPRESSION = os.getenv("DESK_EVENT_COMPRESSION", "gzip").lower()
+DESK_EVENT_CHUNK_DESKS = max(1, int(os.getenv("DESK_EVENT_CHUNK_DESKS", "1000")))
+
+COLUMNAR_FORMAT = "desk.action.columnar.v1"
+COLUMNAR_CONTENT_TYPE = "application/vnd.desk-action.columnar+json"
+# Index = status code in the "status" column
+STATUS_CODES = ["moved", "skipped", "failed"]
+# Per-desk result fields sent as columns when any desk has them
+OPTIONAL_COLUMNS = ("latency_ms", "arrived", "arrival_s")
+
+
+@dataclass(frozen=True)
+class EncodedChunk:
+    """One message of a columnar event, ready to publish."""
+
+    body: Union[str, bytes]
+    content_type: str
+    content_encoding: Optional[str]
+    headers: Dict[str, object]
+
+
+def encode_columnar(
+    payload: Dict[str, object],
+    *,
+    chunk_desks: int = DESK_EVENT_CHUNK_DESKS,
+    compression: str = DESK_EVENT_COMPRESSION,
+    run_id: Optional[str] = None,
+) -> List[EncodedChunk]:
+    """Split a ``desk.action`` payload into columnar chunks.
+
+    Every chunk carries the run summary (the payload without ``results``),
+    the run id, its position among the chunks and up to ``chunk_desks``
+    desks as columns: ``desk_id``, ``status`` (index into
+    ``status_codes``), ``position_mm`` and, when any desk has them,
+    ``latency_ms``/``arrived``/``arrival_s``. A desk's index in the run is
+    ``desk_offset`` plus its row. The run id and chunk position are also
+    sent as message headers.
+    """
+    results: List[Dict[str, object]] = list(payload.get("results") or [])  # type: ignore[call-overload]
+    summary = {key: value for key, value in payload.items() if key != "results"}
+    run_id = run_id or uuid4().hex
+    chunk_desks = max(1, chunk_desks)
+    starts = list(range(0, len(results), chunk_desks)) or [0]
+    gzipped = compression == "gzip"
+
+    chunks: List[EncodedChunk] = []
+    for chunk, start in enumerate(starts):
+        rows = results[start : start + chunk_desks]
+        columns: Dict[str, List[object]] = {
+            "desk_id": [r["desk_id"] for r in rows],
+            "status": [_status_code(r) for r in rows],
+            "position_mm": [r.get("position_mm") for r in rows],
+        }
+        for name in OPTIONAL_COLUMNS:
+            if any(name in r for r in rows):
+                columns[name] = [r.get(name) for r in rows]
+        document = {
+            "format": COLUMNAR_FORMAT,
+            "run_id": run_id,
+            "chunk": chunk,
+            "chunks": len(starts),
+            "summary": summary,
+            "status_codes": STATUS_CODES,
+            "desk_offset": start,
+            "columns": columns,
+        }
+        body = json.dumps(document, separators=(",", ":"))
+        chunks.append(
+            EncodedChunk(
+                body=gzip.compress(body.encode("utf-8")) if gzipped else body,
+                content_type=COLUMNAR_CONTENT_TYPE,
+                content_encoding="gzip" if gzipped else None,
+                headers={
+                    "run_id": run_id,
+                    "chunk": chunk,
+                    "chunks": len(starts),
+                    "format": COLUMNAR_FORMAT,
+                },
+            )
+        )
+    return chunks
+
+
+def decode_columnar(
+    messages: Iterable[Tuple[Union[str, bytes], Optional[str]]],
+) -> Dict[str, object]:
+    """Reassemble a columnar event from ``(body, content_encoding)`` pairs.
+
+    The chunks may arrive in any order. Returns the summary with the
+    per-desk ``results`` restored, in the shape of the plain JSON event.
+
+    Raises:
+        ValueError: If chunks are missing, mixed between runs or malformed.
+
+    """
+    documents: Dict[int, Dict[str, object]] = {}
+    for body, content_encoding in messages:
+        raw = gzip.decompress(body) if content_encoding == "gzip" else body  # type: ignore[arg-type]
+        document = json.loads(raw)
+        if document.get("format") != COLUMNAR_FORMAT:
+            raise ValueError("Unknown event format: %r" % document.get("format"))
+        documents[document["chunk"]] = document
+
+    if not documents:
+        raise ValueError("No chunks to decode")
+    first = documents[min(documents)]
+    if {d["run_id"] for d in documents.values()} != {first["run_id"]}:
+        raise ValueError("Chunks belong to different runs")
+    if sorted(documents) != list(range(first["chunks"])):  # type: ignore[arg-type]
+        raise ValueError(
+            "Missing chunks of run %s: have %s of %s"
+            % (first["run_id"], sorted(documents), first["chunks"])
+        )
+
+    results: List[Dict[str, object]] = []
+    for index in sorted(documents):
+        columns: Dict[str, List[object]] = documents[index]["columns"]  # type: ignore[assignment]
+        codes: List[str] = documents[index]["status_codes"]  # type: ignore[assignment]
+        for row in range(len(columns["desk_id"])):
+            status = codes[columns["status"][row]]  # type: ignore[index]
+            result: Dict[str, object] = {
+                "desk_id": columns["desk_id"][row],
+                "success": status != "failed",
+                "position_mm": columns["position_mm"][row],
+                "status": status,
+            }
+            for name in OPTIONAL_COLUMNS:
+                if name in columns and columns[name][row] is not None:
+                    result[name] = columns[name][row]
+            results.append(result)
+
+    return {**first["summary"], "run_id": first["run_id"], "results": results}  # type: ignore[dict-item]
+
+
+def _status_code(result: Dict[str, object]) -> int:
+    """Return the status code of one per-desk result."""
+    status = result.get("status") or ("moved" if result.get("success") else "failed")
+    return STATUS_CODES.index(status)  # type: ignore[arg-type]
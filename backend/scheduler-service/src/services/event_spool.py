@@ -0,0 +1,350 @@
+"""Append-only disk spool for events that could not reach RabbitMQ."""
+
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+CURSOR_FILE = "cursor.json"
+# Window used to compute the replay rate
+RATE_WINDOW_SECONDS = 10.0
+
+
+@dataclass
+class SpoolSettings:
+    """Spool limits and durability knobs from environment variables."""
+
+    directory: str = os.getenv("EVENT_SPOOL_DIR", "data/event-spool")
+    segment_bytes: int = int(os.getenv("EVENT_SPOOL_SEGMENT_BYTES", str(4 << 20)))
+    max_bytes: int = int(os.getenv("EVENT_SPOOL_MAX_BYTES", str(256 << 20)))
+    fsync_every: int = int(os.getenv("EVENT_SPOOL_FSYNC_EVERY", "64"))
+    fsync_interval: float = float(
+        os.getenv("EVENT_SPOOL_FSYNC_INTERVAL_SECONDS", "0.2")
+    )
+
+
+@dataclass(frozen=True)
+class SpooledEvent:
+    """An event as published to RabbitMQ or stored in the spool.
+
+    ``body`` is bytes for binary (e.g. compressed) events, which are stored
+    base64-encoded.
+    """
+
+    routing_key: str
+    body: Union[str, bytes]
+    persistent: bool = True
+    content_type: str = "application/json"
+    content_encoding: Optional[str] = None
+    headers: Optional[Dict[str, object]] = None
+
+    def to_record(self) -> Dict[str, object]:
+        """Return the JSON record stored for this event."""
+        record: Dict[str, object] = {
+            "routing_key": self.routing_key,
+            "persistent": self.persistent,
+        }
+        if isinstance(self.body, bytes):
+            record["body_b64"] = base64.b64encode(self.body).decode("ascii")
+        else:
+            record["body"] = self.body
+        if self.content_type != "application/json":
+            record["content_type"] = self.content_type
+        if self.content_encoding is not None:
+            record["content_encoding"] = self.content_encoding
+        if self.headers:
+            record["headers"] = self.headers
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "SpooledEvent":
+        """Rebuild an event from its stored JSON record."""
+        body: Union[str, bytes] = (
+            base64.b64decode(record["body_b64"])
+            if "body_b64" in record
+            else record["body"]
+        )
+        return cls(
+            routing_key=record["routing_key"],
+            body=body,
+            persistent=record.get("persistent", True),
+            content_type=record.get("content_type", "application/json"),
+            content_encoding=record.get("content_encoding"),
+            headers=record.get("headers"),
+        )
+
+
+class EventSpool:
+    """Ordered, disk-backed FIFO of events split into segment files.
+
+    Events are appended as JSON lines to the newest segment, which rolls over
+    once it reaches ``segment_bytes``. Writes are fsynced in batches: after
+    ``fsync_every`` events or ``fsync_interval`` seconds, whichever comes
+    first, so a crash can lose at most that unsynced tail. Readers ``peek`` a
+    batch from the front and ``ack`` it once it has been published; fully
+    replayed segments are deleted and the read position is persisted, so
+    replay resumes in order after a restart (at-least-once). Appends that
+    would grow the spool past ``max_bytes`` are rejected and counted.
+    """
+
+    def __init__(self, settings: Optional[SpoolSettings] = None) -> None:
+        """Open (or create) the spool directory and recover its state."""
+        self.settings = settings or SpoolSettings()
+        self._dir = Path(self.settings.directory)
+        self._lock = threading.Lock()
+        self._segments: List[Path] = []
+        self._writer = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        # Read position: offset into the first segment
+        self._read_offset = 0
+        self._pending = 0
+        self._bytes = 0
+        self._spooled_total = 0
+        self._replayed_total = 0
+        self._dropped_total = 0
+        self._acks: Deque[Tuple[float, int]] = deque()
+        self._opened = False
+
+    # -------- lifecycle --------
+
+    def open(self) -> None:
+        """Create the directory and recover segments left by a previous run."""
+        with self._lock:
+            if self._opened:
+                return
+            self._dir.mkdir(parents=True, exist_ok=True)
+            self._segments = sorted(
+                self._dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")
+            )
+            if self._segments:
+                self._truncate_torn_tail(self._segments[-1])
+            self._read_offset = self._load_cursor()
+            self._bytes = sum(path.stat().st_size for path in self._segments)
+            self._pending = self._count_pending()
+            self._opened = True
+        if self._pending:
+            logger.info("Recovered %d spooled events from %s", self._pending, self._dir)
+
+    def close(self) -> None:
+        """Flush and close the active segment."""
+        with self._lock:
+            self._sync_locked()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    # -------- writes --------
+
+    def append(self, events: Sequence[SpooledEvent]) -> int:
+        """Append events in order; return how many were accepted."""
+        self.open()
+        accepted = 0
+        with self._lock:
+            for event in events:
+                line = (json.dumps(event.to_record()) + "\n").encode("utf-8")
+                if self._bytes + len(line) > self.settings.max_bytes:
+                    break
+                writer = self._active_writer(len(line))
+                writer.write(line)
+                self._bytes += len(line)
+                self._pending += 1
+                self._unsynced += 1
+                accepted += 1
+
+            dropped = len(events) - accepted
+            self._spooled_total += accepted
+            self._dropped_total += dropped
+            if (
+                self._unsynced >= self.settings.fsync_every
+                or time.monotonic() - self._last_sync >= self.settings.fsync_interval
+            ):
+                self._sync_locked()
+
+        if dropped:
+            logger.warning("✗ Event spool full; dropped %d events", dropped)
+        return accepted
+
+    def flush(self) -> None:
+        """Fsync any buffered appends."""
+        with self._lock:
+            self._sync_locked()
+
+    # -------- reads --------
+
+    def peek(self, limit: int) -> List[SpooledEvent]:
+        """Return up to ``limit`` events from the front without removing them."""
+        self.open()
+        with self._lock:
+            # Make buffered appends visible to the reader
+            if self._writer is not None:
+                self._writer.flush()
+            return [event for event, _ in self._read_front(limit)]
+
+    def ack(self, count: int) -> None:
+        """Remove the first ``count`` events after they were published."""
+        if count <= 0:
+            return
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+            entries = self._read_front(count)
+            if not entries:
+                return
+            _, (segment_index, end_offset) = entries[-1]
+            consumed = self._segments[:segment_index]
+            del self._segments[:segment_index]
+            self._read_offset = end_offset
+            self._pending -= len(entries)
+            self._replayed_total += len(entries)
+            self._acks.append((time.monotonic(), len(entries)))
+            if self._pending == 0 and len(self._segments) == 1:
+                # Fully drained: retire the active segment too
+                consumed.extend(self._segments)
+                self._segments.clear()
+                self._read_offset = 0
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+            # Persist the new position before deleting replayed segments
+            self._store_cursor()
+            for path in consumed:
+                self._remove_segment(path)
+
+    def __len__(self) -> int:
+        """Return the number of events waiting to be replayed."""
+        with self._lock:
+            return self._pending
+
+    def stats(self) -> Dict[str, object]:
+        """Return spool size and replay counters."""
+        with self._lock:
+            now = time.monotonic()
+            while self._acks and now - self._acks[0][0] > RATE_WINDOW_SECONDS:
+                self._acks.popleft()
+            replayed_recently = sum(count for _, count in self._acks)
+            return {
+                "directory": str(self._dir),
+                "pending": self._pending,
+                "bytes": self._bytes,
+                "max_bytes": self.settings.max_bytes,
+                "segments": len(self._segments),
+                "spooled_total": self._spooled_total,
+                "replayed_total": self._replayed_total,
+                "dropped_total": self._dropped_total,
+                "replay_rate": replayed_recently / RATE_WINDOW_SECONDS,
+            }
+
+    # -------- internals (called with the lock held) --------
+
+    def _active_writer(self, incoming: int):  # noqa: ANN202
+        """Return the writer for the newest segment, rolling over if full."""
+        if self._writer is not None and (
+            self._writer.tell() + incoming > self.settings.segment_bytes
+        ):
+            self._sync_locked()
+            self._writer.close()
+            self._writer = None
+            self._segments.append(self._next_segment_path())
+        if self._writer is None:
+            if not self._segments:
+                self._segments.append(self._next_segment_path())
+            self._writer = open(self._segments[-1], "ab")  # noqa: SIM115
+        return self._writer
+
+    def _next_segment_path(self) -> Path:
+        """Return a new segment path that sorts after, and never reuses, old ones."""
+        last = (
+            int(self._segments[-1].stem[len(SEGMENT_PREFIX) :]) if self._segments else 0
+        )
+        sequence = max(last + 1, time.time_ns())
+        return self._dir / f"{SEGMENT_PREFIX}{sequence:020d}{SEGMENT_SUFFIX}"
+
+    def _sync_locked(self) -> None:
+        """Flush and fsync the active segment."""
+        if self._writer is not None and self._unsynced:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _read_front(self, limit: int) -> List[Tuple[SpooledEvent, Tuple[int, int]]]:
+        """Read up to ``limit`` events with the (segment, offset) after each."""
+        entries: List[Tuple[SpooledEvent, Tuple[int, int]]] = []
+        for index, path in enumerate(self._segments):
+            if len(entries) >= limit:
+                break
+            with open(path, "rb") as segment:
+                segment.seek(self._read_offset if index == 0 else 0)
+                while len(entries) < limit:
+                    line = segment.readline()
+                    if not line.endswith(b"\n"):
+                        break
+                    event = self._decode(line, path)
+                    if event is not None:
+                        entries.append((event, (index, segment.tell())))
+        return entries
+
+    @staticmethod
+    def _decode(line: bytes, path: Path) -> Optional[SpooledEvent]:
+        """Decode one spooled line, skipping corrupt records."""
+        try:
+            return SpooledEvent.from_record(json.loads(line))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Skipping corrupt spool record in %s", path.name)
+            return None
+
+    def _remove_segment(self, path: Path) -> None:
+        """Delete a replayed segment file."""
+        self._bytes -= path.stat().st_size
+        path.unlink(missing_ok=True)
+
+    def _count_pending(self) -> int:
+        """Count events from the read position to the end of the spool."""
+        return len(self._read_front(limit=1 << 62))
+
+    def _load_cursor(self) -> int:
+        """Load the persisted read position, discarding replayed segments."""
+        try:
+            cursor = json.loads((self._dir / CURSOR_FILE).read_text())
+        except (OSError, ValueError):
+            return 0
+        names = [path.name for path in self._segments]
+        if cursor.get("segment") not in names:
+            return 0
+        # Segments before the cursor were replayed but not yet deleted
+        index = names.index(cursor["segment"])
+        for path in self._segments[:index]:
+            path.unlink()
+        del self._segments[:index]
+        return int(cursor.get("offset", 0))
+
+    def _store_cursor(self) -> None:
+        """Atomically persist the read position."""
+        cursor = {
+            "segment": self._segments[0].name if self._segments else None,
+            "offset": self._read_offset,
+        }
+        tmp = self._dir / (CURSOR_FILE + ".tmp")
+        tmp.write_text(json.dumps(cursor))
+        os.replace(tmp, self._dir / CURSOR_FILE)
+
+    @staticmethod
+    def _truncate_torn_tail(path: Path) -> None:
+        """Cut off a partially written last line left by a crash."""
+        data = path.read_bytes()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            with open(path, "r+b") as segment:
+                segment.truncate(end)
+            logger.warning("Truncated torn write at the end of %s", path.name)
@@ -3,8 +3,15 @@ from __future__ import annotations
 import json
 import logging
 import os
-from dataclasses import dataclass
-from typing import Optional
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Union
+
+from src.services.event_spool import EventSpool, SpooledEvent
 
 try:
     import pika
@@ -25,16 +32,68 @@ class RabbitMQSettings:
     password: str = os.getenv("RABBITMQ_PASSWORD", "guest")
     exchange: str = os.getenv("RABBITMQ_EXCHANGE", "desk_scheduler_events")
     exchange_type: str = os.getenv("RABBITMQ_EXCHANGE_TYPE", "topic")
+    spool_enabled: bool = os.getenv("EVENT_SPOOL_ENABLED", "true").lower() == "true"
+    replay_interval: float = float(
+        os.getenv("EVENT_SPOOL_REPLAY_INTERVAL_SECONDS", "1")
+    )
+    replay_batch_size: int = int(os.getenv("EVENT_SPOOL_REPLAY_BATCH_SIZE", "100"))
+    replay_backoff_max: float = float(
+        os.getenv("EVENT_SPOOL_REPLAY_BACKOFF_MAX_SECONDS", "30")
+    )
+    heartbeat: int = int(os.getenv("RABBITMQ_HEARTBEAT_SECONDS", "60"))
+    publish_confirms: bool = (
+        os.getenv("RABBITMQ_PUBLISH_CONFIRMS", "true").lower() == "true"
+    )
+    publish_timeout: float = float(os.getenv("RABBITMQ_PUBLISH_TIMEOUT_SECONDS", "10"))
+
+
+@dataclass
+class _PublishRequest:
+    """An event handed to the publisher thread, with its outcome."""
+
+    event: SpooledEvent
+    result: "Future[bool]" = field(default_factory=Future)
+
+
+# Queued by stop_publisher() to end the publisher thread
+_STOP = object()
 
 
 class RabbitMQClient:
-    """Thin wrapper around pika to simplify publishing events to RabbitMQ."""
+    """Thin wrapper around pika to simplify publishing events to RabbitMQ.
+
+    With a ``spool``, events that can't be published are appended to it
+    instead of being lost, and later events are spooled behind them to keep
+    their order. A replay thread (see ``start_replay``) publishes the spool
+    in batches once the broker is reachable again.
 
-    def __init__(self, settings: Optional[RabbitMQSettings] = None) -> None:
+    A pika ``BlockingConnection`` must only be used by one thread, so the
+    service runs a publisher thread (see ``start_publisher``) that owns the
+    connection: ``publish`` hands events to it through a queue from any
+    thread and waits for the broker's confirm, and while idle the thread
+    services heartbeats and replays the spool. Without the publisher thread
+    ``publish`` uses the connection directly.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[RabbitMQSettings] = None,
+        *,
+        spool: Optional[EventSpool] = None,
+    ) -> None:
         self.settings = settings or RabbitMQSettings()
         self._connection: Optional[pika.BlockingConnection] = None
         self._channel: Optional[pika.channel.Channel] = None
         self._connected = False
+        self._spool = spool
+        # Serialises channel use between publishers and the replay thread
+        self._lock = threading.RLock()
+        self._replay_stop = threading.Event()
+        self._replay_thread: Optional[threading.Thread] = None
+        self._requests: "queue.Queue[Union[_PublishRequest, object]]" = queue.Queue()
+        self._publisher_thread: Optional[threading.Thread] = None
+        self._published_total = 0
+        self._failed_total = 0
 
     # Lifecycle management
 
@@ -55,12 +114,15 @@ class RabbitMQClient:
                 host=self.settings.host,
                 port=self.settings.port,
                 credentials=credentials,
-                heartbeat=600,
+                heartbeat=self.settings.heartbeat,
                 blocked_connection_timeout=300,
             )
 
             self._connection = pika.BlockingConnection(parameters)
             self._channel = self._connection.channel()
+            if self.settings.publish_confirms:
+                # basic_publish then waits for the broker to take the message
+                self._channel.confirm_delivery()
 
             # Declare the exchange
             self._channel.exchange_declare(
@@ -111,48 +173,298 @@ class RabbitMQClient:
 
     # Publishing helpers
 
-    def publish(
+    def publish(  # noqa: PLR0913
         self,
         routing_key: str,
         payload: object,
         persistent: bool = True,
+        *,
+        content_type: str = "application/json",
+        content_encoding: Optional[str] = None,
+        headers: Optional[Dict[str, object]] = None,
     ) -> bool:
-        """Publish ``payload`` with ``routing_key`` and return ``True`` on success."""
+        """Publish ``payload`` with ``routing_key`` and return ``True`` on success.
+
+        When the event can't be published and a spool is configured, it is
+        spooled for replay (``False`` is still returned). With the publisher
+        thread running, this waits up to ``publish_timeout`` seconds for the
+        thread to publish the event. With a ``content_encoding`` (e.g.
+        ``gzip``) a bytes payload is sent as is.
+        """
+        body: Union[str, bytes] = (
+            bytes(payload)
+            if content_encoding and isinstance(payload, (bytes, bytearray))
+            else self._serialise_payload(payload)
+        )
+        event = SpooledEvent(
+            routing_key,
+            body,
+            persistent,
+            content_type=content_type,
+            content_encoding=content_encoding,
+            headers=headers,
+        )
+
+        if self._publisher_running():
+            return self._publish_via_thread(event)
+
+        with self._lock:
+            return self._publish_locked(event)
+
+    # Publisher thread
+
+    def start_publisher(self) -> None:
+        """Start the thread that owns the connection and publishes all events.
+
+        It also replays the spool, so ``start_replay`` is not needed with it.
+        """
+        if self._publisher_running():
+            return
+        if self._spool is not None:
+            self._spool.open()
+        self._publisher_thread = threading.Thread(
+            target=self._publisher_loop, name="rabbitmq-publisher", daemon=True
+        )
+        self._publisher_thread.start()
+        logger.info("RabbitMQ publisher thread started")
+
+    def stop_publisher(self, timeout: float = 10.0) -> None:
+        """Publish the queued events, then stop the thread and disconnect."""
+        if self._publisher_thread is None:
+            return
+        self._requests.put(_STOP)
+        self._publisher_thread.join(timeout)
+        self._publisher_thread = None
+
+    def publisher_stats(self) -> Dict[str, object]:
+        """Return publisher thread state and counters."""
+        return {
+            "thread_running": self._publisher_running(),
+            "connected": self._connected,
+            "queued": self._requests.qsize(),
+            "published_total": self._published_total,
+            "failed_total": self._failed_total,
+            "confirms": self.settings.publish_confirms,
+        }
+
+    def _publisher_running(self) -> bool:
+        return self._publisher_thread is not None and self._publisher_thread.is_alive()
+
+    def _publish_via_thread(self, event: SpooledEvent) -> bool:
+        """Queue an event for the publisher thread and wait for its confirm."""
+        request = _PublishRequest(event)
+        self._requests.put(request)
+        try:
+            return request.result.result(timeout=self.settings.publish_timeout)
+        except FutureTimeoutError:
+            # Still queued; it will be published or spooled in order
+            logger.warning(
+                "No confirm within %ss for routing_key %s",
+                self.settings.publish_timeout,
+                event.routing_key,
+            )
+            return False
+
+    def _publisher_loop(self) -> None:
+        """Publish queued events; service heartbeats and replay while idle."""
+        # Often enough for the broker to see a heartbeat every interval
+        idle_wait = max(0.1, min(1.0, self.settings.heartbeat / 4))
+        replay_delay = self.settings.replay_interval
+        next_replay = time.monotonic() + replay_delay
+        stopping = False
+        while not stopping:
+            timeout = idle_wait
+            if self._spool is not None and len(self._spool):
+                timeout = min(timeout, max(0.0, next_replay - time.monotonic()))
+            try:
+                item = self._requests.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    self._handle_request(item)  # type: ignore[arg-type]
+                try:
+                    item = self._requests.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if (
+                not stopping
+                and self._spool is not None
+                and len(self._spool)
+                and time.monotonic() >= next_replay
+            ):
+                replay_delay = self._replay_once(replay_delay)
+                next_replay = time.monotonic() + replay_delay
+            self._service_heartbeats()
+
+        self.disconnect()
+        logger.info("RabbitMQ publisher thread stopped")
+
+    def _handle_request(self, request: _PublishRequest) -> None:
+        """Publish one queued event on the publisher thread."""
+        try:
+            with self._lock:
+                published = self._publish_locked(request.event)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.exception("RabbitMQ publisher failed: %s", exc)
+            published = False
+        request.result.set_result(published)
+
+    def _service_heartbeats(self) -> None:
+        """Let pika answer heartbeats and detect a dead connection."""
+        if not self._connected or self._connection is None:
+            return
+        try:
+            with self._lock:
+                self._connection.process_data_events(time_limit=0)
+        except Exception as exc:  # pragma: no cover - network failure path
+            logger.warning("RabbitMQ connection lost while idle: %s", exc)
+            self._connected = False
+
+    # Spool replay
+
+    def start_replay(self) -> None:
+        """Start the background thread that replays spooled events."""
+        if self._spool is None or (
+            self._replay_thread is not None and self._replay_thread.is_alive()
+        ):
+            return
+        self._spool.open()
+        self._replay_stop.clear()
+        self._replay_thread = threading.Thread(
+            target=self._replay_loop, name="rabbitmq-spool-replay", daemon=True
+        )
+        self._replay_thread.start()
+
+    def stop_replay(self, timeout: float = 5.0) -> None:
+        """Stop the replay thread and close the spool."""
+        if self._replay_thread is not None:
+            self._replay_stop.set()
+            self._replay_thread.join(timeout)
+            self._replay_thread = None
+        if self._spool is not None:
+            self._spool.close()
+
+    def replay_spool(self) -> bool:
+        """Publish one batch of spooled events in order.
+
+        Returns:
+            ``True`` if the batch was fully published (or the spool is empty).
+
+        """
+        if self._spool is None:
+            return True
+
+        with self._lock:
+            batch = self._spool.peek(self.settings.replay_batch_size)
+            if not batch:
+                return True
+            if not self._ensure_connection():
+                return False
+            published = 0
+            for event in batch:
+                if not self._basic_publish(event):
+                    break
+                published += 1
+            self._spool.ack(published)
+
+        if published:
+            logger.info("Replayed %d spooled RabbitMQ events", published)
+        return published == len(batch)
+
+    def spool_stats(self) -> Optional[Dict[str, object]]:
+        """Return spool size and replay counters, or None without a spool."""
+        return None if self._spool is None else self._spool.stats()
+
+    def _replay_loop(self) -> None:
+        """Replay the spool until stopped, backing off while the broker is down."""
+        delay = self.settings.replay_interval
+        while not self._replay_stop.wait(delay):
+            delay = self._replay_once(delay)
+
+    def _replay_once(self, delay: float) -> float:
+        """Replay one batch and return how long to wait before the next one."""
+        try:
+            replayed = self.replay_spool()
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.exception("Spool replay failed: %s", exc)
+            replayed = False
+        if replayed and self._spool is not None and len(self._spool):
+            # More to drain; go again straight away
+            return 0
+        if replayed:
+            self._spool.flush()  # type: ignore[union-attr]
+            return self.settings.replay_interval
+        return min(
+            max(delay * 2, self.settings.replay_interval),
+            self.settings.replay_backoff_max,
+        )
+
+    # Internal helpers
+
+    def _publish_locked(self, event: SpooledEvent) -> bool:
+        """Publish or spool one event; the caller holds ``_lock``."""
+        if self._spool is not None and len(self._spool):
+            # Older events are still spooled; queue up behind them
+            self._spool_event(event)
+            return False
+
         if not self._ensure_connection():
             logger.warning(
                 "Skipping RabbitMQ publish because the client is not connected "
                 "(routing_key=%s)",
-                routing_key,
+                event.routing_key,
             )
+            self._spool_event(event)
+            return False
+
+        if not self._basic_publish(event):
+            self._spool_event(event)
             return False
 
-        payload_str = self._serialise_payload(payload)
+        logger.debug(
+            "Published RabbitMQ message with routing_key: %s", event.routing_key
+        )
+        return True
 
+    def _basic_publish(self, event: SpooledEvent) -> bool:
+        """Send one message on the open channel; return ``True`` on success."""
         try:
             properties = pika.BasicProperties(
-                delivery_mode=2 if persistent else 1,  # 2 = persistent
-                content_type="application/json",
+                delivery_mode=2 if event.persistent else 1,  # 2 = persistent
+                content_type=event.content_type,
+                content_encoding=event.content_encoding,
+                headers=event.headers,
             )
 
             self._channel.basic_publish(
                 exchange=self.settings.exchange,
-                routing_key=routing_key,
-                body=payload_str,
+                routing_key=event.routing_key,
+                body=event.body,
                 properties=properties,
             )
         except Exception as exc:  # pragma: no cover - network failure path
             logger.exception(
                 "RabbitMQ publish failed for routing_key %s: %s",
-                routing_key,
+                event.routing_key,
                 exc,
             )
             self._connected = False  # Mark as disconnected to trigger reconnect
+            self._failed_total += 1
             return False
-
-        logger.debug("Published RabbitMQ message with routing_key: %s", routing_key)
+        self._published_total += 1
         return True
 
-    # Internal helpers
+    def _spool_event(self, event: SpooledEvent) -> None:
+        """Append an unpublished event to the spool, if one is configured."""
+        if self._spool is None:
+            return
+        if self._spool.append([event]):
+            logger.warning("Spooled RabbitMQ event for replay: %s", event.routing_key)
 
     @staticmethod
     def _serialise_payload(payload: object) -> str:
@@ -164,4 +476,7 @@ class RabbitMQClient:
 
 
 # Shared singleton used across the service
-rabbitmq_client = RabbitMQClient()
+rabbitmq_settings = RabbitMQSettings()
+# Also used by the asyncio client (see async_rabbitmq_client)
+event_spool = EventSpool() if rabbitmq_settings.spool_enabled else None
+rabbitmq_client = RabbitMQClient(rabbitmq_settings, spool=event_spool)
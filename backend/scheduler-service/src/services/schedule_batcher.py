@@ -0,0 +1,131 @@
+"""Merge schedules that fire together into a single desk move plan."""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.services.desk_service import _load_positive_number
+
+logger = logging.getLogger(__name__)
+
+# Merge schedules firing in the same minute into one move plan
+SCHEDULER_BATCH_ENABLED = (
+    os.getenv("SCHEDULER_BATCH_ENABLED", "false").lower() == "true"
+)
+# How long the first schedule of a minute waits for the others to fire
+SCHEDULER_BATCH_WINDOW = min(
+    _load_positive_number("SCHEDULER_BATCH_WINDOW_SECONDS", 2), 30
+)
+
+
+@dataclass(frozen=True)
+class ScheduledMove:
+    """One fired schedule waiting to be merged into a move plan."""
+
+    job_id: str
+    name: str
+    action: str
+    position_mm: int
+
+
+class ScheduleBatcher:
+    """Collects schedules that fire together and executes them as one plan.
+
+    The first schedule to fire opens a batch and waits ``window`` seconds;
+    every schedule firing meanwhile joins that batch and returns at once.
+    The first one then hands the whole batch, in firing order, to
+    ``execute``. Cron triggers have minute resolution, so schedules of the
+    same minute fire within a fraction of the window.
+
+    Coroutine jobs use ``submit_async``, which waits on the event loop and
+    hands the batch to ``execute_async``.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[List[ScheduledMove]], None],
+        *,
+        window: float = SCHEDULER_BATCH_WINDOW,
+        sleep: Callable[[float], None] = time.sleep,
+        execute_async: Optional[
+            Callable[[List[ScheduledMove]], Awaitable[None]]
+        ] = None,
+    ) -> None:
+        """Initialize a batcher that passes each batch to ``execute``."""
+        self.window = window
+        self._execute = execute
+        self._execute_async = execute_async
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._pending: Optional[List[ScheduledMove]] = None
+        self._plans = 0
+        self._moves = 0
+        self._largest = 0
+
+    def submit(self, move: ScheduledMove) -> bool:
+        """Add a fired schedule to the open batch, opening one if needed.
+
+        Returns:
+            Whether this call executed the batch (False if it only joined).
+
+        """
+        if not self._join(move):
+            return False
+        self._sleep(self.window)
+        self._execute(self._close())
+        return True
+
+    async def submit_async(self, move: ScheduledMove) -> bool:
+        """Like ``submit``, but wait and execute on the event loop.
+
+        Returns:
+            Whether this call executed the batch (False if it only joined).
+
+        """
+        if self._execute_async is None:
+            raise RuntimeError("ScheduleBatcher has no execute_async callback")
+        if not self._join(move):
+            return False
+        await asyncio.sleep(self.window)
+        await self._execute_async(self._close())
+        return True
+
+    def _join(self, move: ScheduledMove) -> bool:
+        """Add a move to the open batch; return True if it opened the batch."""
+        with self._lock:
+            self._moves += 1
+            if self._pending is not None:
+                self._pending.append(move)
+                return False
+            self._pending = [move]
+            return True
+
+    def _close(self) -> List[ScheduledMove]:
+        """Close the open batch and return its moves in firing order."""
+        with self._lock:
+            moves = self._pending or []
+            self._pending = None
+            self._plans += 1
+            self._largest = max(self._largest, len(moves))
+
+        logger.info(
+            "Executing %d co-firing schedules as one plan: %s",
+            len(moves),
+            [m.job_id for m in moves],
+        )
+        return moves
+
+    def stats(self) -> Dict[str, object]:
+        """Return batching counters."""
+        with self._lock:
+            return {
+                "window": self.window,
+                "plans": self._plans,
+                "moves": self._moves,
+                "largest_plan": self._largest,
+                "pending": len(self._pending or []),
+            }
@@ -0,0 +1,58 @@
+"""Summaries of scheduled desk moves for the run history."""
+
+import math
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from src.models.db.schedule_run import ScheduleRun
+
+
+def percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    """Return the ``fraction`` percentile (e.g. 0.99), or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize_run(  # noqa: PLR0913
+    *,
+    job_id: str,
+    action: str,
+    position_mm: int,
+    started_at: datetime,
+    finished_at: datetime,
+    duration_s: float,
+    results: List[Dict[str, object]],
+    error: Optional[str] = None,
+    superseded_by: Optional[str] = None,
+) -> ScheduleRun:
+    """Build the history row of a run from its per-desk results."""
+    latencies: Dict[str, float] = {
+        str(r["desk_id"]): float(r["latency_ms"])  # type: ignore[arg-type]
+        for r in results
+        if r.get("latency_ms") is not None
+    }
+    samples = list(latencies.values())
+    statuses = [r.get("status") for r in results]
+    skipped = statuses.count("skipped")
+    successful = sum(1 for r in results if r.get("success")) - skipped
+    return ScheduleRun(
+        job_id=job_id,
+        action=action,
+        position_mm=position_mm,
+        started_at=started_at,
+        finished_at=finished_at,
+        duration_s=round(duration_s, 3),
+        total_desks=len(results),
+        successful=successful,
+        failed=len(results) - successful - skipped,
+        skipped=skipped,
+        latency_p50_ms=percentile(samples, 0.5),
+        latency_p95_ms=percentile(samples, 0.95),
+        latency_max_ms=max(samples, default=None),
+        desk_latencies_ms=latencies,
+        error=error,
+        superseded_by=superseded_by,
+    )
@@ -0,0 +1,190 @@
+"""Prefetch the desk inventory shortly before a schedule fires."""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.services.desk_service import _load_positive_number
+
+logger = logging.getLogger(__name__)
+
+# Fetch the desk list (and positions) before each run instead of at its start
+SCHEDULER_WARMUP_ENABLED = (
+    os.getenv("SCHEDULER_WARMUP_ENABLED", "false").lower() == "true"
+)
+# How long before a job's next run time the inventory is fetched
+SCHEDULER_WARMUP_LEAD = _load_positive_number("SCHEDULER_WARMUP_LEAD_SECONDS", 15)
+# How often the next run time is re-read while no warmup is due
+SCHEDULER_WARMUP_POLL = _load_positive_number("SCHEDULER_WARMUP_POLL_SECONDS", 30)
+
+# Desk ids and, when a snapshot was taken, the positions of desks at rest
+Inventory = Tuple[List[str], Optional[Dict[str, int]]]
+
+
+def _utcnow() -> datetime:
+    """Return the current time in UTC."""
+    return datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class WarmInventory:
+    """Desk inventory fetched ahead of the run due at ``fire_time``."""
+
+    fire_time: datetime
+    fetched_at: datetime
+    desk_ids: List[str]
+    positions: Optional[Dict[str, int]] = None
+
+
+class ScheduleWarmup:
+    """Keeps the desk inventory warm for the next scheduled run.
+
+    A background thread reads the earliest next run time of the jobs and,
+    ``lead`` seconds before it, calls ``prefetch`` for the desk list (and a
+    position snapshot). Runs starting between ``lead`` seconds before and
+    ``max_delay`` seconds after that run time ``take`` the prefetched
+    inventory instead of fetching it themselves, until it is invalidated.
+    Job changes are noticed within ``poll`` seconds; a failed prefetch is
+    not retried, the run then simply fetches the inventory itself.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        next_fire_time: Callable[[], Optional[datetime]],
+        prefetch: Callable[[], Inventory],
+        *,
+        lead: float = SCHEDULER_WARMUP_LEAD,
+        poll: float = SCHEDULER_WARMUP_POLL,
+        max_delay: float = 60,
+        clock: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        """Initialize a warmup; call ``start`` to run it in the background."""
+        self.lead = lead
+        self.poll = poll
+        self.max_delay = max_delay
+        self._next_fire_time = next_fire_time
+        self._prefetch = prefetch
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inventory: Optional[WarmInventory] = None
+        self._attempted: Optional[datetime] = None
+        self._warmups = 0
+        self._failures = 0
+        self._used = 0
+        self._missed = 0
+
+    def start(self) -> None:
+        """Start the warmup thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="schedule-warmup", daemon=True
+        )
+        self._thread.start()
+        logger.info("Schedule warmup started (lead=%ss)", self.lead)
+
+    def stop(self) -> None:
+        """Stop the warmup thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def take(self) -> Optional[WarmInventory]:
+        """Return the inventory prefetched for a run starting now, if any.
+
+        Every run of the same run time gets the same inventory.
+        """
+        now = self._clock()
+        with self._lock:
+            inventory = self._inventory
+            if inventory is not None and (
+                inventory.fire_time - timedelta(seconds=self.lead)
+                <= now
+                <= inventory.fire_time + timedelta(seconds=self.max_delay)
+            ):
+                self._used += 1
+                return inventory
+            self._missed += 1
+            return None
+
+    def invalidate(self) -> None:
+        """Drop the inventory, e.g. once desks have moved."""
+        with self._lock:
+            self._inventory = None
+
+    def tick(self) -> float:
+        """Prefetch the inventory if the next run is due within ``lead``.
+
+        Returns:
+            Seconds to wait before the next tick.
+
+        """
+        fire_time = self._next_fire_time()
+        if fire_time is None:
+            return self.poll
+        now = self._clock()
+        until_warmup = (fire_time - now).total_seconds() - self.lead
+        if until_warmup > 0:
+            return min(self.poll, until_warmup)
+
+        if self._attempted != fire_time:
+            self._attempted = fire_time
+            self.warm(fire_time)
+        # Nothing to do until this run has fired and the next one is known
+        return max(1.0, min(self.poll, (fire_time - self._clock()).total_seconds()))
+
+    def warm(self, fire_time: datetime) -> Optional[WarmInventory]:
+        """Prefetch the inventory for the run due at ``fire_time``."""
+        try:
+            desk_ids, positions = self._prefetch()
+        except Exception as exc:  # noqa: BLE001
+            with self._lock:
+                self._inventory = None
+                self._failures += 1
+            logger.warning("✗ Warmup for run at %s failed: %s", fire_time, exc)
+            return None
+
+        inventory = WarmInventory(fire_time, self._clock(), desk_ids, positions)
+        with self._lock:
+            self._inventory = inventory
+            self._warmups += 1
+        logger.info(
+            "✓ Warmed %d desks for run at %s (%.1fs ahead)",
+            len(desk_ids),
+            fire_time.isoformat(),
+            (fire_time - inventory.fetched_at).total_seconds(),
+        )
+        return inventory
+
+    def stats(self) -> Dict[str, object]:
+        """Return warmup counters and the current inventory."""
+        with self._lock:
+            inventory = self._inventory
+            return {
+                "lead": self.lead,
+                "running": self._thread is not None,
+                "warmups": self._warmups,
+                "failures": self._failures,
+                "used": self._used,
+                "missed": self._missed,
+                "fire_time": inventory.fire_time.isoformat() if inventory else None,
+                "fetched_at": inventory.fetched_at.isoformat() if inventory else None,
+                "desks": len(inventory.desk_ids) if inventory else 0,
+            }
+
+    def _run(self) -> None:
+        """Tick until stopped."""
+        while not self._stop.is_set():
+            try:
+                delay = self.tick()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("✗ Schedule warmup failed: %s", exc)
+                delay = self.poll
+            self._stop.wait(delay)
@@ -0,0 +1,222 @@
+"""Lease-based leader election between scheduler-service replicas."""
+
+import logging
+import os
+import socket
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+from uuid import uuid4
+
+from sqlalchemy import insert, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from src.models.db.scheduler_lease import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    """Return the current time in UTC."""
+    return datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class LeaderSettings:
+    """Lease parameters from environment variables.
+
+    Attributes:
+        lease_name: Name of the lease row shared by the replicas.
+        ttl: Seconds a lease stays valid without renewal; a standby takes
+            over at most this long after the leader died.
+        renew_interval: Seconds between renewals (and takeover attempts).
+
+    """
+
+    lease_name: str = os.getenv("SCHEDULER_LEASE_NAME", "scheduler")
+    ttl: float = float(os.getenv("SCHEDULER_LEASE_TTL_SECONDS", "15"))
+    renew_interval: float = float(os.getenv("SCHEDULER_LEASE_RENEW_SECONDS", "5"))
+
+
+class LeaderElector:
+    """Keeps at most one replica the leader through a lease row.
+
+    Every ``renew_interval`` each replica tries to take or extend the lease
+    with a single conditional ``UPDATE`` (it succeeds only for the current
+    holder or once the lease has expired), inserting the row on first use.
+    ``on_elected`` runs when this replica becomes the leader, ``on_demoted``
+    when it loses the lease, can't reach the database or stops; while leader,
+    ``on_renewed`` runs after every renewal. Replica clocks must agree to
+    well within ``ttl``.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        engine: Engine,
+        *,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        on_renewed: Optional[Callable[[], None]] = None,
+        settings: Optional[LeaderSettings] = None,
+        holder: Optional[str] = None,
+        clock: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        """Initialize a follower; call ``start`` to begin campaigning."""
+        self.settings = settings or LeaderSettings()
+        self.holder = holder or "%s-%d-%s" % (
+            socket.gethostname(),
+            os.getpid(),
+            uuid4().hex[:8],
+        )
+        self._engine = engine
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self._on_renewed = on_renewed
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._is_leader = False
+        self._elected_at: Optional[datetime] = None
+        self._elections = 0
+        self._errors = 0
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this replica currently holds the lease."""
+        with self._lock:
+            return self._is_leader
+
+    def start(self) -> None:
+        """Create the lease table if needed and start campaigning."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        SchedulerLease.__table__.create(self._engine, checkfirst=True)  # type: ignore[attr-defined]
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="scheduler-leader", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Leader election started as %s (lease=%s, ttl=%ss)",
+            self.holder,
+            self.settings.lease_name,
+            self.settings.ttl,
+        )
+
+    def stop(self) -> None:
+        """Stop campaigning and hand the lease over to a standby."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.settings.renew_interval + 5)
+            self._thread = None
+        if self.is_leader:
+            self._release()
+            self._set_leader(False)
+
+    def campaign(self) -> bool:
+        """Take or renew the lease once and update leadership.
+
+        Returns:
+            Whether this replica is the leader afterwards.
+
+        """
+        try:
+            acquired = self._acquire()
+        except SQLAlchemyError as exc:
+            self._errors += 1
+            logger.error("✗ Leader lease check failed: %s", exc)
+            acquired = False
+
+        self._set_leader(acquired)
+        if acquired and self._on_renewed is not None:
+            self._on_renewed()
+        return acquired
+
+    def stats(self) -> Dict[str, object]:
+        """Return the leadership state of this replica."""
+        with self._lock:
+            return {
+                "holder": self.holder,
+                "is_leader": self._is_leader,
+                "elected_at": self._elected_at.isoformat()
+                if self._elected_at
+                else None,
+                "elections": self._elections,
+                "errors": self._errors,
+                "lease_name": self.settings.lease_name,
+                "ttl": self.settings.ttl,
+            }
+
+    def _run(self) -> None:
+        """Campaign every ``renew_interval`` until stopped."""
+        while not self._stop.is_set():
+            self.campaign()
+            self._stop.wait(self.settings.renew_interval)
+
+    def _acquire(self) -> bool:
+        """Take the lease if free or expired, or extend it if already held."""
+        now = self._clock()
+        expires_at = now + timedelta(seconds=self.settings.ttl)
+        table = SchedulerLease.__table__  # type: ignore[attr-defined]
+        with self._engine.begin() as connection:
+            result = connection.execute(
+                update(table)
+                .where(
+                    table.c.name == self.settings.lease_name,
+                    (table.c.holder == self.holder) | (table.c.expires_at <= now),
+                )
+                .values(holder=self.holder, expires_at=expires_at)
+            )
+            if result.rowcount == 1:
+                return True
+        try:
+            with self._engine.begin() as connection:
+                connection.execute(
+                    insert(table).values(
+                        name=self.settings.lease_name,
+                        holder=self.holder,
+                        expires_at=expires_at,
+                    )
+                )
+        except IntegrityError:
+            # Another replica holds the lease
+            return False
+        return True
+
+    def _release(self) -> None:
+        """Expire the lease now so a standby can take over immediately."""
+        table = SchedulerLease.__table__  # type: ignore[attr-defined]
+        try:
+            with self._engine.begin() as connection:
+                connection.execute(
+                    update(table)
+                    .where(
+                        table.c.name == self.settings.lease_name,
+                        table.c.holder == self.holder,
+                    )
+                    .values(expires_at=self._clock())
+                )
+        except SQLAlchemyError as exc:
+            logger.warning("Failed to release leader lease: %s", exc)
+
+    def _set_leader(self, leader: bool) -> None:
+        """Record leadership and run the elected/demoted callback on change."""
+        with self._lock:
+            changed = leader != self._is_leader
+            self._is_leader = leader
+            if changed and leader:
+                self._elected_at = self._clock()
+                self._elections += 1
+            elif changed:
+                self._elected_at = None
+        if not changed:
+            return
+        if leader:
+            logger.info("✓ %s is now the scheduler leader", self.holder)
+            self._on_elected()
+        else:
+            logger.warning("%s is no longer the scheduler leader", self.holder)
+            self._on_demoted()
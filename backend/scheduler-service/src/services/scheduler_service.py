@@ -1,46 +1,425 @@
+import asyncio
 import logging
-from typing import Any, Dict, List
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
 
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.schedulers.base import STATE_RUNNING
+from apscheduler.schedulers.base import (
+    STATE_PAUSED,
+    STATE_RUNNING,
+    STATE_STOPPED,
+    BaseScheduler,
+)
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
 
 from src.models.db.schedule import Schedule as DBSchedule
+from src.models.db.schedule_run import ScheduleRun
 from src.repositories.schedule_repository import ScheduleRepository
-from src.services.desk_service import DeskService
+from src.repositories.schedule_run_repository import ScheduleRunRepository
+from src.services.async_desk_service import async_desk_service
+from src.services.desk_service import BULK_MOVE_SKIP_NOOP, DeskService
+from src.services.desk_snapshot import desk_snapshot, positions_at_rest
+from src.services.schedule_batcher import (
+    SCHEDULER_BATCH_ENABLED,
+    ScheduleBatcher,
+    ScheduledMove,
+)
+from src.services.schedule_runs import summarize_run
+from src.services.schedule_warmup import (
+    SCHEDULER_WARMUP_ENABLED,
+    Inventory,
+    ScheduleWarmup,
+)
+from src.services.scheduler_leader import LeaderElector
 
 logger = logging.getLogger(__name__)
 
+# Keep jobs in the database and fire them on the elected leader replica only
+SCHEDULER_DB_JOBSTORE_ENABLED = (
+    os.getenv("SCHEDULER_DB_JOBSTORE_ENABLED", "true").lower() == "true"
+)
+# A job may still run this late, e.g. right after a failover
+SCHEDULER_MISFIRE_GRACE_SECONDS = int(
+    os.getenv("SCHEDULER_MISFIRE_GRACE_SECONDS", "60")
+)
+SCHEDULER_JOBS_TABLE = "apscheduler_jobs"
+# Run jobs as coroutines on the app's event loop instead of on threads
+SCHEDULER_ASYNCIO_ENABLED = (
+    os.getenv("SCHEDULER_ASYNCIO_ENABLED", "false").lower() == "true"
+)
+
+
+def run_scheduled_move(job_id: str, name: str, action: str, position_mm: int) -> None:
+    """Run one scheduled raise/lower; the callable stored with every job.
+
+    A module-level function (rather than a closure) so jobs can be persisted
+    in the database jobstore. With ``SCHEDULER_BATCH_ENABLED`` the move joins
+    the plan of all schedules firing in the same minute instead.
+    """
+    if SCHEDULER_BATCH_ENABLED:
+        schedule_batcher.submit(ScheduledMove(job_id, name, action, position_mm))
+        return
+
+    _run_schedule_move(action, position_mm, _schedule_context(job_id, name))
+
+
+async def run_scheduled_move_async(
+    job_id: str, name: str, action: str, position_mm: int
+) -> None:
+    """Coroutine version of ``run_scheduled_move``, run on the event loop.
+
+    Stored with every job when ``SCHEDULER_ASYNCIO_ENABLED``.
+    """
+    if SCHEDULER_BATCH_ENABLED:
+        await schedule_batcher.submit_async(
+            ScheduledMove(job_id, name, action, position_mm)
+        )
+        return
+
+    await _run_schedule_move_async(action, position_mm, _schedule_context(job_id, name))
+
+
+def run_move_plan(moves: List[ScheduledMove]) -> None:
+    """Execute schedules that fired together as a single bulk move.
+
+    Every schedule moves all desks, so the schedule that fired last wins for
+    each desk: the desk list is fetched once and desks are commanded in one
+    fan-out, however many schedules fired. The superseded schedules are
+    listed in the event context and get a run of their own in the history.
+    """
+    if not moves:
+        return
+    winner = moves[-1]
+    _run_schedule_move(
+        winner.action, winner.position_mm, _plan_context(moves), moves[:-1]
+    )
+
+
+async def run_move_plan_async(moves: List[ScheduledMove]) -> None:
+    """Coroutine version of ``run_move_plan``."""
+    if not moves:
+        return
+    winner = moves[-1]
+    await _run_schedule_move_async(
+        winner.action, winner.position_mm, _plan_context(moves), moves[:-1]
+    )
+
+
+def _schedule_context(job_id: str, name: str) -> Dict[str, object]:
+    """Return the event context of a scheduled move."""
+    return {
+        "trigger": "schedule",
+        "job_id": job_id,
+        "job_name": name,
+    }
+
+
+def _plan_context(moves: List[ScheduledMove]) -> Dict[str, object]:
+    """Return the event context of a move plan, run for its last schedule."""
+    winner = moves[-1]
+    context = _schedule_context(winner.job_id, winner.name)
+    superseded = [move.job_id for move in moves[:-1]]
+    if superseded:
+        context["superseded_job_ids"] = superseded
+        logger.info(
+            "Schedule %s supersedes %d co-firing schedules: %s",
+            winner.job_id,
+            len(superseded),
+            superseded,
+        )
+    return context
+
+
+def _run_schedule_move(
+    action: str,
+    position_mm: int,
+    context: Dict[str, object],
+    superseded: Sequence[ScheduledMove] = (),
+) -> None:
+    """Raise or lower every desk on behalf of a schedule."""
+    options = _move_options()
+    started_at = datetime.now(timezone.utc)
+    started = time.monotonic()
+    results: List[Dict[str, object]] = []
+    error: Optional[str] = None
+    try:
+        if action == "raise":
+            results = DeskService.raise_all_desks(
+                position_mm, context=context, **options
+            )
+        else:
+            results = DeskService.lower_all_desks(
+                position_mm, context=context, **options
+            )
+    except Exception as exc:
+        error = str(exc)
+        raise
+    finally:
+        scheduler_service.record_runs(
+            _finish_run(
+                action,
+                position_mm,
+                context,
+                started_at,
+                started,
+                results,
+                error,
+                superseded,
+            )
+        )
+
+
+async def _run_schedule_move_async(
+    action: str,
+    position_mm: int,
+    context: Dict[str, object],
+    superseded: Sequence[ScheduledMove] = (),
+) -> None:
+    """Raise or lower every desk on behalf of a schedule, on the event loop."""
+    options = _move_options()
+    started_at = datetime.now(timezone.utc)
+    started = time.monotonic()
+    results: List[Dict[str, object]] = []
+    error: Optional[str] = None
+    try:
+        if action == "raise":
+            results = await async_desk_service.raise_all_desks(
+                position_mm, context=context, **options
+            )
+        else:
+            results = await async_desk_service.lower_all_desks(
+                position_mm, context=context, **options
+            )
+    except Exception as exc:
+        error = str(exc)
+        raise
+    finally:
+        # The run history is written with the blocking database driver
+        await asyncio.to_thread(
+            scheduler_service.record_runs,
+            _finish_run(
+                action,
+                position_mm,
+                context,
+                started_at,
+                started,
+                results,
+                error,
+                superseded,
+            ),
+        )
+
+
+def _move_options() -> Dict[str, Any]:
+    """Return the bulk move options of a scheduled run."""
+    # Skip desks already at the target (DESK_BULK_SKIP_NOOP_ENABLED)
+    options: Dict[str, Any] = (
+        {"current_positions": desk_snapshot.positions} if BULK_MOVE_SKIP_NOOP else {}
+    )
+    # Start from the inventory prefetched ahead of the run (SCHEDULER_WARMUP_*)
+    inventory = scheduler_service.warmup.take() if SCHEDULER_WARMUP_ENABLED else None
+    if inventory is not None:
+        options["desk_ids"] = inventory.desk_ids
+        if BULK_MOVE_SKIP_NOOP and inventory.positions is not None:
+            positions = inventory.positions
+            options["current_positions"] = lambda: positions
+    return options
+
+
+def _finish_run(  # noqa: PLR0913, PLR0917
+    action: str,
+    position_mm: int,
+    context: Dict[str, object],
+    started_at: datetime,
+    started: float,
+    results: List[Dict[str, object]],
+    error: Optional[str],
+    superseded: Sequence[ScheduledMove] = (),
+) -> List[ScheduleRun]:
+    """Drop desk data made stale by a run and build its history rows.
+
+    The run itself comes first, followed by one row (without desks) for each
+    co-firing schedule it superseded.
+    """
+    # Desks are moving; don't serve their old positions from the snapshot
+    desk_snapshot.invalidate()
+    scheduler_service.warmup.invalidate()
+    job_id = str(context["job_id"])
+    finished_at = datetime.now(timezone.utc)
+    duration_s = time.monotonic() - started
+    run = summarize_run(
+        job_id=job_id,
+        action=action,
+        position_mm=position_mm,
+        started_at=started_at,
+        finished_at=finished_at,
+        duration_s=duration_s,
+        results=results if isinstance(results, list) else [],
+        error=error,
+    )
+    return [run] + [
+        summarize_run(
+            job_id=move.job_id,
+            action=move.action,
+            position_mm=move.position_mm,
+            started_at=started_at,
+            finished_at=finished_at,
+            duration_s=duration_s,
+            results=[],
+            error=error,
+            superseded_by=job_id,
+        )
+        for move in superseded
+    ]
+
+
+def prefetch_desk_inventory() -> Inventory:
+    """Fetch the desk list, and their positions if runs skip desks at target.
+
+    Raises:
+        DeskServiceError: If the desk list cannot be fetched.
+
+    """
+    if not BULK_MOVE_SKIP_NOOP:
+        return DeskService.get_all_desks(), None
+    entries = desk_snapshot.get()
+    return [entry.desk_id for entry in entries], positions_at_rest(entries)
+
+
+# Global schedule batcher instance
+schedule_batcher = ScheduleBatcher(run_move_plan, execute_async=run_move_plan_async)
+
 
 class SchedulerService:
     """Service for managing scheduled desk operations with database persistence."""
 
     def __init__(self) -> None:
-        # In-memory scheduler
-        self.scheduler = BackgroundScheduler()
+        # In-memory scheduler until use_database() is called; an asyncio one
+        # must be started from the running event loop
+        self.scheduler: BaseScheduler = (
+            AsyncIOScheduler() if SCHEDULER_ASYNCIO_ENABLED else BackgroundScheduler()
+        )
+        self.leader: Optional[LeaderElector] = None
+        # Run history is recorded only once a database is attached
+        self.engine: Optional[Engine] = None
+        # Started with the scheduler when SCHEDULER_WARMUP_ENABLED
+        self.warmup = ScheduleWarmup(
+            self.next_fire_time,
+            prefetch_desk_inventory,
+            max_delay=SCHEDULER_MISFIRE_GRACE_SECONDS,
+        )
         logger.info("Scheduler service initialized (not started yet)")
 
+    def use_database(self, engine: Engine) -> None:
+        """Persist jobs in the database and fire them only while leader.
+
+        Must be called before ``start``. Every replica keeps its scheduler
+        paused (it can still add and remove jobs) until it wins the leader
+        lease; the leader resumes it, and pauses it again if it loses the
+        lease. Jobs added by other replicas are picked up at every renewal.
+        Every run of a schedule is recorded in the run history.
+        """
+        self.scheduler.configure(
+            jobstores={
+                "default": SQLAlchemyJobStore(
+                    engine=engine, tablename=SCHEDULER_JOBS_TABLE
+                )
+            },
+            job_defaults={"misfire_grace_time": SCHEDULER_MISFIRE_GRACE_SECONDS},
+        )
+        ScheduleRun.__table__.create(engine, checkfirst=True)  # type: ignore[attr-defined]
+        self.engine = engine
+        self.leader = LeaderElector(
+            engine,
+            on_elected=self.scheduler.resume,
+            on_demoted=self.scheduler.pause,
+            on_renewed=self.scheduler.wakeup,
+        )
+        logger.info("Scheduler jobs are persisted in table %s", SCHEDULER_JOBS_TABLE)
+
     # -------- lifecycle --------
     def start(self) -> None:
-        """Start the scheduler if not already running."""
-        if self.scheduler.state != STATE_RUNNING:
+        """Start the scheduler if not already running.
+
+        With a leader election it starts paused and campaigns for the lease.
+        With ``SCHEDULER_WARMUP_ENABLED`` the desk inventory is prefetched
+        ahead of every run.
+        """
+        if self.scheduler.state != STATE_STOPPED:
+            logger.info("Scheduler already running; start() skipped")
+            return
+        if SCHEDULER_WARMUP_ENABLED:
+            self.warmup.start()
+        if self.leader is None:
             self.scheduler.start()
             logger.info("Scheduler started")
-        else:
-            logger.info("Scheduler already running; start() skipped")
+            return
+        self.scheduler.start(paused=True)
+        self.leader.start()
+        logger.info("Scheduler started in standby; campaigning for leadership")
 
     def shutdown(self) -> None:
         """Shutdown the scheduler if running."""
-        if self.scheduler.state == STATE_RUNNING:
+        self.warmup.stop()
+        if self.leader is not None:
+            self.leader.stop()
+        if self.scheduler.state != STATE_STOPPED:
             self.scheduler.shutdown(wait=False)
             logger.info("Scheduler service shut down")
         else:
             logger.info("Scheduler not running; shutdown() skipped")
 
     def is_running(self) -> bool:
-        """Check if scheduler is running."""
-        return self.scheduler.state == STATE_RUNNING
+        """Check if scheduler is running (or standing by for leadership)."""
+        return self.scheduler.state in (STATE_RUNNING, STATE_PAUSED)
+
+    def is_leader(self) -> bool:
+        """Check if this replica fires jobs (always, without leader election)."""
+        return self.leader is None or self.leader.is_leader
+
+    def record_runs(self, runs: List[ScheduleRun]) -> None:
+        """Store finished runs in the run history; failures are only logged.
+
+        The first run is the one that moved the desks; any others are the
+        co-firing schedules it superseded.
+        """
+        if self.engine is None or not runs:
+            return
+        run = runs[0]
+        try:
+            with Session(self.engine) as session:
+                ScheduleRunRepository(session).create_many(runs)
+        except SQLAlchemyError as exc:
+            logger.warning("Failed to record run of %s: %s", run.job_id, exc)
+            return
+        logger.info(
+            "Recorded run of %s: %d/%d desks in %.3fs (%d superseded)",
+            run.job_id,
+            run.successful + run.skipped,
+            run.total_desks,
+            run.duration_s,
+            len(runs) - 1,
+        )
+
+    def next_fire_time(self) -> Optional[datetime]:
+        """Return the earliest next run time of the jobs this replica fires."""
+        if self.scheduler.state != STATE_RUNNING or not self.is_leader():
+            return None
+        return min(
+            (
+                job.next_run_time
+                for job in self.scheduler.get_jobs()
+                if job.next_run_time
+            ),
+            default=None,
+        )
 
     # -------- info --------
     def get_jobs_count(self) -> int:
@@ -104,7 +483,7 @@ class SchedulerService:
         minute: int,
         day_of_week: str,
     ) -> DBSchedule:
-        """Save or update a schedule in the database.
+        """Save or update a schedule in the database in one statement.
 
         Args:
             session: Database session.
@@ -121,23 +500,8 @@ class SchedulerService:
 
         """
         repo = ScheduleRepository(session)
-        existing = repo.get_by_job_id(job_id)
-
-        if existing:
-            # Update existing
-            existing.name = name
-            existing.action = action
-            existing.position_mm = position_mm
-            existing.hour = hour
-            existing.minute = minute
-            existing.day_of_week = day_of_week
-            existing.is_active = True
-            updated = repo.update(existing)
-            logger.info(f"Updated schedule in database: {job_id}")
-            return updated
-        else:
-            # Create new
-            db_schedule = DBSchedule(
+        saved = repo.upsert(
+            DBSchedule(
                 job_id=job_id,
                 name=name,
                 action=action,
@@ -147,9 +511,9 @@ class SchedulerService:
                 day_of_week=day_of_week,
                 is_active=True,
             )
-            created = repo.create(db_schedule)
-            logger.info(f"Created schedule in database: {job_id}")
-            return created
+        )
+        logger.info(f"Saved schedule in database: {job_id}")
+        return saved
 
     def _delete_schedule_from_db(self, session: Session, job_id: str) -> bool:
         """Delete a schedule from the database.
@@ -196,13 +560,7 @@ class SchedulerService:
             Dict containing job_id and next_run time.
 
         """
-        # Validate action
-        action_norm = (action or "").strip().lower()
-        if action_norm not in {"raise", "lower"}:
-            raise ValueError(f"Invalid action: {action}. Use 'raise' or 'lower'.")
-
-        if not isinstance(position_mm, int) or position_mm <= 0:
-            raise ValueError("position_mm must be a positive integer (millimeters).")
+        action_norm = self._validate_schedule(action, position_mm)
 
         # Add to APScheduler
         job = self._add_schedule_to_apscheduler(
@@ -238,6 +596,84 @@ class SchedulerService:
             "next_run": job.next_run_time.isoformat() if job.next_run_time else None,
         }
 
+    def add_schedules(
+        self, schedules: List[Dict[str, Any]], session: Session
+    ) -> List[Dict[str, Any]]:
+        """Create or replace many schedules at once.
+
+        Every schedule is validated first (including its cron fields), then
+        all of them are saved in one database transaction and registered with
+        APScheduler in one pass; nothing is saved if any schedule is invalid.
+
+        Args:
+            schedules: Dicts with the arguments of ``add_schedule`` (without
+                ``session``); ``day_of_week`` defaults to ``'*'``.
+            session: Database session for persistence.
+
+        Returns:
+            List of dicts with job_id and next_run time, in input order.
+
+        Raises:
+            ValueError: If any schedule is invalid.
+
+        """
+        specs: List[Dict[str, Any]] = []
+        for index, schedule in enumerate(schedules):
+            try:
+                action = self._validate_schedule(
+                    schedule.get("action", ""), schedule.get("position_mm")
+                )
+                # Bad cron fields would otherwise only fail after the commit
+                CronTrigger(
+                    hour=schedule.get("hour"),
+                    minute=schedule.get("minute"),
+                    day_of_week=schedule.get("day_of_week", "*"),
+                )
+            except ValueError as e:
+                raise ValueError(
+                    f"Schedule #{index} ({schedule.get('job_id')}): {e}"
+                ) from e
+            specs.append({"day_of_week": "*", **schedule, "action": action})
+
+        ScheduleRepository(session).upsert_many(
+            DBSchedule(is_active=True, **spec) for spec in specs
+        )
+        logger.info(f"Saved {len(specs)} schedules in database")
+
+        results = []
+        for spec in specs:
+            job = self._add_schedule_to_apscheduler(**spec)
+            results.append(
+                {
+                    "job_id": job.id,
+                    "next_run": job.next_run_time.isoformat()
+                    if job.next_run_time
+                    else None,
+                }
+            )
+        logger.info(f"✓ Registered {len(results)} schedules with APScheduler")
+        return results
+
+    @staticmethod
+    def _validate_schedule(action: str, position_mm: object) -> str:
+        """Validate a schedule's action and position.
+
+        Returns:
+            The normalized action.
+
+        Raises:
+            ValueError: If the action or position is invalid.
+
+        """
+        # Validate action
+        action_norm = (action or "").strip().lower()
+        if action_norm not in {"raise", "lower"}:
+            raise ValueError(f"Invalid action: {action}. Use 'raise' or 'lower'.")
+
+        if not isinstance(position_mm, int) or position_mm <= 0:
+            raise ValueError("position_mm must be a positive integer (millimeters).")
+        return action_norm
+
     def _add_schedule_to_apscheduler(
         self,
         job_id: str,
@@ -263,19 +699,6 @@ class SchedulerService:
             APScheduler job object.
 
         """
-
-        def _job_func() -> None:
-            context = {
-                "trigger": "schedule",
-                "job_id": job_id,
-                "job_name": name,
-            }
-
-            if action == "raise":
-                DeskService.raise_all_desks(position_mm, context=context)
-            else:
-                DeskService.lower_all_desks(position_mm, context=context)
-
         # Build cron trigger
         trigger = CronTrigger(
             hour=hour,
@@ -285,7 +708,10 @@ class SchedulerService:
 
         # Add (or replace) job
         job = self.scheduler.add_job(
-            _job_func,
+            run_scheduled_move_async
+            if SCHEDULER_ASYNCIO_ENABLED
+            else run_scheduled_move,
+            args=[job_id, name, action, position_mm],
             trigger=trigger,
             id=job_id,
             name=name,
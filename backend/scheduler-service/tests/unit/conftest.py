@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 import sys
+import tempfile
 from pathlib import Path
 from typing import Iterator
 from unittest.mock import Mock
@@ -14,6 +15,8 @@ import pytest
 os.environ.setdefault("DESK_API_BASE_URL", "http://localhost:8000/api/v2")
 os.environ.setdefault("DESK_API_KEY", "test-api-key-for-unit-tests")
 os.environ.setdefault("DESK_API_TIMEOUT_SECONDS", "10")
+# Keep the event spool of the shared publisher out of the source tree
+os.environ.setdefault("EVENT_SPOOL_DIR", tempfile.mkdtemp(prefix="event-spool-"))
 os.environ.setdefault("RABBITMQ_HOST", "localhost")
 os.environ.setdefault("RABBITMQ_PORT", "5672")
 os.environ.setdefault("RABBITMQ_USERNAME", "guest")
@@ -46,6 +49,16 @@ def reset_env_vars() -> Iterator[None]:
     os.environ.update(original_env)
 
 
+@pytest.fixture(autouse=True)
+def reset_desk_guard() -> Iterator[None]:
+    """Start every test with closed circuit breakers."""
+    from src.services.desk_service import desk_guard  # noqa: PLC0415
+
+    desk_guard.reset()
+    yield
+    desk_guard.reset()
+
+
 @pytest.fixture
 def mock_desk_service() -> Mock:
     """Fixture to mock DeskService."""
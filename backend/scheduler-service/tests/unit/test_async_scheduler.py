@@ -0,0 +1,261 @@
+"""Unit tests for the asyncio execution path.
+
+Tests AsyncDeskService against an ``httpx.MockTransport``, the aio-pika
+client with a fake exchange, and scheduled runs as coroutines.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import tempfile
+import time
+import unittest
+from typing import Dict, List
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from src.services.async_desk_service import AsyncDeskService
+from src.services.async_rabbitmq_client import AsyncRabbitMQClient
+from src.services.event_spool import EventSpool, SpoolSettings
+from src.services.rabbitmq_client import RabbitMQSettings
+from src.services.schedule_batcher import ScheduleBatcher, ScheduledMove
+from src.services.scheduler_service import (
+    SchedulerService,
+    run_scheduled_move_async,
+)
+
+RAISE_POSITION_MM = 1100
+DESKS = ["desk1", "desk2", "desk3"]
+HTTP_OK = 200
+HTTP_SERVER_ERROR = 500
+
+
+def _box(
+    failing: tuple[str, ...] = (), slow: tuple[str, ...] = ()
+) -> httpx.MockTransport:
+    """Return a fake box listing DESKS and accepting position commands."""
+
+    async def _handle(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "GET" and path.endswith("/desks/"):
+            return httpx.Response(HTTP_OK, json=DESKS)
+        desk_id = path.split("/")[-2]
+        if desk_id in slow:
+            await asyncio.sleep(5)
+        if desk_id in failing:
+            return httpx.Response(HTTP_SERVER_ERROR, text="desk error")
+        return httpx.Response(HTTP_OK, json=json.loads(request.content))
+
+    return httpx.MockTransport(_handle)
+
+
+class TestAsyncDeskService(unittest.IsolatedAsyncioTestCase):
+    """Test bulk moves on the event loop."""
+
+    async def asyncSetUp(self) -> None:
+        """Capture published events."""
+        self.publish = AsyncMock(return_value=True)
+        patcher = patch(
+            "src.services.async_desk_service.async_rabbitmq_client.publish",
+            self.publish,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_moves_every_desk_and_publishes(self) -> None:
+        """Test that results and the event match the sync service."""
+        service = AsyncDeskService(transport=_box(failing=("desk2",)))
+
+        results = await service.raise_all_desks(
+            RAISE_POSITION_MM, context={"trigger": "test"}
+        )
+        await service.aclose()
+
+        assert [(r["desk_id"], r["status"]) for r in results] == [
+            ("desk1", "moved"),
+            ("desk2", "failed"),
+            ("desk3", "moved"),
+        ]
+        assert all("latency_ms" in r for r in results)
+        routing_key, payload = self.publish.call_args.args
+        assert routing_key == "desk.action.raise"
+        assert (payload["successful"], payload["failed"]) == (2, 1)  # noqa: PLR2004
+
+    async def test_unexpected_desk_error_fails_only_that_desk(self) -> None:
+        """Test that an unwrapped transport error doesn't abort the run."""
+
+        async def _handle(request: httpx.Request) -> httpx.Response:
+            if "desk2" in request.url.path:
+                raise RuntimeError("transport bug")
+            return httpx.Response(HTTP_OK, json={})
+
+        service = AsyncDeskService(transport=httpx.MockTransport(_handle))
+
+        outcomes = await service._fan_out_moves(
+            DESKS, RAISE_POSITION_MM, concurrency=3, desk_timeout=1, run_timeout=1
+        )
+        await service.aclose()
+
+        assert outcomes == {"desk1": True, "desk2": False, "desk3": True}
+
+    async def test_run_deadline_cancels_slow_desks(self) -> None:
+        """Test that desks still in flight at the deadline are failed."""
+        service = AsyncDeskService(transport=_box(slow=("desk3",)))
+
+        results = await service._move_all_desks(
+            "raise", RAISE_POSITION_MM, desk_ids=DESKS, run_timeout=0.2
+        )
+        await service.aclose()
+
+        assert [r["status"] for r in results] == ["moved", "moved", "failed"]
+        assert "latency_ms" not in results[2]
+
+    async def test_verification_stops_at_deadline(self) -> None:
+        """Test that a hanging position read is cancelled at the deadline."""
+
+        async def _hang(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(5)
+            return httpx.Response(HTTP_OK, json={})
+
+        service = AsyncDeskService(transport=httpx.MockTransport(_hang))
+
+        started = time.monotonic()
+        arrivals = await service._verify_arrivals(
+            DESKS,
+            RAISE_POSITION_MM,
+            concurrency=1,
+            desk_timeout=5,
+            timeout=0.2,
+            initial_interval=0.01,
+        )
+        await service.aclose()
+
+        assert arrivals == {}
+        assert time.monotonic() - started < 1
+
+    async def test_skips_desks_at_target(self) -> None:
+        """Test that a blocking position source is honoured."""
+        service = AsyncDeskService(transport=_box())
+
+        results = await service.lower_all_desks(
+            RAISE_POSITION_MM,
+            desk_ids=DESKS,
+            current_positions=lambda: {"desk1": RAISE_POSITION_MM},
+        )
+        await service.aclose()
+
+        assert [r["status"] for r in results] == ["skipped", "moved", "moved"]
+
+
+class FakeExchange:
+    """Records published messages, failing while ``down`` is set."""
+
+    def __init__(self) -> None:
+        """Start with a reachable broker."""
+        self.down = False
+        self.published: List[str] = []
+
+    async def publish(self, message: object, routing_key: str, **_: object) -> None:
+        """Record a message or fail like an unreachable broker."""
+        if self.down:
+            raise ConnectionError("broker down")
+        self.published.append(routing_key)
+
+
+class TestAsyncRabbitMQClient(unittest.IsolatedAsyncioTestCase):
+    """Test publishing and spooling on the event loop."""
+
+    async def asyncSetUp(self) -> None:
+        """Create a client with a fake open connection and a spool."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.spool = EventSpool(SpoolSettings(directory=self.tmpdir.name))
+        self.client = AsyncRabbitMQClient(RabbitMQSettings(), spool=self.spool)
+        self.exchange = FakeExchange()
+        self.client._exchange = self.exchange  # type: ignore[assignment]
+        self.client._connection = Mock(is_closed=False)
+
+    async def test_failed_events_are_spooled_and_replayed_in_order(self) -> None:
+        """Test that events queue behind the spool until it is replayed."""
+        assert await self.client.publish("desk.action.raise", {"n": 1})
+        self.exchange.down = True
+        assert not await self.client.publish("desk.action.lower", {"n": 2})
+        self.exchange.down = False
+        assert not await self.client.publish("desk.action.raise", {"n": 3})
+
+        assert await self.client.replay_spool()
+
+        assert self.exchange.published == [
+            "desk.action.raise",
+            "desk.action.lower",
+            "desk.action.raise",
+        ]
+        assert len(self.spool) == 0
+        assert self.client.stats()["failed_total"] == 1
+
+
+class TestAsyncScheduledRuns(unittest.IsolatedAsyncioTestCase):
+    """Test scheduled runs as coroutines."""
+
+    @patch("src.services.scheduler_service.desk_snapshot")
+    @patch("src.services.scheduler_service.async_desk_service")
+    async def test_run_uses_async_service(
+        self, mock_service: Mock, mock_snapshot: Mock
+    ) -> None:
+        """Test that a coroutine job moves desks and records the run."""
+        mock_service.lower_all_desks = AsyncMock(return_value=[])
+        service = SchedulerService()
+        service.record_runs = Mock()  # type: ignore[method-assign]
+        with patch("src.services.scheduler_service.scheduler_service", service):
+            await run_scheduled_move_async("evening", "Evening", "lower", 680)
+
+        mock_service.lower_all_desks.assert_awaited_once()
+        assert mock_service.lower_all_desks.call_args.kwargs["context"] == {
+            "trigger": "schedule",
+            "job_id": "evening",
+            "job_name": "Evening",
+        }
+        service.record_runs.assert_called_once()
+        mock_snapshot.invalidate.assert_called_once()
+
+    @patch("src.services.scheduler_service.SCHEDULER_ASYNCIO_ENABLED", True)
+    async def test_jobs_are_coroutines_on_the_running_loop(self) -> None:
+        """Test that the asyncio scheduler stores the coroutine job."""
+        service = SchedulerService()
+        service.start()
+        try:
+            job = service._add_schedule_to_apscheduler(
+                "standup", "Standup", "raise", RAISE_POSITION_MM, 9, 0, "*"
+            )
+        finally:
+            service.shutdown()
+
+        assert isinstance(service.scheduler, AsyncIOScheduler)
+        assert job.func is run_scheduled_move_async
+
+    async def test_cofiring_coroutines_form_one_plan(self) -> None:
+        """Test that coroutine jobs are batched like threaded ones."""
+        plans: List[List[ScheduledMove]] = []
+
+        async def _execute(moves: List[ScheduledMove]) -> None:
+            plans.append(moves)
+
+        batcher = ScheduleBatcher(Mock(), window=0.05, execute_async=_execute)
+        moves: Dict[str, ScheduledMove] = {
+            job_id: ScheduledMove(job_id, job_id, "raise", RAISE_POSITION_MM)
+            for job_id in ("a", "b", "c")
+        }
+
+        executed = await asyncio.gather(
+            *(batcher.submit_async(move) for move in moves.values())
+        )
+
+        assert executed == [True, False, False]
+        assert plans == [list(moves.values())]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+"""Unit tests for desk_breaker.py.
+
+Tests the circuit breakers and adaptive timeouts, and how DeskService fails
+fast through them, with the HTTP transport mocked.
+"""
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.services.desk_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerSettings,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeskCallGuard,
+)
+from src.services.desk_service import DeskService, DeskServiceError, desk_guard
+
+RESET_SECONDS = 30.0
+DEFAULT_TIMEOUT = 10.0
+HTTP_SERVICE_UNAVAILABLE = 503
+
+
+class _Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Tests for CircuitBreaker."""
+
+    def setUp(self) -> None:
+        """Create a breaker that opens after 3 failures."""
+        self.clock = _Clock()
+        self.breaker = CircuitBreaker("desk1", 3, RESET_SECONDS, clock=self.clock)
+
+    def _fail(self, times: int) -> None:
+        for _ in range(times):
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self) -> None:
+        """The breaker opens at the threshold and rejects calls."""
+        self._fail(2)
+        assert self.breaker.allow()
+
+        self._fail(1)
+
+        assert self.breaker.state == OPEN
+        assert not self.breaker.allow()
+        assert self.breaker.retry_in() == RESET_SECONDS
+
+    def test_success_resets_failure_count(self) -> None:
+        """Failures only count when consecutive."""
+        self._fail(2)
+        self.breaker.record_success()
+        self._fail(2)
+
+        assert self.breaker.state == CLOSED
+
+    def test_half_open_lets_a_single_probe_through(self) -> None:
+        """After the reset timeout exactly one call may probe the desk."""
+        self._fail(3)
+        self.clock.now = RESET_SECONDS
+
+        assert self.breaker.state == HALF_OPEN
+        assert self.breaker.allow()
+        assert not self.breaker.allow()
+
+        self.breaker.record_success()
+        assert self.breaker.state == CLOSED
+        assert self.breaker.allow()
+
+    def test_failed_probe_reopens(self) -> None:
+        """A failed probe opens the breaker for another reset period."""
+        self._fail(3)
+        self.clock.now = RESET_SECONDS
+        assert self.breaker.allow()
+
+        self.breaker.record_failure()
+
+        assert self.breaker.state == OPEN
+        self.clock.now = RESET_SECONDS * 2 - 1
+        assert not self.breaker.allow()
+
+    def test_lost_probe_is_replaced(self) -> None:
+        """A probe that never reports back doesn't block the desk forever."""
+        self._fail(3)
+        self.clock.now = RESET_SECONDS
+        assert self.breaker.allow()
+
+        self.clock.now = RESET_SECONDS * 2
+        assert self.breaker.allow()
+
+
+class TestDeskCallGuard(unittest.TestCase):
+    """Tests for DeskCallGuard."""
+
+    def setUp(self) -> None:
+        """Create a guard with small thresholds."""
+        self.clock = _Clock()
+        self.guard = DeskCallGuard(
+            BreakerSettings(
+                desk_failures=2,
+                box_failures=3,
+                reset_timeout=RESET_SECONDS,
+                latency_window=100,
+                min_samples=10,
+                p99_multiplier=3,
+                min_timeout=1,
+            ),
+            clock=self.clock,
+        )
+
+    def test_desk_errors_open_only_the_desk(self) -> None:
+        """Desk-only failures such as timeouts don't open the box breaker."""
+        for _ in range(5):
+            self.guard.record_failure("box", "desk1", box_down=False)
+
+        with pytest.raises(CircuitOpenError, match="desk desk1"):
+            self.guard.check("box", "desk1")
+        self.guard.check("box", "desk2")
+
+    def test_unreachable_box_opens_the_box(self) -> None:
+        """Connection failures spread over desks open the box breaker."""
+        for desk_id in ("desk1", "desk2", "desk3"):
+            self.guard.record_failure("box", desk_id, box_down=True)
+
+        with pytest.raises(CircuitOpenError, match="box box"):
+            self.guard.check("box", "desk4")
+        assert self.guard.stats()["boxes"]["box"]["state"] == OPEN
+
+    def test_open_desk_keeps_the_box_probe(self) -> None:
+        """A rejected desk doesn't use up the half-open box's only probe."""
+        for desk_id in ("desk2", "desk3", "desk4"):
+            self.guard.record_failure("box", desk_id, box_down=True)
+        self.clock.now = RESET_SECONDS / 2
+        for _ in range(2):
+            self.guard.record_failure("other-box", "desk1", box_down=False)
+        self.clock.now = RESET_SECONDS
+
+        with pytest.raises(CircuitOpenError, match="desk desk1"):
+            self.guard.check("box", "desk1")
+        self.guard.check("box", "desk5")
+
+    def test_open_box_gives_back_the_desk_probe(self) -> None:
+        """A desk probe rejected by the box is available on the next call."""
+        for _ in range(3):
+            self.guard.record_failure("box", "desk1", box_down=True)
+        self.clock.now = RESET_SECONDS
+        self.guard.check("box", None)
+
+        with pytest.raises(CircuitOpenError, match="box box"):
+            self.guard.check("box", "desk1")
+        self.guard.record_success("box", None, 0.1)
+        self.guard.check("box", "desk1")
+
+    def test_read_timeout_adapts_to_p99(self) -> None:
+        """The read timeout follows the box's p99 latency once warmed up."""
+        assert self.guard.read_timeout("box", DEFAULT_TIMEOUT) == DEFAULT_TIMEOUT
+
+        for _ in range(98):
+            self.guard.record_success("box", "desk1", 0.5)
+        assert self.guard.read_timeout("box", DEFAULT_TIMEOUT) == pytest.approx(1.5)
+
+        # Two slow calls in a hundred move the p99
+        self.guard.record_success("box", "desk1", 2.0)
+        self.guard.record_success("box", "desk1", 2.0)
+        assert self.guard.read_timeout("box", DEFAULT_TIMEOUT) == pytest.approx(6.0)
+
+    def test_read_timeout_is_bounded_by_default(self) -> None:
+        """A slow box never gets more than the configured timeout."""
+        for _ in range(20):
+            self.guard.record_success("box", None, 8.0)
+
+        assert self.guard.read_timeout("box", DEFAULT_TIMEOUT) == DEFAULT_TIMEOUT
+
+
+class TestDeskServiceFailFast(unittest.TestCase):
+    """Tests for DeskService calls through the circuit breakers."""
+
+    @patch("src.services.desk_service.desk_transport.request")
+    def test_open_desk_fails_without_calling_the_box(self, mock_request: Mock) -> None:
+        """Once a desk's breaker is open, calls fail fast with HTTP 503."""
+        mock_request.side_effect = requests.exceptions.Timeout("slow")
+        threshold = BreakerSettings().desk_failures
+        for _ in range(threshold):
+            with pytest.raises(DeskServiceError):
+                DeskService.set_desk_position("dead-desk", 800)
+
+        with pytest.raises(DeskServiceError) as exc_info:
+            DeskService.set_desk_position("dead-desk", 800)
+
+        assert exc_info.value.status_code == HTTP_SERVICE_UNAVAILABLE
+        assert mock_request.call_count == threshold
+
+    @patch("src.services.desk_service.desk_transport.request")
+    def test_desk_timeouts_leave_the_box_closed(self, mock_request: Mock) -> None:
+        """Slow desks open their own breakers, not their box's."""
+        mock_request.side_effect = requests.exceptions.Timeout("slow")
+        for i in range(BreakerSettings().box_failures + 1):
+            with pytest.raises(DeskServiceError):
+                DeskService.set_desk_position("slow-desk-%d" % i, 800)
+
+        boxes = desk_guard.stats()["boxes"]
+        assert boxes
+        assert all(box["state"] == CLOSED for box in boxes.values())  # type: ignore[attr-defined, index]
+
+    @patch("src.services.desk_service.desk_transport.request")
+    def test_client_errors_do_not_trip_the_breaker(self, mock_request: Mock) -> None:
+        """A 404 means the box is fine and the desk breaker stays closed."""
+        mock_request.return_value = Mock(status_code=404, text="Not found")
+        for _ in range(BreakerSettings().desk_failures + 1):
+            with pytest.raises(DeskServiceError) as exc_info:
+                DeskService.get_desk_document("missing-desk")
+            assert exc_info.value.status_code == 404  # noqa: PLR2004
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,188 @@
+"""Unit tests for desk_routing.py and multi-box routing in DeskService.
+
+Tests box parsing, the desk -> box table and per-box fan-out with the HTTP
+transport mocked.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from typing import Dict, List
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.services.desk_routing import DeskBox, DeskRoutingTable, parse_boxes
+from src.services.desk_service import DeskService, DeskServiceError
+
+BOX_A = DeskBox(name="a", base_url="http://box-a/api/v2", api_key="KEY_A")
+BOX_B = DeskBox(name="b", base_url="http://box-b/api/v2", api_key="KEY_B")
+DESKS: Dict[str, List[str]] = {"KEY_A": ["desk1", "desk2"], "KEY_B": ["desk3"]}
+HTTP_OK = 200
+
+
+def _response(payload: object) -> Mock:
+    response = Mock()
+    response.status_code = HTTP_OK
+    response.json.return_value = payload
+    return response
+
+
+def _box_api(unreachable: tuple[str, ...] = ()) -> Mock:
+    """Return a fake transport.request serving DESKS per box API key."""
+
+    def _request(*, method: str, url: str, **_: object) -> Mock:
+        api_key = next(key for key in DESKS if f"/{key}/" in url)
+        if api_key in unreachable:
+            raise requests.exceptions.ConnectionError("box down")
+        if method == "GET" and url.endswith("/desks/"):
+            return _response(DESKS[api_key])
+        return _response({"position_mm": 800})
+
+    return Mock(side_effect=_request)
+
+
+class TestParseBoxes(unittest.TestCase):
+    """Tests for parse_boxes."""
+
+    def test_named_and_unnamed_boxes(self) -> None:
+        """Named entries keep their name; unnamed ones are numbered."""
+        boxes = parse_boxes("floor1=http://box1/api/v2/|K1, http://box2/api/v2|K2")
+
+        assert boxes == [
+            DeskBox("floor1", "http://box1/api/v2", "K1"),
+            DeskBox("box2", "http://box2/api/v2", "K2"),
+        ]
+
+    def test_missing_key_is_rejected(self) -> None:
+        """An entry without an API key is invalid."""
+        with pytest.raises(ValueError, match="Invalid desk box"):
+            parse_boxes("floor1=http://box1/api/v2")
+
+    def test_duplicate_names_are_rejected(self) -> None:
+        """Box names must be unique."""
+        with pytest.raises(ValueError, match="Duplicate"):
+            parse_boxes("a=http://x|K1,a=http://y|K2")
+
+
+class TestDeskRoutingTable(unittest.TestCase):
+    """Tests for DeskRoutingTable."""
+
+    def test_single_box_routes_everything(self) -> None:
+        """With one box no lookup is needed."""
+        table = DeskRoutingTable([BOX_A])
+
+        assert table.box_for("anything") == BOX_A
+
+    def test_merge_routes_desks_to_their_box(self) -> None:
+        """Merged listings route each desk to the box that listed it."""
+        table = DeskRoutingTable([BOX_A, BOX_B])
+
+        desk_ids = table.merge([(BOX_A, ["desk1", "desk2"]), (BOX_B, ["desk3"])])
+
+        assert desk_ids == ["desk1", "desk2", "desk3"]
+        assert table.box_for("desk3") == BOX_B
+        assert table.box_for("unknown") is None
+        assert table.stats()["boxes"] == {"a": 2, "b": 1}
+
+    def test_duplicate_desk_stays_on_first_box(self) -> None:
+        """A desk listed by two boxes is routed to the first one."""
+        table = DeskRoutingTable([BOX_A, BOX_B])
+
+        table.merge([(BOX_A, ["desk1"]), (BOX_B, ["desk1"])])
+
+        assert table.box_for("desk1") == BOX_A
+
+    def test_unlisted_box_keeps_last_routes(self) -> None:
+        """Desks of a box that couldn't be listed keep their route."""
+        table = DeskRoutingTable([BOX_A, BOX_B])
+        table.merge([(BOX_A, ["desk1"]), (BOX_B, ["desk3"])])
+
+        desk_ids = table.merge([(BOX_A, ["desk1", "desk2"]), (BOX_B, None)])
+
+        assert desk_ids == ["desk1", "desk2", "desk3"]
+        assert table.box_for("desk3") == BOX_B
+
+
+class TestMultiBoxDeskService(unittest.TestCase):
+    """Tests for DeskService routed over two boxes."""
+
+    def setUp(self) -> None:
+        """Route DeskService over BOX_A and BOX_B."""
+        patcher = patch.object(DeskService, "_routes", DeskRoutingTable([BOX_A, BOX_B]))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_all_desks_merges_boxes(self) -> None:
+        """Every box is listed and the lists are merged."""
+        with patch("src.services.desk_service.desk_transport.request", _box_api()):
+            assert DeskService.get_all_desks() == ["desk1", "desk2", "desk3"]
+
+    def test_get_all_desks_tolerates_one_box_down(self) -> None:
+        """A box that can't be listed is skipped."""
+        api = _box_api(unreachable=("KEY_B",))
+        with patch("src.services.desk_service.desk_transport.request", api):
+            assert DeskService.get_all_desks() == ["desk1", "desk2"]
+
+    def test_get_all_desks_fails_when_every_box_is_down(self) -> None:
+        """With no box reachable the listing fails."""
+        api = _box_api(unreachable=("KEY_A", "KEY_B"))
+        with (
+            patch("src.services.desk_service.desk_transport.request", api),
+            pytest.raises(DeskServiceError),
+        ):
+            DeskService.get_all_desks()
+
+    def test_desk_calls_go_to_owning_box(self) -> None:
+        """A desk call refreshes the routes once and uses the desk's box."""
+        api = _box_api()
+        with patch("src.services.desk_service.desk_transport.request", api):
+            DeskService.set_desk_position("desk3", 800)
+
+        urls = [call.kwargs["url"] for call in api.call_args_list]
+        assert urls[-1] == "http://box-b/api/v2/KEY_B/desks/desk3/state"
+        assert sum(url.endswith("/desks/") for url in urls) == len(DESKS)
+
+    def test_unknown_desk_is_not_found(self) -> None:
+        """A desk no box lists raises a 404 DeskServiceError."""
+        with (
+            patch("src.services.desk_service.desk_transport.request", _box_api()),
+            pytest.raises(DeskServiceError) as exc_info,
+        ):
+            DeskService.get_desk_document("ghost")
+
+        assert exc_info.value.status_code == 404  # noqa: PLR2004
+
+    @patch("src.services.desk_service.rabbitmq_client.publish")
+    def test_bulk_move_runs_boxes_in_parallel(self, mock_publish: Mock) -> None:
+        """Each box has its own workers, so a slow box doesn't block others."""
+        mock_publish.return_value = True
+        release = threading.Event()
+        moved: List[str] = []
+
+        def _set_position(desk_id: str, position_mm: int) -> Dict[str, object]:
+            if desk_id == "desk1":
+                release.wait(2)
+            moved.append(desk_id)
+            if desk_id == "desk3":
+                release.set()
+            return {"position_mm": position_mm}
+
+        with (
+            patch("src.services.desk_service.desk_transport.request", _box_api()),
+            patch.object(DeskService, "set_desk_position", side_effect=_set_position),
+        ):
+            started = time.monotonic()
+            results = DeskService._move_all_desks("raise", 800, concurrency=1)
+
+        assert all(result["success"] for result in results)
+        # desk3 on box b finished while desk1 held box a's only worker
+        assert moved.index("desk3") < moved.index("desk1")
+        assert time.monotonic() - started < 2  # noqa: PLR2004
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -7,6 +7,8 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
+import time
 import unittest
 from typing import Any, Dict
 from unittest.mock import Mock, patch
@@ -14,7 +16,7 @@ from unittest.mock import Mock, patch
 import pytest
 import requests
 
-from src.services.desk_service import DeskService, DeskServiceError
+from src.services.desk_service import DeskService, DeskServiceError, _request_timeout
 
 # === Test constants to avoid magic values ===
 DEFAULT_DESK_COUNT = 3
@@ -23,6 +25,8 @@ EXPECTED_POSITION_MM = 800
 RAISE_POSITION_MM = 1100
 HTTP_NOT_FOUND = 404
 LOWER_POSITION_MM = 680
+FAN_OUT_DESK_COUNT = 8
+FAN_OUT_CONCURRENCY = 3
 
 
 # Add the project root to the path (go up from tests/unit to project root)
@@ -70,7 +74,7 @@ class TestDeskService(unittest.TestCase):
 
     # ==================== Get All Desks Tests ====================
 
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_get_all_desks_success(self, mock_request: Mock) -> None:
         """Test successfully getting all desks."""
         mock_response = Mock()
@@ -84,7 +88,7 @@ class TestDeskService(unittest.TestCase):
         assert "desk1" in desks
         mock_request.assert_called_once()
 
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_get_all_desks_empty_list(self, mock_request: Mock) -> None:
         """Test getting all desks when list is empty."""
         mock_response = Mock()
@@ -96,7 +100,7 @@ class TestDeskService(unittest.TestCase):
 
         assert len(desks) == 0
 
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_get_all_desks_api_error(self, mock_request: Mock) -> None:
         """Test getting all desks when API returns error."""
         mock_response = Mock()
@@ -109,7 +113,7 @@ class TestDeskService(unittest.TestCase):
 
         assert "500" in str(ctx.value)
 
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_get_all_desks_network_error(self, mock_request: Mock) -> None:
         """Test getting all desks when network error occurs."""
         mock_request.side_effect = requests.RequestException("Network error")
@@ -119,7 +123,7 @@ class TestDeskService(unittest.TestCase):
 
         assert "Failed to communicate" in str(ctx.value)
 
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_get_all_desks_unexpected_format(self, mock_request: Mock) -> None:
         """Test getting all desks with unexpected response format."""
         mock_response = Mock()
@@ -134,7 +138,7 @@ class TestDeskService(unittest.TestCase):
 
     # ==================== Set Desk Position Tests ====================
 
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_set_desk_position_success(self, mock_request: Mock) -> None:
         """Test successfully setting desk position."""
         mock_response = Mock()
@@ -152,7 +156,7 @@ class TestDeskService(unittest.TestCase):
         assert call_args.kwargs["method"] == "PUT"
         assert call_args.kwargs["json"] == {"position_mm": 1100}
 
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_set_desk_position_empty_desk_id(self, mock_request: Mock) -> None:
         """Test setting desk position with empty desk ID."""
         with pytest.raises(DeskServiceError) as ctx:
@@ -161,7 +165,7 @@ class TestDeskService(unittest.TestCase):
         assert "Desk identifier is required" in str(ctx.value)
         mock_request.assert_not_called()
 
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_set_desk_position_api_error(self, mock_request: Mock) -> None:
         """Test setting desk position when API returns error."""
         mock_response = Mock()
@@ -176,7 +180,7 @@ class TestDeskService(unittest.TestCase):
 
     # ==================== Get Desk State Tests ====================
 
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_get_desk_state_success(self, mock_request: Mock) -> None:
         """Test successfully getting desk state."""
         mock_response = Mock()
@@ -193,7 +197,7 @@ class TestDeskService(unittest.TestCase):
         assert state["config"]["name"] == "Test Desk"
         assert state["state"]["position_mm"] == EXPECTED_POSITION_MM
 
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_get_desk_state_empty_desk_id(self, mock_request: Mock) -> None:
         """Test getting desk state with empty desk ID."""
         state = DeskService.get_desk_state("")
@@ -201,7 +205,7 @@ class TestDeskService(unittest.TestCase):
         assert state is None
         mock_request.assert_not_called()
 
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_get_desk_state_api_error(self, mock_request: Mock) -> None:
         """Test getting desk state when API returns error."""
         mock_response = Mock()
@@ -349,6 +353,278 @@ class TestDeskService(unittest.TestCase):
         routing_key = call_args[0][0]
         assert routing_key == "desk.action.raise"
 
+    # ==================== Bulk Fan-out Tests ====================
+
+    @patch("src.services.desk_service.rabbitmq_client.publish")
+    @patch("src.services.desk_service.DeskService.set_desk_position")
+    @patch("src.services.desk_service.DeskService.get_all_desks")
+    def test_move_all_desks_respects_concurrency_limit(
+        self, mock_get_all: Mock, mock_set_pos: Mock, mock_publish: Mock
+    ) -> None:
+        """Test that no more than ``concurrency`` desks are commanded at once."""
+        desk_ids = [f"desk{i}" for i in range(FAN_OUT_DESK_COUNT)]
+        mock_get_all.return_value = desk_ids
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def set_position_side_effect(desk_id: str, position: int) -> Dict[str, Any]:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return {"status": "success"}
+
+        mock_set_pos.side_effect = set_position_side_effect
+        mock_publish.return_value = True
+
+        results = DeskService._move_all_desks(
+            "raise", RAISE_POSITION_MM, concurrency=FAN_OUT_CONCURRENCY
+        )
+
+        assert [r["desk_id"] for r in results] == desk_ids
+        assert all(r["success"] for r in results)
+        assert 1 < peak <= FAN_OUT_CONCURRENCY
+
+    @patch("src.services.desk_service.rabbitmq_client.publish")
+    @patch("src.services.desk_service.DeskService.set_desk_position")
+    @patch("src.services.desk_service.DeskService.get_all_desks")
+    def test_move_all_desks_run_deadline_returns_partial_results(
+        self, mock_get_all: Mock, mock_set_pos: Mock, mock_publish: Mock
+    ) -> None:
+        """Test that desks still running at the run deadline are reported failed."""
+        mock_get_all.return_value = ["desk1", "slow", "desk3"]
+        release = threading.Event()
+
+        def set_position_side_effect(desk_id: str, position: int) -> Dict[str, Any]:
+            if desk_id == "slow":
+                release.wait(timeout=1)
+            return {"status": "success"}
+
+        mock_set_pos.side_effect = set_position_side_effect
+        mock_publish.return_value = True
+
+        try:
+            results = DeskService._move_all_desks(
+                "raise", RAISE_POSITION_MM, concurrency=3, run_timeout=0.1
+            )
+        finally:
+            release.set()
+
+        by_id = {r["desk_id"]: r["success"] for r in results}
+        assert by_id == {"desk1": True, "slow": False, "desk3": True}
+        payload = mock_publish.call_args[0][1]
+        assert payload["failed"] == 1
+
+    @patch("src.services.desk_service.DeskService.set_desk_position")
+    def test_fan_out_ignores_stragglers_and_unexpected_errors(
+        self, mock_set_pos: Mock
+    ) -> None:
+        """Test that late latencies aren't kept and odd errors fail one desk."""
+        release = threading.Event()
+        finished = threading.Event()
+
+        def set_position_side_effect(desk_id: str, position: int) -> Dict[str, Any]:
+            if desk_id == "slow":
+                release.wait(timeout=1)
+                finished.set()
+            if desk_id == "broken":
+                raise requests.exceptions.InvalidURL("bad desk id")
+            return {"status": "success"}
+
+        mock_set_pos.side_effect = set_position_side_effect
+        latencies: Dict[str, float] = {}
+
+        try:
+            outcomes = DeskService._fan_out_moves(
+                ["desk1", "slow", "broken"],
+                RAISE_POSITION_MM,
+                concurrency=3,
+                desk_timeout=1,
+                run_timeout=0.1,
+                latencies=latencies,
+            )
+        finally:
+            release.set()
+        finished.wait(timeout=1)
+        time.sleep(0.05)  # let the straggler's worker finish
+
+        assert outcomes == {"desk1": True, "broken": False}
+        assert set(latencies) == {"desk1", "broken"}
+
+    @patch("src.services.desk_service.desk_transport.request")
+    def test_move_all_desks_applies_desk_timeout(self, mock_request: Mock) -> None:
+        """Test that the per-desk deadline is used as the request timeout."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"status": "success"}
+        mock_request.return_value = mock_response
+
+        with (
+            patch.object(DeskService, "get_all_desks", return_value=["desk1"]),
+            patch("src.services.desk_service.rabbitmq_client.publish"),
+        ):
+            DeskService._move_all_desks("raise", RAISE_POSITION_MM, desk_timeout=2.5)
+
+        _, read_timeout = mock_request.call_args.kwargs["timeout"]
+        assert read_timeout == 2.5  # noqa: PLR2004
+
+    # ==================== No-op Skipping Tests ====================
+
+    @patch("src.services.desk_service.rabbitmq_client.publish")
+    @patch("src.services.desk_service.DeskService.set_desk_position")
+    @patch("src.services.desk_service.DeskService.get_all_desks")
+    def test_move_all_desks_skips_desks_at_target(
+        self, mock_get_all: Mock, mock_set_pos: Mock, mock_publish: Mock
+    ) -> None:
+        """Test that desks within the tolerance of the target are not commanded."""
+        mock_get_all.return_value = ["near", "far", "unknown"]
+        mock_set_pos.return_value = {"status": "success"}
+
+        results = DeskService._move_all_desks(
+            "raise",
+            RAISE_POSITION_MM,
+            current_positions=lambda: {
+                "near": RAISE_POSITION_MM - 3,
+                "far": LOWER_POSITION_MM,
+            },
+            skip_tolerance_mm=5,
+        )
+
+        assert [r["status"] for r in results] == ["skipped", "moved", "moved"]
+        assert all(r["success"] for r in results)
+        assert sorted(c.args[0] for c in mock_set_pos.call_args_list) == [
+            "far",
+            "unknown",
+        ]
+        payload = mock_publish.call_args[0][1]
+        assert payload["skipped"] == 1
+        assert payload["successful"] == TWO_DESKS_COUNT
+        assert payload["failed"] == 0
+
+    @patch("src.services.desk_service.rabbitmq_client.publish")
+    @patch("src.services.desk_service.DeskService.set_desk_position")
+    @patch("src.services.desk_service.DeskService.get_all_desks")
+    def test_move_all_desks_moves_every_desk_without_positions(
+        self, mock_get_all: Mock, mock_set_pos: Mock, mock_publish: Mock
+    ) -> None:
+        """Test that an unreadable snapshot doesn't skip any desk."""
+        mock_get_all.return_value = ["desk1", "desk2"]
+        mock_set_pos.return_value = {"status": "success"}
+
+        def unavailable() -> Dict[str, int]:
+            raise DeskServiceError("Desk API unreachable")
+
+        results = DeskService._move_all_desks(
+            "lower", LOWER_POSITION_MM, current_positions=unavailable
+        )
+
+        assert [r["status"] for r in results] == ["moved", "moved"]
+        assert mock_set_pos.call_count == TWO_DESKS_COUNT
+
+    # ==================== Arrival Verification Tests ====================
+
+    @patch("src.services.desk_service.DeskService.get_desk_document")
+    def test_verify_arrivals_polls_until_desks_arrive(
+        self, mock_document: Mock
+    ) -> None:
+        """Test that desks are polled in rounds until each reaches the target."""
+        polls: Dict[str, int] = {"fast": 0, "slow": 0, "stuck": 0}
+        lock = threading.Lock()
+
+        def document(desk_id: str) -> Dict[str, Any]:
+            with lock:
+                polls[desk_id] += 1
+                count = polls[desk_id]
+            arrived = desk_id == "fast" or (desk_id == "slow" and count >= 3)  # noqa: PLR2004
+            position = RAISE_POSITION_MM if arrived else LOWER_POSITION_MM
+            return {"state": {"position_mm": position, "speed_mms": 0}}
+
+        mock_document.side_effect = document
+
+        arrivals = DeskService._verify_arrivals(
+            ["fast", "slow", "stuck"],
+            RAISE_POSITION_MM,
+            concurrency=3,
+            desk_timeout=1,
+            timeout=0.2,
+            initial_interval=0.01,
+            max_interval=0.02,
+        )
+
+        assert set(arrivals) == {"fast", "slow"}
+        assert arrivals["fast"] < arrivals["slow"]
+        # Arrived desks are not polled again
+        assert polls["fast"] == 1
+        assert polls["slow"] == 3  # noqa: PLR2004
+        assert polls["stuck"] > polls["slow"]
+
+    @patch("src.services.desk_service.DeskService.get_desk_document")
+    def test_verify_arrivals_round_stops_at_deadline(self, mock_document: Mock) -> None:
+        """Test that reads queued behind slow ones don't outlast the deadline."""
+        timeouts: list[float] = []
+
+        def document(desk_id: str) -> Dict[str, Any]:
+            timeouts.append(_request_timeout.get())  # type: ignore[arg-type]
+            time.sleep(0.1)
+            return {"state": {"position_mm": LOWER_POSITION_MM, "speed_mms": 0}}
+
+        mock_document.side_effect = document
+
+        started = time.monotonic()
+        arrivals = DeskService._verify_arrivals(
+            [f"desk{i}" for i in range(FAN_OUT_DESK_COUNT)],
+            RAISE_POSITION_MM,
+            concurrency=1,
+            desk_timeout=5,
+            timeout=0.25,
+            initial_interval=0.01,
+            max_interval=0.01,
+        )
+
+        assert arrivals == {}
+        assert time.monotonic() - started < 0.5  # noqa: PLR2004
+        assert len(timeouts) < FAN_OUT_DESK_COUNT
+        assert all(t <= 0.25 for t in timeouts)  # noqa: PLR2004
+        assert timeouts == sorted(timeouts, reverse=True)
+
+    @patch("src.services.desk_service.rabbitmq_client.publish")
+    @patch("src.services.desk_service.DeskService._verify_arrivals")
+    @patch("src.services.desk_service.DeskService.set_desk_position")
+    @patch("src.services.desk_service.DeskService.get_all_desks")
+    def test_move_all_desks_reports_stragglers(
+        self,
+        mock_get_all: Mock,
+        mock_set_pos: Mock,
+        mock_verify: Mock,
+        mock_publish: Mock,
+    ) -> None:
+        """Test that arrival times and stragglers reach the results and event."""
+        mock_get_all.return_value = ["desk1", "desk2", "broken"]
+
+        def set_position_side_effect(desk_id: str, position: int) -> Dict[str, Any]:
+            if desk_id == "broken":
+                raise DeskServiceError("Desk unreachable")
+            return {"status": "success"}
+
+        mock_set_pos.side_effect = set_position_side_effect
+        mock_verify.return_value = {"desk1": 12.5}
+
+        results = DeskService._move_all_desks("raise", RAISE_POSITION_MM, verify=True)
+
+        assert mock_verify.call_args.args[0] == ["desk1", "desk2"]
+        by_id = {r["desk_id"]: r for r in results}
+        assert by_id["desk1"]["arrived"] is True
+        assert by_id["desk1"]["arrival_s"] == 12.5  # noqa: PLR2004
+        assert by_id["desk2"]["arrived"] is False
+        assert "arrived" not in by_id["broken"]
+        verification = mock_publish.call_args[0][1]["verification"]
+        assert verification["arrived"] == 1
+        assert verification["stragglers"] == ["desk2"]
+
 
 class TestDeskServiceError(unittest.TestCase):
     """Test the DeskServiceError exception class."""
@@ -377,7 +653,7 @@ class TestDeskServiceIntegration(unittest.TestCase):
     """Integration-style tests for DeskService operations."""
 
     @patch("src.services.desk_service.rabbitmq_client.publish")
-    @patch("src.services.desk_service.requests.request")
+    @patch("src.services.desk_service.desk_transport.request")
     def test_full_raise_workflow(self, mock_request: Mock, mock_publish: Mock) -> None:
         """Test full workflow of raising all desks."""
         # Mock getting all desks
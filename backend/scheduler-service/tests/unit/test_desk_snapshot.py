@@ -0,0 +1,201 @@
+"""Unit tests for desk_snapshot.py.
+
+Tests the bulk desk snapshot with DeskService mocked.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from typing import Dict
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.services.desk_service import DeskServiceError
+from src.services.desk_snapshot import DeskSnapshotCache, parse_fields, project
+
+DESK_IDS = [f"desk{i}" for i in range(6)]
+SNAPSHOT_CONCURRENCY = 3
+CONCURRENT_CALLERS = 5
+POSITION_MM = 800
+DOCUMENT: Dict[str, object] = {
+    "config": {"name": "Test Desk"},
+    "state": {"position_mm": POSITION_MM, "status": "Normal", "speed_mms": 0},
+    "usage": {"activationsCounter": 3},
+}
+
+
+class _Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestFieldProjection(unittest.TestCase):
+    """Test parsing and applying ``?fields=`` projections."""
+
+    def test_parse_fields(self) -> None:
+        """Test that dotted paths are split into segments."""
+        assert parse_fields(None) is None
+        assert parse_fields(" ") is None
+        assert parse_fields("state.position_mm, config") == [
+            ("state", "position_mm"),
+            ("config",),
+        ]
+
+    def test_parse_fields_rejects_empty_segments(self) -> None:
+        """Test that malformed paths are rejected."""
+        with pytest.raises(ValueError, match="Invalid field path"):
+            parse_fields("state..position_mm")
+
+    def test_project_keeps_requested_paths(self) -> None:
+        """Test that only requested fields survive and missing ones are skipped."""
+        paths = parse_fields("state.position_mm,state.status,state.missing,config")
+
+        assert project(DOCUMENT, paths) == {
+            "state": {"position_mm": POSITION_MM, "status": "Normal"},
+            "config": {"name": "Test Desk"},
+        }
+
+
+@patch("src.services.desk_snapshot.DeskService")
+class TestDeskSnapshotCache(unittest.TestCase):
+    """Test the DeskSnapshotCache class."""
+
+    def setUp(self) -> None:
+        """Create a fresh snapshot cache with a manual clock."""
+        self.clock = _Clock()
+        self.snapshot = DeskSnapshotCache(
+            ttl=2, concurrency=SNAPSHOT_CONCURRENCY, desk_timeout=1, clock=self.clock
+        )
+
+    def test_failed_desks_get_error_column(self, mock_service: Mock) -> None:
+        """Test that unreadable desks are reported rather than dropped."""
+        mock_service.get_all_desks.return_value = ["desk1", "desk2"]
+
+        def fetch(desk_id: str) -> Dict[str, object]:
+            if desk_id == "desk2":
+                raise DeskServiceError("Desk API returned 404")
+            return DOCUMENT
+
+        mock_service.get_desk_document.side_effect = fetch
+
+        rows = [entry.as_row() for entry in self.snapshot.get()]
+
+        assert rows == [
+            {"id": "desk1", "state": DOCUMENT, "error": None},
+            {"id": "desk2", "state": None, "error": "Desk API returned 404"},
+        ]
+
+    def test_fetches_desks_concurrently_with_limit(self, mock_service: Mock) -> None:
+        """Test that desk documents are fetched in parallel up to the limit."""
+        mock_service.get_all_desks.return_value = DESK_IDS
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+
+        def fetch(desk_id: str) -> Dict[str, object]:
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return DOCUMENT
+
+        mock_service.get_desk_document.side_effect = fetch
+
+        entries = self.snapshot.get()
+
+        assert [entry.desk_id for entry in entries] == DESK_IDS
+        assert active["peak"] == SNAPSHOT_CONCURRENCY
+
+    def test_snapshot_is_reused_until_ttl_expires(self, mock_service: Mock) -> None:
+        """Test that callers share a cached snapshot within the TTL."""
+        mock_service.get_all_desks.return_value = ["desk1"]
+        mock_service.get_desk_document.return_value = DOCUMENT
+
+        self.snapshot.get()
+        self.clock.now = 1.5
+        self.snapshot.get()
+        assert mock_service.get_all_desks.call_count == 1
+
+        self.clock.now = 2.5
+        self.snapshot.get()
+        assert mock_service.get_all_desks.call_count == 2  # noqa: PLR2004
+
+    def test_invalidate_forces_rebuild(self, mock_service: Mock) -> None:
+        """Test that invalidate drops the cached snapshot."""
+        mock_service.get_all_desks.return_value = ["desk1"]
+        mock_service.get_desk_document.return_value = DOCUMENT
+
+        self.snapshot.get()
+        self.snapshot.invalidate()
+        self.snapshot.get()
+
+        assert mock_service.get_all_desks.call_count == 2  # noqa: PLR2004
+
+    def test_concurrent_callers_share_one_build(self, mock_service: Mock) -> None:
+        """Test that callers arriving mid-build wait for the same snapshot."""
+        release = threading.Event()
+
+        def list_desks() -> list[str]:
+            release.wait(1)
+            return ["desk1"]
+
+        mock_service.get_all_desks.side_effect = list_desks
+        mock_service.get_desk_document.return_value = DOCUMENT
+
+        results: list[object] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.snapshot.get()))
+            for _ in range(CONCURRENT_CALLERS)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == CONCURRENT_CALLERS
+        assert mock_service.get_all_desks.call_count == 1
+        assert self.snapshot.stats()["shared_builds"] == CONCURRENT_CALLERS - 1
+
+    def test_desk_list_failure_is_raised_and_not_cached(
+        self, mock_service: Mock
+    ) -> None:
+        """Test that a failed desk list propagates and the next call retries."""
+        mock_service.get_all_desks.side_effect = [
+            DeskServiceError("Failed to connect"),
+            ["desk1"],
+        ]
+        mock_service.get_desk_document.return_value = DOCUMENT
+
+        with pytest.raises(DeskServiceError):
+            self.snapshot.get()
+
+        assert [entry.desk_id for entry in self.snapshot.get()] == ["desk1"]
+
+    def test_positions_only_include_desks_at_rest(self, mock_service: Mock) -> None:
+        """Test that moving and unreadable desks have no position."""
+        mock_service.get_all_desks.return_value = ["rest", "moving", "broken"]
+        moving = {**DOCUMENT, "state": {"position_mm": POSITION_MM, "speed_mms": 32}}
+
+        def fetch(desk_id: str) -> Dict[str, object]:
+            if desk_id == "broken":
+                raise DeskServiceError("Desk API returned 404")
+            return moving if desk_id == "moving" else DOCUMENT
+
+        mock_service.get_desk_document.side_effect = fetch
+
+        assert self.snapshot.positions() == {"rest": POSITION_MM}
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
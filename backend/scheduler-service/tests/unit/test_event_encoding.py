@@ -0,0 +1,132 @@
+"""Unit tests for event_encoding.py.
+
+Tests the columnar desk.action encoding and its use by DeskService.
+"""
+
+from __future__ import annotations
+
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.services.desk_service import DeskService
+from src.services.event_encoding import (
+    COLUMNAR_CONTENT_TYPE,
+    decode_columnar,
+    encode_columnar,
+)
+
+DESK_COUNT = 25
+CHUNK_DESKS = 10
+EXPECTED_CHUNKS = 3
+RAISE_POSITION_MM = 1100
+
+
+def _payload(desks: int = DESK_COUNT) -> dict[str, object]:
+    statuses = ["moved", "skipped", "failed"]
+    return {
+        "action": "raise",
+        "position_mm": RAISE_POSITION_MM,
+        "total_desks": desks,
+        "context": {"trigger": "schedule", "job_id": "standup"},
+        "results": [
+            {
+                "desk_id": "desk%03d" % i,
+                "success": statuses[i % 3] != "failed",
+                "position_mm": RAISE_POSITION_MM,
+                "status": statuses[i % 3],
+                **({"latency_ms": float(i)} if statuses[i % 3] != "skipped" else {}),
+            }
+            for i in range(desks)
+        ],
+    }
+
+
+class TestColumnarEncoding(unittest.TestCase):
+    """Test encoding results as compressed column chunks."""
+
+    def test_round_trip_in_any_chunk_order(self) -> None:
+        """Test that decoding the chunks restores the original event."""
+        payload = _payload()
+
+        chunks = encode_columnar(payload, chunk_desks=CHUNK_DESKS, run_id="run1")
+        decoded = decode_columnar(
+            (chunk.body, chunk.content_encoding) for chunk in reversed(chunks)
+        )
+
+        assert len(chunks) == EXPECTED_CHUNKS
+        assert [c.headers["chunk"] for c in chunks] == [0, 1, 2]
+        assert {c.content_encoding for c in chunks} == {"gzip"}
+        assert decoded == {**payload, "run_id": "run1"}
+
+    def test_compressed_columns_are_smaller_than_json(self) -> None:
+        """Test that the encoding shrinks a large event."""
+        payload = _payload(desks=2000)
+
+        chunks = encode_columnar(payload, chunk_desks=2000)
+
+        assert len(chunks[0].body) * 5 < len(json.dumps(payload))
+
+    def test_uncompressed_chunks_are_json_text(self) -> None:
+        """Test that compression can be turned off."""
+        chunks = encode_columnar(_payload(), compression="none")
+
+        assert chunks[0].content_encoding is None
+        assert json.loads(chunks[0].body)["columns"]["status"][:3] == [0, 1, 2]
+
+    def test_missing_chunk_is_rejected(self) -> None:
+        """Test that an incomplete run can't be decoded."""
+        chunks = encode_columnar(_payload(), chunk_desks=CHUNK_DESKS)
+
+        with pytest.raises(ValueError, match="Missing chunks"):
+            decode_columnar((c.body, c.content_encoding) for c in chunks[:2])
+
+    @patch("src.services.desk_service.rabbitmq_client.publish")
+    @patch("src.services.desk_service.DESK_EVENT_ENCODING", "columnar")
+    def test_desk_service_publishes_columnar_chunks(self, mock_publish: Mock) -> None:
+        """Test that DeskService sends chunks with their content encoding."""
+        mock_publish.return_value = True
+        payload = _payload(desks=3)
+
+        DeskService._publish_rabbitmq_event(
+            action="raise",
+            position_mm=RAISE_POSITION_MM,
+            results=payload["results"],  # type: ignore[arg-type]
+            context=None,
+        )
+
+        mock_publish.assert_called_once()
+        kwargs = mock_publish.call_args.kwargs
+        assert mock_publish.call_args.args[0] == "desk.action.raise"
+        assert kwargs["content_type"] == COLUMNAR_CONTENT_TYPE
+        decoded = decode_columnar(
+            [(mock_publish.call_args.args[1], kwargs["content_encoding"])]
+        )
+        assert decoded["successful"] == 1
+        assert decoded["results"] == payload["results"]
+
+    @patch("src.services.desk_service.rabbitmq_client.publish")
+    @patch("src.services.desk_service.DESK_EVENT_ENCODING", "columnar")
+    def test_every_chunk_is_attempted_after_a_failure(self, mock_publish: Mock) -> None:
+        """Test that a failed chunk doesn't stop the later ones."""
+        mock_publish.side_effect = [False, True, True]
+        payload = _payload()
+
+        with patch(
+            "src.services.desk_service.encode_columnar",
+            lambda p: encode_columnar(p, chunk_desks=CHUNK_DESKS),
+        ):
+            DeskService._publish_rabbitmq_event(
+                action="raise",
+                position_mm=RAISE_POSITION_MM,
+                results=payload["results"],  # type: ignore[arg-type]
+                context=None,
+            )
+
+        assert mock_publish.call_count == EXPECTED_CHUNKS
+
+
+if __name__ == "__main__":
+    unittest.main()
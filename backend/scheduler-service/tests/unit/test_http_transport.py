@@ -0,0 +1,104 @@
+"""Unit tests for http_transport.py.
+
+Runs the pooled transport against a local keep-alive HTTP server.
+"""
+
+from __future__ import annotations
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.services.http_transport import DeskHttpTransport, HttpTransportSettings
+
+REQUEST_COUNT = 5
+CONNECT_TIMEOUT = 1.5
+READ_TIMEOUT = 4.0
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Minimal handler that keeps connections open between requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Respond with a tiny JSON body."""
+        body = b"[]"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Silence request logging."""
+
+
+class TestDeskHttpTransport(unittest.TestCase):
+    """Test the DeskHttpTransport class."""
+
+    def setUp(self) -> None:
+        """Start a local HTTP server and a fresh transport."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = "http://127.0.0.1:%s/desks/" % self.server.server_port
+        self.transport = DeskHttpTransport(
+            HttpTransportSettings(
+                pool_maxsize=2,
+                connect_timeout=CONNECT_TIMEOUT,
+                read_timeout=READ_TIMEOUT,
+            )
+        )
+
+    def tearDown(self) -> None:
+        """Stop the server and close the transport."""
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self) -> None:
+        """Test that sequential requests share one keep-alive connection."""
+        for _ in range(REQUEST_COUNT):
+            response = self.transport.request("GET", self.url)
+            assert response.status_code == 200  # noqa: PLR2004
+
+        stats = self.transport.stats()
+        assert stats["requests_total"] == REQUEST_COUNT
+        assert stats["in_flight"] == 0
+        (host,) = stats["hosts"]
+        assert host["connections_opened"] == 1
+        assert host["requests"] == REQUEST_COUNT
+        assert host["idle_connections"] == 1
+
+    def test_default_timeout_is_connect_read_tuple(self) -> None:
+        """Test that separate connect and read timeouts are applied."""
+        with patch.object(self.transport._session, "request") as mock_request:
+            mock_request.return_value = Mock(status_code=200)
+            self.transport.request("GET", self.url)
+
+        assert mock_request.call_args.kwargs["timeout"] == (
+            CONNECT_TIMEOUT,
+            READ_TIMEOUT,
+        )
+
+    def test_errors_are_counted(self) -> None:
+        """Test that failed requests increment the error counter."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.transport.close()
+
+        with pytest.raises(requests.ConnectionError):
+            self.transport.request("GET", self.url)
+
+        stats = self.transport.stats()
+        assert stats["errors_total"] == 1
+        assert stats["in_flight"] == 0
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -6,9 +6,13 @@ Tests the RabbitMQClient class in isolation with all dependencies mocked.
 import json
 import os
 import sys
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import Mock, patch
 
+from src.services.event_spool import EventSpool, SpoolSettings
 from src.services.rabbitmq_client import RabbitMQClient, RabbitMQSettings
 
 # ---- Test constants (replace magic numbers/strings in assertions) ----
@@ -25,6 +29,8 @@ ANSWER_NUMBER = 42
 
 DELIVERY_MODE_PERSISTENT = 2
 DELIVERY_MODE_NON_PERSISTENT = 1
+SPOOLED_EVENT_COUNT = 3
+PUBLISHING_THREADS = 8
 # ----------------------------------------------------------------------
 
 # Add the project root to the path (go up from tests/unit to project root)
@@ -386,6 +392,182 @@ class TestRabbitMQClientIntegration(unittest.TestCase):
         mock_connection.close.assert_called_once()
 
 
+class TestRabbitMQClientSpool(unittest.TestCase):
+    """Test spooling and replay of events while the broker is down."""
+
+    def setUp(self) -> None:
+        """Create a client backed by a spool in a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.spool = EventSpool(SpoolSettings(directory=self.tmpdir.name))
+        self.client = RabbitMQClient(RabbitMQSettings(), spool=self.spool)
+
+    def tearDown(self) -> None:
+        """Close the spool and remove its directory."""
+        self.client.stop_replay()
+        self.tmpdir.cleanup()
+
+    def _go_online(self, mock_pika: Mock) -> Mock:
+        mock_connection = Mock()
+        mock_connection.is_closed = False
+        mock_channel = Mock()
+        mock_pika.BlockingConnection.side_effect = None
+        mock_pika.BlockingConnection.return_value = mock_connection
+        mock_connection.channel.return_value = mock_channel
+        return mock_channel
+
+    @patch("src.services.rabbitmq_client.pika")
+    def test_events_are_spooled_while_disconnected(self, mock_pika: Mock) -> None:
+        """Test that unpublishable events land in the spool instead of being lost."""
+        mock_pika.BlockingConnection.side_effect = Exception("Connection refused")
+
+        for i in range(SPOOLED_EVENT_COUNT):
+            assert self.client.publish("desk.action.raise", {"n": i}) is False
+
+        assert len(self.spool) == SPOOLED_EVENT_COUNT
+
+    @patch("src.services.rabbitmq_client.pika")
+    def test_replay_publishes_spooled_events_in_order(self, mock_pika: Mock) -> None:
+        """Test that replay drains the spool in order once the broker is back."""
+        mock_pika.BlockingConnection.side_effect = Exception("Connection refused")
+        for i in range(SPOOLED_EVENT_COUNT):
+            self.client.publish("desk.action.raise", {"n": i})
+
+        mock_channel = self._go_online(mock_pika)
+        assert self.client.replay_spool() is True
+
+        bodies = [
+            json.loads(call.kwargs["body"])["n"]
+            for call in mock_channel.basic_publish.call_args_list
+        ]
+        assert bodies == list(range(SPOOLED_EVENT_COUNT))
+        assert len(self.spool) == 0
+        assert self.client.spool_stats()["replayed_total"] == SPOOLED_EVENT_COUNT
+
+    @patch("src.services.rabbitmq_client.pika")
+    def test_new_events_queue_behind_spool_backlog(self, mock_pika: Mock) -> None:
+        """Test that a new event is not published ahead of spooled ones."""
+        mock_pika.BlockingConnection.side_effect = Exception("Connection refused")
+        self.client.publish("desk.action.raise", {"n": 0})
+
+        mock_channel = self._go_online(mock_pika)
+        assert self.client.publish("desk.action.lower", {"n": 1}) is False
+        mock_channel.basic_publish.assert_not_called()
+
+        self.client.replay_spool()
+        keys = [
+            call.kwargs["routing_key"]
+            for call in mock_channel.basic_publish.call_args_list
+        ]
+        assert keys == ["desk.action.raise", "desk.action.lower"]
+
+    @patch("src.services.rabbitmq_client.pika")
+    def test_binary_events_keep_their_encoding_in_the_spool(
+        self, mock_pika: Mock
+    ) -> None:
+        """Test that a compressed event is replayed byte for byte."""
+        mock_pika.BlockingConnection.side_effect = Exception("Connection refused")
+        body = b"\x1f\x8b compressed"
+        self.client.publish(
+            "desk.action.raise",
+            body,
+            content_type="application/octet-stream",
+            content_encoding="gzip",
+            headers={"chunk": 0},
+        )
+
+        mock_channel = self._go_online(mock_pika)
+        self.client.replay_spool()
+
+        assert mock_channel.basic_publish.call_args.kwargs["body"] == body
+        properties = mock_pika.BasicProperties.call_args.kwargs
+        assert properties["content_encoding"] == "gzip"
+        assert properties["headers"] == {"chunk": 0}
+
+
+class TestRabbitMQPublisherThread(unittest.TestCase):
+    """Test publishing through the thread that owns the connection."""
+
+    def setUp(self) -> None:
+        """Create a client whose broker connection is mocked."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.spool = EventSpool(SpoolSettings(directory=self.tmpdir.name))
+        self.client = RabbitMQClient(
+            RabbitMQSettings(heartbeat=1, publish_timeout=5), spool=self.spool
+        )
+        patcher = patch("src.services.rabbitmq_client.pika")
+        self.mock_pika = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_connection = Mock()
+        self.mock_connection.is_closed = False
+        self.mock_channel = Mock()
+        self.mock_channel.is_closed = False
+        self.mock_pika.BlockingConnection.return_value = self.mock_connection
+        self.mock_connection.channel.return_value = self.mock_channel
+
+    def tearDown(self) -> None:
+        """Stop the publisher thread and remove the spool directory."""
+        self.client.stop_publisher()
+        self.client.stop_replay()
+        self.tmpdir.cleanup()
+
+    def test_publishes_from_many_threads_on_one_thread(self) -> None:
+        """Test that every publish runs on the publisher thread with confirms."""
+        publishing_threads: list[str] = []
+        self.mock_channel.basic_publish.side_effect = lambda **_: (
+            publishing_threads.append(threading.current_thread().name)
+        )
+        self.client.start_publisher()
+
+        results: list[bool] = []
+        workers = [
+            threading.Thread(
+                target=lambda i=i: results.append(
+                    self.client.publish("desk.action.raise", {"n": i})
+                )
+            )
+            for i in range(PUBLISHING_THREADS)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=5)
+
+        assert results == [True] * PUBLISHING_THREADS
+        assert publishing_threads == ["rabbitmq-publisher"] * PUBLISHING_THREADS
+        self.mock_pika.BlockingConnection.assert_called_once()
+        self.mock_channel.confirm_delivery.assert_called_once()
+        assert self.client.publisher_stats()["published_total"] == PUBLISHING_THREADS
+
+    def test_unconfirmed_event_is_spooled(self) -> None:
+        """Test that an event the broker doesn't confirm lands in the spool."""
+        self.mock_channel.basic_publish.side_effect = Exception("NACK")
+        self.client.start_publisher()
+
+        assert self.client.publish("desk.action.raise", {"n": 0}) is False
+        assert len(self.spool) == 1
+
+    def test_idle_thread_services_heartbeats(self) -> None:
+        """Test that the connection is serviced while nothing is published."""
+        self.client.start_publisher()
+        self.client.publish("desk.action.raise", {"n": 0})
+
+        deadline = time.monotonic() + 5
+        while not self.mock_connection.process_data_events.called:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        self.mock_connection.process_data_events.assert_called_with(time_limit=0)
+
+    def test_stop_publisher_disconnects(self) -> None:
+        """Test that stopping the thread closes the connection it owns."""
+        self.client.start_publisher()
+        self.client.publish("desk.action.raise", {"n": 0})
+
+        self.client.stop_publisher()
+
+        self.mock_connection.close.assert_called_once()
+        assert self.client.publisher_stats()["thread_running"] is False
+
+
 if __name__ == "__main__":
     # Run the tests with verbose output
     unittest.main(verbosity=2)
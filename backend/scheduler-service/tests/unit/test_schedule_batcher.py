@@ -0,0 +1,106 @@
+"""Unit tests for schedule_batcher.py.
+
+Tests merging co-firing schedules into one move plan with DeskService mocked.
+"""
+
+from __future__ import annotations
+
+import threading
+import unittest
+from typing import List
+from unittest.mock import Mock, patch
+
+from src.services.schedule_batcher import ScheduleBatcher, ScheduledMove
+from src.services.scheduler_service import run_move_plan, run_scheduled_move
+
+RAISE_POSITION_MM = 1100
+LOWER_POSITION_MM = 680
+COFIRING_SCHEDULES = 5
+
+RAISE = ScheduledMove("standup", "Standup", "raise", RAISE_POSITION_MM)
+LOWER = ScheduledMove("cleaning_end", "End Cleaning", "lower", LOWER_POSITION_MM)
+
+
+class TestScheduleBatcher(unittest.TestCase):
+    """Test cases for ScheduleBatcher."""
+
+    def setUp(self) -> None:
+        """Set up a batcher recording the plans it executes."""
+        self.plans: List[List[ScheduledMove]] = []
+        self.window_open = threading.Event()
+        self.window_closed = threading.Event()
+
+        def _sleep(_: float) -> None:
+            self.window_open.set()
+            self.window_closed.wait(timeout=5)
+
+        self.batcher = ScheduleBatcher(self.plans.append, sleep=_sleep)
+
+    def test_cofiring_schedules_execute_as_one_plan(self) -> None:
+        """Test that schedules firing within the window form a single plan."""
+        moves = [
+            ScheduledMove("job%d" % i, "Job %d" % i, "raise", RAISE_POSITION_MM + i)
+            for i in range(COFIRING_SCHEDULES)
+        ]
+        first = threading.Thread(target=self.batcher.submit, args=(moves[0],))
+        first.start()
+        assert self.window_open.wait(timeout=5)
+
+        joined = [self.batcher.submit(move) for move in moves[1:]]
+        self.window_closed.set()
+        first.join(timeout=5)
+
+        assert joined == [False] * (COFIRING_SCHEDULES - 1)
+        assert self.plans == [moves]
+        stats = self.batcher.stats()
+        assert stats["plans"] == 1
+        assert stats["largest_plan"] == COFIRING_SCHEDULES
+
+    def test_schedules_after_the_window_form_a_new_plan(self) -> None:
+        """Test that a schedule firing after the window isn't merged."""
+        self.window_closed.set()
+
+        assert self.batcher.submit(RAISE)
+        assert self.batcher.submit(LOWER)
+
+        assert self.plans == [[RAISE], [LOWER]]
+
+
+class TestRunMovePlan(unittest.TestCase):
+    """Test cases for executing a merged move plan."""
+
+    @patch("src.services.scheduler_service.desk_snapshot")
+    @patch("src.services.scheduler_service.DeskService")
+    def test_latest_schedule_wins(
+        self, mock_desk_service: Mock, mock_snapshot: Mock
+    ) -> None:
+        """Test that desks are moved once, to the last schedule's target."""
+        run_move_plan([RAISE, LOWER])
+
+        mock_desk_service.raise_all_desks.assert_not_called()
+        mock_desk_service.lower_all_desks.assert_called_once_with(
+            LOWER_POSITION_MM,
+            context={
+                "trigger": "schedule",
+                "job_id": "cleaning_end",
+                "job_name": "End Cleaning",
+                "superseded_job_ids": ["standup"],
+            },
+        )
+        mock_snapshot.invalidate.assert_called_once()
+
+    @patch("src.services.scheduler_service.schedule_batcher")
+    @patch("src.services.scheduler_service.DeskService")
+    @patch("src.services.scheduler_service.SCHEDULER_BATCH_ENABLED", True)
+    def test_scheduled_move_joins_the_batch(
+        self, mock_desk_service: Mock, mock_batcher: Mock
+    ) -> None:
+        """Test that a fired schedule is handed to the batcher when enabled."""
+        run_scheduled_move("standup", "Standup", "raise", RAISE_POSITION_MM)
+
+        mock_batcher.submit.assert_called_once_with(RAISE)
+        mock_desk_service.raise_all_desks.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Unit tests for the schedule run history.
+
+Runs against an in-memory SQLite database with DeskService mocked.
+"""
+
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session
+
+from src.models.db.schedule_run import ScheduleRun
+from src.repositories.schedule_run_repository import ScheduleRunRepository
+from src.services.schedule_batcher import ScheduledMove
+from src.services.schedule_runs import percentile, summarize_run
+from src.services.scheduler_service import (
+    SchedulerService,
+    run_move_plan,
+    run_scheduled_move,
+)
+
+RAISE_POSITION_MM = 1100
+RUNS = 5
+PAGE_SIZE = 2
+STARTED_AT = datetime(2025, 1, 1, 8, 0, tzinfo=timezone.utc)
+
+RESULTS: list[dict[str, object]] = [
+    {"desk_id": "desk1", "success": True, "status": "moved", "latency_ms": 40.0},
+    {"desk_id": "desk2", "success": True, "status": "moved", "latency_ms": 120.0},
+    {"desk_id": "desk3", "success": False, "status": "failed", "latency_ms": 900.0},
+    {"desk_id": "desk4", "success": True, "status": "skipped"},
+]
+
+
+def _run(job_id: str, minutes: int, duration_s: float) -> ScheduleRun:
+    started_at = STARTED_AT + timedelta(minutes=minutes)
+    return summarize_run(
+        job_id=job_id,
+        action="raise",
+        position_mm=RAISE_POSITION_MM,
+        started_at=started_at,
+        finished_at=started_at + timedelta(seconds=duration_s),
+        duration_s=duration_s,
+        results=RESULTS,
+    )
+
+
+class TestSummarizeRun(unittest.TestCase):
+    """Test building run history rows."""
+
+    def test_counts_and_latencies(self) -> None:
+        """Test that desk outcomes and command latencies are summarized."""
+        run = _run("standup", 0, 1.5)
+
+        assert (run.total_desks, run.successful, run.failed, run.skipped) == (
+            4,
+            2,
+            1,
+            1,
+        )
+        assert run.latency_p50_ms == 120.0  # noqa: PLR2004
+        assert run.latency_max_ms == 900.0  # noqa: PLR2004
+        assert set(run.desk_latencies_ms) == {"desk1", "desk2", "desk3"}
+
+    def test_percentile(self) -> None:
+        """Test the nearest-rank percentile."""
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 0.5) == 50.0  # noqa: PLR2004
+        assert percentile(values, 0.99) == 99.0  # noqa: PLR2004
+        assert percentile([], 0.5) is None
+
+
+class TestScheduleRunHistory(unittest.TestCase):
+    """Test storing and paging through the run history."""
+
+    def setUp(self) -> None:
+        """Create an in-memory database with a few runs."""
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        ScheduleRun.__table__.create(self.engine)  # type: ignore[attr-defined]
+        self.session = Session(self.engine)
+        self.repo = ScheduleRunRepository(self.session)
+        for i in range(RUNS):
+            self.repo.create(_run("standup", i, float(i + 1)))
+        self.repo.create(_run("cleaning", 0, 30.0))
+
+    def tearDown(self) -> None:
+        """Close the session."""
+        self.session.close()
+
+    def test_pages_newest_first(self) -> None:
+        """Test that runs are paged per schedule, newest first."""
+        first = self.repo.list_by_job_id("standup", limit=PAGE_SIZE)
+        second = self.repo.list_by_job_id("standup", limit=PAGE_SIZE, offset=2)
+
+        assert [r.duration_s for r in first + second] == [5.0, 4.0, 3.0, 2.0]
+        assert self.repo.count_by_job_id("standup") == RUNS
+        assert self.repo.recent_durations("standup", limit=PAGE_SIZE) == [5.0, 4.0]
+
+    @patch("src.services.scheduler_service.desk_snapshot")
+    @patch("src.services.scheduler_service.DeskService")
+    def test_scheduled_move_is_recorded(
+        self, mock_desk_service: Mock, mock_snapshot: Mock
+    ) -> None:
+        """Test that a scheduled move leaves a row in the run history."""
+        mock_desk_service.raise_all_desks.return_value = RESULTS
+        service = SchedulerService()
+        service.engine = self.engine
+        with patch("src.services.scheduler_service.scheduler_service", service):
+            run_scheduled_move("morning", "Morning", "raise", RAISE_POSITION_MM)
+
+        runs = self.repo.list_by_job_id("morning", limit=PAGE_SIZE)
+        assert len(runs) == 1
+        assert runs[0].successful == 2  # noqa: PLR2004
+        assert runs[0].error is None
+
+    @patch("src.services.scheduler_service.SCHEDULER_BATCH_ENABLED", True)
+    @patch("src.services.scheduler_service.desk_snapshot")
+    @patch("src.services.scheduler_service.DeskService")
+    def test_superseded_schedules_are_recorded(
+        self, mock_desk_service: Mock, mock_snapshot: Mock
+    ) -> None:
+        """Test that every schedule of a merged plan gets a run."""
+        mock_desk_service.raise_all_desks.return_value = RESULTS
+        service = SchedulerService()
+        service.engine = self.engine
+        with patch("src.services.scheduler_service.scheduler_service", service):
+            run_move_plan(
+                [
+                    ScheduledMove("early", "Early", "lower", 700),
+                    ScheduledMove("late", "Late", "raise", RAISE_POSITION_MM),
+                ]
+            )
+
+        (late,) = self.repo.list_by_job_id("late", limit=PAGE_SIZE)
+        (early,) = self.repo.list_by_job_id("early", limit=PAGE_SIZE)
+        assert (late.total_desks, late.superseded_by) == (4, None)  # noqa: PLR2004
+        assert (early.action, early.total_desks, early.superseded_by) == (
+            "lower",
+            0,
+            "late",
+        )
+        assert early.duration_s == late.duration_s
+        assert self.repo.recent_durations("early", limit=PAGE_SIZE) == [
+            early.duration_s
+        ]
@@ -0,0 +1,181 @@
+"""Unit tests for upserting schedules.
+
+Runs against an in-memory SQLite database with APScheduler mocked.
+"""
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, select
+
+from src.models.db.schedule import Schedule
+from src.repositories.schedule_repository import ScheduleRepository
+from src.services.scheduler_service import SchedulerService
+
+RAISE_POSITION_MM = 1100
+LOWER_POSITION_MM = 700
+BULK_SIZE = 200
+
+
+def _schedule(job_id: str, action: str = "raise", minute: int = 0) -> Schedule:
+    return Schedule(
+        job_id=job_id,
+        name=job_id.title(),
+        action=action,
+        position_mm=RAISE_POSITION_MM if action == "raise" else LOWER_POSITION_MM,
+        hour=8,
+        minute=minute,
+        day_of_week="*",
+        is_active=True,
+    )
+
+
+class TestScheduleUpsert(unittest.TestCase):
+    """Test inserting and replacing schedules by job_id."""
+
+    def setUp(self) -> None:
+        """Create an in-memory database."""
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Schedule.__table__.create(self.engine)  # type: ignore[attr-defined]
+        self.session = Session(self.engine)
+        self.repo = ScheduleRepository(self.session)
+
+    def tearDown(self) -> None:
+        """Close the session."""
+        self.session.close()
+
+    def test_upsert_inserts_then_replaces(self) -> None:
+        """Test that a second upsert updates the row and keeps its id."""
+        created = self.repo.upsert(_schedule("standup"))
+        updated = self.repo.upsert(_schedule("standup", action="lower", minute=30))
+
+        rows = self.session.exec(select(Schedule)).all()
+        assert len(rows) == 1
+        assert updated.id == created.id
+        assert updated.created_at == created.created_at
+        assert (rows[0].action, rows[0].minute) == ("lower", 30)  # noqa: PLR2004
+
+    def test_upsert_many_in_one_transaction(self) -> None:
+        """Test bulk upserts, where a repeated job_id keeps the last entry."""
+        self.repo.upsert(_schedule("job0"))
+        schedules = [_schedule(f"job{i}", minute=i % 60) for i in range(BULK_SIZE)]
+        schedules.append(_schedule("job1", action="lower"))
+
+        saved = self.repo.upsert_many(schedules)
+
+        assert len(saved) == BULK_SIZE
+        assert len(self.session.exec(select(Schedule)).all()) == BULK_SIZE
+        assert self.repo.get_by_job_id("job1").action == "lower"  # type: ignore[union-attr]
+
+
+class TestAddSchedules(unittest.TestCase):
+    """Test SchedulerService.add_schedules."""
+
+    def setUp(self) -> None:
+        """Create a service with a mocked APScheduler and a database."""
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Schedule.__table__.create(engine)  # type: ignore[attr-defined]
+        self.session = Session(engine)
+        self.service = SchedulerService()
+        self.service.scheduler = Mock()
+        self.service.scheduler.add_job.side_effect = lambda *_, **kw: Mock(
+            id=kw["id"], next_run_time=None
+        )
+
+    def tearDown(self) -> None:
+        """Close the session."""
+        self.session.close()
+
+    def test_saves_and_registers_all(self) -> None:
+        """Test that every schedule is saved and registered."""
+        results = self.service.add_schedules(
+            [
+                {
+                    "job_id": f"job{i}",
+                    "name": f"Job {i}",
+                    "action": "RAISE",
+                    "position_mm": RAISE_POSITION_MM,
+                    "hour": 8,
+                    "minute": i,
+                }
+                for i in range(3)
+            ],
+            self.session,
+        )
+
+        assert [r["job_id"] for r in results] == ["job0", "job1", "job2"]
+        assert self.service.scheduler.add_job.call_count == 3  # noqa: PLR2004
+        rows = self.session.exec(select(Schedule)).all()
+        assert {(r.action, r.day_of_week) for r in rows} == {("raise", "*")}
+
+    def test_invalid_schedule_saves_nothing(self) -> None:
+        """Test that one invalid schedule rejects the whole batch."""
+        schedules = [
+            {
+                "job_id": "ok",
+                "name": "Ok",
+                "action": "raise",
+                "position_mm": RAISE_POSITION_MM,
+                "hour": 8,
+                "minute": 0,
+            },
+            {
+                "job_id": "bad",
+                "name": "Bad",
+                "action": "jump",
+                "position_mm": RAISE_POSITION_MM,
+                "hour": 8,
+                "minute": 0,
+            },
+        ]
+
+        with pytest.raises(ValueError, match=r"Schedule #1 \(bad\)"):
+            self.service.add_schedules(schedules, self.session)
+
+        assert self.session.exec(select(Schedule)).all() == []
+        self.service.scheduler.add_job.assert_not_called()
+
+    def test_invalid_cron_fields_save_nothing(self) -> None:
+        """Test that a bad day_of_week rejects the batch before saving."""
+        schedules = [
+            {
+                "job_id": "a",
+                "name": "A",
+                "action": "raise",
+                "position_mm": RAISE_POSITION_MM,
+                "hour": 8,
+                "minute": 0,
+            },
+            {
+                "job_id": "b",
+                "name": "B",
+                "action": "lower",
+                "position_mm": LOWER_POSITION_MM,
+                "hour": 17,
+                "minute": 0,
+                "day_of_week": "funday",
+            },
+        ]
+
+        with pytest.raises(ValueError, match=r"Schedule #1 \(b\).*funday"):
+            self.service.add_schedules(schedules, self.session)
+
+        assert self.session.exec(select(Schedule)).all() == []
+        self.service.scheduler.add_job.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
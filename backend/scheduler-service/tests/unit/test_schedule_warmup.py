@@ -0,0 +1,143 @@
+"""Unit tests for schedule_warmup.py.
+
+Tests prefetching the desk inventory ahead of scheduled runs with a fake
+clock and DeskService mocked.
+"""
+
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from unittest.mock import Mock, patch
+
+from src.services.desk_service import DeskService, DeskServiceError
+from src.services.schedule_warmup import ScheduleWarmup, WarmInventory
+from src.services.scheduler_service import SchedulerService, run_scheduled_move
+
+RAISE_POSITION_MM = 1100
+LEAD = 15.0
+POLL = 30.0
+FIRE_TIME = datetime(2025, 1, 6, 9, 0, tzinfo=timezone.utc)
+DESKS = ["desk1", "desk2"]
+
+
+class TestScheduleWarmup(unittest.TestCase):
+    """Test cases for ScheduleWarmup."""
+
+    def setUp(self) -> None:
+        """Set up a warmup with a fake clock and a counting prefetch."""
+        self.now = FIRE_TIME - timedelta(minutes=5)
+        self.fire_time: Optional[datetime] = FIRE_TIME
+        self.prefetches: List[datetime] = []
+
+        def _prefetch() -> tuple[list[str], None]:
+            self.prefetches.append(self.now)
+            return DESKS, None
+
+        self.prefetch = Mock(side_effect=_prefetch)
+        self.warmup = ScheduleWarmup(
+            lambda: self.fire_time,
+            self.prefetch,
+            lead=LEAD,
+            poll=POLL,
+            max_delay=60,
+            clock=lambda: self.now,
+        )
+
+    def test_waits_until_the_lead_time(self) -> None:
+        """Test that nothing is fetched before the lead time."""
+        assert self.warmup.tick() == POLL
+        self.now = FIRE_TIME - timedelta(seconds=LEAD + 10)
+
+        assert self.warmup.tick() == 10  # noqa: PLR2004
+        assert self.prefetches == []
+        assert self.warmup.take() is None
+
+    def test_prefetches_once_per_run_time(self) -> None:
+        """Test that the inventory is fetched once and shared by the run."""
+        self.now = FIRE_TIME - timedelta(seconds=LEAD - 1)
+
+        wait = self.warmup.tick()
+        self.warmup.tick()
+
+        assert wait == LEAD - 1
+        assert len(self.prefetches) == 1
+        self.now = FIRE_TIME + timedelta(seconds=2)
+        inventory = self.warmup.take()
+        assert inventory is not None
+        assert (inventory.fire_time, inventory.desk_ids) == (FIRE_TIME, DESKS)
+
+    def test_stale_or_invalidated_inventory_is_not_used(self) -> None:
+        """Test that a run far from the warmed run time fetches itself."""
+        self.now = FIRE_TIME - timedelta(seconds=5)
+        self.warmup.tick()
+
+        self.now = FIRE_TIME + timedelta(minutes=2)
+        assert self.warmup.take() is None
+        self.now = FIRE_TIME
+        self.warmup.invalidate()
+        assert self.warmup.take() is None
+        assert self.warmup.stats()["missed"] == 2  # noqa: PLR2004
+
+    def test_failed_prefetch_is_not_retried(self) -> None:
+        """Test that a failing box leaves the run to fetch the inventory."""
+        self.prefetch.side_effect = DeskServiceError("Desk API unreachable")
+        self.now = FIRE_TIME - timedelta(seconds=5)
+
+        self.warmup.tick()
+        self.warmup.tick()
+
+        assert self.prefetch.call_count == 1
+        assert self.warmup.take() is None
+        assert self.warmup.stats()["failures"] == 1
+
+    def test_no_jobs(self) -> None:
+        """Test that the warmup idles without a next run time."""
+        self.fire_time = None
+
+        assert self.warmup.tick() == POLL
+        assert self.prefetches == []
+
+
+class TestWarmScheduledRun(unittest.TestCase):
+    """Test that scheduled runs start from the warm inventory."""
+
+    @patch("src.services.scheduler_service.SCHEDULER_WARMUP_ENABLED", True)
+    @patch("src.services.scheduler_service.desk_snapshot")
+    @patch("src.services.scheduler_service.DeskService")
+    def test_run_uses_prefetched_desks(
+        self, mock_desk_service: Mock, mock_snapshot: Mock
+    ) -> None:
+        """Test that the run skips the desk list request and drops the data."""
+        mock_desk_service.raise_all_desks.return_value = []
+        service = SchedulerService()
+        service.warmup.take = Mock(  # type: ignore[method-assign]
+            return_value=WarmInventory(FIRE_TIME, FIRE_TIME, DESKS)
+        )
+        service.warmup.invalidate = Mock()  # type: ignore[method-assign]
+        with patch("src.services.scheduler_service.scheduler_service", service):
+            run_scheduled_move("standup", "Standup", "raise", RAISE_POSITION_MM)
+
+        kwargs = mock_desk_service.raise_all_desks.call_args.kwargs
+        assert kwargs["desk_ids"] == DESKS
+        service.warmup.invalidate.assert_called_once()
+
+    @patch("src.services.desk_service.rabbitmq_client.publish")
+    @patch("src.services.desk_service.DeskService.set_desk_position")
+    @patch("src.services.desk_service.DeskService.get_all_desks")
+    def test_bulk_move_with_desk_ids_skips_listing(
+        self, mock_get_all: Mock, mock_set_pos: Mock, mock_publish: Mock
+    ) -> None:
+        """Test that prefetched desk ids are commanded without a list call."""
+        mock_set_pos.return_value = {"status": "success"}
+
+        results = DeskService.raise_all_desks(RAISE_POSITION_MM, desk_ids=DESKS)
+
+        mock_get_all.assert_not_called()
+        mock_publish.assert_called_once()
+        assert [r["desk_id"] for r in results] == DESKS
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Unit tests for scheduler_leader.py and the database jobstore.
+
+Runs against an in-memory SQLite database.
+"""
+
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from src.models.db.scheduler_lease import SchedulerLease
+from src.services.scheduler_leader import LeaderElector, LeaderSettings
+from src.services.scheduler_service import SchedulerService
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+LEASE_TTL = 15
+RAISE_POSITION_MM = 1100
+
+
+class _Clock:
+    """Manually advanced UTC clock."""
+
+    def __init__(self) -> None:
+        self.now = datetime(2025, 1, 1, 8, 0, tzinfo=timezone.utc)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _engine() -> Engine:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SchedulerLease.__table__.create(engine)  # type: ignore[attr-defined]
+    return engine
+
+
+class TestLeaderElector(unittest.TestCase):
+    """Test the lease-based leader election."""
+
+    def setUp(self) -> None:
+        """Create two replicas sharing one database and clock."""
+        self.engine = _engine()
+        self.clock = _Clock()
+        settings = LeaderSettings(lease_name="test", ttl=LEASE_TTL, renew_interval=1)
+        self.callbacks = {name: Mock() for name in ("a", "b")}
+        self.replicas = {
+            name: LeaderElector(
+                self.engine,
+                on_elected=callbacks.elected,
+                on_demoted=callbacks.demoted,
+                settings=settings,
+                holder=name,
+                clock=self.clock,
+            )
+            for name, callbacks in self.callbacks.items()
+        }
+
+    def test_only_one_replica_leads(self) -> None:
+        """Test that the lease holder leads and the other stands by."""
+        a, b = self.replicas["a"], self.replicas["b"]
+
+        assert a.campaign()
+        assert not b.campaign()
+        # Renewing keeps the lease with the holder
+        self.clock.now += timedelta(seconds=LEASE_TTL - 1)
+        assert a.campaign()
+        assert not b.campaign()
+
+        self.callbacks["a"].elected.assert_called_once()
+        self.callbacks["b"].elected.assert_not_called()
+
+    def test_standby_takes_over_expired_lease(self) -> None:
+        """Test that a standby becomes leader once the lease lapses."""
+        a, b = self.replicas["a"], self.replicas["b"]
+        a.campaign()
+
+        self.clock.now += timedelta(seconds=LEASE_TTL + 1)
+        assert b.campaign()
+        assert not a.campaign()
+
+        self.callbacks["a"].demoted.assert_called_once()
+        self.callbacks["b"].elected.assert_called_once()
+
+    def test_stop_releases_lease(self) -> None:
+        """Test that a stopping leader lets a standby take over at once."""
+        a, b = self.replicas["a"], self.replicas["b"]
+        a.campaign()
+
+        a.stop()
+
+        assert not a.is_leader
+        assert b.campaign()
+
+    def test_database_error_demotes_leader(self) -> None:
+        """Test that a leader that can't reach the database steps down."""
+        a = self.replicas["a"]
+        a.campaign()
+
+        SchedulerLease.__table__.drop(self.engine)  # type: ignore[attr-defined]
+
+        assert not a.campaign()
+        self.callbacks["a"].demoted.assert_called_once()
+        assert a.stats()["errors"] == 1
+
+
+class TestDatabaseJobstore(unittest.TestCase):
+    """Test that jobs are persisted and shared between replicas."""
+
+    def setUp(self) -> None:
+        """Create two scheduler replicas on one database."""
+        self.engine = _engine()
+        self.services = [SchedulerService(), SchedulerService()]
+        for service in self.services:
+            service.use_database(self.engine)
+
+    def tearDown(self) -> None:
+        """Stop both replicas."""
+        for service in self.services:
+            service.shutdown()
+
+    def test_jobs_are_shared_and_fired_by_leader_only(self) -> None:
+        """Test that a job added on one replica is visible on the other."""
+        first, second = self.services
+        for service in self.services:
+            service.start()
+
+        first.add_schedule(
+            job_id="standup",
+            name="Standup",
+            action="raise",
+            position_mm=RAISE_POSITION_MM,
+            hour=9,
+            minute=0,
+        )
+
+        assert [job["id"] for job in second.get_all_jobs()] == ["standup"]
+        assert all(service.is_running() for service in self.services)
+        assert sum(service.is_leader() for service in self.services) == 1
+        job = second.scheduler.get_job("standup")
+        assert job.args == ("standup", "Standup", "raise", RAISE_POSITION_MM)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
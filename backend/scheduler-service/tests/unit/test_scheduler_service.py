@@ -309,16 +309,18 @@ class TestSchedulerServiceJobExecution(unittest.TestCase):
         mock_job.id = "test_raise"
         mock_job.next_run_time = datetime(2025, 1, 1, 8, 0)
 
-        # Capture the job function
+        # Capture the job function and the arguments it is stored with
         captured_func: Callable[..., object] | None = None
+        captured_args: list[object] = []
 
         def capture_add_job(
             func: Callable[..., object],
             *args: object,
             **kwargs: object,
         ) -> Mock:
-            nonlocal captured_func
+            nonlocal captured_func, captured_args
             captured_func = func
+            captured_args = kwargs.get("args", [])  # type: ignore[assignment]
             return mock_job
 
         self.service.scheduler.add_job.side_effect = capture_add_job
@@ -335,7 +337,7 @@ class TestSchedulerServiceJobExecution(unittest.TestCase):
 
         # Execute the captured function
         assert captured_func is not None
-        captured_func()
+        captured_func(*captured_args)
 
         # Verify DeskService.raise_all_desks was called
         mock_desk_service.raise_all_desks.assert_called_once_with(
@@ -354,16 +356,18 @@ class TestSchedulerServiceJobExecution(unittest.TestCase):
         mock_job.id = "test_lower"
         mock_job.next_run_time = datetime(2025, 1, 1, 17, 0)
 
-        # Capture the job function
+        # Capture the job function and the arguments it is stored with
         captured_func: Callable[..., object] | None = None
+        captured_args: list[object] = []
 
         def capture_add_job(
             func: Callable[..., object],
             *args: object,
             **kwargs: object,
         ) -> Mock:
-            nonlocal captured_func
+            nonlocal captured_func, captured_args
             captured_func = func
+            captured_args = kwargs.get("args", [])  # type: ignore[assignment]
             return mock_job
 
         self.service.scheduler.add_job.side_effect = capture_add_job
@@ -380,7 +384,7 @@ class TestSchedulerServiceJobExecution(unittest.TestCase):
 
         # Execute the captured function
         assert captured_func is not None
-        captured_func()
+        captured_func(*captured_args)
 
         # Verify DeskService.lower_all_desks was called
         mock_desk_service.lower_all_desks.assert_called_once_with(